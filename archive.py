@@ -0,0 +1,589 @@
+"""
+Memory-mapped columnar tweet archive.
+
+Large dumps shaped like tests/fixtures/sample_tweets.json are slow to load
+because json.load parses every tweet into dicts before any work starts.
+write_archive() converts tweets once into a single file that TweetArchive
+opens with mmap: opening reads only a small footer, and afterwards each
+column or row is paged in from disk when first touched.
+
+File layout (all integers little-endian, every section 64-byte aligned):
+- preamble: MAGIC, then the footer offset and length as uint64
+- fixed-width numeric columns, one contiguous array each (NUMERIC_COLUMNS):
+  engagement counters, created_at epoch seconds, author follower counts,
+  sentiment code, feature counts and a uint16 bitmask of FLAG_BITS
+- string heaps (HEAPS): n + 1 uint64 offsets into a UTF-8 data block, so
+  row i is data[offsets[i]:offsets[i + 1]]; list fields (hashtags, topics)
+  are joined with LIST_SEPARATOR
+- id index: the numeric ids sorted, plus the row of each sorted id, for
+  O(log n) lookup by id with np.searchsorted
+- footer: JSON describing the row count and every section's dtype and offset
+
+The archive keeps the fields analysis uses (what TweetFrame carries, plus
+text, author, hashtags and topics); URLs, media, mentions, language, thread
+position, profile details beyond follower counts and quoted or retweeted
+payloads are not stored. Tweet ids must be numeric.
+"""
+
+import json
+import mmap
+import os
+import shutil
+import struct
+import tempfile
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import IO, Any, Dict, Iterable, List, Mapping, Optional, Union
+
+import numpy as np
+
+from models import ContentFeatures, EngagementMetrics, Profile, Tweet
+from tweet_frame import COLUMNS, FEATURE_FLAGS, SENTIMENT_CODES, TweetFrame
+
+MAGIC = b"TWARCH01"
+VERSION = 1
+
+# MAGIC, footer offset, footer length.
+_PREAMBLE = struct.Struct("<8sQQ")
+ALIGNMENT = 64
+
+NUMERIC_COLUMNS = {
+    "id": "<u8",
+    "likes": "<i8",
+    "retweets": "<i8",
+    "replies": "<i8",
+    "views": "<i8",
+    "created_at": "<f8",
+    "followers": "<i8",
+    "following": "<i8",
+    "sentiment": "<i1",
+    "topic_count": "<i4",
+    "length": "<i4",
+    "word_count": "<i4",
+    "emoji_count": "<i4",
+    "flags": "<u2",
+}
+
+# Bit i of the flags column holds FLAG_BITS[i].
+FLAG_BITS = ("verified", *FEATURE_FLAGS, "is_retweet", "is_reply", "is_thread")
+
+HEAPS = ("author_id", "username", "text", "hashtags", "topics")
+
+LIST_SEPARATOR = "\x1f"
+
+_SENTIMENTS = {code: name for name, code in SENTIMENT_CODES.items()}
+
+Record = Union[Tweet, Mapping[str, Any]]
+
+
+def _align(offset: int) -> int:
+    """offset rounded up to ALIGNMENT."""
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _numeric_id(tweet_id: Any) -> int:
+    """tweet_id as an int, or ValueError if it is not a uint64."""
+    try:
+        value = int(tweet_id)
+    except (TypeError, ValueError):
+        raise ValueError(f"Archive tweet ids must be numeric: {tweet_id!r}") from None
+    if not 0 <= value < 1 << 64:
+        raise ValueError(f"Archive tweet id out of range: {tweet_id!r}")
+    return value
+
+
+def _record_fields(record: Record) -> tuple:
+    """Values the frame columns do not carry, for a Tweet or raw tweet dict.
+
+    Returns (id, author_id, username, text, hashtags, topics, emoji_count,
+    is_retweet, is_reply, is_thread).
+    """
+    if isinstance(record, Tweet):
+        return (
+            record.id,
+            record.user.id,
+            record.user.username,
+            record.text,
+            record.hashtags,
+            record.features.topics,
+            record.features.emoji_count,
+            record.is_retweet,
+            record.is_reply,
+            record.is_thread,
+        )
+    user = record.get("user") or {}
+    features = record.get("features") or {}
+    return (
+        record.get("id", ""),
+        user.get("id", ""),
+        user.get("username", ""),
+        record.get("text", ""),
+        record.get("hashtags") or [],
+        features.get("topics") or [],
+        features.get("emojiCount", features.get("emoji_count", 0)),
+        record.get("isRetweet", record.get("is_retweet", False)),
+        record.get("isReply", record.get("is_reply", False)),
+        record.get("isThread", record.get("is_thread", False)),
+    )
+
+
+class ArchiveWriter:
+    """Streams tweets into an archive file, chunk_size rows at a time.
+
+    Sections are spooled to temporary files while rows arrive, so memory
+    stays bounded by the chunk size; close() assembles the archive and
+    replaces path atomically.
+    """
+
+    def __init__(self, path: Union[str, Path], chunk_size: int = 65536):
+        """Prepare to write an archive at path."""
+        if chunk_size <= 0:
+            raise ValueError("chunk_size must be positive")
+        self.path = Path(path)
+        self.chunk_size = chunk_size
+        self.rows = 0
+        self._pending: List[Record] = []
+        self._columns: Dict[str, IO[bytes]] = {
+            name: tempfile.TemporaryFile() for name in NUMERIC_COLUMNS
+        }
+        self._heap_data: Dict[str, IO[bytes]] = {
+            name: tempfile.TemporaryFile() for name in HEAPS
+        }
+        self._heap_offsets: Dict[str, IO[bytes]] = {
+            name: tempfile.TemporaryFile() for name in HEAPS
+        }
+        self._heap_sizes = dict.fromkeys(HEAPS, 0)
+        for offsets in self._heap_offsets.values():
+            offsets.write(np.zeros(1, dtype="<u8").tobytes())
+        self._closed = False
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit; writes the archive unless an error occurred."""
+        if exc_type is None:
+            self.close()
+        else:
+            self._discard()
+
+    def add(self, records: Iterable[Record]) -> None:
+        """Append Tweets or raw tweet dicts."""
+        if self._closed:
+            raise ValueError("ArchiveWriter is closed")
+        for record in records:
+            self._pending.append(record)
+            if len(self._pending) >= self.chunk_size:
+                self._flush()
+
+    def _flush(self) -> None:
+        """Encode the pending rows and append them to the section files."""
+        chunk = self._pending
+        if not chunk:
+            return
+        self._pending = []
+        if all(isinstance(record, Tweet) for record in chunk):
+            frame = TweetFrame.from_tweets(chunk)
+        elif not any(isinstance(record, Tweet) for record in chunk):
+            frame = TweetFrame.from_dicts(chunk)
+        else:
+            chunk = [
+                record if isinstance(record, Tweet) else Tweet.from_dict(record)
+                for record in chunk
+            ]
+            frame = TweetFrame.from_tweets(chunk)
+
+        fields = [_record_fields(record) for record in chunk]
+        values: Dict[str, Any] = {name: frame.columns.get(name) for name in COLUMNS}
+        values["id"] = [_numeric_id(row[0]) for row in fields]
+        values["emoji_count"] = [row[6] for row in fields]
+        extra = {
+            "is_retweet": [row[7] for row in fields],
+            "is_reply": [row[8] for row in fields],
+            "is_thread": [row[9] for row in fields],
+        }
+        flags = np.zeros(len(chunk), dtype="<u2")
+        for bit, name in enumerate(FLAG_BITS):
+            column = values[name] if name in COLUMNS else extra[name]
+            flags |= np.asarray(column, dtype=bool).astype("<u2") << bit
+        values["flags"] = flags
+        for name, dtype in NUMERIC_COLUMNS.items():
+            self._columns[name].write(np.asarray(values[name], dtype=dtype).tobytes())
+
+        strings = {
+            "author_id": [row[1] for row in fields],
+            "username": [row[2] for row in fields],
+            "text": [row[3] for row in fields],
+            "hashtags": [LIST_SEPARATOR.join(row[4]) for row in fields],
+            "topics": [LIST_SEPARATOR.join(row[5]) for row in fields],
+        }
+        for name, column in strings.items():
+            encoded = [(value or "").encode("utf-8") for value in column]
+            ends = np.cumsum([len(value) for value in encoded], dtype=np.uint64)
+            self._heap_offsets[name].write(
+                (ends + np.uint64(self._heap_sizes[name])).astype("<u8").tobytes()
+            )
+            data = b"".join(encoded)
+            self._heap_data[name].write(data)
+            self._heap_sizes[name] += len(data)
+        self.rows += len(chunk)
+
+    def close(self) -> Path:
+        """Write the archive file and return its path."""
+        if self._closed:
+            return self.path
+        try:
+            self._flush()
+            self._assemble()
+        finally:
+            self._discard()
+        return self.path
+
+    def _assemble(self) -> None:
+        """Build the id index and write every section and the footer."""
+        self._columns["id"].seek(0)
+        ids = np.frombuffer(self._columns["id"].read(), dtype="<u8")
+        order = np.argsort(ids, kind="stable")
+        index = {
+            "id_sorted": ids[order].astype("<u8").tobytes(),
+            "id_rows": order.astype("<i8").tobytes(),
+        }
+
+        sections: List[tuple] = []
+        footer: Dict[str, Any] = {
+            "version": VERSION,
+            "rows": self.rows,
+            "columns": {},
+            "heaps": {},
+            "index": {},
+        }
+        offset = _align(_PREAMBLE.size)
+        for name, dtype in NUMERIC_COLUMNS.items():
+            footer["columns"][name] = {"dtype": dtype, "offset": offset}
+            sections.append((offset, self._columns[name]))
+            offset = _align(offset + self.rows * np.dtype(dtype).itemsize)
+        for name in HEAPS:
+            footer["heaps"][name] = {"offsets": offset}
+            sections.append((offset, self._heap_offsets[name]))
+            offset = _align(offset + (self.rows + 1) * 8)
+            footer["heaps"][name]["data"] = offset
+            sections.append((offset, self._heap_data[name]))
+            offset = _align(offset + self._heap_sizes[name])
+        for name, data in index.items():
+            footer["index"][name] = offset
+            sections.append((offset, data))
+            offset = _align(offset + len(data))
+        footer_bytes = json.dumps(footer, separators=(",", ":")).encode("utf-8")
+
+        partial = self.path.with_name(self.path.name + ".partial")
+        try:
+            with open(partial, "wb") as out:
+                out.write(_PREAMBLE.pack(MAGIC, offset, len(footer_bytes)))
+                for start, source in sections:
+                    out.write(b"\0" * (start - out.tell()))
+                    if isinstance(source, bytes):
+                        out.write(source)
+                    else:
+                        source.seek(0)
+                        shutil.copyfileobj(source, out)
+                out.write(b"\0" * (offset - out.tell()))
+                out.write(footer_bytes)
+            os.replace(partial, self.path)
+        finally:
+            if partial.exists():
+                partial.unlink()
+
+    def _discard(self) -> None:
+        """Drop the temporary section files."""
+        self._closed = True
+        self._pending = []
+        for files in (self._columns, self._heap_data, self._heap_offsets):
+            for spool in files.values():
+                spool.close()
+
+
+def write_archive(
+    path: Union[str, Path], records: Iterable[Record], chunk_size: int = 65536
+) -> Path:
+    """Write Tweets or raw tweet dicts to an archive at path."""
+    with ArchiveWriter(path, chunk_size=chunk_size) as writer:
+        writer.add(records)
+    return writer.path
+
+
+def archive_from_json(
+    json_path: Union[str, Path], path: Union[str, Path], chunk_size: int = 65536
+) -> Path:
+    """Convert a JSON dump ({"tweets": [...]} or a list of tweets) once."""
+    with open(json_path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    records = data["tweets"] if isinstance(data, Mapping) else data
+    return write_archive(path, records, chunk_size=chunk_size)
+
+
+def _unpack(flags: np.ndarray, name: str) -> np.ndarray:
+    """Bool array of the FLAG_BITS bit called name."""
+    bit = np.uint16(FLAG_BITS.index(name))
+    return (flags >> bit) & np.uint16(1) == 1
+
+
+class _ArchiveRows:
+    """Archive rows of a TweetFrame, materialized as Tweets on access."""
+
+    def __init__(self, archive: "TweetArchive", rows: np.ndarray):
+        """Wrap archive row numbers."""
+        self._archive = archive
+        self._rows = rows
+
+    def __len__(self) -> int:
+        """Number of rows."""
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        """Tweet for row index."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._archive[int(self._rows[index])]
+
+    def take(self, indices: np.ndarray):
+        """The same kind of sequence over a subset of the rows."""
+        return type(self)(self._archive, self._rows[indices])
+
+
+class _ArchiveIds(_ArchiveRows):
+    """Tweet ids of archive rows as strings, converted only when read."""
+
+    def __getitem__(self, index):
+        """Id string of row index."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return str(self._archive.ids[self._rows[index]])
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """All ids as an object array of strings."""
+        return self._archive.ids[self._rows].astype(str).astype(object)
+
+
+class _ArchiveUsernames(_ArchiveRows):
+    """Author usernames of archive rows, decoded only when read."""
+
+    def __getitem__(self, index):
+        """Username of row index."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        return self._archive.username(int(self._rows[index]))
+
+    def __array__(self, dtype=None, copy=None) -> np.ndarray:
+        """All usernames as an object array."""
+        usernames = np.empty(len(self._rows), dtype=object)
+        usernames[:] = [self._archive.username(row) for row in self._rows.tolist()]
+        return usernames
+
+
+class TweetArchive:
+    """Read-only, memory-mapped view of an archive file."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Map the archive at path; only the footer is read."""
+        self.path = Path(path)
+        with open(self.path, "rb") as f:
+            self._mmap = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            magic, footer_offset, footer_length = _PREAMBLE.unpack_from(self._mmap)
+            if magic != MAGIC:
+                raise ValueError(f"Not a tweet archive: {path}")
+            footer = json.loads(
+                self._mmap[footer_offset : footer_offset + footer_length]
+            )
+            if footer["version"] != VERSION:
+                raise ValueError(f"Unsupported archive version: {footer['version']}")
+        except Exception:
+            self._mmap.close()
+            raise
+        self.rows: int = footer["rows"]
+        self._footer = footer
+        self._arrays: Dict[str, np.ndarray] = {}
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit; unmaps the file."""
+        self.close()
+
+    def __len__(self) -> int:
+        """Number of tweets in the archive."""
+        return self.rows
+
+    def close(self) -> None:
+        """Unmap the file.
+
+        Column arrays handed out earlier keep the mapping alive until they
+        are garbage collected.
+        """
+        self._arrays.clear()
+        try:
+            self._mmap.close()
+        except BufferError:
+            pass
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the archive file in bytes."""
+        return len(self._mmap)
+
+    def _array(self, key: str, offset: int, dtype: str, count: int) -> np.ndarray:
+        """Read-only array view of count dtype items at offset (cached)."""
+        array = self._arrays.get(key)
+        if array is None:
+            array = np.frombuffer(self._mmap, dtype=dtype, count=count, offset=offset)
+            self._arrays[key] = array
+        return array
+
+    def column(self, name: str) -> np.ndarray:
+        """Column by name.
+
+        NUMERIC_COLUMNS are zero-copy views of the file; FLAG_BITS names are
+        bool arrays unpacked from the flags column.
+        """
+        if name in FLAG_BITS:
+            return _unpack(self.column("flags"), name)
+        spec = self._footer["columns"].get(name)
+        if spec is None:
+            raise KeyError(f"Unknown archive column: {name}")
+        return self._array(name, spec["offset"], spec["dtype"], self.rows)
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Tweet ids as uint64, in row order."""
+        return self.column("id")
+
+    def string(self, heap: str, row: int) -> str:
+        """String value of row in a heap (HEAPS)."""
+        spec = self._footer["heaps"].get(heap)
+        if spec is None:
+            raise KeyError(f"Unknown archive heap: {heap}")
+        if not -self.rows <= row < self.rows:
+            raise IndexError("archive row out of range")
+        row %= self.rows
+        offsets = self._array(heap, spec["offsets"], "<u8", self.rows + 1)
+        start = spec["data"] + int(offsets[row])
+        end = spec["data"] + int(offsets[row + 1])
+        return self._mmap[start:end].decode("utf-8")
+
+    def strings(self, heap: str, row: int) -> List[str]:
+        """List value of row in the hashtags or topics heap."""
+        value = self.string(heap, row)
+        return value.split(LIST_SEPARATOR) if value else []
+
+    def text(self, row: int) -> str:
+        """Tweet text of row."""
+        return self.string("text", row)
+
+    def username(self, row: int) -> str:
+        """Author username of row."""
+        return self.string("username", row)
+
+    def find(self, tweet_id: Union[str, int]) -> int:
+        """Row of tweet_id, or -1 if it is not in the archive."""
+        try:
+            value = np.uint64(_numeric_id(tweet_id))
+        except ValueError:
+            return -1
+        return int(self.find_many(np.array([value], dtype=np.uint64))[0])
+
+    def find_many(self, tweet_ids: Union[np.ndarray, Iterable[Any]]) -> np.ndarray:
+        """Rows of many ids at once (int64, -1 where absent)."""
+        if not isinstance(tweet_ids, np.ndarray):
+            tweet_ids = np.array([_numeric_id(i) for i in tweet_ids], dtype=np.uint64)
+        tweet_ids = tweet_ids.astype(np.uint64, copy=False)
+        if not self.rows:
+            return np.full(len(tweet_ids), -1, dtype=np.int64)
+        index = self._footer["index"]
+        sorted_ids = self._array("id_sorted", index["id_sorted"], "<u8", self.rows)
+        id_rows = self._array("id_rows", index["id_rows"], "<i8", self.rows)
+        positions = np.searchsorted(sorted_ids, tweet_ids)
+        clipped = np.minimum(positions, self.rows - 1)
+        found = sorted_ids[clipped] == tweet_ids
+        return np.where(found, id_rows[clipped], -1)
+
+    def __getitem__(self, row: int) -> Tweet:
+        """Row as a Tweet."""
+        if not -self.rows <= row < self.rows:
+            raise IndexError("archive row out of range")
+        row %= self.rows
+        values = {name: self.column(name)[row].item() for name in NUMERIC_COLUMNS}
+        flags = values["flags"]
+        bits = {name: bool(flags >> bit & 1) for bit, name in enumerate(FLAG_BITS)}
+        user = Profile(
+            id=self.string("author_id", row),
+            username=self.username(row),
+            display_name="",
+            verified=bits["verified"],
+            followers=values["followers"],
+            following=values["following"],
+        )
+        return Tweet(
+            id=str(values["id"]),
+            text=self.text(row),
+            user=user,
+            created_at=datetime.fromtimestamp(values["created_at"], tz=timezone.utc),
+            engagement=EngagementMetrics(
+                likes=values["likes"],
+                retweets=values["retweets"],
+                replies=values["replies"],
+                views=values["views"],
+            ),
+            features=ContentFeatures(
+                length=values["length"],
+                word_count=values["word_count"],
+                emoji_count=values["emoji_count"],
+                sentiment=_SENTIMENTS[values["sentiment"]],
+                topics=self.strings("topics", row),
+                **{name: bits[name] for name in FEATURE_FLAGS},
+            ),
+            hashtags=self.strings("hashtags", row),
+            is_retweet=bits["is_retweet"],
+            is_reply=bits["is_reply"],
+            is_thread=bits["is_thread"],
+        )
+
+    def get(self, tweet_id: Union[str, int]) -> Optional[Tweet]:
+        """Tweet with tweet_id, or None."""
+        row = self.find(tweet_id)
+        return self[row] if row >= 0 else None
+
+    def frame(
+        self, rows: Optional[Union[slice, np.ndarray, Iterable[int]]] = None
+    ) -> TweetFrame:
+        """TweetFrame over rows (all rows, a slice, indices or a boolean mask).
+
+        Slices give zero-copy column views; other selections gather only the
+        chosen rows. Ids and usernames are converted only when the frame's
+        ids or usernames are read, and Tweets only when rows are indexed.
+        """
+        if rows is None:
+            rows = slice(None)
+        if isinstance(rows, slice):
+            positions = np.arange(self.rows)[rows]
+        else:
+            positions = np.asarray(rows)
+            if positions.dtype == np.bool_:
+                positions = np.flatnonzero(positions)
+            positions = positions.astype(np.intp, copy=False)
+            rows = positions
+        flags = self.column("flags")[rows]
+        columns = {}
+        for name, dtype in COLUMNS.items():
+            if name in FLAG_BITS:
+                columns[name] = _unpack(flags, name)
+            else:
+                columns[name] = self.column(name)[rows].astype(dtype, copy=False)
+        return TweetFrame(
+            _ArchiveIds(self, positions),
+            columns,
+            _ArchiveRows(self, positions),
+            _ArchiveUsernames(self, positions),
+        )
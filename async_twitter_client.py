@@ -0,0 +1,212 @@
+"""
+Asyncio twin of TwitterClient for bounded concurrent fan-out to the Node.js bridge.
+
+AsyncTwitterClient speaks the same bridge contract as TwitterClient
+(`/api/timeline`, `/api/tweet/{id}`, `/api/tweets`) and delegates every request to the
+synchronous request path, so retries, `_handle_response` error mapping and
+response normalization behave identically. Requests run on a worker pool and
+at most `processing['max_concurrent_requests']` are in flight at once.
+"""
+
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
+from typing import (
+    Any,
+    AsyncIterator,
+    Callable,
+    Dict,
+    List,
+    Optional,
+    Sequence,
+    Union,
+)
+
+from requests.adapters import HTTPAdapter
+
+from config import AppConfig
+from models import Tweet
+from twitter_client import TwitterClient, TwitterClientError
+
+
+class AsyncTwitterClient:
+    """Async Twitter client that runs bridge requests concurrently."""
+
+    def __init__(
+        self,
+        config: Optional[AppConfig] = None,
+        max_concurrent_requests: Optional[int] = None,
+        seen_store: Optional[Any] = None,
+    ):
+        """Initialize AsyncTwitterClient with configuration.
+
+        seen_store is passed to the wrapped TwitterClient.
+        """
+        self._client = TwitterClient(config, seen_store=seen_store)
+        self.config = self._client.config
+
+        if max_concurrent_requests is None:
+            max_concurrent_requests = self.config.processing.get(
+                "max_concurrent_requests", 3
+            )
+        if max_concurrent_requests <= 0:
+            raise ValueError("Max concurrent requests must be positive")
+        self.max_concurrent_requests = max_concurrent_requests
+
+        # Size the connection pool to the concurrency limit so that every
+        # in-flight request can reuse a keep-alive connection.
+        adapter = HTTPAdapter(
+            pool_connections=max_concurrent_requests,
+            pool_maxsize=max_concurrent_requests,
+        )
+        self._client.session.mount("http://", adapter)
+        self._client.session.mount("https://", adapter)
+
+        self._executor = ThreadPoolExecutor(
+            max_workers=max_concurrent_requests,
+            thread_name_prefix="async-twitter-client",
+        )
+        self._semaphore: Optional[asyncio.Semaphore] = None
+        self._semaphore_loop: Optional[asyncio.AbstractEventLoop] = None
+
+    async def __aenter__(self):
+        """Async context manager entry."""
+        return self
+
+    async def __aexit__(self, exc_type, exc_val, exc_tb):
+        """Async context manager exit - close worker pool and session."""
+        self.close()
+
+    def close(self) -> None:
+        """Shut down the worker pool and close the underlying session."""
+        self._executor.shutdown(wait=True)
+        self._client.close()
+
+    def load_cookies(self, cookie_data: Any) -> None:
+        """Load cookie data from open_x_cdp.py format."""
+        self._client.load_cookies(cookie_data)
+
+    def is_authenticated(self) -> bool:
+        """Determine whether essential cookies satisfy the Node bridge contract."""
+        return self._client.is_authenticated()
+
+    def _get_semaphore(self) -> asyncio.Semaphore:
+        """Return the concurrency semaphore bound to the running event loop."""
+        loop = asyncio.get_running_loop()
+        if self._semaphore is None or self._semaphore_loop is not loop:
+            self._semaphore = asyncio.Semaphore(self.max_concurrent_requests)
+            self._semaphore_loop = loop
+        return self._semaphore
+
+    async def _run(self, func: Callable[..., Any], *args: Any) -> Any:
+        """Run a synchronous client call on the worker pool under the semaphore."""
+        async with self._get_semaphore():
+            loop = asyncio.get_running_loop()
+            return await loop.run_in_executor(
+                self._executor, functools.partial(func, *args)
+            )
+
+    async def get_timeline(
+        self, count: int = 20, skip_seen: bool = True
+    ) -> List[Tweet]:
+        """Get timeline tweets; skip_seen as in TwitterClient.get_timeline."""
+        return await self._run(self._client.get_timeline, count, skip_seen)
+
+    async def iter_timeline(
+        self,
+        max_items: Optional[int] = None,
+        page_size: int = 20,
+        include_replies: bool = False,
+        since_id: Optional[str] = None,
+        skip_seen: bool = True,
+    ) -> AsyncIterator[Tweet]:
+        """Stream timeline tweets page by page following bridge cursors.
+
+        Mirrors TwitterClient.iter_timeline: the next page is requested as a
+        background task while the caller consumes the current one, and
+        leaving the loop early stops further page requests. With since_id
+        paging stops at the first already-seen tweet. Only yielded tweets are
+        marked seen.
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        remaining = max_items
+        if remaining is not None and remaining <= 0:
+            return
+
+        fetch_page = self._client._fetch_timeline_page
+        next_page: Optional[asyncio.Future] = None
+        try:
+            count = page_size if remaining is None else min(page_size, remaining)
+            page, cursor = await self._run(
+                fetch_page, count, None, include_replies, since_id, skip_seen
+            )
+            while True:
+                if remaining is not None:
+                    page = page[:remaining]
+                    remaining -= len(page)
+                if cursor is not None and remaining != 0:
+                    count = (
+                        page_size if remaining is None else min(page_size, remaining)
+                    )
+                    next_page = asyncio.ensure_future(
+                        self._run(
+                            fetch_page,
+                            count,
+                            cursor,
+                            include_replies,
+                            since_id,
+                            skip_seen,
+                        )
+                    )
+
+                for tweet in page:
+                    self._client._mark_seen([tweet], skip_seen)
+                    yield tweet
+
+                if next_page is None:
+                    return
+                page, cursor = await next_page
+                next_page = None
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+
+    async def get_latest_tweet(self) -> Tweet:
+        """Get the latest tweet from timeline."""
+        return await self._run(self._client.get_latest_tweet)
+
+    async def get_tweets_and_replies(
+        self, count: int = 20, skip_seen: bool = True
+    ) -> List[Tweet]:
+        """Get tweets and replies; skip_seen as in TwitterClient.get_timeline."""
+        return await self._run(self._client.get_tweets_and_replies, count, skip_seen)
+
+    async def get_tweet(self, tweet_id: str) -> Tweet:
+        """Get specific tweet by ID."""
+        return await self._run(self._client.get_tweet, tweet_id)
+
+    async def get_tweets(
+        self, tweet_ids: Sequence[str]
+    ) -> List[Union[Tweet, TwitterClientError]]:
+        """Fetch many tweets, running batch requests concurrently.
+
+        Unique ids are split into chunks of processing['batch_size'] and each
+        chunk is fetched through TwitterClient.get_tweets, so de-duplication,
+        in-flight coalescing and per-id errors are shared with the sync
+        client. Results follow the input order.
+        """
+        unique_ids = list(dict.fromkeys(tweet_ids))
+        batch_size = self.config.processing.get("batch_size", 20)
+        chunks = [
+            unique_ids[start : start + batch_size]
+            for start in range(0, len(unique_ids), batch_size)
+        ]
+        chunk_results = await asyncio.gather(
+            *(self._run(self._client.get_tweets, chunk) for chunk in chunks)
+        )
+
+        results: Dict[str, Union[Tweet, TwitterClientError]] = {}
+        for chunk, fetched in zip(chunks, chunk_results):
+            results.update(zip(chunk, fetched))
+        return [results[tweet_id] for tweet_id in tweet_ids]
@@ -0,0 +1,117 @@
+#!/usr/bin/env python3
+"""
+Benchmark: json.load of a tweet dump vs opening a memory-mapped archive.
+
+Writes N synthetic tweets (copies of the sample fixture with distinct ids)
+as a JSON dump shaped like tests/fixtures/sample_tweets.json and as an
+archive. Then times, for each format, loading it and summing the likes
+column, and for the archive alone: the open, random id lookups, a
+TweetFrame over every row narrowed with take(), and reading single rows
+back as Tweets.
+
+Usage: python benchmarks/bench_archive.py [--tweets 200000] [--lookups 10000]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from archive import TweetArchive, write_archive  # noqa: E402
+from snowflake import TWITTER_EPOCH_MS  # noqa: E402
+from tweet_frame import TweetFrame  # noqa: E402
+
+FIXTURE = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def make_records(count):
+    """count copies of the fixture tweets with distinct Snowflake ids."""
+    with open(FIXTURE / "sample_tweets.json", "r", encoding="utf-8") as f:
+        samples = json.load(f)["tweets"]
+    base_ms = 1705314600000 - TWITTER_EPOCH_MS
+    return [
+        dict(
+            samples[i % len(samples)],
+            id=str(((base_ms + i * 1000) << 22) | i % 4096),
+        )
+        for i in range(count)
+    ]
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--tweets", type=int, default=200_000)
+    arg_parser.add_argument("--lookups", type=int, default=10_000)
+    args = arg_parser.parse_args()
+
+    records = make_records(args.tweets)
+    rng = np.random.default_rng(42)
+    wanted = [records[i]["id"] for i in rng.integers(0, args.tweets, args.lookups)]
+
+    with tempfile.TemporaryDirectory() as directory:
+        dump = Path(directory) / "tweets.json"
+        with open(dump, "w", encoding="utf-8") as f:
+            json.dump({"tweets": records}, f)
+        started = time.perf_counter()
+        path = write_archive(Path(directory) / "tweets.twa", records)
+        converting = time.perf_counter() - started
+        del records
+
+        started = time.perf_counter()
+        with open(dump, "r", encoding="utf-8") as f:
+            loaded = json.load(f)["tweets"]
+        json_likes = TweetFrame.from_dicts(loaded).columns["likes"].sum()
+        json_seconds = time.perf_counter() - started
+        del loaded
+
+        started = time.perf_counter()
+        archive = TweetArchive(path)
+        opening = time.perf_counter() - started
+        archive_likes = archive.column("likes").sum()
+        archive_seconds = time.perf_counter() - started
+        assert archive_likes == json_likes
+
+        started = time.perf_counter()
+        rows = archive.find_many(wanted)
+        batch_lookup = time.perf_counter() - started
+        started = time.perf_counter()
+        for tweet_id in wanted:
+            archive.find(tweet_id)
+        single_lookup = time.perf_counter() - started
+        assert (rows >= 0).all()
+
+        started = time.perf_counter()
+        frame = archive.frame()
+        frame.take(frame.columns["likes"] > frame.columns["likes"].mean())
+        framing = time.perf_counter() - started
+        del frame
+
+        started = time.perf_counter()
+        for row in rows[:1000].tolist():
+            archive[row]
+        materializing = (time.perf_counter() - started) / min(len(rows), 1000)
+
+        sizes = (dump.stat().st_size, archive.nbytes)
+        archive.close()
+
+    print(f"tweets:              {args.tweets:,}")
+    print(f"file size:           json {sizes[0]:,} B, archive {sizes[1]:,} B")
+    print(f"convert once:        {converting:.2f}s")
+    print(f"json load + likes:   {json_seconds * 1e3:.1f}ms")
+    print(f"archive open:        {opening * 1e3:.3f}ms")
+    print(f"archive open+likes:  {archive_seconds * 1e3:.1f}ms")
+    print(f"speedup:             {json_seconds / archive_seconds:.0f}x")
+    print(f"id lookup (single):  {single_lookup / args.lookups * 1e6:.1f}us")
+    print(f"id lookup (batched): {batch_lookup / args.lookups * 1e6:.2f}us")
+    print(f"frame + take:        {framing * 1e3:.1f}ms")
+    print(f"row -> Tweet:        {materializing * 1e6:.1f}us")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,92 @@
+#!/usr/bin/env python3
+"""
+Benchmark: seen-id Bloom filter vs an exact set of id strings.
+
+Adds --ids Snowflake-sized ids to a Python set and to a ScalableBloomFilter
+(starting at a tenth of the ids, so it grows), then looks up the same number
+of ids that were never added. Reports memory per id, add and lookup rates,
+the measured false-positive rate and the time to save and memory-map the
+filter back.
+
+Usage: python benchmarks/bench_bloom.py [--ids 1000000] [--error-rate 0.001]
+"""
+
+import argparse
+import sys
+import tempfile
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from bloom import ScalableBloomFilter  # noqa: E402
+
+BASE_ID = 1_600_000_000_000_000_000
+
+
+def set_bytes(ids):
+    """Approximate size of a set of strings: the table plus every string."""
+    return sys.getsizeof(ids) + sum(sys.getsizeof(tweet_id) for tweet_id in ids)
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--ids", type=int, default=1_000_000)
+    arg_parser.add_argument("--error-rate", type=float, default=0.001)
+    args = arg_parser.parse_args()
+
+    rng = np.random.default_rng(0)
+    added = BASE_ID + rng.choice(4 * args.ids, size=2 * args.ids, replace=False)
+    added, absent = added[: args.ids].astype(np.uint64), added[args.ids :]
+    absent = absent.astype(np.uint64)
+    strings = [str(tweet_id) for tweet_id in added.tolist()]
+    absent_strings = [str(tweet_id) for tweet_id in absent.tolist()]
+
+    started = time.perf_counter()
+    exact = set(strings)
+    set_add = time.perf_counter() - started
+    started = time.perf_counter()
+    hits = sum(tweet_id in exact for tweet_id in absent_strings)
+    set_lookup = time.perf_counter() - started
+    exact_bytes = set_bytes(exact)
+
+    bloom = ScalableBloomFilter(
+        initial_capacity=max(1, args.ids // 10), error_rate=args.error_rate
+    )
+    started = time.perf_counter()
+    bloom.add(added)
+    bloom_add = time.perf_counter() - started
+    started = time.perf_counter()
+    false_positives = int(bloom.contains(absent).sum())
+    bloom_lookup = time.perf_counter() - started
+    assert hits == 0 and bloom.contains(added).all()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = Path(tmp) / "seen.bloom"
+        started = time.perf_counter()
+        bloom.save(path)
+        save_time = time.perf_counter() - started
+        started = time.perf_counter()
+        ScalableBloomFilter.load(path, mmap_mode="r")
+        load_time = time.perf_counter() - started
+
+    print(f"ids:                {args.ids:,}")
+    print(f"filters:            {len(bloom.filters)}")
+    print(f"set bytes/id:       {exact_bytes / args.ids:.1f}")
+    print(f"bloom bytes/id:     {bloom.nbytes / args.ids:.2f}")
+    print(f"set add/s:          {args.ids / set_add:,.0f}")
+    print(f"bloom add/s:        {args.ids / bloom_add:,.0f}")
+    print(f"set lookup/s:       {args.ids / set_lookup:,.0f}")
+    print(f"bloom lookup/s:     {args.ids / bloom_lookup:,.0f}")
+    print(
+        f"false positives:    {false_positives / args.ids:.4%}"
+        f" (target {args.error_rate:.4%})"
+    )
+    print(f"save:               {save_time * 1e3:.1f}ms")
+    print(f"mmap load:          {load_time * 1e3:.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: re-scoring every candidate vs CandidateIndex top-K queries.
+
+Loads N decaying candidates into a CandidateIndex, then answers "current top
+K" queries at later times both by re-scoring and sorting every candidate and
+by querying the index, checks that both agree and reports the time per query.
+
+Usage: python benchmarks/bench_candidate_index.py [--candidates 1000000] [--k 10]
+"""
+
+import argparse
+import math
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from candidate_index import CandidateIndex  # noqa: E402
+
+DECAY_RATE = 0.1
+HOUR = 3600.0
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--candidates", type=int, default=1_000_000)
+    arg_parser.add_argument("--k", type=int, default=10)
+    arg_parser.add_argument("--queries", type=int, default=5)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(42)
+    epoch = time.time()
+    index = CandidateIndex(DECAY_RATE, epoch=epoch)
+    candidates = []
+    started = time.perf_counter()
+    for i in range(args.candidates):
+        scored_at = epoch + rng.uniform(0, 24) * HOUR
+        score = rng.uniform(0.01, 100)
+        index.add(i, score, created_at=scored_at, scored_at=scored_at)
+        candidates.append((i, score, scored_at))
+    insert = time.perf_counter() - started
+
+    rescore = query = 0.0
+    for q in range(args.queries):
+        now = epoch + (24 + q) * HOUR
+
+        started = time.perf_counter()
+        rescored = sorted(
+            (
+                (score * math.exp(-DECAY_RATE * (now - at) / HOUR), i)
+                for i, score, at in candidates
+            ),
+            reverse=True,
+        )[: args.k]
+        rescore += time.perf_counter() - started
+
+        started = time.perf_counter()
+        top = index.top(args.k, now=now)
+        query += time.perf_counter() - started
+
+        assert [item_id for item_id, _, _ in top] == [i for _, i in rescored]
+
+    print(f"candidates:   {args.candidates:,} (k={args.k})")
+    print(f"insert:       {insert / args.candidates * 1e6:.2f}us per candidate")
+    print(f"re-score all: {rescore / args.queries * 1e3:.1f}ms per query")
+    print(f"index top-K:  {query / args.queries * 1e3:.3f}ms per query")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,71 @@
+#!/usr/bin/env python3
+"""
+Benchmark: brute-force Hamming scan vs banded SimHashIndex lookup.
+
+Inserts N random 64-bit fingerprints into a SimHashIndex, then looks up Q
+queries (half of them stored fingerprints with a few bits flipped, half
+random) with the index and with a NumPy scan over every stored fingerprint.
+Checks that both agree on which queries have a match within max_distance and
+reports insert rate, per-query time and index bytes per fingerprint.
+
+Usage: python benchmarks/bench_dedup.py [--fingerprints 500000] [--queries 2000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dedup import SimHashIndex, hamming_distances  # noqa: E402
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--fingerprints", type=int, default=500_000)
+    arg_parser.add_argument("--queries", type=int, default=2_000)
+    arg_parser.add_argument("--max-distance", type=int, default=3)
+    args = arg_parser.parse_args()
+
+    rng = np.random.default_rng(42)
+    stored = rng.integers(0, 2**64, size=args.fingerprints, dtype=np.uint64)
+    queries = rng.integers(0, 2**64, size=args.queries, dtype=np.uint64)
+    near = args.queries // 2
+    queries[:near] = stored[rng.integers(0, args.fingerprints, size=near)]
+    for _ in range(args.max_distance):
+        flips = rng.integers(0, 64, size=near).astype(np.uint64)
+        queries[:near] ^= np.uint64(1) << flips
+
+    index = SimHashIndex(max_distance=args.max_distance)
+    started = time.perf_counter()
+    for fingerprint in stored.tolist():
+        index.add(fingerprint)
+    inserting = time.perf_counter() - started
+
+    started = time.perf_counter()
+    indexed = [index.query(q)[0] >= 0 for q in queries.tolist()]
+    lookup = time.perf_counter() - started
+
+    started = time.perf_counter()
+    scanned = [
+        bool(hamming_distances(stored, q).min() <= args.max_distance)
+        for q in queries.tolist()
+    ]
+    scan = time.perf_counter() - started
+
+    assert indexed == scanned
+    assert all(indexed[:near])
+
+    print(f"fingerprints:    {args.fingerprints:,} (max_distance={args.max_distance})")
+    print(f"inserts/s:       {args.fingerprints / inserting:,.0f}")
+    print(f"scan per query:  {scan / args.queries * 1e3:.3f}ms")
+    print(f"index per query: {lookup / args.queries * 1e3:.3f}ms")
+    print(f"speedup:         {scan / lookup:.1f}x")
+    print(f"bytes/entry:     {index.nbytes / args.fingerprints:.1f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,73 @@
+#!/usr/bin/env python3
+"""
+Benchmark: one search per keyword vs a compiled KeywordMatcher.
+
+Tags N synthetic tweets with K monitored keywords (strategy.yaml's
+keywords_to_monitor padded with generated terms), first by running one
+word-boundary regex search per keyword per tweet, then with a single
+KeywordMatcher pass per tweet. Checks that both find the same keywords and
+reports the time each takes.
+
+Usage: python benchmarks/bench_keywords.py [--tweets 5000] [--keywords 500]
+"""
+
+import argparse
+import random
+import re
+import sys
+import time
+from pathlib import Path
+
+ROOT = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(ROOT))
+
+from keywords import KeywordMatcher  # noqa: E402
+from opportunity import load_strategy  # noqa: E402
+
+FILLER = (
+    "just shipped a new release of our training stack and the benchmarks look "
+    "promising thanks to everyone who tested the nightly builds this week"
+).split()
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--tweets", type=int, default=5_000)
+    arg_parser.add_argument("--keywords", type=int, default=500)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(42)
+    keywords = list(load_strategy(ROOT / "strategy.yaml")["keywords_to_monitor"])
+    while len(keywords) < args.keywords:
+        keywords.append(f"{rng.choice(FILLER)} {rng.choice(FILLER)}x{len(keywords)}")
+    texts = [
+        " ".join(rng.choice(FILLER + keywords[:20]) for _ in range(25))
+        for _ in range(args.tweets)
+    ]
+
+    started = time.perf_counter()
+    searches = [
+        (keyword, re.compile(rf"(?<!\w){re.escape(keyword)}(?!\w)", re.IGNORECASE))
+        for keyword in keywords
+    ]
+    naive = [
+        {keyword for keyword, search in searches if search.search(text)}
+        for text in texts
+    ]
+    per_keyword = time.perf_counter() - started
+
+    started = time.perf_counter()
+    matcher = KeywordMatcher({keyword: keyword for keyword in keywords})
+    compiled = [set(matcher.topics(text)) for text in texts]
+    single_pass = time.perf_counter() - started
+
+    assert naive == compiled
+
+    print(f"tweets:             {args.tweets:,} (keywords={len(keywords)})")
+    print(f"search per keyword: {per_keyword:.3f}s")
+    print(f"KeywordMatcher:     {single_pass:.3f}s")
+    print(f"speedup:            {per_keyword / single_pass:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,123 @@
+#!/usr/bin/env python3
+"""
+Memory benchmark: bytes per tweet with slotted vs dict-backed models.
+
+The models in models.py are `@dataclass(slots=True)`. For comparison this
+script rebuilds dict-backed twins of the same dataclasses (identical fields,
+defaults and validation, but without __slots__) and measures, with
+tracemalloc, the memory held by N synthetic tweets for each variant. Authors
+are shared between tweets as they are after profile interning.
+
+Slots alone do not halve the memory per tweet: on CPython 3.11, which
+already stores instance dicts inline, the saving is about 14%. Most of what
+remains is strings, datetimes and per-tweet lists that slots do not touch, so
+this is not a compact layout in itself; TweetFrame's columnar arrays are.
+
+Usage: python benchmarks/bench_model_memory.py [--tweets 1000000] [--authors 10000]
+"""
+
+import argparse
+import dataclasses
+import gc
+import sys
+import tracemalloc
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+from types import FunctionType
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+import models  # noqa: E402
+
+GENERATED = {"__init__", "__repr__", "__eq__", "__getstate__", "__setstate__"}
+
+
+def dict_backed_twin(cls):
+    """Rebuild a slotted dataclass as a regular (per-instance __dict__) dataclass."""
+    namespace = {"__annotations__": dict(cls.__annotations__), "__doc__": cls.__doc__}
+    for f in dataclasses.fields(cls):
+        namespace[f.name] = dataclasses.field(
+            default=f.default, default_factory=f.default_factory
+        )
+    for name, value in vars(cls).items():
+        if name not in GENERATED and isinstance(
+            value, (FunctionType, classmethod, staticmethod)
+        ):
+            namespace[name] = value
+    return dataclasses.dataclass(type(cls.__name__, (), namespace))
+
+
+def build_tweets(count, authors, tweet_cls, profile_cls, metrics_cls, features_cls):
+    """Create count tweets from a pool of shared author profiles."""
+    profiles = [
+        profile_cls(
+            id=str(100_000 + i),
+            username=f"user_{i}",
+            display_name=f"User {i}",
+            followers=i * 10,
+            following=100,
+        )
+        for i in range(authors)
+    ]
+    base = datetime(2024, 3, 15, 14, 30, tzinfo=timezone.utc)
+    tweets = []
+    for i in range(count):
+        text = f"Tweet {i} about machine learning and neural networks #AI"
+        tweets.append(
+            tweet_cls(
+                id=str(1234567890123456789 + i),
+                text=text,
+                user=profiles[i % authors],
+                created_at=base - timedelta(seconds=i),
+                engagement=metrics_cls(
+                    likes=i % 500, retweets=i % 50, replies=i % 20, views=i % 10_000
+                ),
+                features=features_cls(
+                    has_hashtags=True, length=len(text), word_count=9
+                ),
+            )
+        )
+    return tweets
+
+
+def measure(count, authors, classes):
+    """Bytes held by the tweets built from classes, per tweet."""
+    gc.collect()
+    tracemalloc.start()
+    tweets = build_tweets(count, authors, *classes)
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del tweets
+    gc.collect()
+    return current / count
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--tweets", type=int, default=1_000_000)
+    arg_parser.add_argument("--authors", type=int, default=10_000)
+    args = arg_parser.parse_args()
+
+    slotted = (
+        models.Tweet,
+        models.Profile,
+        models.EngagementMetrics,
+        models.ContentFeatures,
+    )
+    dict_backed = tuple(dict_backed_twin(cls) for cls in slotted)
+    assert not hasattr(models.EngagementMetrics(), "__dict__")
+    assert hasattr(dict_backed[2](), "__dict__")
+
+    before = measure(args.tweets, args.authors, dict_backed)
+    after = measure(args.tweets, args.authors, slotted)
+
+    print(f"python:              {sys.version.split()[0]}")
+    print(f"tweets:              {args.tweets:,} ({args.authors:,} authors)")
+    print(f"dict-backed models:  {before:,.0f} bytes/tweet")
+    print(f"slotted models:      {after:,.0f} bytes/tweet")
+    print(f"saving:              {1 - after / before:.0%}")
+    print("target:              50% (not reached by slots alone; see TweetFrame)")
+
+
+if __name__ == "__main__":
+    main()
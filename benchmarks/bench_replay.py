@@ -0,0 +1,97 @@
+#!/usr/bin/env python3
+"""
+Benchmark: client normalization throughput over replayed bridge responses.
+
+Builds a capture log of timeline pages (the sample fixture tweets with
+distinct ids), or uses --capture to read a real one, then replays it through
+TwitterClient with no bridge running. Reports the time spent in
+_make_request + _handle_response (replay transport, JSON decode) and in
+tweet normalization, per request and per tweet.
+
+Usage: python benchmarks/bench_replay.py [--pages 200] [--page-size 100]
+       [--capture capture.jsonl] [--speed 0]
+"""
+
+import argparse
+import json
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from capture import ReplayTransport, read_capture  # noqa: E402
+from config import AppConfig  # noqa: E402
+from twitter_client import TwitterClient  # noqa: E402
+
+FIXTURE = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def synthetic_records(pages, page_size):
+    """Capture records of timeline pages built from the fixture tweets."""
+    with open(FIXTURE / "sample_tweets.json", "r", encoding="utf-8") as f:
+        samples = json.load(f)["tweets"]
+    records = []
+    for page in range(pages):
+        tweets = [
+            dict(samples[i % len(samples)], id=str(10**18 + page * page_size + i))
+            for i in range(page_size)
+        ]
+        body = {"success": True, "data": tweets, "metadata": {"count": page_size}}
+        records.append(
+            {
+                "method": "POST",
+                "endpoint": "/api/timeline",
+                "request": {"count": page_size, "page": page},
+                "elapsed": 0.2,
+                "status": 200,
+                "reason": "OK",
+                "body": json.dumps(body),
+            }
+        )
+    return records
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--pages", type=int, default=200)
+    arg_parser.add_argument("--page-size", type=int, default=100)
+    arg_parser.add_argument("--capture", type=Path, default=None)
+    arg_parser.add_argument("--speed", type=float, default=0.0)
+    args = arg_parser.parse_args()
+
+    if args.capture is not None:
+        records = list(read_capture(args.capture))
+    else:
+        records = synthetic_records(args.pages, args.page_size)
+
+    config = AppConfig()
+    config.api["rate_limit"] = None
+    client = TwitterClient(config=config)
+    ReplayTransport(records, speed=args.speed).install(client)
+
+    fetching = normalizing = 0.0
+    tweets = 0
+    for record in records:
+        started = time.perf_counter()
+        request = dict(record["request"]) if record["request"] else None
+        data = client._make_request(record["method"], record["endpoint"], request)
+        fetched = time.perf_counter()
+        payload = data.get("data")
+        if isinstance(payload, list):
+            tweets += len(client._normalize_tweets(payload))
+        elif isinstance(payload, dict) and "text" in payload:
+            client._normalize_tweet(payload)
+            tweets += 1
+        fetching += fetched - started
+        normalizing += time.perf_counter() - fetched
+
+    print(f"requests:          {len(records):,}")
+    print(f"tweets:            {tweets:,}")
+    print(f"fetch per request: {fetching / len(records) * 1e3:.3f}ms")
+    print(f"normalize/s:       {tweets / normalizing:,.0f} tweets")
+    print(f"end to end/s:      {tweets / (fetching + normalizing):,.0f} tweets")
+
+
+if __name__ == "__main__":
+    main()
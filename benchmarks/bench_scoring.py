@@ -0,0 +1,53 @@
+#!/usr/bin/env python3
+"""
+Benchmark: scalar ScoringConfig scoring vs vectorized score_batch.
+
+Scores N random metric rows with calculate_score + get_priority_level in a
+Python loop and with ScoringConfig.score_batch, checks that both agree and
+reports throughput.
+
+Usage: python benchmarks/bench_scoring.py [--rows 1000000]
+"""
+
+import argparse
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from config import ScoringConfig  # noqa: E402
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--rows", type=int, default=1_000_000)
+    args = arg_parser.parse_args()
+
+    scoring_config = ScoringConfig()
+    names = list(scoring_config.metric_weights)
+    matrix = np.random.default_rng(42).random((args.rows, len(names)))
+    rows = [dict(zip(names, values)) for values in matrix.tolist()]
+
+    started = time.perf_counter()
+    scalar_scores = [scoring_config.calculate_score(row) for row in rows]
+    scalar_levels = [scoring_config.get_priority_level(s) for s in scalar_scores]
+    scalar = time.perf_counter() - started
+
+    started = time.perf_counter()
+    batch_scores, batch_levels = scoring_config.score_batch(matrix)
+    batch = time.perf_counter() - started
+
+    assert batch_scores.tolist() == scalar_scores
+    assert batch_levels.tolist() == scalar_levels
+
+    print(f"rows:    {args.rows:,}")
+    print(f"scalar:  {scalar:.3f}s ({args.rows / scalar:,.0f} tweets/s)")
+    print(f"batch:   {batch:.3f}s ({args.rows / batch:,.0f} tweets/s)")
+    print(f"speedup: {scalar / batch:.0f}x")
+
+
+if __name__ == "__main__":
+    main()
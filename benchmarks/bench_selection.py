@@ -0,0 +1,49 @@
+#!/usr/bin/env python3
+"""
+Benchmark: sort-then-slice vs streaming TopKSelector.
+
+Selects the K best of N random (score, id) pairs by sorting the whole list and
+slicing, and by streaming the pairs through a TopKSelector, checks that both
+pick the same items and reports the time each takes.
+
+Usage: python benchmarks/bench_selection.py [--items 1000000] [--k 10]
+"""
+
+import argparse
+import random
+import sys
+import time
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from selection import TopKSelector  # noqa: E402
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--items", type=int, default=1_000_000)
+    arg_parser.add_argument("--k", type=int, default=10)
+    args = arg_parser.parse_args()
+
+    rng = random.Random(42)
+    scored = [(rng.random(), str(i)) for i in range(args.items)]
+
+    started = time.perf_counter()
+    sorted_top = sorted(scored, key=lambda pair: pair[0], reverse=True)[: args.k]
+    sort_slice = time.perf_counter() - started
+
+    started = time.perf_counter()
+    streamed_top = TopKSelector(args.k).consume(iter(scored)).top()
+    streaming = time.perf_counter() - started
+
+    assert [(score, item) for score, _, item in streamed_top] == sorted_top
+
+    print(f"items:          {args.items:,} (k={args.k})")
+    print(f"sort-then-slice: {sort_slice:.3f}s")
+    print(f"TopKSelector:    {streaming:.3f}s")
+    print(f"speedup:         {sort_slice / streaming:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,99 @@
+#!/usr/bin/env python3
+"""
+Benchmark: per-tweet commits vs batched TweetStore upserts.
+
+Builds N synthetic tweets from the sample fixture (distinct Snowflake ids and
+authors), writes a sample of them one committed upsert at a time and all of
+them with TweetStore.upsert_tweets, then re-upserts everything (the refresh
+path) and streams the store back as Tweets and as TweetFrames. Reports rows
+per second for each.
+
+Usage: python benchmarks/bench_storage.py [--tweets 50000] [--single 2000]
+"""
+
+import argparse
+import json
+import sys
+import tempfile
+import time
+from dataclasses import replace
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from models import Tweet  # noqa: E402
+from snowflake import TWITTER_EPOCH_MS  # noqa: E402
+from storage import TweetStore  # noqa: E402
+
+FIXTURE = Path(__file__).resolve().parent.parent / "tests" / "fixtures"
+
+
+def make_tweets(count):
+    """count copies of the fixture tweets with new ids and 1000 authors."""
+    with open(FIXTURE / "sample_tweets.json", "r", encoding="utf-8") as f:
+        samples = [Tweet.from_dict(data) for data in json.load(f)["tweets"]]
+    base_ms = 1705314600000 - TWITTER_EPOCH_MS
+    tweets = []
+    for i in range(count):
+        sample = samples[i % len(samples)]
+        user = replace(sample.user, id=str(1000 + i % 1000))
+        tweet_id = str(((base_ms + i * 1000) << 22) | i % 4096)
+        tweets.append(replace(sample, id=tweet_id, user=user))
+    return tweets
+
+
+def rate(rows, seconds):
+    """Rows per second, formatted."""
+    return f"{rows / seconds:,.0f} rows/s"
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--tweets", type=int, default=50_000)
+    arg_parser.add_argument("--single", type=int, default=2_000)
+    arg_parser.add_argument("--batch-size", type=int, default=5_000)
+    args = arg_parser.parse_args()
+
+    tweets = make_tweets(args.tweets)
+    single = tweets[: args.single]
+
+    with tempfile.TemporaryDirectory() as directory:
+        with TweetStore(Path(directory) / "single.db") as store:
+            started = time.perf_counter()
+            for tweet in single:
+                store.upsert_tweets([tweet])
+            one_by_one = time.perf_counter() - started
+
+        path = Path(directory) / "batched.db"
+        with TweetStore(path, batch_size=args.batch_size) as store:
+            started = time.perf_counter()
+            store.upsert_tweets(tweets)
+            batched = time.perf_counter() - started
+
+            started = time.perf_counter()
+            store.upsert_tweets(tweets)
+            refreshed = time.perf_counter() - started
+            assert store.count() == args.tweets
+
+        with TweetStore(path, read_only=True, batch_size=args.batch_size) as reader:
+            started = time.perf_counter()
+            read = sum(1 for _ in reader.iter_tweets())
+            as_tweets = time.perf_counter() - started
+
+            started = time.perf_counter()
+            framed = sum(len(frame) for frame in reader.iter_frames())
+            as_frames = time.perf_counter() - started
+        assert read == framed == args.tweets
+
+    print(f"tweets:           {args.tweets:,} (batch_size={args.batch_size:,})")
+    print(f"per-tweet commit: {rate(args.single, one_by_one)}")
+    print(f"batched insert:   {rate(args.tweets, batched)}")
+    print(f"batched refresh:  {rate(args.tweets, refreshed)}")
+    speedup = (one_by_one / args.single) / (batched / args.tweets)
+    print(f"speedup:          {speedup:.1f}x")
+    print(f"read Tweets:      {rate(args.tweets, as_tweets)}")
+    print(f"read TweetFrames: {rate(args.tweets, as_frames)}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+#!/usr/bin/env python3
+"""
+Micro-benchmark: dateutil vs the timestamps fast path.
+
+Builds records shaped like tests/fixtures/sample_tweets.json (unique
+`createdAt` per tweet, `joinDate` repeated per author) and times parsing both
+fields with dateutil.parser.parse and with parse_timestamp /
+parse_timestamp_cached.
+
+Usage: python benchmarks/bench_timestamps.py [--records 100000] [--authors 500]
+"""
+
+import argparse
+import sys
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dateutil import parser as date_parser  # noqa: E402
+
+from timestamps import parse_timestamp, parse_timestamp_cached  # noqa: E402
+
+
+def build_records(count: int, authors: int):
+    """Return (createdAt, joinDate) pairs in bridge format."""
+    base = datetime(2024, 3, 15, 14, 30, tzinfo=timezone.utc)
+    join_dates = [
+        (base - timedelta(days=30 + i)).strftime("%Y-%m-%dT%H:%M:%S.000Z")
+        for i in range(authors)
+    ]
+    return [
+        (
+            (base - timedelta(seconds=i)).strftime("%Y-%m-%dT%H:%M:%S.000Z"),
+            join_dates[i % authors],
+        )
+        for i in range(count)
+    ]
+
+
+def time_parser(records, parse_created, parse_joined):
+    """Seconds taken to parse both fields of every record."""
+    started = time.perf_counter()
+    for created_at, join_date in records:
+        parse_created(created_at)
+        parse_joined(join_date)
+    return time.perf_counter() - started
+
+
+def main():
+    arg_parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    arg_parser.add_argument("--records", type=int, default=100_000)
+    arg_parser.add_argument("--authors", type=int, default=500)
+    args = arg_parser.parse_args()
+
+    records = build_records(args.records, args.authors)
+    baseline = time_parser(records, date_parser.parse, date_parser.parse)
+    fast = time_parser(records, parse_timestamp, parse_timestamp_cached)
+
+    for created_at, join_date in records[:1000]:
+        assert parse_timestamp(created_at) == date_parser.parse(created_at)
+        assert parse_timestamp_cached(join_date) == date_parser.parse(join_date)
+
+    print(f"records:        {args.records:,} ({args.authors} authors)")
+    print(f"dateutil:       {baseline:.3f}s ({args.records / baseline:,.0f} records/s)")
+    print(f"fast path:      {fast:.3f}s ({args.records / fast:,.0f} records/s)")
+    print(f"speedup:        {baseline / fast:.1f}x")
+
+
+if __name__ == "__main__":
+    main()
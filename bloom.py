@@ -0,0 +1,444 @@
+"""
+Compact seen-id set for deduplicating ingestion.
+
+The same tweet ids arrive again and again across feeds and pollers, and an
+exact set of id strings grows to gigabytes over weeks of data. This module
+keeps a scalable Bloom filter over 64-bit ids instead:
+- BloomFilter: a NumPy bit array sized for a capacity and false-positive
+  rate, with k probes from double hashing a splitmix64-mixed id; adds and
+  lookups are vectorized over id batches
+- ScalableBloomFilter: when the newest filter reaches its capacity a larger
+  one (growth times the capacity, tightening times the error rate) is added,
+  so the overall false-positive rate stays below error_rate however many
+  ids arrive
+- save()/load(): one file with every filter's bits, 64-byte aligned, opened
+  with np.memmap so a large filter is paged in instead of read
+- SeenIds: the client-facing set. "Not seen" answers are exact; "maybe seen"
+  answers are confirmed against a TweetStore when one is given, so false
+  positives never drop a new tweet. With a store, only stored ids stay seen:
+  callers must upsert every tweet they are given, or its id counts as new
+  again and the tweet is delivered again
+
+Numeric (Snowflake) ids are used as they are; other ids are hashed to 64 bits.
+"""
+
+import hashlib
+import json
+import math
+import os
+import struct
+import threading
+from pathlib import Path
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Sequence, Union
+
+import numpy as np
+
+MAGIC = b"TWBLOOM1"
+
+# MAGIC, footer offset, footer length.
+_PREAMBLE = struct.Struct("<8sQQ")
+ALIGNMENT = 64
+
+# Ids are hashed in chunks so the (chunk, k) probe matrix stays small.
+_CHUNK = 65536
+
+_SALT = np.uint64(0x9E3779B97F4A7C15)
+_MUL1 = np.uint64(0xBF58476D1CE4E5B9)
+_MUL2 = np.uint64(0x94D049BB133111EB)
+
+
+def _align(offset: int) -> int:
+    """offset rounded up to ALIGNMENT."""
+    return -(-offset // ALIGNMENT) * ALIGNMENT
+
+
+def _id_key(tweet_id: Any) -> int:
+    """64-bit key of an id: the number itself, or a hash of the string."""
+    try:
+        value = int(tweet_id)
+    except (TypeError, ValueError):
+        value = -1
+    if 0 <= value < 1 << 64:
+        return value
+    digest = hashlib.blake2b(str(tweet_id).encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def id_keys(tweet_ids: Union[np.ndarray, Iterable[Any]]) -> np.ndarray:
+    """uint64 keys for ids (integer arrays pass through)."""
+    if isinstance(tweet_ids, np.ndarray) and tweet_ids.dtype.kind in "iu":
+        return tweet_ids.astype(np.uint64, copy=False)
+    return np.array([_id_key(tweet_id) for tweet_id in tweet_ids], dtype=np.uint64)
+
+
+def _mix(keys: np.ndarray) -> np.ndarray:
+    """splitmix64 finalizer: spreads nearby ids over all 64 bits."""
+    with np.errstate(over="ignore"):
+        keys = (keys ^ (keys >> np.uint64(30))) * _MUL1
+        keys = (keys ^ (keys >> np.uint64(27))) * _MUL2
+    return keys ^ (keys >> np.uint64(31))
+
+
+def optimal_parameters(capacity: int, error_rate: float) -> tuple:
+    """(bits, hashes) for capacity ids at error_rate false positives."""
+    if capacity <= 0:
+        raise ValueError("capacity must be positive")
+    if not 0 < error_rate < 1:
+        raise ValueError("error_rate must be between 0 and 1")
+    bits = math.ceil(-capacity * math.log(error_rate) / math.log(2) ** 2)
+    bits = _align(bits)
+    hashes = max(1, round(bits / capacity * math.log(2)))
+    return bits, hashes
+
+
+class BloomFilter:
+    """Fixed-capacity Bloom filter over 64-bit keys, backed by a uint8 array."""
+
+    def __init__(
+        self,
+        capacity: int,
+        error_rate: float = 0.001,
+        bits: Optional[np.ndarray] = None,
+        count: Optional[np.ndarray] = None,
+    ):
+        """Empty filter for capacity ids at error_rate.
+
+        bits and count (a one-element uint64 array) are passed when loading
+        a saved filter; they may be memory-mapped.
+        """
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits, self.num_hashes = optimal_parameters(capacity, error_rate)
+        if bits is None:
+            bits = np.zeros(self.num_bits // 8, dtype=np.uint8)
+        elif len(bits) * 8 != self.num_bits:
+            raise ValueError("bit array does not match capacity and error_rate")
+        self.bits = bits
+        self._count = count if count is not None else np.zeros(1, dtype=np.uint64)
+
+    @property
+    def count(self) -> int:
+        """Ids added (repeats of an id already present are not counted)."""
+        return int(self._count[0])
+
+    @property
+    def full(self) -> bool:
+        """Whether the filter holds capacity ids."""
+        return self.count >= self.capacity
+
+    @property
+    def nbytes(self) -> int:
+        """Size of the bit array in bytes."""
+        return self.bits.nbytes
+
+    def _probes(self, keys: np.ndarray) -> np.ndarray:
+        """Bit positions of each key, shape (len(keys), num_hashes)."""
+        h1 = _mix(keys)
+        h2 = _mix(keys ^ _SALT) | np.uint64(1)
+        steps = np.arange(self.num_hashes, dtype=np.uint64)
+        with np.errstate(over="ignore"):
+            probes = h1[:, None] + steps[None, :] * h2[:, None]
+        return probes % np.uint64(self.num_bits)
+
+    def contains_keys(self, keys: np.ndarray) -> np.ndarray:
+        """Per key: True if maybe present, False if certainly absent."""
+        found = np.empty(len(keys), dtype=bool)
+        for start in range(0, len(keys), _CHUNK):
+            probes = self._probes(keys[start : start + _CHUNK])
+            words = self.bits[probes >> np.uint64(3)]
+            set_bits = (words >> (probes & np.uint64(7)).astype(np.uint8)) & 1
+            found[start : start + _CHUNK] = set_bits.all(axis=1)
+        return found
+
+    def add_keys(self, keys: np.ndarray) -> np.ndarray:
+        """Add keys; returns which were (maybe) present beforehand."""
+        if not self.bits.flags.writeable:
+            raise ValueError("Bloom filter is read-only (loaded with mmap_mode='r')")
+        present = self.contains_keys(keys)
+        new = keys[~present]
+        for start in range(0, len(new), _CHUNK):
+            probes = self._probes(new[start : start + _CHUNK]).ravel()
+            masks = np.uint8(1) << (probes & np.uint64(7)).astype(np.uint8)
+            np.bitwise_or.at(self.bits, probes >> np.uint64(3), masks)
+        self._count[0] += np.uint64(len(np.unique(new)))
+        return present
+
+
+class ScalableBloomFilter:
+    """Bloom filter that adds larger, tighter filters as ids accumulate."""
+
+    def __init__(
+        self,
+        initial_capacity: int = 1_000_000,
+        error_rate: float = 0.001,
+        growth: int = 2,
+        tightening: float = 0.5,
+    ):
+        """Start with one filter of initial_capacity ids.
+
+        Filter i holds initial_capacity * growth**i ids at
+        error_rate * (1 - tightening) * tightening**i, so the combined
+        false-positive rate stays below error_rate.
+        """
+        if growth < 1:
+            raise ValueError("growth must be at least 1")
+        if not 0 < tightening < 1:
+            raise ValueError("tightening must be between 0 and 1")
+        optimal_parameters(initial_capacity, error_rate)
+        self.initial_capacity = initial_capacity
+        self.error_rate = error_rate
+        self.growth = growth
+        self.tightening = tightening
+        self.filters: List[BloomFilter] = []
+        self._lock = threading.Lock()
+        self._grow()
+
+    def _grow(self) -> BloomFilter:
+        """Append the next filter in the series."""
+        level = len(self.filters)
+        bloom = BloomFilter(
+            self.initial_capacity * self.growth**level,
+            self.error_rate * (1 - self.tightening) * self.tightening**level,
+        )
+        self.filters.append(bloom)
+        return bloom
+
+    def __len__(self) -> int:
+        """Ids added."""
+        return sum(bloom.count for bloom in self.filters)
+
+    def __contains__(self, tweet_id: Any) -> bool:
+        """Whether tweet_id was (maybe) added."""
+        return bool(self.contains(np.array([_id_key(tweet_id)], dtype=np.uint64))[0])
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes of bit arrays across all filters."""
+        return sum(bloom.nbytes for bloom in self.filters)
+
+    def contains(self, tweet_ids: Union[np.ndarray, Iterable[Any]]) -> np.ndarray:
+        """Per id: True if maybe added, False if certainly not."""
+        keys = id_keys(tweet_ids)
+        found = np.zeros(len(keys), dtype=bool)
+        for bloom in self.filters:
+            if bloom.count:
+                pending = ~found
+                found[pending] = bloom.contains_keys(keys[pending])
+        return found
+
+    def add(self, tweet_ids: Union[np.ndarray, Iterable[Any]]) -> np.ndarray:
+        """Add ids; returns which were (maybe) added before."""
+        keys = id_keys(tweet_ids)
+        with self._lock:
+            present = self.contains(keys)
+            new = np.flatnonzero(~present)
+            while len(new):
+                bloom = self.filters[-1]
+                if bloom.full:
+                    bloom = self._grow()
+                room = bloom.capacity - bloom.count
+                batch, new = new[:room], new[room:]
+                bloom.add_keys(keys[batch])
+        return present
+
+    def save(self, path: Union[str, Path]) -> Path:
+        """Write every filter to path (replaced atomically)."""
+        path = Path(path)
+        footer: Dict[str, Any] = {
+            "initial_capacity": self.initial_capacity,
+            "error_rate": self.error_rate,
+            "growth": self.growth,
+            "tightening": self.tightening,
+            "filters": [],
+        }
+        sections = []
+        offset = _align(_PREAMBLE.size)
+        with self._lock:
+            for bloom in self.filters:
+                footer["filters"].append(
+                    {
+                        "capacity": bloom.capacity,
+                        "error_rate": bloom.error_rate,
+                        "count": offset,
+                        "bits": offset + ALIGNMENT,
+                    }
+                )
+                sections.append((offset, bloom._count.astype("<u8").tobytes()))
+                sections.append((offset + ALIGNMENT, bloom.bits))
+                offset = _align(offset + ALIGNMENT + bloom.nbytes)
+            footer_bytes = json.dumps(footer, separators=(",", ":")).encode("utf-8")
+            partial = path.with_name(path.name + ".partial")
+            with open(partial, "wb") as out:
+                out.write(_PREAMBLE.pack(MAGIC, offset, len(footer_bytes)))
+                for start, data in sections:
+                    out.write(b"\0" * (start - out.tell()))
+                    out.write(memoryview(data))
+                out.write(b"\0" * (offset - out.tell()))
+                out.write(footer_bytes)
+                out.flush()
+                os.fsync(out.fileno())
+            os.replace(partial, path)
+        return path
+
+    @classmethod
+    def load(
+        cls, path: Union[str, Path], mmap_mode: Optional[str] = "r"
+    ) -> "ScalableBloomFilter":
+        """Open a saved filter.
+
+        mmap_mode "r" (read-only) or "c" (copy-on-write) maps the bit arrays
+        instead of reading them, so only the pages probed are read; adds to a
+        copy-on-write filter stay in memory until save(). None reads the
+        whole file.
+        """
+        path = Path(path)
+        with open(path, "rb") as f:
+            magic, footer_offset, footer_length = _PREAMBLE.unpack(
+                f.read(_PREAMBLE.size)
+            )
+            if magic != MAGIC:
+                raise ValueError(f"Not a saved Bloom filter: {path}")
+            f.seek(footer_offset)
+            footer = json.loads(f.read(footer_length))
+        scalable = cls.__new__(cls)
+        scalable.initial_capacity = footer["initial_capacity"]
+        scalable.error_rate = footer["error_rate"]
+        scalable.growth = footer["growth"]
+        scalable.tightening = footer["tightening"]
+        scalable._lock = threading.Lock()
+        scalable.filters = []
+        for spec in footer["filters"]:
+            num_bits, _ = optimal_parameters(spec["capacity"], spec["error_rate"])
+            count = _section(path, spec["count"], "<u8", 1, mmap_mode)
+            bits = _section(path, spec["bits"], np.uint8, num_bits // 8, mmap_mode)
+            scalable.filters.append(
+                BloomFilter(spec["capacity"], spec["error_rate"], bits, count)
+            )
+        return scalable
+
+
+def _section(
+    path: Path, offset: int, dtype: Any, count: int, mmap_mode: Optional[str]
+) -> np.ndarray:
+    """count items of dtype at offset in path, mapped or read."""
+    if mmap_mode is None:
+        with open(path, "rb") as f:
+            f.seek(offset)
+            return np.fromfile(f, dtype=dtype, count=count).copy()
+    return np.memmap(path, dtype=dtype, mode=mmap_mode, offset=offset, shape=(count,))
+
+
+class SeenIds:
+    """Seen-id set: a scalable Bloom filter with an exact store fallback."""
+
+    def __init__(
+        self,
+        bloom: Optional[ScalableBloomFilter] = None,
+        store: Optional[Any] = None,
+        path: Optional[Union[str, Path]] = None,
+    ):
+        """Track seen ids in bloom (a new default filter if None).
+
+        With store (a TweetStore), ids the filter reports as maybe seen are
+        only treated as seen when the store has them, so the caller must
+        upsert every tweet it is given: an id missing from the store counts as
+        new and its tweet is delivered again. path is where save() writes the
+        filter.
+        """
+        self.bloom = bloom if bloom is not None else ScalableBloomFilter()
+        self.store = store
+        self.path = Path(path) if path is not None else None
+        self._lock = threading.Lock()
+        self.checked = 0
+        self.skipped = 0
+        self.false_positives = 0
+
+    def __contains__(self, tweet_id: Any) -> bool:
+        """Whether tweet_id has been seen."""
+        if tweet_id not in self.bloom:
+            return False
+        if self.store is None:
+            return True
+        return bool(self.store.existing_ids([str(tweet_id)]))
+
+    def filter_new(self, tweet_ids: Sequence[Any], mark: bool = True) -> List[bool]:
+        """Per id, whether it is new; with mark, new ids are marked seen.
+
+        Repeats within tweet_ids count as seen after their first occurrence.
+        Pass mark=False to check only, and mark() the ids once processed.
+        """
+        first = {}
+        for position, tweet_id in enumerate(tweet_ids):
+            first.setdefault(tweet_id, position)
+        unique = list(first)
+        maybe_seen = self.bloom.add(unique) if mark else self.bloom.contains(unique)
+        seen = maybe_seen.tolist()
+        if self.store is not None and maybe_seen.any():
+            candidates = [str(i) for i, maybe in zip(unique, seen) if maybe]
+            stored = self.store.existing_ids(candidates)
+            for index, tweet_id in enumerate(unique):
+                if seen[index] and str(tweet_id) not in stored:
+                    seen[index] = False
+                    self.false_positives += 1
+        new_ids = {tweet_id for tweet_id, was in zip(unique, seen) if not was}
+        is_new = [
+            tweet_id in new_ids and first[tweet_id] == position
+            for position, tweet_id in enumerate(tweet_ids)
+        ]
+        with self._lock:
+            self.checked += len(tweet_ids)
+            self.skipped += len(tweet_ids) - sum(is_new)
+        return is_new
+
+    def filter_records(
+        self, records: Sequence[Mapping[str, Any]], mark: bool = True
+    ) -> List[Mapping[str, Any]]:
+        """Raw tweet dicts whose id is new, in order; with mark, marks them seen."""
+        if not records:
+            return []
+        is_new = self.filter_new([record.get("id", "") for record in records], mark)
+        return [record for record, new in zip(records, is_new) if new]
+
+    def mark(self, tweet_ids: Iterable[Any]) -> None:
+        """Mark ids as seen."""
+        tweet_ids = list(tweet_ids)
+        if tweet_ids:
+            self.bloom.add(tweet_ids)
+
+    def save(self) -> Optional[Path]:
+        """Write the filter to path, if one was given."""
+        if self.path is None:
+            return None
+        return self.bloom.save(self.path)
+
+    def stats(self) -> Dict[str, Any]:
+        """Counters and filter size."""
+        with self._lock:
+            return {
+                "checked": self.checked,
+                "skipped": self.skipped,
+                "false_positives": self.false_positives,
+                "ids": len(self.bloom),
+                "filters": len(self.bloom.filters),
+                "bytes": self.bloom.nbytes,
+            }
+
+    @classmethod
+    def from_config(
+        cls, seen_ids: Mapping[str, Any], store: Optional[Any] = None
+    ) -> "SeenIds":
+        """Create SeenIds from a processing['seen_ids'] dictionary.
+
+        Keys: capacity, error_rate, and path (loaded copy-on-write when the
+        file exists, written by save()). store is the optional TweetStore
+        confirming maybe-seen ids.
+        """
+        path = seen_ids.get("path")
+        if path is not None and Path(path).exists():
+            bloom = ScalableBloomFilter.load(path, mmap_mode="c")
+        else:
+            bloom = ScalableBloomFilter(
+                initial_capacity=seen_ids.get("capacity", 1_000_000),
+                error_rate=seen_ids.get("error_rate", 0.001),
+            )
+        return cls(bloom, store=store, path=path)
@@ -0,0 +1,124 @@
+"""
+Bounded TTL + LRU response cache for TwitterClient lookups.
+
+Entries expire after a per-entry TTL and the least recently used entry is
+evicted once `max_size` is reached. Negative entries record lookups that
+failed with NOT_FOUND so deleted tweets are not re-requested; they use a
+separate, normally shorter, TTL. Configured from AppConfig.api['cache']:
+`max_size`, `ttl_seconds`, `negative_ttl_seconds`.
+"""
+
+import threading
+import time
+from collections import OrderedDict
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, Iterable, Optional
+
+
+@dataclass
+class CacheEntry:
+    """Cached value with its expiry time."""
+
+    value: Any
+    expires_at: float
+    negative: bool = False
+
+
+class TTLCache:
+    """Thread-safe LRU cache with per-entry TTL and negative caching."""
+
+    def __init__(
+        self,
+        max_size: int = 1024,
+        ttl_seconds: float = 300.0,
+        negative_ttl_seconds: float = 60.0,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize an empty cache."""
+        if max_size <= 0:
+            raise ValueError("Cache max_size must be positive")
+        if ttl_seconds <= 0 or negative_ttl_seconds <= 0:
+            raise ValueError("Cache TTLs must be positive")
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self.negative_ttl_seconds = negative_ttl_seconds
+        self._clock = clock
+        self._entries: "OrderedDict[Hashable, CacheEntry]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+
+    @classmethod
+    def from_config(cls, cache_config: Dict[str, Any]) -> "TTLCache":
+        """Create TTLCache from an api['cache'] dictionary."""
+        return cls(
+            max_size=cache_config.get("max_size", 1024),
+            ttl_seconds=cache_config.get("ttl_seconds", 300.0),
+            negative_ttl_seconds=cache_config.get("negative_ttl_seconds", 60.0),
+        )
+
+    def __len__(self) -> int:
+        """Number of stored entries, including ones not yet purged."""
+        return len(self._entries)
+
+    def get(self, key: Hashable) -> Optional[CacheEntry]:
+        """Return the live entry for key, or None on miss or expiry."""
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None and entry.expires_at <= self._clock():
+                del self._entries[key]
+                entry = None
+            if entry is None:
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return entry
+
+    def set(
+        self, key: Hashable, value: Any, ttl_seconds: Optional[float] = None
+    ) -> None:
+        """Store a positive entry."""
+        ttl = self.ttl_seconds if ttl_seconds is None else ttl_seconds
+        self._store(key, value, ttl, negative=False)
+
+    def set_negative(self, key: Hashable, value: Any = None) -> None:
+        """Store a negative entry (e.g. the NOT_FOUND error) with the negative TTL."""
+        self._store(key, value, self.negative_ttl_seconds, negative=True)
+
+    def _store(self, key: Hashable, value: Any, ttl: float, negative: bool) -> None:
+        with self._lock:
+            self._entries[key] = CacheEntry(value, self._clock() + ttl, negative)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def invalidate(self, key: Hashable) -> bool:
+        """Drop key; return True if it was cached."""
+        with self._lock:
+            return self._entries.pop(key, None) is not None
+
+    def invalidate_many(self, keys: Iterable[Hashable]) -> int:
+        """Drop several keys; return how many were cached."""
+        with self._lock:
+            return sum(self._entries.pop(key, None) is not None for key in keys)
+
+    def clear(self) -> None:
+        """Drop every entry. Counters are kept."""
+        with self._lock:
+            self._entries.clear()
+
+    def stats(self) -> Dict[str, Any]:
+        """Return hit/miss counters and current size."""
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "size": len(self._entries),
+                "max_size": self.max_size,
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
@@ -0,0 +1,211 @@
+"""
+Decay-aware candidate index for live engagement opportunities.
+
+Under exponential time decay every score shrinks by the same factor,
+exp(-decay_rate * elapsed_hours), so the relative order of stored candidates
+never changes. The index therefore stores each score once, in log space and
+relative to a fixed epoch:
+
+    key = log(score_at_t) + decay_rate * (t - epoch) / 3600
+
+The key does not depend on when it is read: the current score at any time
+`now` is exp(key - decay_rate * (now - epoch) / 3600). Ranking by key is
+ranking by current score, so inserts are O(log n) heap pushes and top-K
+queries pop K entries instead of re-scoring everything. Working in log space
+keeps keys small however long the monitor runs, where undecayed scores would
+overflow.
+
+A second heap orders candidates by creation time; expire() pops candidates
+older than max_age_hours from its root. Removed, replaced and expired
+candidates are dropped from the heaps lazily and the heaps are compacted when
+stale entries outnumber live ones.
+"""
+
+import heapq
+import itertools
+import math
+import threading
+import time
+from dataclasses import dataclass
+from typing import Any, Callable, Dict, Hashable, List, Mapping, Optional, Tuple
+
+# (item_id, current score, item)
+RankedCandidate = Tuple[Hashable, float, Any]
+
+
+@dataclass(slots=True)
+class Candidate:
+    """A stored candidate with its epoch-relative log score."""
+
+    item_id: Hashable
+    key: float
+    created_at: float
+    item: Any
+    sequence: int
+
+
+class CandidateIndex:
+    """Thread-safe top-K index over exponentially decaying scores."""
+
+    def __init__(
+        self,
+        decay_rate: float,
+        max_age_hours: Optional[float] = None,
+        epoch: Optional[float] = None,
+        clock: Callable[[], float] = time.time,
+    ):
+        """Create an empty index.
+
+        decay_rate is per hour, as in strategy.yaml's time_decay. Times are
+        epoch seconds; epoch defaults to the current clock reading.
+        """
+        if not math.isfinite(decay_rate) or decay_rate < 0:
+            raise ValueError("decay_rate must be a non-negative number")
+        if max_age_hours is not None and max_age_hours <= 0:
+            raise ValueError("max_age_hours must be positive")
+        self.decay_rate = decay_rate
+        self.max_age_hours = max_age_hours
+        self._clock = clock
+        self.epoch = clock() if epoch is None else epoch
+        self._candidates: Dict[Hashable, Candidate] = {}
+        # (-key, sequence, item_id): best candidate at the root
+        self._by_score: List[Tuple[float, int, Hashable]] = []
+        # (created_at, sequence, item_id): oldest candidate at the root
+        self._by_age: List[Tuple[float, int, Hashable]] = []
+        self._sequence = itertools.count()
+        self._lock = threading.Lock()
+        self.expired = 0
+
+    @classmethod
+    def from_strategy(
+        cls, strategy: Mapping[str, Any], max_age_hours: Optional[float] = None
+    ) -> "CandidateIndex":
+        """Index decaying at strategy.yaml's opportunity_scoring decay_rate."""
+        scoring = strategy.get("opportunity_scoring") or {}
+        decay_rate = (scoring.get("time_decay") or {}).get("decay_rate", 0.0)
+        return cls(decay_rate, max_age_hours=max_age_hours)
+
+    @classmethod
+    def from_scoring_config(cls, scoring_config) -> "CandidateIndex":
+        """Index decaying with a ScoringConfig's half-life and max age."""
+        time_decay = scoring_config.time_decay
+        half_life = time_decay.get("half_life_hours", 24)
+        if half_life <= 0:
+            raise ValueError("half_life_hours must be positive")
+        return cls(
+            math.log(2) / half_life, max_age_hours=time_decay.get("max_age_hours")
+        )
+
+    def _elapsed_decay(self, t: float) -> float:
+        """decay_rate * hours between the epoch and t."""
+        return self.decay_rate * (t - self.epoch) / 3600
+
+    def add(
+        self,
+        item_id: Hashable,
+        score: float,
+        created_at: float,
+        item: Any = None,
+        scored_at: Optional[float] = None,
+    ) -> None:
+        """Insert or replace a candidate whose score was score at scored_at.
+
+        scored_at defaults to now. A score of 0 is stored and ranks last.
+        """
+        if not score >= 0:
+            raise ValueError(f"Candidate score must be non-negative, got {score}")
+        if scored_at is None:
+            scored_at = self._clock()
+        log_score = math.log(score) if score > 0 else -math.inf
+        key = log_score + self._elapsed_decay(scored_at)
+        with self._lock:
+            sequence = next(self._sequence)
+            self._candidates[item_id] = Candidate(
+                item_id, key, created_at, item, sequence
+            )
+            heapq.heappush(self._by_score, (-key, sequence, item_id))
+            if self.max_age_hours is not None:
+                heapq.heappush(self._by_age, (created_at, sequence, item_id))
+            self._maybe_compact()
+
+    def remove(self, item_id: Hashable) -> bool:
+        """Drop a candidate; returns False if it was not stored."""
+        with self._lock:
+            removed = self._candidates.pop(item_id, None) is not None
+            if removed:
+                self._maybe_compact()
+            return removed
+
+    def score(self, item_id: Hashable, now: Optional[float] = None) -> float:
+        """Current decayed score of a stored candidate (KeyError if absent)."""
+        if now is None:
+            now = self._clock()
+        with self._lock:
+            key = self._candidates[item_id].key
+        return math.exp(key - self._elapsed_decay(now))
+
+    def expire(self, now: Optional[float] = None) -> int:
+        """Drop candidates older than max_age_hours; returns how many."""
+        if self.max_age_hours is None:
+            return 0
+        if now is None:
+            now = self._clock()
+        cutoff = now - self.max_age_hours * 3600
+        count = 0
+        with self._lock:
+            by_age = self._by_age
+            while by_age and by_age[0][0] < cutoff:
+                _, sequence, item_id = heapq.heappop(by_age)
+                candidate = self._candidates.get(item_id)
+                if candidate is not None and candidate.sequence == sequence:
+                    del self._candidates[item_id]
+                    count += 1
+            self.expired += count
+            self._maybe_compact()
+        return count
+
+    def top(self, k: int, now: Optional[float] = None) -> List[RankedCandidate]:
+        """(item_id, current score, item) for the k best candidates, best first.
+
+        Expires old candidates first. Costs O(k log n); nothing is re-scored.
+        """
+        if now is None:
+            now = self._clock()
+        self.expire(now)
+        decay = self._elapsed_decay(now)
+        with self._lock:
+            by_score = self._by_score
+            popped = []
+            result = []
+            while by_score and len(result) < k:
+                entry = heapq.heappop(by_score)
+                negative_key, sequence, item_id = entry
+                candidate = self._candidates.get(item_id)
+                if candidate is None or candidate.sequence != sequence:
+                    continue
+                popped.append(entry)
+                score = math.exp(-negative_key - decay)
+                result.append((item_id, score, candidate.item))
+            for entry in popped:
+                heapq.heappush(by_score, entry)
+        return result
+
+    def _maybe_compact(self) -> None:
+        """Rebuild the heaps once stale entries outnumber live candidates."""
+        live = len(self._candidates)
+        if len(self._by_score) <= 2 * live + 64:
+            return
+        candidates = self._candidates.values()
+        self._by_score = [(-c.key, c.sequence, c.item_id) for c in candidates]
+        heapq.heapify(self._by_score)
+        if self.max_age_hours is not None:
+            self._by_age = [(c.created_at, c.sequence, c.item_id) for c in candidates]
+            heapq.heapify(self._by_age)
+
+    def __len__(self) -> int:
+        """Number of live candidates."""
+        return len(self._candidates)
+
+    def __contains__(self, item_id: Hashable) -> bool:
+        """Whether item_id is stored."""
+        return item_id in self._candidates
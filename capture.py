@@ -0,0 +1,417 @@
+"""
+Capture and replay of raw bridge traffic.
+
+CaptureLog records every bridge round trip TwitterClient._make_request makes
+(enable it with api['capture'] or by assigning client.capture). The request
+thread only builds a small dict and enqueues it; a background writer thread
+serializes records as JSON lines and appends them to the log:
+- append-only: each record is one line, flushed per batch; a crash loses at
+  most the records still queued
+- size-rotated: once the active file reaches max_bytes it is renamed to the
+  next numbered segment (capture.00001.jsonl, ...) and a new file started
+- optionally compressed: with compress=True closed segments are gzipped
+- bounded: when the queue is full records are dropped and counted rather
+  than slowing requests down
+- fail-stop: if the writer fails (a full disk, say) it keeps the error in
+  CaptureLog.error, drops further records, and flush()/close() raise it
+  instead of waiting for a writer that is gone
+
+Each record holds the method, endpoint, request body (without cookies), HTTP
+status, raw response text and the observed latency, or the transport error
+(timeout or connection) when there was no response.
+
+ReplayTransport serves those records back in place of the requests session
+(install() swaps it onto a client), so the real _make_request, retry and
+_handle_response paths run against recorded payloads with no bridge. Records
+are matched on method, endpoint and request body and served in recorded
+order; latency is replayed as recorded, scaled down by speed, or skipped.
+"""
+
+import gzip
+import json
+import queue
+import re
+import threading
+import time
+from collections import defaultdict, deque
+from pathlib import Path
+from typing import Any, Callable, Deque, Dict, Iterable, Iterator, List, Optional, Union
+from urllib.parse import urlsplit
+
+import requests
+
+# Placeholder cookies install() loads so replayed clients pass the
+# authentication check; replay never sends them anywhere.
+REPLAY_COOKIES = {
+    "cookieHeader": "replay=1",
+    "essentials": {
+        name: "replay" for name in ("auth_token", "ct0", "twid", "guest_id", "att")
+    },
+}
+
+_STOP = object()
+
+
+def _segment_number(path: Path, base: Path) -> Optional[int]:
+    """Rotation number of a segment file of base, or None."""
+    pattern = rf"{re.escape(base.stem)}\.(\d+){re.escape(base.suffix)}(\.gz)?"
+    match = re.fullmatch(pattern, path.name)
+    return int(match.group(1)) if match else None
+
+
+def capture_segments(path: Union[str, Path]) -> List[Path]:
+    """Files of a capture log in recorded order: rotated segments, then path."""
+    path = Path(path)
+    numbered = []
+    if path.parent.exists():
+        for candidate in path.parent.iterdir():
+            number = _segment_number(candidate, path)
+            if number is not None:
+                numbered.append((number, candidate))
+    segments = [candidate for _, candidate in sorted(numbered)]
+    if path.exists():
+        segments.append(path)
+    return segments
+
+
+def read_capture(path: Union[str, Path]) -> Iterator[Dict[str, Any]]:
+    """Records of a capture log, across all its segments, in recorded order."""
+    for segment in capture_segments(path):
+        opener = gzip.open if segment.suffix == ".gz" else open
+        with opener(segment, "rt", encoding="utf-8") as f:
+            for line in f:
+                if line.strip():
+                    yield json.loads(line)
+
+
+def _request_body(data: Optional[Dict[str, Any]]) -> Optional[Dict[str, Any]]:
+    """Request body as recorded: without the cookies sent to the bridge."""
+    if data is None:
+        return None
+    return {key: value for key, value in data.items() if key != "cookies"}
+
+
+def _request_key(method: str, endpoint: str, body: Optional[Dict[str, Any]]) -> tuple:
+    """Key that matches a replayed request to its recorded responses."""
+    return (method.upper(), endpoint, json.dumps(body, sort_keys=True))
+
+
+class CaptureLog:
+    """Append-only, size-rotated JSONL log written by a background thread."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        max_bytes: int = 64 * 1024 * 1024,
+        compress: bool = False,
+        queue_size: int = 10000,
+    ):
+        """Start the writer thread appending to path.
+
+        max_bytes is the size at which the active file is rotated; compress
+        gzips rotated segments. At most queue_size records wait for the
+        writer; beyond that new records are dropped.
+        """
+        if max_bytes <= 0:
+            raise ValueError("max_bytes must be positive")
+        if queue_size <= 0:
+            raise ValueError("queue_size must be positive")
+        self.path = Path(path)
+        self.max_bytes = max_bytes
+        self.compress = compress
+        self.recorded = 0
+        self.dropped = 0
+        self.error: Optional[BaseException] = None
+        self._queue: queue.Queue = queue.Queue(maxsize=queue_size)
+        self._lock = threading.Lock()
+        self._sequence = 0
+        self._closed = False
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        numbers = [
+            _segment_number(segment, self.path)
+            for segment in capture_segments(self.path)
+        ]
+        self._segments = max((n for n in numbers if n is not None), default=0)
+        self._thread = threading.Thread(
+            target=self._run, name="capture-writer", daemon=True
+        )
+        self._thread.start()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit; drains the queue and stops the writer."""
+        self.close()
+
+    def record(
+        self,
+        method: str,
+        endpoint: str,
+        data: Optional[Dict[str, Any]],
+        elapsed: float,
+        response: Optional[Any] = None,
+        error: Optional[str] = None,
+    ) -> bool:
+        """Queue one round trip; returns False if it was dropped.
+
+        Pass the response object, or error ("timeout" or "connection") when
+        the request failed before a response arrived.
+        """
+        if self._closed:
+            return False
+        entry: Dict[str, Any] = {
+            "time": time.time(),
+            "method": method.upper(),
+            "endpoint": endpoint,
+            "request": _request_body(data),
+            "elapsed": elapsed,
+        }
+        if response is not None:
+            entry["status"] = response.status_code
+            entry["reason"] = getattr(response, "reason", None)
+            entry["body"] = response.text
+        else:
+            entry["error"] = error
+        with self._lock:
+            entry["seq"] = self._sequence
+            self._sequence += 1
+        try:
+            self._queue.put_nowait(entry)
+        except queue.Full:
+            with self._lock:
+                self.dropped += 1
+            return False
+        return True
+
+    def flush(self) -> None:
+        """Block until every queued record has been written.
+
+        Raises the writer's error if it failed.
+        """
+        done = self._queue.all_tasks_done
+        with done:
+            while self._queue.unfinished_tasks and self._thread.is_alive():
+                done.wait(0.1)
+        self._raise_error()
+
+    def close(self) -> None:
+        """Write the queued records and stop the writer thread.
+
+        Raises the writer's error if it failed.
+        """
+        self._closed = True
+        while self._thread.is_alive():
+            try:
+                self._queue.put(_STOP, timeout=0.1)
+                break
+            except queue.Full:
+                continue
+        self._thread.join()
+        self._raise_error()
+
+    def _raise_error(self) -> None:
+        """Raise the error the writer thread stopped on, if any."""
+        if self.error is not None:
+            raise self.error
+
+    def _run(self) -> None:
+        """Writer thread: write records until stopped or until writing fails."""
+        try:
+            self._write()
+        except Exception as e:
+            self.error = e
+            self._closed = True
+            # Nothing more will be written: drop what is queued
+            while True:
+                try:
+                    entry = self._queue.get_nowait()
+                except queue.Empty:
+                    break
+                if entry is not _STOP:
+                    with self._lock:
+                        self.dropped += 1
+                self._queue.task_done()
+
+    def _write(self) -> None:
+        """Append queued records, rotating by size, until _STOP arrives."""
+        out = open(self.path, "ab")
+        size = out.tell()
+        try:
+            while True:
+                entries = [self._queue.get()]
+                while True:
+                    try:
+                        entries.append(self._queue.get_nowait())
+                    except queue.Empty:
+                        break
+                stop = False
+                try:
+                    for entry in entries:
+                        if entry is _STOP:
+                            stop = True
+                            continue
+                        line = json.dumps(entry, separators=(",", ":")) + "\n"
+                        line = line.encode()
+                        if size and size + len(line) > self.max_bytes:
+                            out.close()
+                            self._rotate()
+                            out = open(self.path, "ab")
+                            size = 0
+                        out.write(line)
+                        size += len(line)
+                    out.flush()
+                    with self._lock:
+                        self.recorded += sum(entry is not _STOP for entry in entries)
+                finally:
+                    for _ in entries:
+                        self._queue.task_done()
+                if stop:
+                    return
+        finally:
+            out.close()
+
+    def _rotate(self) -> None:
+        """Move the active file to the next numbered segment."""
+        self._segments += 1
+        segment = self.path.with_name(
+            f"{self.path.stem}.{self._segments:05d}{self.path.suffix}"
+        )
+        self.path.rename(segment)
+        if self.compress:
+            with open(segment, "rb") as source, gzip.open(
+                f"{segment}.gz", "wb"
+            ) as target:
+                while True:
+                    chunk = source.read(1 << 20)
+                    if not chunk:
+                        break
+                    target.write(chunk)
+            segment.unlink()
+
+    @classmethod
+    def from_config(cls, capture: Dict[str, Any]) -> "CaptureLog":
+        """Create a CaptureLog from an api['capture'] dictionary."""
+        return cls(
+            capture["path"],
+            max_bytes=capture.get("max_bytes", 64 * 1024 * 1024),
+            compress=capture.get("compress", False),
+            queue_size=capture.get("queue_size", 10000),
+        )
+
+
+class ReplayResponse:
+    """Recorded response with the parts of requests.Response the client reads."""
+
+    def __init__(self, status_code: int, text: str, reason: Optional[str] = None):
+        """Wrap a recorded status, body text and reason phrase."""
+        self.status_code = status_code
+        self.text = text
+        self.reason = reason or ""
+
+    def json(self) -> Any:
+        """Parsed body; raises json.JSONDecodeError like requests does."""
+        return json.loads(self.text)
+
+
+class ReplayMissError(LookupError):
+    """A replayed request has no (remaining) recorded response."""
+
+
+class ReplayTransport:
+    """Serves recorded bridge responses in place of a requests session."""
+
+    def __init__(
+        self,
+        records: Union[str, Path, Iterable[Dict[str, Any]]],
+        speed: float = 0.0,
+        loop: bool = False,
+        sleep: Callable[[float], None] = time.sleep,
+    ):
+        """Index records (or the capture log at a path) for replay.
+
+        speed 1.0 replays recorded latency as-is, 10.0 ten times faster, and
+        0 skips it. With loop, a request whose recorded responses have all
+        been served starts over from its first one; otherwise it raises
+        ReplayMissError.
+        """
+        if speed < 0:
+            raise ValueError("speed must not be negative")
+        if isinstance(records, (str, Path)):
+            records = read_capture(records)
+        self.speed = speed
+        self.loop = loop
+        self._sleep = sleep
+        self._recorded: Dict[tuple, List[Dict[str, Any]]] = defaultdict(list)
+        for entry in records:
+            key = _request_key(entry["method"], entry["endpoint"], entry["request"])
+            self._recorded[key].append(entry)
+        self._pending: Dict[tuple, Deque[Dict[str, Any]]] = {
+            key: deque(entries) for key, entries in self._recorded.items()
+        }
+        self._lock = threading.Lock()
+        self.served = 0
+
+    def __len__(self) -> int:
+        """Number of recorded round trips."""
+        return sum(len(entries) for entries in self._recorded.values())
+
+    def install(self, client: Any) -> "ReplayTransport":
+        """Serve client's requests from this transport.
+
+        Loads REPLAY_COOKIES when the client has no cookies, so no real
+        session is needed.
+        """
+        client.session = self
+        if client.cookie_data is None:
+            client.load_cookies(REPLAY_COOKIES)
+        return self
+
+    def reset(self) -> None:
+        """Start serving every request's responses from the beginning."""
+        with self._lock:
+            self._pending = {
+                key: deque(entries) for key, entries in self._recorded.items()
+            }
+            self.served = 0
+
+    def _next(self, method: str, url: str, data: Optional[Dict[str, Any]]):
+        """Recorded entry for a request, consuming it."""
+        endpoint = urlsplit(url)
+        path = endpoint.path + (f"?{endpoint.query}" if endpoint.query else "")
+        key = _request_key(method, path, _request_body(data))
+        with self._lock:
+            pending = self._pending.get(key)
+            if not pending and self.loop and key in self._recorded:
+                pending = self._pending[key] = deque(self._recorded[key])
+            if not pending:
+                raise ReplayMissError(f"No recorded response for {method} {path}")
+            self.served += 1
+            return pending.popleft()
+
+    def _serve(self, method: str, url: str, data: Optional[Dict[str, Any]]):
+        """Replay one round trip: wait, then respond or raise its error."""
+        entry = self._next(method, url, data)
+        if self.speed:
+            self._sleep(entry.get("elapsed", 0.0) / self.speed)
+        error = entry.get("error")
+        if error == "timeout":
+            raise requests.Timeout("Replayed timeout")
+        if error is not None:
+            raise requests.ConnectionError("Replayed connection error")
+        return ReplayResponse(entry["status"], entry["body"], entry.get("reason"))
+
+    def post(self, url: str, json: Optional[Dict[str, Any]] = None, **kwargs):
+        """Replay a POST."""
+        return self._serve("POST", url, json)
+
+    def get(self, url: str, **kwargs):
+        """Replay a GET."""
+        return self._serve("GET", url, None)
+
+    def mount(self, prefix: str, adapter: Any) -> None:
+        """Accept connection adapters; replay opens no connections."""
+
+    def close(self) -> None:
+        """Nothing to release."""
@@ -14,12 +14,17 @@ Supported environment variables:
 
 from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Dict, Any, List, Optional
+from typing import TYPE_CHECKING, Dict, Any, List, Optional, Tuple
 import json
 import yaml
 import os
 from urllib.parse import urlparse
 
+if TYPE_CHECKING:
+    import numpy as np
+
+    from scoring import MetricsInput
+
 
 @dataclass
 class PersonaConfig:
@@ -152,6 +157,19 @@ class ScoringConfig:
         else:
             return "none"
 
+    def score_batch(
+        self, metrics: "MetricsInput"
+    ) -> "Tuple[np.ndarray, np.ndarray]":
+        """Calculate scores and priority levels for many rows at once.
+
+        Vectorized equivalent of calculate_score + get_priority_level; takes an
+        (n, k) metrics matrix or a mapping of metric name to column. scoring
+        (and NumPy) are imported on first use, so config stays a leaf module.
+        """
+        from scoring import BatchScorer
+
+        return BatchScorer(self).score_batch(metrics)
+
     @classmethod
     def from_dict(cls, data: Dict[str, Any]) -> "ScoringConfig":
         """Create ScoringConfig from dictionary."""
@@ -245,10 +263,21 @@ class AppConfig:
         if "timeout" in self.api and self.api["timeout"] <= 0:
             raise ValueError("Timeout must be positive")
 
+        rate_limit = self.api.get("rate_limit") or {}
+        if rate_limit.get("requests_per_minute", 1) <= 0:
+            raise ValueError("Rate limit requests_per_minute must be positive")
+        if rate_limit.get("burst_limit", 1) < 1:
+            raise ValueError("Rate limit burst_limit must be at least 1")
+
     def _validate_processing_config(self):
         """Validate processing configuration."""
         if "batch_size" in self.processing and self.processing["batch_size"] <= 0:
             raise ValueError("Batch size must be positive")
+        if (
+            "max_concurrent_requests" in self.processing
+            and self.processing["max_concurrent_requests"] <= 0
+        ):
+            raise ValueError("Max concurrent requests must be positive")
 
     def validate(self) -> bool:
         """Validate entire configuration."""
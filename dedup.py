@@ -0,0 +1,333 @@
+"""
+Near-duplicate tweet detection with 64-bit SimHash and banded LSH.
+
+simhash_batch() fingerprints texts: each text is reduced to word unigrams and
+bigrams (lowercased, links and @mentions dropped, so reposts with a different
+short link or tag still collide), every feature is hashed to 64 bits with
+BLAKE2b, and bit i of the fingerprint is set when most features have bit i
+set. Similar texts get fingerprints a few bits apart. The bit voting runs in
+NumPy over all features of a batch at once.
+
+SimHashIndex finds a stored fingerprint within max_distance bits of a query.
+The 64 bits are split into `bands` > max_distance bands; by pigeonhole, two
+fingerprints within max_distance bits agree exactly on at least one band, so
+only entries sharing a band value are compared. Every structure is a NumPy
+array rather than Python objects:
+- fingerprints: uint64 per entry
+- one bucket table of int32 chain heads per band, plus an int32 next-entry
+  link per entry and band (chained hashing inside arrays)
+- cluster id per entry, and representative entry and best engagement per
+  cluster
+
+That is 8 + 4 * bands + 4 bytes per entry, 12 more for the per-cluster
+arrays (sized like the entry arrays), plus the fixed bucket tables. Insert and
+query touch one bucket chain per band, so they take expected O(1) time while
+chains stay short (distinct fingerprints per bucket table size); exact repeats
+are stored but not chained. Arrays grow by doubling.
+
+Deduplicator collapses tweets into clusters of near-duplicates and keeps the
+highest-engagement tweet of each, so only one copy of a copy-pasted tweet is
+scored and recommended. Tweets without words (only links, mentions or emoji)
+all fingerprint to 0, so they are passed through rather than clustered.
+"""
+
+import hashlib
+import re
+import threading
+from functools import lru_cache
+from typing import Dict, Iterable, List, Sequence, Tuple
+
+import numpy as np
+
+from models import Tweet
+
+FINGERPRINT_BITS = 64
+DEFAULT_MAX_DISTANCE = 3
+
+# Bucket tables are capped at 2**20 chain heads per band.
+MAX_TABLE_BITS = 20
+
+_IGNORED = re.compile(r"^\s*rt\b|https?://\S+|www\.\S+|(?<!\w)@\w+")
+_WORD = re.compile(r"\w+")
+_BIT_SHIFTS = np.arange(FINGERPRINT_BITS, dtype=np.uint64)
+_POPCOUNT_TABLE = np.array([bin(i).count("1") for i in range(256)], dtype=np.uint8)
+
+
+@lru_cache(maxsize=1 << 16)
+def _feature_hash(feature: str) -> int:
+    """Stable 64-bit hash of a feature (Python's hash() is salted per process)."""
+    digest = hashlib.blake2b(feature.encode("utf-8"), digest_size=8).digest()
+    return int.from_bytes(digest, "little")
+
+
+def text_features(text: str) -> List[str]:
+    """Word unigrams and bigrams of text, ignoring case, links and mentions."""
+    words = _WORD.findall(_IGNORED.sub(" ", text.lower()))
+    return words + [f"{a} {b}" for a, b in zip(words, words[1:])]
+
+
+def simhash_batch(texts: Iterable[str]) -> np.ndarray:
+    """uint64 SimHash fingerprint of each text; texts without words get 0."""
+    return _simhash_features(text_features(text) for text in texts)
+
+
+def _simhash_features(feature_lists: Iterable[List[str]]) -> np.ndarray:
+    """uint64 SimHash fingerprint of each list of features; empty lists get 0."""
+    hashes: List[int] = []
+    counts: List[int] = []
+    for features in feature_lists:
+        hashes.extend(_feature_hash(feature) for feature in features)
+        counts.append(len(features))
+    fingerprints = np.zeros(len(counts), dtype=np.uint64)
+    if not hashes:
+        return fingerprints
+    bits = (np.array(hashes, dtype=np.uint64)[:, None] >> _BIT_SHIFTS) & np.uint64(1)
+    # +1 per feature with the bit set, -1 per feature without it.
+    votes = bits.astype(np.int32) * 2 - 1
+    counts_array = np.array(counts)
+    nonempty = counts_array > 0
+    starts = np.concatenate(([0], np.cumsum(counts_array)[:-1]))[nonempty]
+    totals = np.add.reduceat(votes, starts, axis=0)
+    set_bits = (totals > 0).astype(np.uint64) << _BIT_SHIFTS
+    fingerprints[nonempty] = np.bitwise_or.reduce(set_bits, axis=1)
+    return fingerprints
+
+
+def simhash(text: str) -> int:
+    """SimHash fingerprint of one text."""
+    return int(simhash_batch([text])[0])
+
+
+def hamming_distances(fingerprints: np.ndarray, fingerprint: int) -> np.ndarray:
+    """Bit distance between each of fingerprints and fingerprint."""
+    diff = np.asarray(fingerprints, dtype=np.uint64) ^ np.uint64(fingerprint)
+    bitwise_count = getattr(np, "bitwise_count", None)
+    if bitwise_count is not None:
+        return bitwise_count(diff).astype(np.int64)
+    return _POPCOUNT_TABLE[diff.view(np.uint8)].reshape(-1, 8).sum(axis=1)
+
+
+class SimHashIndex:
+    """Banded LSH index of SimHash fingerprints, stored in NumPy arrays."""
+
+    def __init__(
+        self,
+        max_distance: int = DEFAULT_MAX_DISTANCE,
+        bands: int = 0,
+        capacity: int = 1024,
+    ):
+        """Create an index matching fingerprints within max_distance bits.
+
+        bands defaults to max_distance + 1, the fewest that still guarantee a
+        shared band for every match.
+        """
+        if max_distance < 0:
+            raise ValueError("max_distance must not be negative")
+        bands = bands or max_distance + 1
+        if bands <= max_distance:
+            raise ValueError("bands must exceed max_distance")
+        if bands > FINGERPRINT_BITS:
+            raise ValueError(f"bands must be at most {FINGERPRINT_BITS}")
+        if capacity <= 0:
+            raise ValueError("capacity must be positive")
+        self.max_distance = max_distance
+        self.bands = bands
+        # The last band takes any leftover bits.
+        width = FINGERPRINT_BITS // bands
+        self._band_shifts = [band * width for band in range(bands)]
+        self._band_masks = [(1 << width) - 1] * (bands - 1)
+        self._band_masks.append((1 << (FINGERPRINT_BITS - width * (bands - 1))) - 1)
+        self._table_mask = (1 << min(width, MAX_TABLE_BITS)) - 1
+
+        self._size = 0
+        self._fingerprints = np.zeros(capacity, dtype=np.uint64)
+        self._heads = np.full((bands, self._table_mask + 1), -1, dtype=np.int32)
+        self._next = np.full((bands, capacity), -1, dtype=np.int32)
+        self._cluster = np.zeros(capacity, dtype=np.int32)
+        self._clusters = 0
+        self._representative = np.zeros(capacity, dtype=np.int32)
+        self._best = np.zeros(capacity, dtype=np.float64)
+
+    def __len__(self) -> int:
+        """Number of stored fingerprints."""
+        return self._size
+
+    @property
+    def cluster_count(self) -> int:
+        """Number of near-duplicate clusters."""
+        return self._clusters
+
+    @property
+    def nbytes(self) -> int:
+        """Bytes held by the index arrays."""
+        return sum(
+            array.nbytes
+            for array in (
+                self._fingerprints,
+                self._heads,
+                self._next,
+                self._cluster,
+                self._representative,
+                self._best,
+            )
+        )
+
+    def _buckets(self, fingerprint: int) -> List[int]:
+        """Bucket of fingerprint in each band's table."""
+        table_mask = self._table_mask
+        return [
+            (fingerprint >> shift) & mask & table_mask
+            for shift, mask in zip(self._band_shifts, self._band_masks)
+        ]
+
+    def _candidates(self, buckets: Sequence[int]) -> List[int]:
+        """Entries sharing at least one band bucket with a fingerprint."""
+        heads = self._heads
+        next_entry = self._next
+        candidates = []
+        for band, bucket in enumerate(buckets):
+            links = next_entry[band]
+            entry = int(heads[band, bucket])
+            while entry >= 0:
+                candidates.append(entry)
+                entry = int(links[entry])
+        return candidates
+
+    def query(self, fingerprint: int) -> Tuple[int, int]:
+        """(entry, distance) of the closest entry within max_distance, or (-1, -1)."""
+        candidates = self._candidates(self._buckets(fingerprint))
+        if not candidates:
+            return -1, -1
+        distances = hamming_distances(self._fingerprints[candidates], fingerprint)
+        closest = int(np.argmin(distances))
+        if distances[closest] > self.max_distance:
+            return -1, -1
+        return candidates[closest], int(distances[closest])
+
+    def _grow(self) -> None:
+        """Double the per-entry and per-cluster arrays."""
+        capacity = len(self._fingerprints) * 2
+        self._fingerprints = np.resize(self._fingerprints, capacity)
+        next_entry = np.full((self.bands, capacity), -1, dtype=np.int32)
+        next_entry[:, : self._size] = self._next[:, : self._size]
+        self._next = next_entry
+        self._cluster = np.resize(self._cluster, capacity)
+        self._representative = np.resize(self._representative, capacity)
+        self._best = np.resize(self._best, capacity)
+
+    def add(self, fingerprint: int, engagement: float = 0.0) -> Tuple[int, int]:
+        """Store fingerprint; return (entry, cluster).
+
+        The entry joins the cluster of its closest match, or starts a new
+        cluster. It becomes the cluster's representative when its engagement
+        beats the cluster's best so far.
+        """
+        fingerprint = int(fingerprint)
+        match, distance = self.query(fingerprint)
+        return self._insert(fingerprint, engagement, match, distance)
+
+    def _insert(
+        self, fingerprint: int, engagement: float, match: int, distance: int
+    ) -> Tuple[int, int]:
+        """Store fingerprint in match's cluster (or a new one if match is -1)."""
+        if self._size == len(self._fingerprints):
+            self._grow()
+        entry = self._size
+        self._size += 1
+        self._fingerprints[entry] = fingerprint
+        # Exact repeats would only lengthen the chains with entries that can
+        # never be a closer match than the one already there.
+        if distance != 0:
+            for band, bucket in enumerate(self._buckets(fingerprint)):
+                self._next[band, entry] = self._heads[band, bucket]
+                self._heads[band, bucket] = entry
+        if match >= 0:
+            cluster = int(self._cluster[match])
+            if engagement > self._best[cluster]:
+                self._best[cluster] = engagement
+                self._representative[cluster] = entry
+        else:
+            cluster = self._clusters
+            self._clusters += 1
+            self._representative[cluster] = entry
+            self._best[cluster] = engagement
+        self._cluster[entry] = cluster
+        return entry, cluster
+
+    def cluster_of(self, entry: int) -> int:
+        """Cluster id of an entry."""
+        if not 0 <= entry < self._size:
+            raise IndexError(f"No entry {entry}")
+        return int(self._cluster[entry])
+
+    def representative(self, cluster: int) -> int:
+        """Entry with the highest engagement in a cluster."""
+        if not 0 <= cluster < self._clusters:
+            raise IndexError(f"No cluster {cluster}")
+        return int(self._representative[cluster])
+
+    def best_engagement(self, cluster: int) -> float:
+        """Highest engagement seen in a cluster."""
+        if not 0 <= cluster < self._clusters:
+            raise IndexError(f"No cluster {cluster}")
+        return float(self._best[cluster])
+
+
+def _engagement(tweet: Tweet) -> float:
+    """Engagement used to pick a cluster's representative."""
+    return float(tweet.engagement.total_engagements())
+
+
+class Deduplicator:
+    """Collapse near-duplicate tweets, keeping the most engaged copy."""
+
+    def __init__(self, max_distance: int = DEFAULT_MAX_DISTANCE, bands: int = 0):
+        """Create a deduplicator over a fresh SimHashIndex."""
+        self.index = SimHashIndex(max_distance=max_distance, bands=bands)
+        self._lock = threading.Lock()
+        self.seen = 0
+        self.collapsed = 0
+
+    def collapse(self, tweets: Sequence[Tweet]) -> List[Tweet]:
+        """The best tweet of each near-duplicate cluster in tweets.
+
+        Clusters keep the order in which they first appear. State carries
+        over between calls: a tweet whose cluster already produced an equally
+        or more engaged tweet in an earlier call is dropped, while a more
+        engaged copy is returned as the cluster's new representative. Tweets
+        without words are never added to the index and are always returned.
+        """
+        feature_lists = [text_features(tweet.text) for tweet in tweets]
+        fingerprints = _simhash_features(feature_lists).tolist()
+        winners: Dict[int, Tweet] = {}
+        with self._lock:
+            index = self.index
+            for position, (tweet, features, fingerprint) in enumerate(
+                zip(tweets, feature_lists, fingerprints)
+            ):
+                if not features:
+                    # Negative keys never clash with cluster ids.
+                    winners[-1 - position] = tweet
+                    continue
+                entry, cluster = index.add(fingerprint, _engagement(tweet))
+                # Only a tweet more engaged than the cluster's best so far
+                # (or the first of its cluster) becomes its representative
+                if index.representative(cluster) == entry:
+                    winners[cluster] = tweet
+            self.seen += len(tweets)
+            self.collapsed += len(tweets) - len(winners)
+        return list(winners.values())
+
+    @classmethod
+    def from_config(cls, processing) -> "Deduplicator":
+        """Deduplicator for processing['near_duplicate_distance'] (default 3)."""
+        return cls(
+            max_distance=processing.get("near_duplicate_distance", DEFAULT_MAX_DISTANCE)
+        )
+
+
+def collapse_near_duplicates(
+    tweets: Sequence[Tweet], max_distance: int = DEFAULT_MAX_DISTANCE
+) -> List[Tweet]:
+    """The highest-engagement tweet of each near-duplicate cluster in tweets."""
+    return Deduplicator(max_distance=max_distance).collapse(tweets)
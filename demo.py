@@ -11,6 +11,10 @@ from pathlib import Path
 
 import models
 import config
+import scoring
+from keywords import KeywordMatcher
+from opportunity import load_strategy
+from selection import TopKSelector
 
 
 def main():
@@ -42,6 +46,20 @@ def main():
 
     print(f"Loaded {len(tweets)} tweets")
 
+    # Keep only the best recommendation_count candidates scoring above 0.5
+    strategy = load_strategy("strategy.yaml")
+    selector = TopKSelector.from_config(
+        strategy.get("recommendation_count", 10),
+        app_config.scoring,
+        action_type=lambda t: "like" if not t.is_retweet else "retweet",
+    )
+
+    # Tag tweets with monitored keywords and content pillars in one pass each
+    keyword_hits = KeywordMatcher.from_config(strategy, app_config.persona).tag(tweets)
+    for keyword, tweet_ids in keyword_hits.items():
+        if tweet_ids:
+            print(f"Keyword {keyword!r}: {len(tweet_ids)} tweet(s)")
+
     # Analyze tweets
     print("\n📊 Tweet Analysis:")
     for i, tweet in enumerate(tweets, 1):
@@ -57,33 +75,23 @@ def main():
             f"  Features: Question={tweet.features.has_question}, Media={tweet.features.has_media}"
         )
         print(f"  Sentiment: {tweet.features.sentiment}")
+        print(f"  Topics: {', '.join(tweet.features.topics) or '-'}")
         print(f"  Engaging Content: {'Yes' if tweet.features.is_engaging() else 'No'}")
         print(f"  Age: {tweet.age_hours():.1f} hours")
 
         # Generate recommendations using scoring config
-        metrics = {
-            "engagement_rate": tweet.engagement.engagement_rate(),
-            "recency": max(0, 1.0 - (tweet.age_hours() / 168)),  # Decay over 1 week
-            "author_credibility": 0.8 if tweet.user.verified else 0.5,
-            "content_relevance": 0.9 if tweet.features.has_question else 0.6,
-            "viral_potential": 0.8 if tweet.features.is_engaging() else 0.4,
-        }
+        metrics = scoring.tweet_metrics(tweet, max_age_hours=168)  # Decay over 1 week
 
         score = app_config.scoring.calculate_score(metrics)
-        priority = app_config.scoring.get_priority_level(score)
-
+        print(f"  Score: {score:.2f}")
         if score > 0.5:  # Only recommend high-scoring content
-            recommendation = models.Recommendation(
-                action_type="like" if not tweet.is_retweet else "retweet",
-                target_id=tweet.id,
-                target_type="tweet",
-                priority=priority,
-                confidence_score=score,
-                reasoning=f"High engagement potential (score: {score:.2f})",
-            )
-            print(
-                f"  💡 Recommendation: {recommendation.action_type.upper()} (Priority: {recommendation.priority})"
-            )
+            selector.push(score, tweet)
+
+    print(f"\n💡 Top {selector.k} Recommendations:")
+    for recommendation in selector.recommendations():
+        print(
+            f"  {recommendation.action_type.upper()} {recommendation.target_id} (Priority: {recommendation.priority})"
+        )
 
     # Configuration validation demo
     print(
@@ -0,0 +1,164 @@
+"""
+Single-pass content feature extraction for tweet text.
+
+One precompiled regex walks the text once with finditer and classifies every
+match by its named group:
+- word: the start of each whitespace-separated token (word count)
+- url: http(s):// or www. links; trailing punctuation such as a closing
+  parenthesis or full stop is left outside the link
+- hashtag: # or ＃ followed by word characters including at least one letter,
+  not preceded by a word character or & (so `#1` and `&#39;` are not tags)
+- mention: @ followed by 1-15 username characters, not part of an email
+- question: ? or ？ outside links
+- emoji: pictographs, symbols and flags, with skin-tone, variation-selector
+  and zero-width-joiner sequences counted as one emoji
+
+Because links are consumed whole, a `#` or `?` inside a URL is never counted
+as a hashtag or question. Length is measured in Unicode code points.
+
+extract_batch() processes lists of texts and can fan out to a process pool.
+record_features() derives a bridge tweet's ContentFeatures, hashtags and
+mentions; TwitterClient and the recommendation pipeline both normalize raw
+tweets through it.
+"""
+
+import re
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+from typing import Any, Callable, Iterable, List, Mapping, Optional, Tuple
+
+from models import ContentFeatures
+
+_EMOJI_BASE = (
+    r"[\U0001F300-\U0001FAFF\u2600-\u27BF\u2B05-\u2B07\u2B1B\u2B1C\u2B50\u2B55"
+    r"\u231A\u231B\u23E9-\u23F3\u23F8-\u23FA\u3030\u303D\u3297\u3299]"
+)
+# Optional variation selector-16 or skin tone after each pictograph.
+_EMOJI_MODIFIER = r"[\uFE0F\U0001F3FB-\U0001F3FF]?"
+# One emoji: a flag (pair of regional indicators) or a zero-width-joiner
+# sequence of pictographs. Shared with sentiment.py.
+EMOJI_PATTERN = (
+    r"[\U0001F1E6-\U0001F1FF]{2}"
+    rf"|{_EMOJI_BASE}{_EMOJI_MODIFIER}(?:\u200D{_EMOJI_BASE}{_EMOJI_MODIFIER})*"
+)
+
+# The word alternative is an empty match at each token start; finditer then
+# retries the same position for a non-empty match (url, hashtag, ...).
+_FEATURE_PATTERN = re.compile(
+    r"(?P<word>(?<!\S)(?=\S))"
+    r"|(?P<url>(?:https?://|\bwww\.)\S+?)(?=[.,;:!?)\]}'\"]*(?:\s|$))"
+    r"|(?<![\w&])[#\uFF03](?P<hashtag>\w*[^\W\d_]\w*)"
+    r"|(?<![\w@])@(?P<mention>[A-Za-z0-9_]{1,15})(?![A-Za-z0-9_@])"
+    r"|(?P<question>[?\uFF1F])"
+    f"|(?P<emoji>{EMOJI_PATTERN})"
+)
+
+
+@dataclass(slots=True)
+class TextFeatures:
+    """Features derived from tweet text."""
+
+    length: int = 0
+    word_count: int = 0
+    hashtags: List[str] = field(default_factory=list)
+    mentions: List[str] = field(default_factory=list)
+    urls: List[str] = field(default_factory=list)
+    has_question: bool = False
+    emoji_count: int = 0
+
+    def to_content_features(
+        self, has_media: bool = False, **overrides
+    ) -> ContentFeatures:
+        """ContentFeatures for these text features plus media presence."""
+        values = dict(
+            has_question=self.has_question,
+            has_media=has_media,
+            has_links=bool(self.urls),
+            has_hashtags=bool(self.hashtags),
+            has_mentions=bool(self.mentions),
+            length=self.length,
+            word_count=self.word_count,
+            emoji_count=self.emoji_count,
+        )
+        values.update(overrides)
+        return ContentFeatures(**values)
+
+
+def extract_features(text: str) -> TextFeatures:
+    """Extract TextFeatures from text in a single regex pass."""
+    word_count = emoji_count = 0
+    hashtags: List[str] = []
+    mentions: List[str] = []
+    urls: List[str] = []
+    has_question = False
+    for match in _FEATURE_PATTERN.finditer(text):
+        kind = match.lastgroup
+        if kind == "word":
+            word_count += 1
+        elif kind == "url":
+            urls.append(match.group())
+        elif kind == "hashtag":
+            hashtags.append(match.group(kind))
+        elif kind == "mention":
+            mentions.append(match.group(kind))
+        elif kind == "question":
+            has_question = True
+        else:
+            emoji_count += 1
+    return TextFeatures(
+        length=len(text),
+        word_count=word_count,
+        hashtags=hashtags,
+        mentions=mentions,
+        urls=urls,
+        has_question=has_question,
+        emoji_count=emoji_count,
+    )
+
+
+def extract_batch(
+    texts: Iterable[str], workers: Optional[int] = None, chunksize: int = 256
+) -> List[TextFeatures]:
+    """Extract features for many texts, in order.
+
+    With workers > 1 the texts are spread over a process pool in chunks of
+    chunksize; otherwise they are processed in this process.
+    """
+    if workers is not None and workers <= 0:
+        raise ValueError("workers must be positive")
+    if chunksize <= 0:
+        raise ValueError("chunksize must be positive")
+    if workers is None or workers == 1:
+        return [extract_features(text) for text in texts]
+    with ProcessPoolExecutor(max_workers=workers) as pool:
+        return list(pool.map(extract_features, texts, chunksize=chunksize))
+
+
+def record_features(
+    tweet_data: Mapping[str, Any],
+    sentiment: Callable[[str], str],
+    keyword_matcher: Optional[Any] = None,
+) -> Tuple[ContentFeatures, List[str], List[str]]:
+    """(features, hashtags, mentions) for a bridge tweet dict.
+
+    sentiment labels the text (SentimentAnalyzer.label); keyword_matcher, if
+    given, supplies the topics. Bridge-extracted links count even when the
+    text shows none (t.co links stripped from the text, for instance), and
+    hashtags and mentions come from the text when the bridge sends none.
+    """
+    text = tweet_data.get("text", "")
+    text_features = extract_features(text)
+    features = text_features.to_content_features(
+        has_media=bool(tweet_data.get("media", [])),
+        has_links=bool(tweet_data.get("urls")) or bool(text_features.urls),
+        sentiment=sentiment(text),
+    )
+    if keyword_matcher is not None:
+        features.topics = keyword_matcher.topics(text)
+    hashtags = tweet_data.get("hashtags")
+    if hashtags is None:
+        hashtags = text_features.hashtags
+    mentions = tweet_data.get("mentions")
+    if mentions is None:
+        mentions = text_features.mentions
+    return features, hashtags, mentions
@@ -0,0 +1,178 @@
+"""
+Keyword and topic matching for tweet text.
+
+KeywordMatcher compiles every monitored phrase (strategy.yaml's
+keywords_to_monitor, persona content_pillars) into one trie, shared prefixes
+and all, and turns the trie into a single regex. Scanning a tweet is then one
+left-to-right pass in the regex engine, whatever the number of phrases,
+instead of one `phrase in text` search per phrase.
+
+Matching is:
+- case-folded: `pytorch`, `PyTorch` and `PYTORCH` are the same phrase
+- word-boundary aware: `LLM` does not match inside `LLMs` or `SLLM`
+- whitespace tolerant: any run of whitespace matches a space in a phrase
+- overlapping: `machine learning` also reports a separately monitored
+  `learning`, and `Claude Code` also reports `Claude`
+
+Each phrase belongs to one or more labels (topics). topics() lists the labels
+found in a text, for ContentFeatures.topics; tag() does that for many tweets
+and returns the ids of the tweets hitting each label.
+
+from_config() caches compiled matchers by their phrases, so a matcher is only
+rebuilt when the configured keywords or pillars change.
+"""
+
+import re
+from functools import lru_cache
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Set, Tuple
+
+from models import Tweet
+
+# Trie key marking the end of a phrase; its value is the folded phrase.
+_END = ""
+
+_WHITESPACE = re.compile(r"\s+")
+
+
+def fold(phrase: str) -> str:
+    """Case-fold phrase and collapse its whitespace to single spaces."""
+    return _WHITESPACE.sub(" ", phrase.casefold()).strip()
+
+
+def _is_word(char: str) -> bool:
+    """Whether char counts as part of a word for boundary checks (like \\w)."""
+    return char.isalnum() or char == "_"
+
+
+def _trie_regex(node: Dict[str, Any]) -> str:
+    """Regex matching exactly the phrases below a trie node."""
+    alternatives = []
+    for char, child in sorted(node.items()):
+        if char == _END:
+            continue
+        piece = r"\s+" if char == " " else re.escape(char)
+        alternatives.append(piece + _trie_regex(child))
+    if not alternatives:
+        return ""
+    if len(alternatives) == 1 and _END not in node:
+        return alternatives[0]
+    group = "(?:" + "|".join(alternatives) + ")"
+    return group + "?" if _END in node else group
+
+
+class KeywordMatcher:
+    """Compiled multi-phrase matcher mapping phrases to topic labels."""
+
+    def __init__(self, topics: Mapping[str, Iterable[str]]):
+        """Compile a matcher from {label: phrases}.
+
+        A label may list a single phrase as a plain string. The same phrase
+        may appear under several labels.
+        """
+        self.labels: Tuple[str, ...] = tuple(topics)
+        self._labels_by_phrase: Dict[str, List[str]] = {}
+        self._trie: Dict[str, Any] = {}
+        for label, phrases in topics.items():
+            if isinstance(phrases, str):
+                phrases = [phrases]
+            for phrase in phrases:
+                folded = fold(phrase)
+                if not folded:
+                    raise ValueError(f"Empty keyword for topic {label!r}")
+                labels = self._labels_by_phrase.setdefault(folded, [])
+                if label not in labels:
+                    labels.append(label)
+                node = self._trie
+                for char in folded:
+                    node = node.setdefault(char, {})
+                node[_END] = folded
+        self._pattern: Optional[re.Pattern] = None
+        if self._trie:
+            # Zero-width lookahead at every word start, so overlapping phrases
+            # starting at later positions are still found.
+            self._pattern = re.compile(rf"(?<!\w)(?=({_trie_regex(self._trie)})(?!\w))")
+
+    @property
+    def phrases(self) -> List[str]:
+        """Folded phrases this matcher looks for."""
+        return list(self._labels_by_phrase)
+
+    def _scan(self, text: str) -> Iterator[str]:
+        """Folded phrases found in text, in order of their start position."""
+        if self._pattern is None:
+            return
+        folded = text.casefold()
+        for match in self._pattern.finditer(folded):
+            # The regex finds the longest phrase starting here; walk the trie
+            # along it to report shorter phrases that end on a word boundary.
+            position, end = match.start(1), match.end(1)
+            node = self._trie
+            while position < end:
+                if folded[position].isspace():
+                    node = node[" "]
+                    while position < end and folded[position].isspace():
+                        position += 1
+                else:
+                    node = node[folded[position]]
+                    position += 1
+                phrase = node.get(_END)
+                if phrase is not None and (
+                    position == end or not _is_word(folded[position])
+                ):
+                    yield phrase
+
+    def find(self, text: str) -> List[str]:
+        """Folded phrases found in text, with repeats, in order."""
+        return list(self._scan(text))
+
+    def first(self, text: str) -> Optional[str]:
+        """Label of the first phrase in text, or None; stops at the first hit."""
+        for phrase in self._scan(text):
+            return self._labels_by_phrase[phrase][0]
+        return None
+
+    def topics(self, text: str) -> List[str]:
+        """Labels found in text, each once, in order of first appearance."""
+        found: Dict[str, None] = {}
+        labels_by_phrase = self._labels_by_phrase
+        for phrase in self._scan(text):
+            for label in labels_by_phrase[phrase]:
+                found[label] = None
+        return list(found)
+
+    def tag(self, tweets: Iterable[Tweet]) -> Dict[str, Set[str]]:
+        """Set features.topics on each tweet and return {label: tweet ids}.
+
+        Every label has an entry, empty when no tweet mentions it.
+        """
+        hits: Dict[str, Set[str]] = {label: set() for label in self.labels}
+        for tweet in tweets:
+            topics = self.topics(tweet.text)
+            tweet.features.topics = topics
+            for label in topics:
+                hits[label].add(tweet.id)
+        return hits
+
+    @classmethod
+    def from_config(
+        cls, strategy: Optional[Mapping[str, Any]] = None, persona: Any = None
+    ) -> "KeywordMatcher":
+        """Matcher for strategy keywords_to_monitor and persona content_pillars.
+
+        Each keyword and each pillar is its own label. persona may be a
+        PersonaConfig or a persona.yaml mapping. Matchers are cached by their
+        phrases, so calling this again with unchanged config is cheap and
+        returns the same matcher.
+        """
+        keywords = (strategy or {}).get("keywords_to_monitor") or []
+        if isinstance(persona, Mapping):
+            pillars = persona.get("content_pillars") or []
+        else:
+            pillars = getattr(persona, "content_pillars", None) or []
+        return _compiled(tuple(dict.fromkeys([*keywords, *pillars])))
+
+
+@lru_cache(maxsize=16)
+def _compiled(labels: Tuple[str, ...]) -> KeywordMatcher:
+    """Cached matcher where each label is also its only phrase."""
+    return KeywordMatcher({label: label for label in labels})
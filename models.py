@@ -3,15 +3,20 @@ Minimal data models using Python dataclasses to make failing tests pass.
 
 This module implements Tweet, Profile, Features, and Recommendation dataclasses
 following TDD Green phase - implementing only what's needed to pass tests.
+
+All models are slotted dataclasses: instances carry no per-instance __dict__,
+which keeps memory per tweet down when millions are held during backfills.
 """
 
 from dataclasses import dataclass, field
 from datetime import datetime, timezone
 from typing import Optional, Dict, Any, List
-from dateutil import parser as date_parser
+
+from snowflake import is_snowflake, snowflake_to_datetime
+from timestamps import parse_timestamp, parse_timestamp_cached
 
 
-@dataclass
+@dataclass(slots=True)
 class EngagementMetrics:
     """Engagement metrics for tweets and content."""
 
@@ -38,7 +43,7 @@ class EngagementMetrics:
         return self.total_engagements() / self.views
 
 
-@dataclass
+@dataclass(slots=True)
 class ContentFeatures:
     """Content analysis features for tweets."""
 
@@ -49,6 +54,7 @@ class ContentFeatures:
     has_mentions: bool = False
     length: int = 0
     word_count: int = 0
+    emoji_count: int = 0
     sentiment: str = "neutral"
     topics: List[str] = field(default_factory=list)
     language: str = "en"
@@ -81,13 +87,14 @@ class ContentFeatures:
             has_mentions=data.get("hasMentions", data.get("has_mentions", False)),
             length=data.get("length", 0),
             word_count=data.get("wordCount", data.get("word_count", 0)),
+            emoji_count=data.get("emojiCount", data.get("emoji_count", 0)),
             sentiment=data.get("sentiment", "neutral"),
             topics=data.get("topics", []),
             language=data.get("language", "en"),
         )
 
 
-@dataclass
+@dataclass(slots=True)
 class Profile:
     """User profile information."""
 
@@ -129,7 +136,7 @@ class Profile:
             date_str = data.get("joinDate", data.get("join_date"))
             if date_str and isinstance(date_str, str):
                 try:
-                    join_date = date_parser.parse(date_str)
+                    join_date = parse_timestamp_cached(date_str)
                 except (ValueError, TypeError):
                     join_date = None
 
@@ -168,7 +175,7 @@ class Profile:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Tweet:
     """Tweet data model."""
 
@@ -217,11 +224,14 @@ class Tweet:
         created_at_str = data.get("createdAt", data.get("created_at"))
         if isinstance(created_at_str, str):
             try:
-                created_at = date_parser.parse(created_at_str)
+                created_at = parse_timestamp(created_at_str)
             except (ValueError, TypeError):
                 raise ValueError(f"Invalid date format: {created_at_str}")
         elif isinstance(created_at_str, datetime):
             created_at = created_at_str
+        elif is_snowflake(data.get("id", "")):
+            # Snowflake ids encode their creation time
+            created_at = snowflake_to_datetime(data["id"])
         else:
             raise ValueError("createdAt field is required and must be a valid datetime")
 
@@ -291,6 +301,7 @@ class Tweet:
                 "hasMentions": features.has_mentions,
                 "length": features.length,
                 "wordCount": features.word_count,
+                "emojiCount": features.emoji_count,
                 "sentiment": features.sentiment,
                 "topics": features.topics,
                 "language": features.language,
@@ -308,7 +319,7 @@ class Tweet:
         }
 
 
-@dataclass
+@dataclass(slots=True)
 class Recommendation:
     """Recommendation for actions to take."""
 
@@ -0,0 +1,295 @@
+"""
+Opportunity scoring compiled from strategy.yaml.
+
+The `opportunity_scoring` section of strategy.yaml ranks tweets as engagement
+opportunities:
+
+    score = base * exp(-decay_rate * age_hours) * author modifiers * content modifiers
+
+- base: likes/replies/retweets/views weighted by metric_weights, normalized so
+  the weights sum to 1
+- author modifiers: influencer multiplier, 1 + factor * log10(followers / 1000)
+  above min_followers_for_bonus, 1 + factor * min(5, ratio) above
+  min_ratio_for_bonus
+- content modifiers: question and media multipliers, link penalty, and a bonus
+  when the text length falls inside ideal_length_range
+
+OpportunityScorer validates every constant once, when it is built, and hoists
+them into local variables of a compiled closure; score() does no dict lookups
+or validation per tweet. score_frame() applies the same formula to a whole
+TweetFrame with NumPy.
+"""
+
+import math
+import time
+from pathlib import Path
+from typing import Any, Callable, Dict, Iterable, Mapping, Optional, Union
+
+import numpy as np
+import yaml
+
+from models import Tweet
+from tweet_frame import TweetFrame
+
+OPPORTUNITY_METRICS = ("likes", "replies", "retweets", "views")
+
+# Divisor inside the follower bonus: 1 + factor * log10(followers / 1000).
+FOLLOWERS_BONUS_SCALE = 1000.0
+
+# Cap on the follower ratio in the ratio bonus: 1 + factor * min(5, ratio).
+DEFAULT_MAX_RATIO = 5.0
+
+
+def _number(
+    section: Mapping[str, Any], key: str, path: str, default=None, minimum=None
+) -> float:
+    """Read a finite number from section[key], enforcing an optional minimum."""
+    value = section.get(key, default)
+    if value is None:
+        raise ValueError(f"Missing opportunity scoring value: {path}.{key}")
+    if isinstance(value, bool) or not isinstance(value, (int, float)):
+        raise ValueError(f"{path}.{key} must be a number, got {value!r}")
+    value = float(value)
+    if not math.isfinite(value):
+        raise ValueError(f"{path}.{key} must be finite, got {value}")
+    if minimum is not None and value < minimum:
+        raise ValueError(f"{path}.{key} must be >= {minimum}, got {value}")
+    return value
+
+
+def _positive(section: Mapping[str, Any], key: str, path: str, default=None) -> float:
+    """Read a number that must be strictly positive (a multiplier)."""
+    value = _number(section, key, path, default)
+    if value <= 0:
+        raise ValueError(f"{path}.{key} must be positive, got {value}")
+    return value
+
+
+def _section(data: Mapping[str, Any], key: str, path: str) -> Mapping[str, Any]:
+    """Return data[key] as a mapping, treating a missing section as empty."""
+    value = data.get(key) or {}
+    if not isinstance(value, Mapping):
+        raise ValueError(f"{path}.{key} must be a mapping")
+    return value
+
+
+class OpportunityScorer:
+    """strategy.yaml's opportunity_scoring section compiled for fast scoring."""
+
+    def __init__(
+        self,
+        opportunity_scoring: Mapping[str, Any],
+        influencers: Iterable[str] = (),
+        priority_thresholds: Optional[Mapping[str, float]] = None,
+    ):
+        """Validate the scoring constants and compile the scoring function.
+
+        Raises ValueError describing the first invalid value.
+        """
+        path = "opportunity_scoring"
+        weights = _section(opportunity_scoring, "metric_weights", path)
+        unknown = set(weights) - set(OPPORTUNITY_METRICS)
+        if unknown:
+            raise ValueError(f"Unknown opportunity metrics: {sorted(unknown)}")
+        raw = {
+            name: _number(weights, name, f"{path}.metric_weights", 0, minimum=0)
+            for name in OPPORTUNITY_METRICS
+        }
+        total = sum(raw.values())
+        if total <= 0:
+            raise ValueError("opportunity_scoring.metric_weights must not all be zero")
+        self.metric_weights = {name: weight / total for name, weight in raw.items()}
+
+        decay = _section(opportunity_scoring, "time_decay", path)
+        self.decay_rate = _number(
+            decay, "decay_rate", f"{path}.time_decay", 0, minimum=0
+        )
+
+        author = _section(opportunity_scoring, "author_modifiers", path)
+        author_path = f"{path}.author_modifiers"
+        self.influencer_multiplier = _positive(
+            author, "is_influencer_multiplier", author_path, 1
+        )
+        followers = _section(author, "followers_bonus", author_path)
+        followers_path = f"{author_path}.followers_bonus"
+        self.followers_factor = _number(followers, "factor", followers_path, 0)
+        self.min_followers = _positive(
+            followers, "min_followers_for_bonus", followers_path, FOLLOWERS_BONUS_SCALE
+        )
+        ratio = _section(author, "follower_ratio_bonus", author_path)
+        ratio_path = f"{author_path}.follower_ratio_bonus"
+        self.ratio_factor = _number(ratio, "factor", ratio_path, 0)
+        self.min_ratio = _number(ratio, "min_ratio_for_bonus", ratio_path, 0, minimum=0)
+        self.max_ratio = _positive(ratio, "max_ratio", ratio_path, DEFAULT_MAX_RATIO)
+
+        content = _section(opportunity_scoring, "content_modifiers", path)
+        content_path = f"{path}.content_modifiers"
+        self.question_multiplier = _positive(
+            content, "contains_question_multiplier", content_path, 1
+        )
+        self.media_multiplier = _positive(
+            content, "contains_media_multiplier", content_path, 1
+        )
+        self.link_penalty = _positive(content, "contains_link_penalty", content_path, 1)
+        length = _section(content, "ideal_length_range", content_path)
+        length_path = f"{content_path}.ideal_length_range"
+        self.min_length = _number(length, "min", length_path, 0, minimum=0)
+        self.max_length = (
+            _number(length, "max", length_path) if "max" in length else math.inf
+        )
+        if self.max_length < self.min_length:
+            raise ValueError(f"{length_path}.max must be >= min")
+        self.length_bonus = _positive(length, "bonus", length_path, 1)
+
+        self.influencers = frozenset(name.lower() for name in influencers)
+
+        thresholds = dict(priority_thresholds or {})
+        for level in thresholds:
+            _number(thresholds, level, "priority_thresholds")
+        # Highest threshold first, so the first one a score reaches wins.
+        self.priority_thresholds = dict(
+            sorted(thresholds.items(), key=lambda item: item[1], reverse=True)
+        )
+
+        self._score = self._compile()
+
+    @classmethod
+    def from_strategy(cls, strategy: Mapping[str, Any]) -> "OpportunityScorer":
+        """Build a scorer from a parsed strategy.yaml document."""
+        if "opportunity_scoring" not in strategy:
+            raise ValueError("Strategy has no opportunity_scoring section")
+        return cls(
+            strategy["opportunity_scoring"] or {},
+            influencers=strategy.get("influencers_to_monitor") or (),
+            priority_thresholds=strategy.get("priority_thresholds"),
+        )
+
+    def _compile(self) -> Callable[[Tweet, float], float]:
+        """Bind every constant to a local and return the per-tweet scorer."""
+        w_likes = self.metric_weights["likes"]
+        w_replies = self.metric_weights["replies"]
+        w_retweets = self.metric_weights["retweets"]
+        w_views = self.metric_weights["views"]
+        decay_rate = self.decay_rate
+        influencers = self.influencers
+        influencer_multiplier = self.influencer_multiplier
+        followers_factor = self.followers_factor
+        min_followers = self.min_followers
+        ratio_factor = self.ratio_factor
+        min_ratio = self.min_ratio
+        max_ratio = self.max_ratio
+        question_multiplier = self.question_multiplier
+        media_multiplier = self.media_multiplier
+        link_penalty = self.link_penalty
+        min_length = self.min_length
+        max_length = self.max_length
+        length_bonus = self.length_bonus
+        exp = math.exp
+        log10 = math.log10
+
+        def score(tweet: Tweet, now: float) -> float:
+            engagement = tweet.engagement
+            user = tweet.user
+            features = tweet.features
+
+            value = (
+                w_likes * engagement.likes
+                + w_replies * engagement.replies
+                + w_retweets * engagement.retweets
+                + w_views * engagement.views
+            )
+            age_hours = max(0.0, (now - tweet.created_at.timestamp()) / 3600)
+            value *= exp(-decay_rate * age_hours)
+
+            if user.username.lower() in influencers:
+                value *= influencer_multiplier
+            if user.followers >= min_followers:
+                value *= 1 + followers_factor * log10(
+                    user.followers / FOLLOWERS_BONUS_SCALE
+                )
+            ratio = user.follower_ratio()
+            if ratio >= min_ratio:
+                value *= 1 + ratio_factor * min(max_ratio, ratio)
+
+            if features.has_question:
+                value *= question_multiplier
+            if features.has_media:
+                value *= media_multiplier
+            if features.has_links:
+                value *= link_penalty
+            if min_length <= features.length <= max_length:
+                value *= length_bonus
+            return value
+
+        return score
+
+    def score(self, tweet: Tweet, now: Optional[float] = None) -> float:
+        """Opportunity score for one tweet; now is epoch seconds (default: now)."""
+        return self._score(tweet, time.time() if now is None else now)
+
+    def score_frame(self, frame: TweetFrame, now: Optional[float] = None) -> np.ndarray:
+        """Opportunity score for every row of a TweetFrame."""
+        columns = frame.columns
+        weights = self.metric_weights
+        scores = (
+            weights["likes"] * columns["likes"]
+            + weights["replies"] * columns["replies"]
+            + weights["retweets"] * columns["retweets"]
+            + weights["views"] * columns["views"]
+        ).astype(np.float64)
+        scores *= np.exp(-self.decay_rate * np.maximum(0.0, frame.age_hours(now)))
+
+        if self.influencers and len(frame):
+            influencer = np.fromiter(
+                (name.lower() in self.influencers for name in frame.usernames),
+                dtype=np.bool_,
+                count=len(frame),
+            )
+            scores[influencer] *= self.influencer_multiplier
+        followers = columns["followers"].astype(np.float64)
+        bonus = followers >= self.min_followers
+        scores[bonus] *= 1 + self.followers_factor * np.log10(
+            followers[bonus] / FOLLOWERS_BONUS_SCALE
+        )
+        ratio = frame.follower_ratio()
+        bonus = ratio >= self.min_ratio
+        scores[bonus] *= 1 + self.ratio_factor * np.minimum(
+            self.max_ratio, ratio[bonus]
+        )
+
+        scores[columns["has_question"]] *= self.question_multiplier
+        scores[columns["has_media"]] *= self.media_multiplier
+        scores[columns["has_links"]] *= self.link_penalty
+        length = columns["length"]
+        ideal = (length >= self.min_length) & (length <= self.max_length)
+        scores[ideal] *= self.length_bonus
+        return scores
+
+    def priority(self, score: float) -> Optional[str]:
+        """Name of the highest priority threshold score reaches, or None."""
+        for level, threshold in self.priority_thresholds.items():
+            if score >= threshold:
+                return level
+        return None
+
+
+def load_strategy(file_path: Union[str, Path] = "strategy.yaml") -> Dict[str, Any]:
+    """Read a strategy YAML file into a dict."""
+    path = Path(file_path)
+    if not path.exists():
+        raise FileNotFoundError(f"Strategy file not found: {file_path}")
+    with open(path, "r", encoding="utf-8") as f:
+        try:
+            data = yaml.safe_load(f)
+        except yaml.YAMLError as e:
+            raise yaml.YAMLError(f"Invalid YAML in {file_path}: {e}")
+    if not isinstance(data, dict):
+        raise ValueError(f"Strategy file must contain a mapping: {file_path}")
+    return data
+
+
+def load_opportunity_scorer(
+    file_path: Union[str, Path] = "strategy.yaml",
+) -> OpportunityScorer:
+    """Load strategy.yaml and compile its opportunity_scoring section."""
+    return OpportunityScorer.from_strategy(load_strategy(file_path))
@@ -0,0 +1,646 @@
+"""
+Streaming recommendation pipeline.
+
+A Pipeline chains batch stages with bounded queues between them. The source
+iterable is cut into batches of `processing['batch_size']` items and every
+stage maps a batch (a list) to a new batch, which may be shorter if the stage
+filters. Each stage runs on its own workers:
+- "thread": `workers` threads pulling from the stage's input queue, for I/O
+  such as bridge requests
+- "process": a ProcessPoolExecutor with `workers` processes fed by a
+  dispatcher thread, for CPU-bound work; the stage function and its batches
+  must be picklable
+
+Bounded queues give backpressure: a slow stage blocks the stages feeding it
+instead of letting batches pile up in memory. Results stream out of run() as
+soon as the last stage emits them. With more than one worker per stage,
+batches may leave a stage in a different order than they entered.
+
+stats() reports per-stage counts, busy time, utilization, throughput and
+input queue depth. The bottleneck is the stage with utilization near 1; the
+input queues of every stage before it stay full.
+
+RecommendationPipeline wires up fetch -> prefilter -> normalize -> dedup ->
+featurize -> score -> rank for ScoringConfig scoring and streams
+Recommendations. The prefilter stage drops tweets on the persona's forbidden
+topics while they are still raw dicts, and the dedup stage collapses
+near-duplicate tweets to their most engaged copy, before any of the later
+stages spend time on them.
+"""
+
+import functools
+import queue
+import threading
+import time
+from concurrent.futures import FIRST_COMPLETED, ProcessPoolExecutor, wait
+from dataclasses import dataclass, replace
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Tuple,
+)
+
+import numpy as np
+
+from dedup import Deduplicator
+from features import record_features
+from keywords import KeywordMatcher
+from models import Recommendation, Tweet
+from prefilter import TopicPrefilter
+from scoring import BatchScorer, frame_metrics
+from selection import TopKSelector
+from sentiment import SentimentAnalyzer
+from tweet_frame import TweetFrame
+from twitter_client import TwitterClientError
+
+EXECUTORS = ("thread", "process")
+
+BatchFunc = Callable[[List[Any]], List[Any]]
+
+# End-of-stream marker passed down the queues.
+_DONE = object()
+
+
+class _Stopped(Exception):
+    """Raised inside workers once the pipeline has been stopped."""
+
+
+@dataclass
+class StageStats:
+    """Counters for one pipeline stage."""
+
+    name: str
+    workers: int = 1
+    executor: str = "thread"
+    batches: int = 0
+    items_in: int = 0
+    items_out: int = 0
+    busy_seconds: float = 0.0
+    queue_depth: int = 0
+    max_queue_depth: int = 0
+    started_at: Optional[float] = None
+    finished_at: Optional[float] = None
+
+    @property
+    def elapsed_seconds(self) -> float:
+        """Wall time since the stage started (until it finished, if it has)."""
+        if self.started_at is None:
+            return 0.0
+        end = self.finished_at if self.finished_at is not None else time.perf_counter()
+        return end - self.started_at
+
+    @property
+    def utilization(self) -> float:
+        """Fraction of the workers' wall time spent inside the stage function."""
+        elapsed = self.elapsed_seconds * self.workers
+        return self.busy_seconds / elapsed if elapsed > 0 else 0.0
+
+    @property
+    def throughput(self) -> float:
+        """Items emitted per second of wall time."""
+        elapsed = self.elapsed_seconds
+        return self.items_out / elapsed if elapsed > 0 else 0.0
+
+
+@dataclass
+class Stage:
+    """A named batch function and how to run it."""
+
+    name: str
+    func: BatchFunc
+    workers: int = 1
+    executor: str = "thread"
+
+    def __post_init__(self):
+        """Validate stage settings."""
+        if self.workers <= 0:
+            raise ValueError(f"Stage {self.name!r} workers must be positive")
+        if self.executor not in EXECUTORS:
+            raise ValueError(
+                f"Stage {self.name!r} executor must be one of {EXECUTORS}, "
+                f"got {self.executor!r}"
+            )
+
+
+def _timed(func: BatchFunc, batch: List[Any]) -> Tuple[List[Any], float]:
+    """Run func on batch; return its result and the seconds it took."""
+    started = time.perf_counter()
+    result = func(batch)
+    return result, time.perf_counter() - started
+
+
+class Pipeline:
+    """Batch stages connected by bounded queues."""
+
+    def __init__(
+        self, stages: Sequence[Stage], batch_size: int = 20, queue_size: int = 4
+    ):
+        """Create a pipeline; queue_size bounds batches waiting between stages."""
+        if not stages:
+            raise ValueError("Pipeline needs at least one stage")
+        if batch_size <= 0:
+            raise ValueError("Batch size must be positive")
+        if queue_size <= 0:
+            raise ValueError("Queue size must be positive")
+        names = [stage.name for stage in stages]
+        if len(set(names)) != len(names):
+            raise ValueError("Stage names must be unique")
+        self.stages = list(stages)
+        self.batch_size = batch_size
+        self.queue_size = queue_size
+        self._stats: Dict[str, StageStats] = {}
+        self._stats_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._error: Optional[BaseException] = None
+        self._running = False
+
+    def stats(self) -> Dict[str, StageStats]:
+        """Snapshot of per-stage stats, including the 'source' feeding stage one."""
+        with self._stats_lock:
+            return {name: replace(stats) for name, stats in self._stats.items()}
+
+    def _fail(self, exc: BaseException) -> None:
+        """Record the first worker error and stop every stage."""
+        with self._stats_lock:
+            if self._error is None:
+                self._error = exc
+        self._stop.set()
+
+    def _put(self, target: queue.Queue, item: Any) -> None:
+        """Put onto a bounded queue, giving up once the pipeline stops."""
+        while True:
+            if self._stop.is_set():
+                raise _Stopped()
+            try:
+                target.put(item, timeout=0.05)
+                return
+            except queue.Full:
+                continue
+
+    def _get(self, source: queue.Queue, stats: Optional[StageStats] = None) -> Any:
+        """Get from a queue, giving up once the pipeline stops."""
+        while True:
+            if self._stop.is_set():
+                raise _Stopped()
+            try:
+                item = source.get(timeout=0.05)
+            except queue.Empty:
+                continue
+            if stats is not None:
+                self._sample_depth(source, stats)
+            return item
+
+    def _sample_depth(self, source: queue.Queue, stats: StageStats) -> None:
+        """Record a stage's input queue depth, counting the batch just taken."""
+        depth = source.qsize()
+        with self._stats_lock:
+            stats.queue_depth = depth
+            stats.max_queue_depth = max(stats.max_queue_depth, depth + 1)
+
+    def _record(
+        self, stats: StageStats, size_in: int, size_out: int, busy: float
+    ) -> None:
+        """Add one processed batch to a stage's counters."""
+        with self._stats_lock:
+            stats.batches += 1
+            stats.items_in += size_in
+            stats.items_out += size_out
+            stats.busy_seconds += busy
+
+    def _feed(
+        self, iterator: Iterator[Any], output: queue.Queue, stats: StageStats
+    ) -> None:
+        """Cut the source into batches and push them to the first stage."""
+        try:
+            while True:
+                started = time.perf_counter()
+                batch = []
+                for item in iterator:
+                    batch.append(item)
+                    if len(batch) >= self.batch_size:
+                        break
+                if batch:
+                    self._record(stats, 0, len(batch), time.perf_counter() - started)
+                    self._put(output, batch)
+                if len(batch) < self.batch_size:
+                    break
+            self._put(output, _DONE)
+        except _Stopped:
+            pass
+        except BaseException as exc:
+            self._fail(exc)
+        finally:
+            stats.finished_at = time.perf_counter()
+            # Stop generator sources (e.g. iter_timeline) from fetching more.
+            close = getattr(iterator, "close", None)
+            if close is not None:
+                close()
+
+    def _run_threads(
+        self, stage: Stage, source: queue.Queue, output: queue.Queue, stats: StageStats
+    ) -> List[threading.Thread]:
+        """Start a stage's worker threads."""
+        remaining = [stage.workers]
+        lock = threading.Lock()
+
+        def work():
+            try:
+                while True:
+                    batch = self._get(source, stats)
+                    if batch is _DONE:
+                        # Let sibling workers see the end of the stream too.
+                        self._put(source, _DONE)
+                        break
+                    result, busy = _timed(stage.func, batch)
+                    self._record(stats, len(batch), len(result), busy)
+                    if result:
+                        self._put(output, result)
+                with lock:
+                    remaining[0] -= 1
+                    last = remaining[0] == 0
+                if last:
+                    stats.finished_at = time.perf_counter()
+                    self._put(output, _DONE)
+            except _Stopped:
+                pass
+            except BaseException as exc:
+                self._fail(exc)
+
+        return [
+            threading.Thread(
+                target=work, name=f"pipeline-{stage.name}-{i}", daemon=True
+            )
+            for i in range(stage.workers)
+        ]
+
+    def _run_processes(
+        self, stage: Stage, source: queue.Queue, output: queue.Queue, stats: StageStats
+    ) -> List[threading.Thread]:
+        """Start the dispatcher thread feeding a stage's process pool."""
+
+        def dispatch():
+            pool = ProcessPoolExecutor(max_workers=stage.workers)
+            pending = {}
+            try:
+                done = False
+                while not done or pending:
+                    # Keep every process busy with one batch queued behind it,
+                    # but only block for input when nothing is in flight.
+                    while not done and len(pending) < 2 * stage.workers:
+                        if pending:
+                            try:
+                                batch = source.get_nowait()
+                            except queue.Empty:
+                                break
+                            self._sample_depth(source, stats)
+                        else:
+                            batch = self._get(source, stats)
+                        if batch is _DONE:
+                            done = True
+                            break
+                        pending[pool.submit(_timed, stage.func, batch)] = len(batch)
+                    if not pending:
+                        continue
+                    finished, _ = wait(
+                        pending, timeout=0.05, return_when=FIRST_COMPLETED
+                    )
+                    for future in finished:
+                        size_in = pending.pop(future)
+                        result, busy = future.result()
+                        self._record(stats, size_in, len(result), busy)
+                        if result:
+                            self._put(output, result)
+                    if self._stop.is_set():
+                        raise _Stopped()
+                stats.finished_at = time.perf_counter()
+                self._put(output, _DONE)
+            except _Stopped:
+                pass
+            except BaseException as exc:
+                self._fail(exc)
+            finally:
+                pool.shutdown(wait=True, cancel_futures=True)
+
+        return [
+            threading.Thread(
+                target=dispatch, name=f"pipeline-{stage.name}", daemon=True
+            )
+        ]
+
+    def run(self, source: Iterable[Any]) -> Iterator[Any]:
+        """Stream source through every stage and yield the final items.
+
+        Re-raises the first exception any stage hits. Closing the generator
+        early stops all stages.
+        """
+        if self._running:
+            raise RuntimeError("Pipeline is already running")
+        iterator = iter(source)
+        self._running = True
+        self._stop.clear()
+        self._error = None
+        queues = [
+            queue.Queue(maxsize=self.queue_size) for _ in range(len(self.stages) + 1)
+        ]
+        now = time.perf_counter()
+        with self._stats_lock:
+            self._stats = {"source": StageStats("source", started_at=now)}
+            for stage in self.stages:
+                self._stats[stage.name] = StageStats(
+                    stage.name, stage.workers, stage.executor, started_at=now
+                )
+
+        threads = [
+            threading.Thread(
+                target=self._feed,
+                args=(iterator, queues[0], self._stats["source"]),
+                name="pipeline-source",
+                daemon=True,
+            )
+        ]
+        for position, stage in enumerate(self.stages):
+            if stage.executor == "thread":
+                start = self._run_threads
+            else:
+                start = self._run_processes
+            stats = self._stats[stage.name]
+            threads.extend(start(stage, queues[position], queues[position + 1], stats))
+        for thread in threads:
+            thread.start()
+
+        try:
+            while True:
+                try:
+                    batch = self._get(queues[-1])
+                except _Stopped:
+                    break
+                if batch is _DONE:
+                    break
+                yield from batch
+            if self._error is not None:
+                raise self._error
+        finally:
+            self._stop.set()
+            for thread in threads:
+                thread.join()
+            self._running = False
+
+
+def fetch_batch(client, batch: List[Any]) -> List[Any]:
+    """Resolve tweet ids with client.get_tweets; other items pass through.
+
+    Ids the bridge could not return (TwitterClientError) are dropped.
+    """
+    ids = [item for item in batch if isinstance(item, str)]
+    if not ids:
+        return batch
+    fetched = iter(client.get_tweets(ids))
+    result = []
+    for item in batch:
+        if isinstance(item, str):
+            item = next(fetched)
+            if isinstance(item, TwitterClientError):
+                continue
+        result.append(item)
+    return result
+
+
+def normalize_record(
+    keyword_matcher: Optional[KeywordMatcher],
+    sentiment_analyzer: SentimentAnalyzer,
+    record: Dict[str, Any],
+) -> Tweet:
+    """Tweet from a raw dict.
+
+    Records that carry no 'features' (raw bridge tweets) get them from
+    record_features, as TwitterClient does: sentiment_analyzer labels the
+    text and keyword_matcher, if there is one, its topics.
+    """
+    tweet = Tweet.from_dict(record)
+    if "features" not in record:
+        tweet.features, tweet.hashtags, tweet.mentions = record_features(
+            record, sentiment_analyzer.label, keyword_matcher
+        )
+    return tweet
+
+
+def normalize_batch(
+    keyword_matcher: Optional[KeywordMatcher],
+    sentiment_analyzer: SentimentAnalyzer,
+    batch: List[Any],
+) -> List[Tweet]:
+    """Convert raw bridge/fixture dicts to Tweets; Tweets pass through."""
+    return [
+        item
+        if isinstance(item, Tweet)
+        else normalize_record(keyword_matcher, sentiment_analyzer, item)
+        for item in batch
+    ]
+
+
+def featurize_batch(
+    metric_names: Sequence[str], max_age_hours: float, batch: List[Tweet]
+) -> List[Tuple[Tweet, np.ndarray]]:
+    """Pair each tweet with its scoring metrics row, in metric_names order."""
+    metrics = frame_metrics(TweetFrame.from_tweets(batch), max_age_hours=max_age_hours)
+    matrix = np.zeros((len(batch), len(metric_names)), dtype=np.float64)
+    for position, name in enumerate(metric_names):
+        if name in metrics:
+            matrix[:, position] = metrics[name]
+    return list(zip(batch, matrix))
+
+
+def score_batch(
+    scorer: BatchScorer, batch: List[Tuple[Tweet, np.ndarray]]
+) -> List[Tuple[float, Tweet]]:
+    """(score, tweet) for every featurized tweet."""
+    if not batch:
+        return []
+    scores = scorer.score(np.vstack([row for _, row in batch]))
+    return [(score, tweet) for score, (tweet, _) in zip(scores.tolist(), batch)]
+
+
+def default_action(tweet: Tweet) -> str:
+    """Retweet retweets, like everything else (as the demo does)."""
+    return "retweet" if tweet.is_retweet else "like"
+
+
+class RecommendationPipeline:
+    """Staged pipeline streaming Recommendations; STAGES lists the stages."""
+
+    STAGES = (
+        "fetch",
+        "prefilter",
+        "normalize",
+        "dedup",
+        "featurize",
+        "score",
+        "rank",
+    )
+
+    def __init__(
+        self,
+        scoring_config,
+        client=None,
+        recommendation_count: int = 10,
+        min_priority: str = "medium",
+        batch_size: int = 20,
+        queue_size: int = 4,
+        stage_options: Optional[Dict[str, Dict[str, Any]]] = None,
+        action_type: Callable[[Tweet], str] = default_action,
+        prefilter: Optional[TopicPrefilter] = None,
+        deduplicator: Optional[Deduplicator] = None,
+        keyword_matcher: Optional[KeywordMatcher] = None,
+        sentiment_analyzer: Optional[SentimentAnalyzer] = None,
+    ):
+        """Build the pipeline.
+
+        client resolves tweet ids in the fetch stage; without one the source
+        must yield Tweets or raw dicts, which reach the prefilter unparsed.
+        Tweets at or above min_priority are streamed out as Recommendations,
+        and every scored tweet is offered to a TopKSelector of
+        recommendation_count. stage_options maps a stage name to
+        {'workers': n, 'executor': 'thread' | 'process'}. prefilter rejects
+        forbidden topics; without one every tweet passes. deduplicator
+        collapses near-duplicates; without one none are collapsed.
+        keyword_matcher and sentiment_analyzer label the topics and sentiment
+        of raw dicts normalized without features, as the client's do for the
+        tweets it fetches; the client's analyzer is shared when there is one.
+        """
+        self.scoring_config = scoring_config
+        self.scorer = BatchScorer(scoring_config)
+        levels = ("high", "medium", "low")
+        if min_priority not in levels:
+            raise ValueError(f"min_priority must be one of {levels}")
+        self.min_priority = min_priority
+        self._accepted = set(levels[: levels.index(min_priority) + 1])
+        self.action_type = action_type
+        self.selector = TopKSelector.from_config(
+            recommendation_count, scoring_config, action_type=action_type
+        )
+
+        stage_options = dict(stage_options or {})
+        unknown = set(stage_options) - set(self.STAGES)
+        if unknown:
+            raise ValueError(f"Unknown pipeline stages: {sorted(unknown)}")
+        for name in ("prefilter", "dedup", "rank"):
+            if stage_options.get(name, {}).get("executor", "thread") != "thread":
+                raise ValueError(f"The {name} stage must run on a thread")
+        if stage_options.get("rank", {}).get("workers", 1) != 1:
+            raise ValueError("The rank stage must run on a single worker")
+        self.prefilter = prefilter or TopicPrefilter(())
+        self.deduplicator = deduplicator
+        if sentiment_analyzer is None:
+            sentiment_analyzer = (
+                client.sentiment_analyzer if client is not None else SentimentAnalyzer()
+            )
+        self.sentiment_analyzer = sentiment_analyzer
+        max_age_hours = scoring_config.time_decay.get("max_age_hours", 168)
+        funcs = {
+            "fetch": functools.partial(fetch_batch, client) if client else list,
+            "prefilter": self.prefilter.filter_batch,
+            "normalize": functools.partial(
+                normalize_batch, keyword_matcher, self.sentiment_analyzer
+            ),
+            "dedup": deduplicator.collapse if deduplicator else list,
+            "featurize": functools.partial(
+                featurize_batch, self.scorer.metric_names, max_age_hours
+            ),
+            "score": functools.partial(score_batch, self.scorer),
+            "rank": self._rank_batch,
+        }
+        if client is not None:
+            stage_options.setdefault(
+                "fetch",
+                {"workers": client.config.processing.get("max_concurrent_requests", 3)},
+            )
+        self.pipeline = Pipeline(
+            [
+                Stage(name, funcs[name], **stage_options.get(name, {}))
+                for name in self.STAGES
+            ],
+            batch_size=batch_size,
+            queue_size=queue_size,
+        )
+
+    @classmethod
+    def from_config(cls, app_config, client=None, **kwargs) -> "RecommendationPipeline":
+        """Build from AppConfig: scoring, batch_size, processing['pipeline'] and
+        the persona's forbidden_topics and content_pillars.
+
+        processing['pipeline'] may set queue_size and per-stage options under
+        'stages'. Near-duplicates are collapsed when
+        processing['near_duplicate_distance'] is set.
+        """
+        options = app_config.processing.get("pipeline") or {}
+        kwargs.setdefault("batch_size", app_config.processing.get("batch_size", 20))
+        kwargs.setdefault("queue_size", options.get("queue_size", 4))
+        kwargs.setdefault("stage_options", options.get("stages"))
+        kwargs.setdefault("prefilter", TopicPrefilter.from_config(app_config.persona))
+        if client is None:
+            kwargs.setdefault(
+                "sentiment_analyzer",
+                SentimentAnalyzer(
+                    memo_size=app_config.processing.get("sentiment_memo_size", 65536)
+                ),
+            )
+        if app_config.persona.content_pillars:
+            matcher = KeywordMatcher.from_config(persona=app_config.persona)
+            kwargs.setdefault("keyword_matcher", matcher)
+        if "near_duplicate_distance" in app_config.processing:
+            kwargs.setdefault(
+                "deduplicator", Deduplicator.from_config(app_config.processing)
+            )
+        return cls(app_config.scoring, client=client, **kwargs)
+
+    def _rank_batch(self, batch: List[Tuple[float, Tweet]]) -> List[Recommendation]:
+        """Offer scores to the top-K selector; emit those reaching min_priority."""
+        recommendations = []
+        for score, tweet in batch:
+            self.selector.push(score, tweet)
+            priority = self.scoring_config.get_priority_level(score)
+            if priority in self._accepted:
+                recommendations.append(
+                    Recommendation(
+                        action_type=self.action_type(tweet),
+                        target_id=tweet.id,
+                        target_type="tweet",
+                        priority=priority,
+                        confidence_score=min(1.0, max(0.0, score)),
+                        reasoning=f"High engagement potential (score: {score:.2f})",
+                    )
+                )
+        return recommendations
+
+    def run(self, source: Iterable[Any]) -> Iterator[Recommendation]:
+        """Stream Recommendations for the tweets (or tweet ids) in source."""
+        return self.pipeline.run(source)
+
+    def stats(self) -> Dict[str, StageStats]:
+        """Per-stage stats of the current or last run."""
+        return self.pipeline.stats()
+
+    def prefilter_summary(self) -> Dict[str, Any]:
+        """Prefilter counters with the downstream time rejected tweets saved.
+
+        The saving is estimated from the busy time per item of every stage
+        after the prefilter in the current or last run.
+        """
+        stats = self.stats()
+        downstream = self.STAGES[self.STAGES.index("prefilter") + 1 :]
+        per_item = sum(
+            stats[name].busy_seconds / stats[name].items_in
+            for name in downstream
+            if name in stats and stats[name].items_in
+        )
+        return self.prefilter.summary(downstream_seconds_per_item=per_item)
+
+    def top_recommendations(self) -> List[Recommendation]:
+        """Best recommendation_count recommendations seen so far."""
+        return self.selector.recommendations()
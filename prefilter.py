@@ -0,0 +1,250 @@
+"""
+Forbidden-topic prefilter for raw tweets.
+
+PersonaConfig.forbidden_topics names topics the persona must not engage with.
+TopicPrefilter expands each topic into a term list (FORBIDDEN_TOPIC_TERMS for
+the topics in persona.yaml, or caller-supplied expansions; the topic name is
+always one of its terms) and rejects a tweet as soon as one term is found:
+
+- hashtags first: a tag is split into words at case changes, digits and
+  underscores (`#BitcoinPrice` -> bitcoin, price), and a term matches when
+  it equals the whole tag or a run of its words with spaces and hyphens
+  removed (`#Politics`, `#TechNews`, `#ETHPrice`); a term never matches
+  part of a word, so `#Ethics`, `#FeatureSelection` and `#Cryptography`
+  pass
+- then the text, with a compiled KeywordMatcher that stops at the first hit
+
+It works on raw bridge dicts (`text` and optional `hashtags`) as well as on
+Tweets, so it can run before normalization and keep rejected tweets away from
+parsing, featurizing, scoring and any LLM call. Counters record how many
+tweets were seen and rejected, per topic; summary() turns them into an
+estimate of the downstream time saved.
+"""
+
+import re
+import threading
+from collections import Counter
+from typing import Any, Dict, Iterable, Iterator, List, Mapping, Optional, Sequence
+
+from keywords import KeywordMatcher, fold
+
+# Term expansions for the forbidden topics in persona.yaml, keyed by the
+# folded topic name.
+FORBIDDEN_TOPIC_TERMS: Dict[str, List[str]] = {
+    "politics": [
+        "political",
+        "politician",
+        "politicians",
+        "election",
+        "elections",
+        "ballot",
+        "senate",
+        "senator",
+        "congress",
+        "congressman",
+        "congresswoman",
+        "parliament",
+        "democrat",
+        "democrats",
+        "republican",
+        "republicans",
+        "gop",
+        "maga",
+        "left-wing",
+        "right-wing",
+        "white house",
+        "campaign trail",
+        "impeachment",
+        "midterms",
+        "polling station",
+    ],
+    "cryptocurrency": [
+        "crypto",
+        "cryptocurrencies",
+        "bitcoin",
+        "btc",
+        "ethereum",
+        "eth",
+        "altcoin",
+        "altcoins",
+        "blockchain",
+        "nft",
+        "nfts",
+        "defi",
+        "web3",
+        "dogecoin",
+        "solana",
+        "memecoin",
+        "hodl",
+        "airdrop",
+        "token sale",
+    ],
+    "general tech news": [
+        "tech news",
+        "gadget",
+        "gadgets",
+        "smartphone",
+        "iphone",
+        "apple event",
+        "product launch",
+        "unboxing",
+        "hands-on review",
+    ],
+}
+
+_TEXT_HASHTAG = re.compile(r"(?<![\w&])[#\uFF03](\w+)")
+
+# Letter runs and digit runs of a tag; underscores separate words.
+_TAG_WORD = re.compile(r"[^\W\d_]+|\d+")
+# Word breaks inside a letter run: fooBar, FOOBar.
+_CAMEL_BREAK = re.compile(r"(?<=[a-z])(?=[A-Z])|(?<=[A-Z])(?=[A-Z][a-z])")
+
+
+def _hashtag_form(term: str) -> str:
+    """How term is written as a hashtag: folded, without spaces or hyphens."""
+    return fold(term).replace(" ", "").replace("-", "")
+
+
+def _hashtag_words(tag: str) -> List[str]:
+    """Folded words of a hashtag, split at case changes, digits and underscores."""
+    return [
+        part.casefold()
+        for run in _TAG_WORD.findall(tag)
+        for part in _CAMEL_BREAK.split(run)
+    ]
+
+
+class TopicPrefilter:
+    """Early rejection of tweets that touch forbidden topics."""
+
+    def __init__(
+        self,
+        forbidden_topics: Sequence[str],
+        expansions: Optional[Mapping[str, Iterable[str]]] = None,
+    ):
+        """Build the matchers for forbidden_topics.
+
+        expansions maps a topic name (case-insensitive) to extra terms and
+        defaults to FORBIDDEN_TOPIC_TERMS.
+        """
+        if expansions is None:
+            expansions = FORBIDDEN_TOPIC_TERMS
+        extra = {fold(topic): list(terms) for topic, terms in expansions.items()}
+        terms_by_topic = {
+            topic: [topic, *extra.get(fold(topic), [])] for topic in forbidden_topics
+        }
+        self.forbidden_topics = tuple(terms_by_topic)
+        self._text_matcher = KeywordMatcher(terms_by_topic)
+
+        self._tag_terms: Dict[str, str] = {}
+        for topic, terms in terms_by_topic.items():
+            for term in terms:
+                self._tag_terms.setdefault(_hashtag_form(term), topic)
+
+        self._lock = threading.Lock()
+        self.seen = 0
+        self.rejected = 0
+        self.rejections: Counter = Counter()
+
+    def _hashtag_topic(self, tags: Iterable[str]) -> Optional[str]:
+        """Forbidden topic of the first matching hashtag, or None."""
+        for tag in tags:
+            words = _hashtag_words(tag)
+            for start in range(len(words)):
+                for end in range(start + 1, len(words) + 1):
+                    topic = self._tag_terms.get("".join(words[start:end]))
+                    if topic is not None:
+                        return topic
+        return None
+
+    def check(self, item: Any) -> Optional[str]:
+        """Forbidden topic that item touches, or None if it may pass.
+
+        item is a raw tweet dict or a Tweet. Without a hashtag list, hashtags
+        are read from the text. Counters are not updated.
+        """
+        if isinstance(item, Mapping):
+            text = item.get("text") or ""
+            tags = item.get("hashtags")
+        else:
+            text = item.text
+            tags = item.hashtags
+        if tags is None:
+            tags = _TEXT_HASHTAG.findall(text)
+        topic = self._hashtag_topic(tags)
+        if topic is None:
+            topic = self._text_matcher.first(text)
+        return topic
+
+    def filter_batch(self, batch: List[Any]) -> List[Any]:
+        """Items of batch that touch no forbidden topic; updates the counters.
+
+        Items that are neither dicts nor Tweets (such as tweet ids) pass
+        through uncounted.
+        """
+        if not self.forbidden_topics:
+            return batch
+        kept = []
+        rejected: Counter = Counter()
+        checked = 0
+        for item in batch:
+            if not isinstance(item, Mapping) and not hasattr(item, "text"):
+                kept.append(item)
+                continue
+            checked += 1
+            topic = self.check(item)
+            if topic is None:
+                kept.append(item)
+            else:
+                rejected[topic] += 1
+        with self._lock:
+            self.seen += checked
+            self.rejected += sum(rejected.values())
+            self.rejections.update(rejected)
+        return kept
+
+    def filter(self, items: Iterable[Any]) -> Iterator[Any]:
+        """Lazily yield the items that touch no forbidden topic."""
+        for item in items:
+            if self.filter_batch([item]):
+                yield item
+
+    def summary(
+        self, downstream_seconds_per_item: Optional[float] = None
+    ) -> Dict[str, Any]:
+        """Counters as a dict, plus estimated_seconds_saved when a cost is given.
+
+        downstream_seconds_per_item is what every later stage together spends
+        on one tweet; rejected tweets never pay it.
+        """
+        with self._lock:
+            summary: Dict[str, Any] = {
+                "seen": self.seen,
+                "rejected": self.rejected,
+                "passed": self.seen - self.rejected,
+                "rejection_rate": self.rejected / self.seen if self.seen else 0.0,
+                "by_topic": dict(self.rejections),
+            }
+        if downstream_seconds_per_item is not None:
+            summary["estimated_seconds_saved"] = (
+                summary["rejected"] * downstream_seconds_per_item
+            )
+        return summary
+
+    def reset(self) -> None:
+        """Zero the counters."""
+        with self._lock:
+            self.seen = 0
+            self.rejected = 0
+            self.rejections.clear()
+
+    @classmethod
+    def from_config(
+        cls, persona: Any, expansions: Optional[Mapping[str, Iterable[str]]] = None
+    ) -> "TopicPrefilter":
+        """Prefilter for a PersonaConfig or persona.yaml mapping."""
+        if isinstance(persona, Mapping):
+            topics = persona.get("forbidden_topics") or []
+        else:
+            topics = getattr(persona, "forbidden_topics", None) or []
+        return cls(topics, expansions=expansions)
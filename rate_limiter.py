@@ -0,0 +1,175 @@
+"""
+Client-side token-bucket rate limiting for Node.js bridge requests.
+
+Buckets are driven by AppConfig.api['rate_limit']: `requests_per_minute` sets
+the sustained refill rate and `burst_limit` the bucket capacity. Each bridge
+endpoint gets its own bucket, optionally overridden per endpoint via
+`rate_limit['endpoints']`. Buckets are thread-safe and can be awaited from
+asyncio code without blocking the event loop.
+"""
+
+import asyncio
+import threading
+import time
+from typing import Any, Callable, Dict, Optional
+
+
+class TokenBucket:
+    """Thread-safe token bucket with blocking, async and non-blocking acquire."""
+
+    def __init__(
+        self,
+        rate_per_second: float,
+        capacity: float,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize a full bucket refilling at rate_per_second."""
+        if rate_per_second <= 0:
+            raise ValueError("Rate must be positive")
+        if capacity < 1:
+            raise ValueError("Capacity must be at least 1")
+        self.rate_per_second = rate_per_second
+        self.capacity = capacity
+        self._clock = clock
+        self._tokens = float(capacity)
+        self._updated_at = clock()
+        self._lock = threading.Lock()
+
+    def _refill(self) -> None:
+        """Add tokens accrued since the last update. Caller holds the lock."""
+        now = self._clock()
+        elapsed = now - self._updated_at
+        if elapsed > 0:
+            self._tokens = min(
+                self.capacity, self._tokens + elapsed * self.rate_per_second
+            )
+        self._updated_at = now
+
+    def _take_or_wait(self, tokens: float) -> float:
+        """Consume tokens if available, else return seconds until they are."""
+        if tokens > self.capacity:
+            raise ValueError(
+                f"Cannot acquire {tokens} tokens from bucket of capacity {self.capacity}"
+            )
+        with self._lock:
+            self._refill()
+            if self._tokens >= tokens:
+                self._tokens -= tokens
+                return 0.0
+            return (tokens - self._tokens) / self.rate_per_second
+
+    @property
+    def available(self) -> float:
+        """Number of tokens currently available."""
+        with self._lock:
+            self._refill()
+            return self._tokens
+
+    def try_acquire(self, tokens: float = 1) -> bool:
+        """Consume tokens without waiting; return False if not available."""
+        return self._take_or_wait(tokens) == 0.0
+
+    def acquire(self, tokens: float = 1, timeout: Optional[float] = None) -> bool:
+        """Block until tokens are available or timeout elapses."""
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            wait = self._take_or_wait(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - self._clock()
+                if remaining < wait:
+                    return False
+            time.sleep(wait)
+
+    async def acquire_async(
+        self, tokens: float = 1, timeout: Optional[float] = None
+    ) -> bool:
+        """Await until tokens are available or timeout elapses."""
+        deadline = None if timeout is None else self._clock() + timeout
+        while True:
+            wait = self._take_or_wait(tokens)
+            if wait == 0.0:
+                return True
+            if deadline is not None:
+                remaining = deadline - self._clock()
+                if remaining < wait:
+                    return False
+            await asyncio.sleep(wait)
+
+
+class RateLimiter:
+    """Per-endpoint token buckets configured from api['rate_limit']."""
+
+    def __init__(
+        self,
+        requests_per_minute: float = 60,
+        burst_limit: int = 10,
+        endpoint_limits: Optional[Dict[str, Dict[str, Any]]] = None,
+        clock: Callable[[], float] = time.monotonic,
+    ):
+        """Initialize limiter with default and per-endpoint limits."""
+        if requests_per_minute <= 0:
+            raise ValueError("requests_per_minute must be positive")
+        if burst_limit < 1:
+            raise ValueError("burst_limit must be at least 1")
+        self.requests_per_minute = requests_per_minute
+        self.burst_limit = burst_limit
+        self.endpoint_limits = {
+            self.endpoint_key(endpoint): limits
+            for endpoint, limits in (endpoint_limits or {}).items()
+        }
+        self._clock = clock
+        self._buckets: Dict[str, TokenBucket] = {}
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_config(cls, rate_limit: Dict[str, Any]) -> "RateLimiter":
+        """Create RateLimiter from an api['rate_limit'] dictionary."""
+        return cls(
+            requests_per_minute=rate_limit.get("requests_per_minute", 60),
+            burst_limit=rate_limit.get("burst_limit", 10),
+            endpoint_limits=rate_limit.get("endpoints", {}),
+        )
+
+    @staticmethod
+    def endpoint_key(endpoint: str) -> str:
+        """Reduce an endpoint path to its bucket key.
+
+        Resource ids and query strings are dropped so that `/api/tweet/123`
+        and `/api/tweet/456` share the `/api/tweet` bucket.
+        """
+        path = endpoint.split("?", 1)[0]
+        segments = [segment for segment in path.split("/") if segment]
+        return "/" + "/".join(segments[:2])
+
+    def bucket(self, endpoint: str) -> TokenBucket:
+        """Return the bucket for an endpoint, creating it on first use."""
+        key = self.endpoint_key(endpoint)
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            with self._lock:
+                bucket = self._buckets.get(key)
+                if bucket is None:
+                    limits = self.endpoint_limits.get(key, {})
+                    rpm = limits.get("requests_per_minute", self.requests_per_minute)
+                    burst = limits.get("burst_limit", self.burst_limit)
+                    bucket = TokenBucket(rpm / 60.0, burst, clock=self._clock)
+                    self._buckets[key] = bucket
+        return bucket
+
+    def try_acquire(self, endpoint: str, tokens: float = 1) -> bool:
+        """Take a request slot for endpoint without waiting."""
+        return self.bucket(endpoint).try_acquire(tokens)
+
+    def acquire(
+        self, endpoint: str, tokens: float = 1, timeout: Optional[float] = None
+    ) -> bool:
+        """Block until a request slot for endpoint is available."""
+        return self.bucket(endpoint).acquire(tokens, timeout)
+
+    async def acquire_async(
+        self, endpoint: str, tokens: float = 1, timeout: Optional[float] = None
+    ) -> bool:
+        """Await a request slot for endpoint without blocking the event loop."""
+        return await self.bucket(endpoint).acquire_async(tokens, timeout)
@@ -0,0 +1,196 @@
+"""
+Streaming top-K recommendation selection.
+
+TopKSelector consumes an unbounded stream of (score, tweet) pairs and keeps
+only the K best in a bounded min-heap, so memory stays O(K) however long the
+stream is. The heap root is the weakest candidate kept; a new item costs one
+float comparison against it and is discarded unless it beats it, which is far
+cheaper than sorting the whole stream and slicing.
+
+Scores are bucketed into priority levels with priority_thresholds (as in
+ScoringConfig). Optional per-level quotas cap how many recommendations one
+level may contribute; each level then keeps its own heap of at most
+min(quota, K) items and the buckets are merged when recommendations are
+requested. Scores below the lowest threshold are rejected.
+
+Recommendations can be read at any point with recommendations(); the stream
+does not have to end first.
+"""
+
+import heapq
+import itertools
+import math
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Tuple, Union
+
+from models import Recommendation
+
+RECOMMENDATION_PRIORITIES = ("high", "medium", "low")
+
+ActionType = Union[str, Callable[[Any], str]]
+
+
+class TopKSelector:
+    """Keep the K highest-scoring items of a stream within priority quotas."""
+
+    def __init__(
+        self,
+        k: int,
+        priority_thresholds: Optional[Mapping[str, float]] = None,
+        quotas: Optional[Mapping[str, int]] = None,
+        action_type: ActionType = "like",
+    ):
+        """Create a selector for the top k items.
+
+        priority_thresholds maps Recommendation priorities to minimum scores;
+        without them every item is 'medium' and nothing is rejected. quotas
+        maps priorities to the most recommendations that level may fill.
+        action_type is the Recommendation action, or a callable deriving it
+        from the item.
+        """
+        if k <= 0:
+            raise ValueError("k must be positive")
+        thresholds = dict(priority_thresholds or {})
+        invalid = set(thresholds) - set(RECOMMENDATION_PRIORITIES)
+        if invalid:
+            raise ValueError(f"Invalid priority levels: {sorted(invalid)}")
+        quotas = dict(quotas or {})
+        if quotas and not thresholds:
+            raise ValueError("Quotas require priority_thresholds")
+        invalid = set(quotas) - set(thresholds)
+        if invalid:
+            raise ValueError(f"Quotas for unknown priority levels: {sorted(invalid)}")
+        if any(quota < 0 for quota in quotas.values()):
+            raise ValueError("Quotas cannot be negative")
+
+        self.k = k
+        self.action_type = action_type
+        # Highest threshold first, so the first level a score reaches wins.
+        self._levels: List[Tuple[str, float]] = sorted(
+            thresholds.items(), key=lambda item: item[1], reverse=True
+        )
+        levels = [level for level, _ in self._levels] or ["medium"]
+        self._capacity = {level: min(quotas.get(level, k), k) for level in levels}
+        self._heaps: Dict[str, list] = {level: [] for level in levels}
+        self._floor = self._levels[-1][1] if self._levels else -math.inf
+        self._sequence = itertools.count()
+        self.seen = 0
+        self.rejected = 0
+
+    @classmethod
+    def from_config(
+        cls,
+        k: int,
+        scoring_config,
+        quotas: Optional[Mapping[str, int]] = None,
+        action_type: ActionType = "like",
+    ) -> "TopKSelector":
+        """Selector bucketing scores with a ScoringConfig's priority_thresholds."""
+        return cls(k, scoring_config.priority_thresholds, quotas, action_type)
+
+    def _level(self, score: float) -> Optional[str]:
+        """Priority level for score, or None below every threshold."""
+        if not self._levels:
+            return "medium"
+        for level, threshold in self._levels:
+            if score >= threshold:
+                return level
+        return None
+
+    def push(self, score: float, item: Any) -> bool:
+        """Offer one scored item; returns True if it is currently kept."""
+        self.seen += 1
+        # Written as `not >=` so NaN scores are rejected too.
+        if not score >= self._floor:
+            self.rejected += 1
+            return False
+        level = self._level(score)
+        heap = self._heaps[level]
+        capacity = self._capacity[level]
+        if len(heap) >= capacity and (not capacity or score <= heap[0][0]):
+            return False
+        # Ties keep the earlier item: later sequence numbers sort lower.
+        entry = (score, -next(self._sequence), item)
+        if len(heap) < capacity:
+            heapq.heappush(heap, entry)
+        else:
+            heapq.heapreplace(heap, entry)
+        return True
+
+    def _admission_bar(self) -> float:
+        """Score every level's heap rejects at or below (-inf while one has room)."""
+        bar = math.inf
+        for level, heap in self._heaps.items():
+            capacity = self._capacity[level]
+            if len(heap) < capacity:
+                return -math.inf
+            if capacity:
+                bar = min(bar, heap[0][0])
+        return bar
+
+    def consume(self, scored: Iterable[Tuple[float, Any]]) -> "TopKSelector":
+        """Push every (score, item) pair from an iterable; returns self.
+
+        Scores at or below the admission bar are dropped with one comparison;
+        only possible candidates go through push().
+        """
+        push = self.push
+        floor = self._floor
+        bar = self._admission_bar()
+        skipped = rejected = 0
+        for score, item in scored:
+            if score <= bar:
+                skipped += 1
+                if score < floor:
+                    rejected += 1
+                continue
+            if push(score, item):
+                bar = self._admission_bar()
+        self.seen += skipped
+        self.rejected += rejected
+        return self
+
+    def top(self) -> List[Tuple[float, str, Any]]:
+        """(score, priority, item) for the current top K, best first."""
+        merged = [
+            (entry, level) for level, heap in self._heaps.items() for entry in heap
+        ]
+        best = heapq.nlargest(self.k, merged, key=lambda pair: pair[0][:2])
+        return [(entry[0], level, entry[2]) for entry, level in best]
+
+    def recommendations(self) -> List[Recommendation]:
+        """Recommendations for the current top K, best first.
+
+        The score becomes the confidence, clamped to Recommendation's [0, 1].
+        """
+        result = []
+        for score, level, item in self.top():
+            action = self.action_type
+            if callable(action):
+                action = action(item)
+            result.append(
+                Recommendation(
+                    action_type=action,
+                    target_id=str(getattr(item, "id", item)),
+                    target_type="tweet",
+                    priority=level,
+                    confidence_score=min(1.0, max(0.0, score)),
+                    reasoning=f"Top {self.k} opportunity (score: {score:.2f})",
+                )
+            )
+        return result
+
+    def __len__(self) -> int:
+        """Number of candidates currently held."""
+        return sum(len(heap) for heap in self._heaps.values())
+
+
+def select_top_k(
+    scored: Iterable[Tuple[float, Any]],
+    k: int,
+    priority_thresholds: Optional[Mapping[str, float]] = None,
+    quotas: Optional[Mapping[str, int]] = None,
+    action_type: ActionType = "like",
+) -> List[Recommendation]:
+    """Recommendations for the k best (score, item) pairs of a stream."""
+    selector = TopKSelector(k, priority_thresholds, quotas, action_type)
+    return selector.consume(scored).recommendations()
@@ -0,0 +1,352 @@
+"""
+Offline lexicon-based sentiment scoring for tweet text.
+
+SentimentAnalyzer tokenizes lowercased text with one precompiled regex and
+looks each word and emoji up in a polarity lexicon (a dict, so every lookup
+is a single hash probe). Rules, in the spirit of VADER:
+- negation: a negator (`not`, `never`, any `...n't`) flips and damps the
+  polarity of the next three words; punctuation ends the negated span
+- intensifiers (`very`, `really`, ...) boost the next sentiment word
+- `but`: words before it count half, words after it count 1.5x
+- emoji carry their own polarity and are not negated
+
+The summed polarity is squashed into [-1, 1] and labelled positive, negative
+or neutral for ContentFeatures.sentiment.
+
+Results are memoized in a bounded LRU keyed by normalized text (lowercased,
+whitespace collapsed, `RT @user:` prefix dropped), so retweets and duplicate
+texts are scored once. No models or downloads are involved.
+"""
+
+import math
+import re
+import threading
+from collections import OrderedDict
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+import numpy as np
+
+from features import EMOJI_PATTERN
+
+# Word polarity on VADER's -4..4 scale.
+LEXICON: Dict[str, float] = {
+    # positive
+    "amazing": 2.8,
+    "awesome": 3.1,
+    "beautiful": 2.9,
+    "best": 3.2,
+    "better": 1.9,
+    "brilliant": 2.8,
+    "clean": 1.7,
+    "cool": 1.3,
+    "congrats": 2.4,
+    "congratulations": 2.9,
+    "delighted": 2.9,
+    "easy": 1.9,
+    "efficient": 1.9,
+    "elegant": 2.1,
+    "enjoy": 2.2,
+    "enjoyed": 2.3,
+    "excellent": 3.2,
+    "excited": 1.9,
+    "exciting": 2.2,
+    "fantastic": 2.6,
+    "fast": 1.2,
+    "fun": 2.3,
+    "glad": 2.0,
+    "good": 1.9,
+    "great": 3.1,
+    "happy": 2.7,
+    "helpful": 1.9,
+    "impressive": 2.3,
+    "incredible": 2.6,
+    "insightful": 2.1,
+    "interesting": 1.7,
+    "like": 1.5,
+    "love": 3.2,
+    "loved": 2.9,
+    "loving": 2.9,
+    "nice": 1.8,
+    "perfect": 2.7,
+    "powerful": 1.8,
+    "promising": 1.8,
+    "recommend": 1.5,
+    "reliable": 1.7,
+    "solid": 1.6,
+    "success": 2.7,
+    "successful": 2.8,
+    "thank": 1.5,
+    "thanks": 1.9,
+    "useful": 1.9,
+    "win": 2.8,
+    "wins": 2.7,
+    "wonderful": 2.7,
+    "wow": 2.3,
+    # negative
+    "angry": -2.3,
+    "annoying": -1.7,
+    "awful": -2.0,
+    "bad": -2.5,
+    "boring": -1.3,
+    "broken": -2.1,
+    "bug": -1.2,
+    "buggy": -1.8,
+    "crash": -1.7,
+    "crashes": -1.7,
+    "disappointed": -1.9,
+    "disappointing": -2.2,
+    "disaster": -3.1,
+    "fail": -2.5,
+    "failed": -2.3,
+    "fails": -2.2,
+    "failure": -2.3,
+    "frustrating": -1.9,
+    "hate": -2.7,
+    "hated": -3.2,
+    "horrible": -2.5,
+    "issue": -0.8,
+    "lose": -1.6,
+    "lost": -1.3,
+    "mess": -1.5,
+    "poor": -2.1,
+    "problem": -1.7,
+    "sad": -2.1,
+    "scary": -2.2,
+    "slow": -1.0,
+    "sucks": -1.5,
+    "terrible": -2.1,
+    "ugly": -2.3,
+    "useless": -1.8,
+    "worse": -2.1,
+    "worst": -3.1,
+    "wrong": -2.1,
+    "hype": -0.6,
+    "overrated": -1.3,
+    "confusing": -1.3,
+}
+
+# Emoji polarity, keyed by the emoji's first code point.
+EMOJI_LEXICON: Dict[str, float] = {
+    "😀": 2.0,
+    "😁": 2.0,
+    "😂": 1.6,
+    "🤣": 1.6,
+    "😃": 2.0,
+    "😄": 2.0,
+    "😊": 2.2,
+    "😍": 2.8,
+    "🥰": 2.8,
+    "😎": 1.8,
+    "🙂": 1.2,
+    "🤩": 2.6,
+    "👍": 1.8,
+    "👏": 2.0,
+    "🙌": 2.0,
+    "🎉": 2.4,
+    "🚀": 1.8,
+    "🔥": 1.6,
+    "💯": 2.0,
+    "✨": 1.4,
+    "❤": 2.6,
+    "💖": 2.6,
+    "💙": 2.2,
+    "💪": 1.6,
+    "✅": 1.2,
+    "⭐": 1.4,
+    "🏆": 2.2,
+    "😞": -2.0,
+    "😢": -2.2,
+    "😭": -2.2,
+    "😠": -2.4,
+    "😡": -2.6,
+    "🤬": -2.8,
+    "😒": -1.6,
+    "😩": -1.8,
+    "🙄": -1.4,
+    "😬": -0.8,
+    "👎": -1.8,
+    "💔": -2.4,
+    "❌": -1.2,
+    "🤮": -2.6,
+    "😤": -1.6,
+}
+
+NEGATORS = frozenset(
+    "not no never none nobody nothing neither nor nowhere cannot without "
+    "aint isnt wasnt dont doesnt didnt cant couldnt wont wouldnt shouldnt".split()
+)
+
+INTENSIFIERS: Dict[str, float] = {
+    "very": 0.293,
+    "really": 0.293,
+    "extremely": 0.293,
+    "super": 0.293,
+    "so": 0.293,
+    "incredibly": 0.293,
+    "totally": 0.293,
+    "absolutely": 0.293,
+    "slightly": -0.293,
+    "somewhat": -0.293,
+    "barely": -0.293,
+}
+
+NEGATION_SCALAR = -0.74
+NEGATION_WINDOW = 3
+NORMALIZATION_ALPHA = 15.0
+NEUTRAL_BAND = 0.05
+
+SENTIMENT_LABELS = ("negative", "neutral", "positive")
+_LABELS = np.array(SENTIMENT_LABELS, dtype=object)
+
+_TOKEN_PATTERN = re.compile(
+    rf"(?P<emoji>{EMOJI_PATTERN})"
+    r"|(?P<word>[a-z0-9]+(?:'[a-z]+)?)"
+    r"|(?P<stop>[.!?;:,\n])"
+)
+_RETWEET_PREFIX = re.compile(r"^rt @\w+:\s*")
+_WHITESPACE = re.compile(r"\s+")
+
+
+def normalize_text(text: str) -> str:
+    """Memo key for text: lowercased, whitespace collapsed, RT prefix dropped."""
+    text = _WHITESPACE.sub(" ", text.lower().replace("\u2019", "'")).strip()
+    return _RETWEET_PREFIX.sub("", text)
+
+
+def polarity_label(compound: float) -> str:
+    """'positive', 'negative' or 'neutral' for a compound score."""
+    if compound >= NEUTRAL_BAND:
+        return "positive"
+    if compound <= -NEUTRAL_BAND:
+        return "negative"
+    return "neutral"
+
+
+def score_text(normalized: str) -> float:
+    """Compound polarity in [-1, 1] for already normalized text."""
+    lexicon = LEXICON
+    emoji_lexicon = EMOJI_LEXICON
+    before_but = 0.0
+    seen_but = False
+    total = 0.0
+    negated = 0
+    boost = 0.0
+    for match in _TOKEN_PATTERN.finditer(normalized):
+        kind = match.lastgroup
+        if kind == "stop":
+            negated = 0
+            boost = 0.0
+            continue
+        token = match.group()
+        if kind == "emoji":
+            total += emoji_lexicon.get(token[0], 0.0)
+            continue
+        if token in NEGATORS or token.endswith("n't"):
+            negated = NEGATION_WINDOW
+            continue
+        if token == "but":
+            before_but += total
+            total = 0.0
+            seen_but = True
+            continue
+        value = lexicon.get(token)
+        if value is None:
+            intensity = INTENSIFIERS.get(token)
+            if intensity is not None:
+                boost += intensity
+            elif negated:
+                negated -= 1
+            continue
+        if boost:
+            value += math.copysign(boost, value)
+            boost = 0.0
+        if negated:
+            value *= NEGATION_SCALAR
+            negated -= 1
+        total += value
+    if seen_but:
+        total = before_but * 0.5 + total * 1.5
+    return total / math.sqrt(total * total + NORMALIZATION_ALPHA)
+
+
+class SentimentAnalyzer:
+    """Thread-safe memoizing lexicon sentiment scorer."""
+
+    def __init__(self, memo_size: int = 65536):
+        """Create an analyzer remembering up to memo_size distinct texts."""
+        if memo_size <= 0:
+            raise ValueError("memo_size must be positive")
+        self.memo_size = memo_size
+        self._memo: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+
+    def score(self, text: str) -> float:
+        """Compound polarity in [-1, 1] for text (memoized)."""
+        key = normalize_text(text)
+        with self._lock:
+            compound = self._memo.get(key)
+            if compound is not None:
+                self._memo.move_to_end(key)
+                self.hits += 1
+                return compound
+            self.misses += 1
+        compound = score_text(key)
+        with self._lock:
+            self._memo[key] = compound
+            if len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        return compound
+
+    def label(self, text: str) -> str:
+        """ContentFeatures.sentiment label for text."""
+        return polarity_label(self.score(text))
+
+    def score_batch(self, texts: Iterable[str]) -> Tuple[np.ndarray, np.ndarray]:
+        """Compound scores and labels for many texts.
+
+        Duplicate texts within the batch (after normalization) are scored once.
+        """
+        keys = [normalize_text(text) for text in texts]
+        scores = np.empty(len(keys), dtype=np.float64)
+        unique: Dict[str, Optional[float]] = dict.fromkeys(keys)
+        with self._lock:
+            for key in unique:
+                compound = self._memo.get(key)
+                if compound is not None:
+                    self._memo.move_to_end(key)
+                    unique[key] = compound
+        missing = [key for key, compound in unique.items() if compound is None]
+        computed = [(key, score_text(key)) for key in missing]
+        with self._lock:
+            self.hits += len(keys) - len(missing)
+            self.misses += len(missing)
+            for key, compound in computed:
+                unique[key] = compound
+                self._memo[key] = compound
+            while len(self._memo) > self.memo_size:
+                self._memo.popitem(last=False)
+        for position, key in enumerate(keys):
+            scores[position] = unique[key]
+        codes = np.ones(len(keys), dtype=np.intp)
+        codes[scores >= NEUTRAL_BAND] = 2
+        codes[scores <= -NEUTRAL_BAND] = 0
+        return scores, _LABELS[codes]
+
+    def __getstate__(self) -> Dict[str, Any]:
+        """Pickle the settings only, so the analyzer can cross to worker processes."""
+        return {"memo_size": self.memo_size}
+
+    def __setstate__(self, state: Dict[str, Any]) -> None:
+        """Restore an analyzer with an empty memo."""
+        self.__init__(state["memo_size"])
+
+    def clear(self) -> None:
+        """Forget memoized scores."""
+        with self._lock:
+            self._memo.clear()
+
+    def __len__(self) -> int:
+        """Number of memoized texts."""
+        return len(self._memo)
@@ -0,0 +1,677 @@
+"""
+SQLite storage for fetched tweets and profiles.
+
+TweetStore keeps normalized Tweets and Profiles in one SQLite file so runs can
+pick up where the last one stopped instead of re-downloading everything.
+
+- WAL journal mode with synchronous=NORMAL: readers never block the writer
+  and the writer never blocks readers, so other processes can open the same
+  file (read_only=True) and query while a backfill is ingesting
+- bulk upserts: upsert_tweets() writes rows with executemany, batch_size rows
+  per transaction, with INSERT ... ON CONFLICT DO UPDATE so re-fetched tweets
+  refresh their engagement counts; each tweet's author is upserted in the
+  same transaction
+- indexes on author id, created_at and the numeric Snowflake id, so
+  per-author, time-window and id-ordered reads do not scan the table
+- reads stream: iter_tweets() yields Tweets and iter_frames() yields
+  TweetFrames, fetching batch_size rows at a time
+- per-feed since_id checkpoints for incremental sync (see sync.py)
+
+Tweets are stored column per field; lists and nested objects (urls, media,
+topics, quoted tweets) are stored as JSON text. created_at is stored as epoch
+seconds (naive datetimes are taken as UTC, as Tweet.to_dict does) and read
+back as UTC datetimes.
+"""
+
+import json
+import sqlite3
+import threading
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import (
+    Any,
+    Dict,
+    Iterable,
+    Iterator,
+    List,
+    Optional,
+    Sequence,
+    Set,
+    Tuple,
+    Union,
+)
+
+import numpy as np
+
+from models import ContentFeatures, EngagementMetrics, Profile, Tweet
+from snowflake import is_snowflake
+from tweet_frame import COLUMNS, SENTIMENT_CODES, TweetFrame
+
+PROFILE_COLUMNS = (
+    "id",
+    "username",
+    "display_name",
+    "bio",
+    "avatar",
+    "verified",
+    "followers",
+    "following",
+    "location",
+    "url",
+    "join_date",
+    "tweet_count",
+    "pinned_tweet",
+)
+
+TWEET_COLUMNS = (
+    "id",
+    "snowflake",
+    "author_id",
+    "text",
+    "created_at",
+    "likes",
+    "retweets",
+    "replies",
+    "views",
+    "has_question",
+    "has_media",
+    "has_links",
+    "has_hashtags",
+    "has_mentions",
+    "length",
+    "word_count",
+    "emoji_count",
+    "sentiment",
+    "language",
+    "topics",
+    "urls",
+    "hashtags",
+    "mentions",
+    "media",
+    "is_retweet",
+    "is_reply",
+    "is_thread",
+    "thread_position",
+    "quoted_tweet",
+    "retweeted_tweet",
+)
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS profiles (
+    id TEXT PRIMARY KEY,
+    username TEXT NOT NULL,
+    display_name TEXT NOT NULL,
+    bio TEXT NOT NULL,
+    avatar TEXT,
+    verified INTEGER NOT NULL,
+    followers INTEGER NOT NULL,
+    following INTEGER NOT NULL,
+    location TEXT,
+    url TEXT,
+    join_date REAL,
+    tweet_count INTEGER NOT NULL,
+    pinned_tweet TEXT
+);
+CREATE TABLE IF NOT EXISTS tweets (
+    id TEXT PRIMARY KEY,
+    snowflake INTEGER,
+    author_id TEXT NOT NULL,
+    text TEXT NOT NULL,
+    created_at REAL NOT NULL,
+    likes INTEGER NOT NULL,
+    retweets INTEGER NOT NULL,
+    replies INTEGER NOT NULL,
+    views INTEGER NOT NULL,
+    has_question INTEGER NOT NULL,
+    has_media INTEGER NOT NULL,
+    has_links INTEGER NOT NULL,
+    has_hashtags INTEGER NOT NULL,
+    has_mentions INTEGER NOT NULL,
+    length INTEGER NOT NULL,
+    word_count INTEGER NOT NULL,
+    emoji_count INTEGER NOT NULL,
+    sentiment TEXT NOT NULL,
+    language TEXT NOT NULL,
+    topics TEXT,
+    urls TEXT,
+    hashtags TEXT,
+    mentions TEXT,
+    media TEXT,
+    is_retweet INTEGER NOT NULL,
+    is_reply INTEGER NOT NULL,
+    is_thread INTEGER NOT NULL,
+    thread_position INTEGER,
+    quoted_tweet TEXT,
+    retweeted_tweet TEXT
+);
+CREATE INDEX IF NOT EXISTS tweets_author_id ON tweets (author_id);
+CREATE INDEX IF NOT EXISTS tweets_created_at ON tweets (created_at);
+CREATE INDEX IF NOT EXISTS tweets_snowflake ON tweets (snowflake);
+CREATE TABLE IF NOT EXISTS checkpoints (
+    feed TEXT PRIMARY KEY,
+    since_id TEXT NOT NULL,
+    updated_at REAL NOT NULL
+);
+"""
+
+ORDERINGS = {"id": "t.snowflake", "created_at": "t.created_at"}
+
+
+def _upsert_sql(table: str, columns: Sequence[str]) -> str:
+    """INSERT ... ON CONFLICT(id) DO UPDATE statement for every column."""
+    updates = ", ".join(f"{column} = excluded.{column}" for column in columns[1:])
+    return (
+        f"INSERT INTO {table} ({', '.join(columns)}) "
+        f"VALUES ({', '.join('?' for _ in columns)}) "
+        f"ON CONFLICT(id) DO UPDATE SET {updates}"
+    )
+
+
+_UPSERT_PROFILE = _upsert_sql("profiles", PROFILE_COLUMNS)
+_UPSERT_TWEET = _upsert_sql("tweets", TWEET_COLUMNS)
+_SELECT_TWEETS = (
+    "SELECT "
+    + ", ".join(f"t.{column}" for column in TWEET_COLUMNS)
+    + ", "
+    + ", ".join(f"p.{column}" for column in PROFILE_COLUMNS)
+    + " FROM tweets t LEFT JOIN profiles p ON p.id = t.author_id"
+)
+
+
+def _epoch(value: Optional[datetime]) -> Optional[float]:
+    """Epoch seconds for a datetime; naive datetimes are taken as UTC."""
+    if value is None:
+        return None
+    if value.tzinfo is None:
+        value = value.replace(tzinfo=timezone.utc)
+    return value.timestamp()
+
+
+def _from_epoch(value: Optional[float]) -> Optional[datetime]:
+    """UTC datetime for epoch seconds."""
+    if value is None:
+        return None
+    return datetime.fromtimestamp(value, tz=timezone.utc)
+
+
+def _dumps(value: Any) -> Optional[str]:
+    """Compact JSON text, or NULL for empty/missing values."""
+    if not value:
+        return None
+    return json.dumps(value, separators=(",", ":"))
+
+
+def _profile_values(profile: Profile) -> tuple:
+    """Row values for a Profile, in PROFILE_COLUMNS order."""
+    return (
+        profile.id,
+        profile.username,
+        profile.display_name,
+        profile.bio,
+        profile.avatar,
+        profile.verified,
+        profile.followers,
+        profile.following,
+        profile.location,
+        profile.url,
+        _epoch(profile.join_date),
+        profile.tweet_count,
+        profile.pinned_tweet,
+    )
+
+
+def _tweet_values(tweet: Tweet) -> tuple:
+    """Row values for a Tweet, in TWEET_COLUMNS order."""
+    engagement = tweet.engagement
+    features = tweet.features
+    return (
+        tweet.id,
+        int(tweet.id) if is_snowflake(tweet.id) else None,
+        tweet.user.id,
+        tweet.text,
+        _epoch(tweet.created_at),
+        engagement.likes,
+        engagement.retweets,
+        engagement.replies,
+        engagement.views,
+        features.has_question,
+        features.has_media,
+        features.has_links,
+        features.has_hashtags,
+        features.has_mentions,
+        features.length,
+        features.word_count,
+        features.emoji_count,
+        features.sentiment,
+        features.language,
+        _dumps(features.topics),
+        _dumps(tweet.urls),
+        _dumps(tweet.hashtags),
+        _dumps(tweet.mentions),
+        _dumps(tweet.media),
+        tweet.is_retweet,
+        tweet.is_reply,
+        tweet.is_thread,
+        tweet.thread_position,
+        _dumps(tweet.quoted_tweet),
+        _dumps(tweet.retweeted_tweet),
+    )
+
+
+def _profile_from_row(row: Sequence[Any]) -> Profile:
+    """Profile from values in PROFILE_COLUMNS order."""
+    return Profile(
+        id=row[0],
+        username=row[1],
+        display_name=row[2],
+        bio=row[3],
+        avatar=row[4],
+        verified=bool(row[5]),
+        followers=row[6],
+        following=row[7],
+        location=row[8],
+        url=row[9],
+        join_date=_from_epoch(row[10]),
+        tweet_count=row[11],
+        pinned_tweet=row[12],
+    )
+
+
+def _list(value: Optional[str]) -> list:
+    """Stored JSON list, [] for NULL."""
+    return json.loads(value) if value else []
+
+
+def _object(value: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Stored JSON object, None for NULL."""
+    return json.loads(value) if value else None
+
+
+def _tweet_from_row(row: Sequence[Any], user: Profile) -> Tweet:
+    """Tweet from a _SELECT_TWEETS row and its author."""
+    return Tweet(
+        id=row[0],
+        text=row[3],
+        user=user,
+        created_at=_from_epoch(row[4]),
+        engagement=EngagementMetrics(
+            likes=row[5], retweets=row[6], replies=row[7], views=row[8]
+        ),
+        features=ContentFeatures(
+            has_question=bool(row[9]),
+            has_media=bool(row[10]),
+            has_links=bool(row[11]),
+            has_hashtags=bool(row[12]),
+            has_mentions=bool(row[13]),
+            length=row[14],
+            word_count=row[15],
+            emoji_count=row[16],
+            sentiment=row[17],
+            language=row[18],
+            topics=_list(row[19]),
+        ),
+        urls=_list(row[20]),
+        hashtags=_list(row[21]),
+        mentions=_list(row[22]),
+        media=_list(row[23]),
+        is_retweet=bool(row[24]),
+        is_reply=bool(row[25]),
+        is_thread=bool(row[26]),
+        thread_position=row[27],
+        quoted_tweet=_object(row[28]),
+        retweeted_tweet=_object(row[29]),
+    )
+
+
+class _StoredRows:
+    """Rows of a TweetFrame read from the store, materialized on access."""
+
+    def __init__(self, rows: List[tuple], profiles: Dict[str, Profile]):
+        """Wrap fetched rows; profiles shares authors between rows."""
+        self._rows = rows
+        self._profiles = profiles
+
+    def __len__(self) -> int:
+        """Number of rows."""
+        return len(self._rows)
+
+    def __getitem__(self, index):
+        """Tweet for row index."""
+        if isinstance(index, slice):
+            return [self[i] for i in range(*index.indices(len(self)))]
+        row = self._rows[index]
+        return _tweet_from_row(row, _author(row, self._profiles))
+
+    def take(self, indices: Sequence[int]) -> "_StoredRows":
+        """Rows at indices, still unmaterialized."""
+        return _StoredRows([self._rows[i] for i in indices], self._profiles)
+
+
+def _author(row: Sequence[Any], profiles: Dict[str, Profile]) -> Profile:
+    """Author Profile of a _SELECT_TWEETS row, shared across rows by id."""
+    author_id = row[2]
+    profile = profiles.get(author_id)
+    if profile is None:
+        offset = len(TWEET_COLUMNS)
+        if row[offset] is None:
+            profile = Profile(id=author_id, username="", display_name="")
+        else:
+            profile = _profile_from_row(row[offset:])
+        profiles[author_id] = profile
+    return profile
+
+
+def _frame_sources() -> Dict[str, int]:
+    """Row position feeding each TweetFrame column."""
+    offset = len(TWEET_COLUMNS)
+    sources = {}
+    for name in COLUMNS:
+        if name in ("followers", "following", "verified"):
+            sources[name] = offset + PROFILE_COLUMNS.index(name)
+        elif name == "topic_count":
+            sources[name] = TWEET_COLUMNS.index("topics")
+        else:
+            sources[name] = TWEET_COLUMNS.index(name)
+    return sources
+
+
+_FRAME_SOURCES = _frame_sources()
+_USERNAME = len(TWEET_COLUMNS) + PROFILE_COLUMNS.index("username")
+
+
+def _frame(rows: List[tuple]) -> TweetFrame:
+    """TweetFrame over fetched rows, built without creating Tweets."""
+    columns = {}
+    for name, dtype in COLUMNS.items():
+        index = _FRAME_SOURCES[name]
+        if name == "sentiment":
+            values = (SENTIMENT_CODES[row[index]] for row in rows)
+        elif name == "topic_count":
+            values = (len(_list(row[index])) for row in rows)
+        else:
+            # Authors missing from the profiles table read as 0/False
+            values = (row[index] or 0 for row in rows)
+        columns[name] = np.fromiter(values, dtype=dtype, count=len(rows))
+    return TweetFrame(
+        [row[0] for row in rows],
+        columns,
+        _StoredRows(rows, {}),
+        [row[_USERNAME] or "" for row in rows],
+    )
+
+
+class TweetStore:
+    """SQLite-backed store of Tweets and Profiles."""
+
+    def __init__(
+        self,
+        path: Union[str, Path],
+        read_only: bool = False,
+        batch_size: int = 5000,
+        timeout: float = 30.0,
+    ):
+        """Open (creating if needed) the store at path.
+
+        read_only opens an existing file for querying, for example from a
+        second process while another ingests. batch_size is the number of
+        rows per write transaction and per streamed read batch.
+        """
+        if batch_size <= 0:
+            raise ValueError("batch_size must be positive")
+        self.path = Path(path)
+        self.read_only = read_only
+        self.batch_size = batch_size
+        if read_only:
+            if not self.path.exists():
+                raise FileNotFoundError(f"Tweet store not found: {path}")
+            uri = f"{self.path.resolve().as_uri()}?mode=ro"
+            self._conn = sqlite3.connect(
+                uri, uri=True, timeout=timeout, check_same_thread=False
+            )
+        else:
+            self._conn = sqlite3.connect(
+                str(self.path), timeout=timeout, check_same_thread=False
+            )
+            self._conn.execute("PRAGMA journal_mode=WAL")
+            self._conn.execute("PRAGMA synchronous=NORMAL")
+            self._conn.executescript(SCHEMA)
+        self._lock = threading.Lock()
+
+    def __enter__(self):
+        """Context manager entry."""
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Context manager exit; closes the connection."""
+        self.close()
+
+    def close(self) -> None:
+        """Close the database connection."""
+        with self._lock:
+            self._conn.close()
+
+    def _check_writable(self) -> None:
+        """Raise if the store was opened read-only."""
+        if self.read_only:
+            raise sqlite3.OperationalError("Tweet store is read-only")
+
+    def upsert_profiles(self, profiles: Iterable[Profile]) -> int:
+        """Insert or update profiles; returns the number written."""
+        self._check_writable()
+        written = 0
+        batch: List[Profile] = []
+        for profile in profiles:
+            batch.append(profile)
+            if len(batch) >= self.batch_size:
+                self._write([], batch)
+                written += len(batch)
+                batch = []
+        if batch:
+            self._write([], batch)
+            written += len(batch)
+        return written
+
+    def upsert_tweets(self, tweets: Iterable[Tweet]) -> int:
+        """Insert or update tweets and their authors; returns tweets written.
+
+        Rows are written batch_size at a time, one transaction per batch.
+        """
+        self._check_writable()
+        written = 0
+        tweet_rows: List[tuple] = []
+        authors: Dict[str, Profile] = {}
+        for tweet in tweets:
+            tweet_rows.append(_tweet_values(tweet))
+            authors[tweet.user.id] = tweet.user
+            if len(tweet_rows) >= self.batch_size:
+                written += self._write(tweet_rows, authors.values())
+                tweet_rows = []
+                authors = {}
+        if tweet_rows:
+            written += self._write(tweet_rows, authors.values())
+        return written
+
+    def _write(self, tweet_rows: List[tuple], profiles: Iterable[Profile]) -> int:
+        """Upsert one batch of tweet rows and profiles in a single transaction."""
+        profile_rows = [_profile_values(profile) for profile in profiles]
+        with self._lock, self._conn:
+            self._conn.executemany(_UPSERT_PROFILE, profile_rows)
+            self._conn.executemany(_UPSERT_TWEET, tweet_rows)
+        return len(tweet_rows)
+
+    def _query(
+        self,
+        author_id: Optional[str],
+        since: Optional[datetime],
+        until: Optional[datetime],
+        since_id: Optional[Union[str, int]],
+        max_id: Optional[Union[str, int]],
+        order_by: str,
+        descending: bool,
+        limit: Optional[int],
+    ) -> Tuple[str, List[Any]]:
+        """SELECT statement and parameters for the read filters."""
+        if order_by not in ORDERINGS:
+            raise ValueError(f"order_by must be one of {tuple(ORDERINGS)}")
+        clauses = []
+        params: List[Any] = []
+        if author_id is not None:
+            clauses.append("t.author_id = ?")
+            params.append(author_id)
+        if since is not None:
+            clauses.append("t.created_at >= ?")
+            params.append(_epoch(since))
+        if until is not None:
+            clauses.append("t.created_at < ?")
+            params.append(_epoch(until))
+        if since_id is not None:
+            clauses.append("t.snowflake > ?")
+            params.append(int(since_id))
+        if max_id is not None:
+            clauses.append("t.snowflake <= ?")
+            params.append(int(max_id))
+        sql = _SELECT_TWEETS
+        if clauses:
+            sql += " WHERE " + " AND ".join(clauses)
+        direction = "DESC" if descending else "ASC"
+        sql += f" ORDER BY {ORDERINGS[order_by]} {direction}, t.id {direction}"
+        if limit is not None:
+            sql += " LIMIT ?"
+            params.append(limit)
+        return sql, params
+
+    def _batches(self, sql: str, params: List[Any]) -> Iterator[List[tuple]]:
+        """Fetch query results batch_size rows at a time."""
+        cursor = self._conn.cursor()
+        try:
+            with self._lock:
+                cursor.execute(sql, params)
+                rows = cursor.fetchmany(self.batch_size)
+            while rows:
+                yield rows
+                with self._lock:
+                    rows = cursor.fetchmany(self.batch_size)
+        finally:
+            cursor.close()
+
+    def iter_tweets(
+        self,
+        author_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        since_id: Optional[Union[str, int]] = None,
+        max_id: Optional[Union[str, int]] = None,
+        order_by: str = "id",
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> Iterator[Tweet]:
+        """Stream stored tweets as Tweets.
+
+        Filters: author_id, created_at in [since, until), Snowflake id in
+        (since_id, max_id]. order_by is "id" (Snowflake order) or
+        "created_at". Tweets by the same author share one Profile.
+        """
+        sql, params = self._query(
+            author_id, since, until, since_id, max_id, order_by, descending, limit
+        )
+        profiles: Dict[str, Profile] = {}
+        for rows in self._batches(sql, params):
+            for row in rows:
+                yield _tweet_from_row(row, _author(row, profiles))
+
+    def iter_frames(
+        self,
+        author_id: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+        since_id: Optional[Union[str, int]] = None,
+        max_id: Optional[Union[str, int]] = None,
+        order_by: str = "id",
+        descending: bool = False,
+        limit: Optional[int] = None,
+    ) -> Iterator[TweetFrame]:
+        """Stream stored tweets as TweetFrames of up to batch_size rows.
+
+        Takes the same filters as iter_tweets(). Columns are filled straight
+        from the rows; Tweets are only built for rows accessed by index.
+        """
+        sql, params = self._query(
+            author_id, since, until, since_id, max_id, order_by, descending, limit
+        )
+        for rows in self._batches(sql, params):
+            yield _frame(rows)
+
+    def get_tweet(self, tweet_id: str) -> Optional[Tweet]:
+        """Stored tweet with tweet_id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                _SELECT_TWEETS + " WHERE t.id = ?", (tweet_id,)
+            ).fetchone()
+        if row is None:
+            return None
+        return _tweet_from_row(row, _author(row, {}))
+
+    def get_profile(self, profile_id: str) -> Optional[Profile]:
+        """Stored profile with profile_id, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                f"SELECT {', '.join(PROFILE_COLUMNS)} FROM profiles WHERE id = ?",
+                (profile_id,),
+            ).fetchone()
+        return _profile_from_row(row) if row is not None else None
+
+    def count(self, author_id: Optional[str] = None) -> int:
+        """Number of stored tweets, optionally by one author."""
+        with self._lock:
+            if author_id is None:
+                return self._conn.execute("SELECT COUNT(*) FROM tweets").fetchone()[0]
+            return self._conn.execute(
+                "SELECT COUNT(*) FROM tweets WHERE author_id = ?", (author_id,)
+            ).fetchone()[0]
+
+    def max_id(self, author_id: Optional[str] = None) -> Optional[str]:
+        """Id of the newest stored Snowflake tweet, optionally by one author."""
+        sql = "SELECT id FROM tweets WHERE snowflake IS NOT NULL"
+        params: Tuple[Any, ...] = ()
+        if author_id is not None:
+            sql += " AND author_id = ?"
+            params = (author_id,)
+        sql += " ORDER BY snowflake DESC LIMIT 1"
+        with self._lock:
+            row = self._conn.execute(sql, params).fetchone()
+        return row[0] if row is not None else None
+
+    def existing_ids(self, tweet_ids: Iterable[str]) -> Set[str]:
+        """The ids among tweet_ids that are stored."""
+        tweet_ids = list(tweet_ids)
+        found: Set[str] = set()
+        # Stay under SQLite's default limit of 999 bound parameters
+        for start in range(0, len(tweet_ids), 900):
+            chunk = tweet_ids[start : start + 900]
+            placeholders = ", ".join("?" for _ in chunk)
+            with self._lock:
+                rows = self._conn.execute(
+                    f"SELECT id FROM tweets WHERE id IN ({placeholders})", chunk
+                ).fetchall()
+            found.update(row[0] for row in rows)
+        return found
+
+    def get_checkpoint(self, feed: str) -> Optional[str]:
+        """Newest synced tweet id recorded for feed, or None."""
+        with self._lock:
+            row = self._conn.execute(
+                "SELECT since_id FROM checkpoints WHERE feed = ?", (feed,)
+            ).fetchone()
+        return row[0] if row is not None else None
+
+    def set_checkpoint(self, feed: str, since_id: str) -> None:
+        """Record since_id as the newest synced tweet id for feed."""
+        self._check_writable()
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT INTO checkpoints (feed, since_id, updated_at) VALUES (?, ?, ?) "
+                "ON CONFLICT(feed) DO UPDATE SET since_id = excluded.since_id, "
+                "updated_at = excluded.updated_at",
+                (feed, since_id, time.time()),
+            )
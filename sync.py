@@ -0,0 +1,302 @@
+"""
+Incremental feed sync with durable since_id checkpoints.
+
+Pollers that call get_timeline(count=...) in a loop receive mostly tweets
+they already have. IncrementalSync remembers, per feed, the newest tweet id
+it has handed out and asks only for newer ones:
+- the request carries `sinceId` so the bridge can filter, and paging stops
+  at the first tweet whose id is not above the checkpoint, so a steady-state
+  poll costs one page plus one per page_size new tweets, whatever the
+  caller's count would have been
+- checkpoints live in a JSON file (CheckpointFile) or in a TweetStore
+  (StoreCheckpoints); both survive restarts
+- a checkpoint only moves forward, and only once the batch is committed:
+  poll() commits straight away by default, or pass commit=False and call
+  commit() after the tweets have been processed so a crash re-delivers them
+- a checkpoint never skips tweets: when more than max_items are new, a poll
+  returns the oldest max_items of them, flagged truncated, and keeps the
+  rest of the gap in memory, so the next polls catch up from there without
+  reading the gap again
+
+Feeds are named. "home" and "home:replies" read the bridge timeline, and
+register_keyword() adds a feed of the timeline tweets that match a
+KeywordMatcher topic. Other feeds (such as one account's tweets) plug in
+through register() with a function that yields tweets newest first.
+
+The built-in feeds read the timeline with skip_seen=False, so a client's
+seen_ids filter never hides tweets from a feed: feeds share timeline
+pages, and uncommitted tweets must come back. Instead commit() marks the
+committed tweets seen, so other get_timeline() callers skip them.
+"""
+
+import bisect
+import itertools
+import json
+import os
+import threading
+import time
+from dataclasses import dataclass
+from pathlib import Path
+from typing import (
+    Any,
+    Callable,
+    Dict,
+    Iterable,
+    List,
+    Optional,
+    Tuple,
+    Union,
+)
+
+from keywords import KeywordMatcher
+from models import Tweet
+from snowflake import id_sort_key
+
+# fetch(since_id, max_items) -> tweets, newest first; max_items may be None.
+FeedFetch = Callable[[Optional[str], Optional[int]], Iterable[Tweet]]
+FeedFilter = Callable[[Tweet], bool]
+
+
+def newest_id(ids: Iterable[str], current: Optional[str] = None) -> Optional[str]:
+    """Numerically largest id of ids and current, or None if there are none."""
+    best = current
+    for tweet_id in ids:
+        if best is None or id_sort_key(tweet_id) > id_sort_key(best):
+            best = tweet_id
+    return best
+
+
+class CheckpointFile:
+    """Per-feed since_id checkpoints in a JSON file, rewritten atomically."""
+
+    def __init__(self, path: Union[str, Path]):
+        """Load checkpoints from path if it exists."""
+        self.path = Path(path)
+        self._lock = threading.Lock()
+        self._feeds: Dict[str, Dict[str, Any]] = {}
+        if self.path.exists():
+            with open(self.path, "r", encoding="utf-8") as f:
+                self._feeds = json.load(f).get("feeds", {})
+
+    def get(self, feed: str) -> Optional[str]:
+        """Checkpointed since_id of feed, or None."""
+        with self._lock:
+            entry = self._feeds.get(feed)
+        return entry["since_id"] if entry else None
+
+    def set(self, feed: str, since_id: str) -> None:
+        """Record since_id for feed and write the file durably."""
+        with self._lock:
+            self._feeds[feed] = {"since_id": since_id, "updated_at": time.time()}
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            partial = self.path.with_name(self.path.name + ".partial")
+            with open(partial, "w", encoding="utf-8") as f:
+                json.dump({"feeds": self._feeds}, f, indent=2, sort_keys=True)
+                f.flush()
+                os.fsync(f.fileno())
+            os.replace(partial, self.path)
+
+    def feeds(self) -> Dict[str, str]:
+        """All checkpoints as {feed: since_id}."""
+        with self._lock:
+            return {feed: entry["since_id"] for feed, entry in self._feeds.items()}
+
+
+class StoreCheckpoints:
+    """Per-feed since_id checkpoints kept in a TweetStore."""
+
+    def __init__(self, store: Any):
+        """Use store's checkpoints table."""
+        self.store = store
+
+    def get(self, feed: str) -> Optional[str]:
+        """Checkpointed since_id of feed, or None."""
+        return self.store.get_checkpoint(feed)
+
+    def set(self, feed: str, since_id: str) -> None:
+        """Record since_id for feed."""
+        self.store.set_checkpoint(feed, since_id)
+
+
+@dataclass
+class SyncResult:
+    """Tweets one poll of a feed returned, and where its checkpoint goes."""
+
+    feed: str
+    tweets: List[Tweet]
+    since_id: Optional[str]
+    newest_id: Optional[str]
+    scanned: int = 0
+    committed: bool = False
+    truncated: bool = False
+
+
+class IncrementalSync:
+    """Polls named feeds for tweets newer than their checkpoints."""
+
+    def __init__(
+        self,
+        client: Any,
+        checkpoints: Union[CheckpointFile, StoreCheckpoints],
+        page_size: int = 20,
+        initial_items: int = 20,
+        max_items: int = 1000,
+        store: Optional[Any] = None,
+    ):
+        """Sync feeds through client, checkpointing in checkpoints.
+
+        A feed without a checkpoint fetches its newest initial_items tweets.
+        Afterwards a poll returns at most max_items newer tweets, the oldest
+        ones first, so a backlog is caught up over several polls. Tweets are
+        upserted into store (a TweetStore) before a checkpoint moves.
+        """
+        if page_size <= 0 or initial_items <= 0 or max_items <= 0:
+            raise ValueError("page_size, initial_items and max_items must be positive")
+        self.client = client
+        self.checkpoints = checkpoints
+        self.page_size = page_size
+        self.initial_items = initial_items
+        self.max_items = max_items
+        self.store = store
+        # Per feed: a gap longer than max_items, as the id key it was read
+        # above, its tweets oldest first and their id keys
+        self._backlog: Dict[str, Tuple[int, List[Tweet], List[int]]] = {}
+        self._feeds: Dict[str, Tuple[FeedFetch, Optional[FeedFilter]]] = {
+            "home": (self._timeline(include_replies=False), None),
+            "home:replies": (self._timeline(include_replies=True), None),
+        }
+
+    def _timeline(self, include_replies: bool) -> FeedFetch:
+        """Fetch function for the bridge timeline."""
+
+        def fetch(since_id: Optional[str], max_items: Optional[int]):
+            return self.client.iter_timeline(
+                max_items=max_items,
+                page_size=self.page_size,
+                include_replies=include_replies,
+                since_id=since_id,
+                skip_seen=False,
+            )
+
+        return fetch
+
+    def register(
+        self, feed: str, fetch: FeedFetch, keep: Optional[FeedFilter] = None
+    ) -> None:
+        """Add a feed; fetch(since_id, max_items) yields tweets newest first.
+
+        max_items is None when polling from a checkpoint: every tweet above
+        since_id is wanted.
+
+        With keep, only tweets it accepts are returned, but the checkpoint
+        still moves past every tweet scanned. A fetch that reads the client
+        timeline should pass skip_seen=False, as the built-in feeds do.
+        """
+        self._feeds[feed] = (fetch, keep)
+
+    def register_keyword(
+        self,
+        feed: str,
+        matcher: KeywordMatcher,
+        topic: Optional[str] = None,
+        include_replies: bool = False,
+    ) -> None:
+        """Add a feed of timeline tweets matching topic (any topic if None).
+
+        The feed keeps its own checkpoint; max_items caps the timeline tweets
+        scanned per poll, not the matches.
+        """
+
+        def keep(tweet: Tweet) -> bool:
+            topics = matcher.topics(tweet.text)
+            return bool(topics) and (topic is None or topic in topics)
+
+        self.register(feed, self._timeline(include_replies), keep)
+
+    @property
+    def feeds(self) -> List[str]:
+        """Names of the registered feeds."""
+        return list(self._feeds)
+
+    def poll(self, feed: str = "home", commit: bool = True) -> SyncResult:
+        """Tweets of feed newer than its checkpoint, newest first.
+
+        Stops at the first tweet the checkpoint already covers. If more than
+        max_items tweets are newer, only the oldest max_items are returned
+        and the result is truncated: poll again for the rest, which is served
+        from the gap already read. With commit
+        the checkpoint moves to the newest returned id before returning.
+        """
+        if feed not in self._feeds:
+            raise ValueError(f"Unknown feed: {feed}")
+        fetch, keep = self._feeds[feed]
+        since_id = self.checkpoints.get(feed)
+        truncated = False
+        if since_id is None:
+            newest = fetch(None, self.initial_items)
+            scanned = list(itertools.islice(newest, self.initial_items))
+        else:
+            backlog, keys = self._gap(feed, fetch, since_id)
+            start = bisect.bisect_right(keys, id_sort_key(since_id))
+            end = start + self.max_items
+            truncated = end < len(backlog)
+            scanned = backlog[start:end][::-1]
+        result = SyncResult(
+            feed=feed,
+            tweets=scanned if keep is None else [t for t in scanned if keep(t)],
+            since_id=since_id,
+            newest_id=newest_id((tweet.id for tweet in scanned), since_id),
+            scanned=len(scanned),
+            truncated=truncated,
+        )
+        if commit:
+            self.commit(result)
+        return result
+
+    def _gap(
+        self, feed: str, fetch: FeedFetch, since_id: str
+    ) -> Tuple[List[Tweet], List[int]]:
+        """Tweets of feed above since_id, oldest first, with their id keys.
+
+        The bridge pages newest first, so the whole gap has to be read to
+        find its oldest tweets. When it holds more than max_items, it is kept
+        for the polls that catch up, which read it from memory as long as
+        the checkpoint lies inside it.
+        """
+        floor = id_sort_key(since_id)
+        cached = self._backlog.pop(feed, None)
+        if cached is not None and cached[0] <= floor < cached[2][-1]:
+            self._backlog[feed] = cached
+            return cached[1], cached[2]
+        gap: List[Tweet] = []
+        for tweet in fetch(since_id, None):
+            if id_sort_key(tweet.id) <= floor:
+                break
+            gap.append(tweet)
+        gap.reverse()
+        keys = [id_sort_key(tweet.id) for tweet in gap]
+        if len(gap) > self.max_items:
+            self._backlog[feed] = (floor, gap, keys)
+        return gap, keys
+
+    def commit(self, result: SyncResult) -> None:
+        """Store result's tweets (if a store is set) and advance the checkpoint.
+
+        The tweets are also marked seen in the client's seen_ids, if any.
+        """
+        if result.committed:
+            return
+        if self.store is not None and result.tweets:
+            self.store.upsert_tweets(result.tweets)
+        seen_ids = getattr(self.client, "seen_ids", None)
+        if seen_ids is not None:
+            seen_ids.mark(tweet.id for tweet in result.tweets)
+        current = self.checkpoints.get(result.feed)
+        newest = newest_id([result.newest_id] if result.newest_id else [], current)
+        if newest is not None and newest != current:
+            self.checkpoints.set(result.feed, newest)
+        result.committed = True
+
+    def poll_all(self, commit: bool = True) -> Dict[str, SyncResult]:
+        """Poll every registered feed."""
+        return {feed: self.poll(feed, commit=commit) for feed in self._feeds}
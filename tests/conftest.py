@@ -0,0 +1,95 @@
+"""
+Fixtures shared across the test modules.
+
+- sample_records / sample_tweets: fixtures/sample_tweets.json as raw dicts
+  and as Tweets
+- sample_cookie_data: fixtures/sample_cookies.json
+- mock_bridge_responses: fixtures/bridge_responses.json
+- clock: a FakeClock, advanced by hand
+- stub_client: a factory for clients pointed at a StubBridge (or at none)
+"""
+
+import json
+from pathlib import Path
+
+import pytest
+
+from config import AppConfig
+from models import Tweet
+from twitter_client import TwitterClient
+
+FIXTURES = Path(__file__).parent / "fixtures"
+
+
+def load_fixture(name):
+    """Parsed JSON of a file in tests/fixtures."""
+    with open(FIXTURES / name, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+class FakeClock:
+    """Manually advanced monotonic clock."""
+
+    def __init__(self):
+        self.now = 0.0
+
+    def __call__(self):
+        return self.now
+
+    def advance(self, seconds):
+        self.now += seconds
+
+
+@pytest.fixture
+def sample_records():
+    """Load sample tweets from fixtures as dicts."""
+    return load_fixture("sample_tweets.json")["tweets"]
+
+
+@pytest.fixture
+def sample_tweets(sample_records):
+    """Sample tweets as Tweets."""
+    return [Tweet.from_dict(record) for record in sample_records]
+
+
+@pytest.fixture
+def sample_cookie_data():
+    """Load sample cookie data fixture."""
+    return load_fixture("sample_cookies.json")
+
+
+@pytest.fixture
+def mock_bridge_responses():
+    """Load mock bridge response fixtures."""
+    return load_fixture("bridge_responses.json")
+
+
+@pytest.fixture
+def clock():
+    """Provide a controllable clock."""
+    return FakeClock()
+
+
+@pytest.fixture
+def stub_client(sample_cookie_data):
+    """Factory for clients pointed at a StubBridge, with cookies loaded.
+
+    stub_client(bridge, client_class=TwitterClient, api=None, processing=None,
+    **kwargs): api and processing update those config sections, in which rate
+    limiting is off by default; kwargs go to the client constructor. With
+    bridge None the default base_url is kept, for clients whose requests are
+    patched or replayed.
+    """
+
+    def make(bridge, client_class=TwitterClient, api=None, processing=None, **kwargs):
+        config = AppConfig()
+        if bridge is not None:
+            config.api["base_url"] = bridge.base_url
+        config.api["rate_limit"] = None
+        config.api.update(api or {})
+        config.processing.update(processing or {})
+        client = client_class(config=config, **kwargs)
+        client.load_cookies(sample_cookie_data)
+        return client
+
+    return make
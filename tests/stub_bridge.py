@@ -0,0 +1,172 @@
+"""
+Local stand-in for the Node.js bridge used by integration-style tests.
+
+StubBridge serves the bridge HTTP contract from in-memory tweet dictionaries
+on an ephemeral localhost port:
+- POST /api/timeline -> newest tweets first, paged by `count` and `cursor`
+- GET /api/tweet/{id} -> single tweet or NOT_FOUND
+- POST /api/tweets -> batch lookup with per-id errors (unless batch_route
+  is False, for bridges that predate it)
+
+Every request is recorded in `requests` so tests can assert on round trips.
+"""
+
+import json
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Any, Dict, List, Optional, Tuple
+
+
+class StubBridge:
+    """In-process HTTP server that mimics the Node.js bridge."""
+
+    def __init__(
+        self,
+        tweets: List[Dict[str, Any]],
+        delay: float = 0.0,
+        batch_route: bool = True,
+    ):
+        """Serve the given bridge-format tweets, optionally with added latency.
+
+        With batch_route False, POST /api/tweets is an unknown route.
+        """
+        self.tweets: Dict[str, Dict[str, Any]] = {
+            tweet["id"]: tweet for tweet in tweets
+        }
+        self.delay = delay
+        self.batch_route = batch_route
+        self.requests: List[Tuple[str, str, Optional[Dict[str, Any]]]] = []
+        self._lock = threading.Lock()
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), self._make_handler())
+        self._server.daemon_threads = True
+        self._thread = threading.Thread(
+            target=self._server.serve_forever,
+            kwargs={"poll_interval": 0.01},
+            daemon=True,
+        )
+
+    @property
+    def base_url(self) -> str:
+        """Base URL to configure as api['base_url']."""
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}"
+
+    def __enter__(self):
+        """Start serving."""
+        self._thread.start()
+        return self
+
+    def __exit__(self, exc_type, exc_val, exc_tb):
+        """Stop serving."""
+        self._server.shutdown()
+        self._server.server_close()
+
+    def requests_to(self, path_prefix: str) -> List[Optional[Dict[str, Any]]]:
+        """Return bodies of recorded requests whose path starts with prefix."""
+        with self._lock:
+            return [
+                body for _, path, body in self.requests if path.startswith(path_prefix)
+            ]
+
+    def _record(self, method: str, path: str, body: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            self.requests.append((method, path, body))
+
+    def _ordered_tweets(self) -> List[Dict[str, Any]]:
+        """Tweets newest first, ordered by numeric id like Snowflake ids."""
+        return sorted(self.tweets.values(), key=lambda t: int(t["id"]), reverse=True)
+
+    def handle(
+        self, method: str, path: str, body: Optional[Dict[str, Any]]
+    ) -> Tuple[int, Dict[str, Any]]:
+        """Route a request to a (status, payload) pair."""
+        if method == "POST" and path == "/api/timeline":
+            ordered = self._ordered_tweets()
+            start = int(body.get("cursor") or 0)
+            end = start + body.get("count", 20)
+            metadata = {"count": len(ordered[start:end]), "hasMore": end < len(ordered)}
+            if metadata["hasMore"]:
+                metadata["nextCursor"] = str(end)
+            return 200, {
+                "success": True,
+                "data": ordered[start:end],
+                "metadata": metadata,
+            }
+        if method == "GET" and path.startswith("/api/tweet/"):
+            tweet_id = path.rsplit("/", 1)[-1]
+            if tweet_id not in self.tweets:
+                return 404, not_found(tweet_id)
+            return 200, {"success": True, "data": self.tweets[tweet_id]}
+        if method == "POST" and path == "/api/tweets" and self.batch_route:
+            ids = body.get("ids", [])
+            return 200, {
+                "success": True,
+                "data": [self.tweets[i] for i in ids if i in self.tweets],
+                "errors": [
+                    dict(not_found(i)["error"], id=i)
+                    for i in ids
+                    if i not in self.tweets
+                ],
+            }
+        return 404, {
+            "success": False,
+            "error": {"code": "NOT_FOUND", "message": "Unknown route"},
+        }
+
+    def _make_handler(self):
+        bridge = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def _respond(self, method: str, body: Optional[Dict[str, Any]]) -> None:
+                bridge._record(method, self.path, body)
+                if bridge.delay:
+                    time.sleep(bridge.delay)
+                status, payload = bridge.handle(method, self.path, body)
+                encoded = json.dumps(payload).encode("utf-8")
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(encoded)))
+                self.end_headers()
+                self.wfile.write(encoded)
+
+            def do_GET(self):
+                self._respond("GET", None)
+
+            def do_POST(self):
+                length = int(self.headers.get("Content-Length", 0))
+                self._respond("POST", json.loads(self.rfile.read(length) or b"{}"))
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+
+def not_found(tweet_id: str) -> Dict[str, Any]:
+    """Bridge NOT_FOUND payload for a tweet id."""
+    return {
+        "success": False,
+        "error": {"code": "NOT_FOUND", "message": f"Tweet {tweet_id} not found"},
+    }
+
+
+def make_bridge_tweet(
+    tweet_id: str, text: str = "", **overrides: Any
+) -> Dict[str, Any]:
+    """Build a bridge-format tweet dictionary."""
+    tweet = {
+        "id": tweet_id,
+        "text": text or f"Tweet number {tweet_id}",
+        "user": {
+            "id": "987654321",
+            "username": "sample_user",
+            "displayName": "Sample User",
+            "followers": 1500,
+            "following": 300,
+        },
+        "createdAt": "2024-01-15T10:30:00.000Z",
+        "engagement": {"likes": 42, "retweets": 15, "replies": 8, "views": 1000},
+    }
+    tweet.update(overrides)
+    return tweet
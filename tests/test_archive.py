@@ -0,0 +1,269 @@
+"""
+Tests for the memory-mapped columnar tweet archive.
+
+Tests cover:
+- Writing Tweets, raw dicts and JSON dumps, in one or many chunks
+- Reading rows back as Tweets and strings from the heaps
+- Zero-copy read-only columns and flag bits unpacked from the bitmask
+- Id lookups through the sorted id index
+- TweetFrames over all rows, slices, indices and masks, with lazy strings
+- Rejecting bad ids, bad files and empty archives
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from archive import (
+    FLAG_BITS,
+    MAGIC,
+    ArchiveWriter,
+    TweetArchive,
+    archive_from_json,
+    write_archive,
+)
+from models import Tweet
+from tweet_frame import TweetFrame
+
+FIXTURE_PATH = Path(__file__).parent / "fixtures" / "sample_tweets.json"
+
+# Fields the archive stores, compared after a round trip.
+STORED_FIELDS = (
+    "id",
+    "text",
+    "createdAt",
+    "engagement",
+    "features",
+    "hashtags",
+    "isRetweet",
+    "isReply",
+    "isThread",
+)
+
+
+@pytest.fixture
+def archive(tmp_path, sample_tweets):
+    """Open archive of the sample tweets, written two rows per chunk."""
+    path = write_archive(tmp_path / "tweets.twa", sample_tweets, chunk_size=2)
+    with TweetArchive(path) as archive:
+        yield archive
+
+
+def assert_same_tweet(stored: Tweet, original: Tweet) -> None:
+    """The fields the archive keeps match."""
+    stored_dict, original_dict = stored.to_dict(), original.to_dict()
+    for field in STORED_FIELDS:
+        assert stored_dict[field] == original_dict[field], field
+    for field in ("id", "username", "followers", "following", "verified"):
+        assert getattr(stored.user, field) == getattr(original.user, field)
+
+
+class TestRoundTrip:
+    """Test writing and reading back tweets."""
+
+    def test_rows_round_trip(self, archive, sample_tweets):
+        """Every row reads back as the Tweet that was written."""
+        assert len(archive) == len(sample_tweets)
+        for row, tweet in enumerate(sample_tweets):
+            assert_same_tweet(archive[row], tweet)
+
+    def test_dicts_match_tweets(self, tmp_path, sample_records, sample_tweets):
+        """Raw dicts are archived without building Tweets, with the same result."""
+        path = write_archive(tmp_path / "dicts.twa", sample_records)
+
+        with TweetArchive(path) as archive:
+            for row, tweet in enumerate(sample_tweets):
+                assert_same_tweet(archive[row], tweet)
+
+    def test_mixed_records(self, tmp_path, sample_records, sample_tweets):
+        """A chunk may mix Tweets and dicts."""
+        records = [sample_tweets[0], *sample_records[1:]]
+        path = write_archive(tmp_path / "mixed.twa", records)
+
+        with TweetArchive(path) as archive:
+            assert_same_tweet(archive[0], sample_tweets[0])
+            assert_same_tweet(archive[3], sample_tweets[3])
+
+    def test_from_json(self, tmp_path, sample_tweets):
+        """JSON dumps are converted once."""
+        path = archive_from_json(FIXTURE_PATH, tmp_path / "dump.twa")
+
+        with TweetArchive(path) as archive:
+            assert archive.ids.tolist() == [int(t.id) for t in sample_tweets]
+
+    def test_strings(self, archive, sample_tweets):
+        """Heap strings are read per row without materializing the Tweet."""
+        assert archive.text(1) == sample_tweets[1].text
+        assert archive.username(-1) == sample_tweets[-1].user.username
+        assert archive.strings("hashtags", 0) == sample_tweets[0].hashtags
+        assert archive.strings("topics", 0) == sample_tweets[0].features.topics
+
+    def test_unicode_text(self, tmp_path, sample_tweets):
+        """Non-ASCII text survives the UTF-8 heap."""
+        tweet = sample_tweets[0]
+        tweet.text = "Ship it 🚀 — naïve café"
+        path = write_archive(tmp_path / "unicode.twa", [tweet])
+
+        with TweetArchive(path) as archive:
+            assert archive.text(0) == tweet.text
+
+    def test_row_out_of_range(self, archive):
+        """Rows past the end raise IndexError."""
+        with pytest.raises(IndexError):
+            archive[len(archive)]
+        with pytest.raises(IndexError):
+            archive.text(len(archive))
+
+
+class TestColumns:
+    """Test memory-mapped columns."""
+
+    def test_columns_are_read_only_views(self, archive, sample_tweets):
+        """Numeric columns map the file and cannot be written."""
+        likes = archive.column("likes")
+
+        assert likes.tolist() == [t.engagement.likes for t in sample_tweets]
+        assert not likes.flags.writeable
+        assert likes.base is not None
+
+    def test_flag_bits(self, archive, sample_tweets):
+        """Booleans are packed into the flags bitmask."""
+        assert archive.column("is_retweet").tolist() == [
+            t.is_retweet for t in sample_tweets
+        ]
+        assert archive.column("has_media").tolist() == [
+            t.features.has_media for t in sample_tweets
+        ]
+        assert archive.column("flags").dtype.itemsize * 8 >= len(FLAG_BITS)
+
+    def test_unknown_column(self, archive):
+        """Unknown names raise KeyError."""
+        with pytest.raises(KeyError):
+            archive.column("bookmarks")
+        with pytest.raises(KeyError):
+            archive.string("bio", 0)
+
+
+class TestIdIndex:
+    """Test id lookups."""
+
+    def test_find(self, tmp_path, sample_tweets):
+        """Ids map to their row regardless of write order."""
+        path = write_archive(tmp_path / "reversed.twa", reversed(sample_tweets))
+
+        with TweetArchive(path) as archive:
+            for tweet in sample_tweets:
+                assert archive.ids[archive.find(tweet.id)] == int(tweet.id)
+            assert archive.get(sample_tweets[0].id).text == sample_tweets[0].text
+
+    def test_missing_ids(self, archive):
+        """Absent and non-numeric ids are not found."""
+        assert archive.find("1") == -1
+        assert archive.find(2**64 - 1) == -1
+        assert archive.find("abc") == -1
+        assert archive.get("1") is None
+
+    def test_find_many(self, archive, sample_tweets):
+        """Many ids are looked up in one vectorized search."""
+        ids = [sample_tweets[2].id, "7", sample_tweets[0].id]
+
+        assert archive.find_many(ids).tolist() == [2, -1, 0]
+
+    def test_non_numeric_id_rejected(self, tmp_path, sample_records):
+        """Writing a non-numeric id fails."""
+        record = dict(sample_records[0], id="tweet-1")
+
+        with pytest.raises(ValueError):
+            write_archive(tmp_path / "bad.twa", [record])
+        assert not (tmp_path / "bad.twa").exists()
+
+
+class TestFrames:
+    """Test TweetFrames over the archive."""
+
+    def test_frame_matches_from_tweets(self, archive, sample_tweets):
+        """Archive frames carry the same columns as TweetFrame.from_tweets."""
+        frame = archive.frame()
+        expected = TweetFrame.from_tweets(sample_tweets)
+
+        assert list(frame.ids) == list(expected.ids)
+        assert list(frame.usernames) == list(expected.usernames)
+        for name, column in expected.columns.items():
+            assert frame.columns[name].dtype == column.dtype
+            np.testing.assert_array_equal(frame.columns[name], column)
+
+    def test_slice_is_zero_copy(self, archive):
+        """Slices share memory with the mapped file."""
+        frame = archive.frame(slice(1, 3))
+
+        assert len(frame) == 2
+        assert np.shares_memory(frame.columns["likes"], archive.column("likes"))
+
+    def test_mask_and_indices(self, archive, sample_tweets):
+        """Masks and index arrays select rows; rows materialize on access."""
+        frame = archive.frame(archive.column("likes") > 100)
+        expected = [t.id for t in sample_tweets if t.engagement.likes > 100]
+        assert list(frame.ids) == expected
+
+        picked = archive.frame([3, 0])
+        assert picked[0].id == sample_tweets[3].id
+        assert picked[1].text == sample_tweets[0].text
+
+    def test_strings_and_tweets_are_lazy(self, archive, sample_tweets):
+        """Usernames and Tweets are only built when read, also after take()."""
+        expected = [t for t in sample_tweets if t.engagement.likes > 100]
+        read_row = TweetArchive.__getitem__
+        with patch.object(archive, "username", wraps=archive.username) as username:
+            with patch.object(
+                TweetArchive, "__getitem__", autospec=True, side_effect=read_row
+            ) as row:
+                frame = archive.frame()
+                kept = frame.take(frame.columns["likes"] > 100)
+                assert username.call_count == 0
+                assert list(kept.usernames) == [t.user.username for t in expected]
+                assert username.call_count == len(kept)
+                assert list(kept.ids) == [t.id for t in expected]
+                assert row.call_count == 0
+                assert kept[0].id == expected[0].id
+                assert row.call_count == 1
+
+
+class TestFiles:
+    """Test file handling."""
+
+    def test_empty_archive(self, tmp_path):
+        """Archives with no rows open and answer queries."""
+        path = write_archive(tmp_path / "empty.twa", [])
+
+        with TweetArchive(path) as archive:
+            assert len(archive) == 0
+            assert archive.find("1") == -1
+            assert len(archive.frame()) == 0
+
+    def test_not_an_archive(self, tmp_path):
+        """Files without the magic bytes are rejected."""
+        path = tmp_path / "tweets.json"
+        path.write_bytes(b"{" + b" " * 64 + b"}")
+
+        with pytest.raises(ValueError):
+            TweetArchive(path)
+
+    def test_magic_header(self, archive):
+        """Files start with the archive magic."""
+        assert archive.path.read_bytes()[: len(MAGIC)] == MAGIC
+
+    def test_writer_is_single_use(self, tmp_path, sample_tweets):
+        """A closed writer refuses more rows."""
+        writer = ArchiveWriter(tmp_path / "once.twa")
+        writer.add(sample_tweets)
+        writer.close()
+
+        with pytest.raises(ValueError):
+            writer.add(sample_tweets)
+
+    def test_invalid_chunk_size(self, tmp_path):
+        """chunk_size must be positive."""
+        with pytest.raises(ValueError):
+            ArchiveWriter(tmp_path / "bad.twa", chunk_size=0)
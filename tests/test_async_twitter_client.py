@@ -0,0 +1,231 @@
+"""
+Tests for AsyncTwitterClient concurrent fan-out.
+
+Tests cover:
+- Concurrency sizing from processing['max_concurrent_requests']
+- Bridge contract parity with TwitterClient
+- Bounded concurrency under a semaphore
+- Per-id error reporting for batch fetches
+"""
+
+import asyncio
+import threading
+import time
+from unittest.mock import Mock, patch
+
+import pytest
+
+from config import AppConfig
+from models import Tweet
+from async_twitter_client import AsyncTwitterClient
+from twitter_client import TwitterClientError
+from stub_bridge import StubBridge, make_bridge_tweet
+
+
+@pytest.fixture
+def async_client(sample_cookie_data):
+    """Create authenticated AsyncTwitterClient for testing."""
+    client = AsyncTwitterClient()
+    client.load_cookies(sample_cookie_data)
+    yield client
+    client.close()
+
+
+def make_response(payload, status_code=200):
+    """Build a mock bridge response."""
+    response = Mock()
+    response.json.return_value = payload
+    response.status_code = status_code
+    return response
+
+
+class TestAsyncTwitterClientInitialization:
+    """Test AsyncTwitterClient configuration."""
+
+    def test_uses_max_concurrent_requests_from_config(self):
+        """Concurrency limit is read from processing config."""
+        app_config = AppConfig()
+        app_config.processing["max_concurrent_requests"] = 7
+
+        client = AsyncTwitterClient(config=app_config)
+        try:
+            assert client.max_concurrent_requests == 7
+        finally:
+            client.close()
+
+    def test_explicit_concurrency_overrides_config(self):
+        """Explicit max_concurrent_requests takes precedence over config."""
+        client = AsyncTwitterClient(max_concurrent_requests=2)
+        try:
+            assert client.max_concurrent_requests == 2
+        finally:
+            client.close()
+
+    def test_rejects_non_positive_concurrency(self):
+        """Non-positive concurrency limit is rejected."""
+        with pytest.raises(ValueError, match="must be positive"):
+            AsyncTwitterClient(max_concurrent_requests=0)
+
+
+class TestAsyncTwitterClientRequests:
+    """Test async requests against the bridge contract."""
+
+    def test_get_timeline_posts_to_timeline_endpoint(
+        self, async_client, mock_bridge_responses
+    ):
+        """get_timeline() posts to /api/timeline and normalizes tweets."""
+        with patch("requests.Session.post") as mock_post:
+            mock_post.return_value = make_response(
+                mock_bridge_responses["timeline_success"]
+            )
+
+            tweets = asyncio.run(async_client.get_timeline(count=5))
+
+            assert mock_post.call_args[0][0].endswith("/api/timeline")
+            assert mock_post.call_args[1]["json"]["count"] == 5
+            assert all(isinstance(tweet, Tweet) for tweet in tweets)
+
+    def test_get_tweet_uses_tweet_endpoint(self, async_client, mock_bridge_responses):
+        """get_tweet() requests /api/tweet/{id}."""
+        with patch("requests.Session.get") as mock_get:
+            mock_get.return_value = make_response(
+                mock_bridge_responses["tweet_success"]
+            )
+
+            tweet = asyncio.run(async_client.get_tweet("1234567890123456789"))
+
+            assert mock_get.call_args[0][0].endswith("/api/tweet/1234567890123456789")
+            assert tweet.id == "1234567890123456789"
+
+    def test_propagates_bridge_errors(self, async_client, mock_bridge_responses):
+        """Bridge errors surface as TwitterClientError."""
+        with patch("requests.Session.get") as mock_get:
+            mock_get.return_value = make_response(
+                mock_bridge_responses["not_found_error"], status_code=404
+            )
+
+            with pytest.raises(TwitterClientError, match="not found"):
+                asyncio.run(async_client.get_tweet("missing"))
+
+
+class TestAsyncTwitterClientConcurrency:
+    """Test bounded concurrent fan-out."""
+
+    @pytest.fixture
+    def bridge(self):
+        """Serve twelve tweets from a local stand-in bridge."""
+        tweets = [make_bridge_tweet(str(1000 + i)) for i in range(12)]
+        with StubBridge(tweets) as bridge:
+            yield bridge
+
+    @pytest.fixture
+    def make_client(self, bridge, stub_client):
+        """Factory for AsyncTwitterClients on the bridge, two ids per batch."""
+
+        def make(max_concurrent_requests=3):
+            return stub_client(
+                bridge,
+                client_class=AsyncTwitterClient,
+                processing={"batch_size": 2},
+                max_concurrent_requests=max_concurrent_requests,
+            )
+
+        return make
+
+    def test_concurrent_requests_stay_within_limit(self, make_client):
+        """Fan-out overlaps requests but never exceeds the limit."""
+        client = make_client(max_concurrent_requests=3)
+        lock = threading.Lock()
+        state = {"active": 0, "peak": 0}
+
+        def slow_get(url, **kwargs):
+            with lock:
+                state["active"] += 1
+                state["peak"] = max(state["peak"], state["active"])
+            time.sleep(0.02)
+            with lock:
+                state["active"] -= 1
+            return make_response({"success": True, "data": make_bridge_tweet("1")})
+
+        async def crawl():
+            return await asyncio.gather(*(client.get_tweet(str(i)) for i in range(12)))
+
+        try:
+            with patch("requests.Session.get", side_effect=slow_get):
+                tweets = asyncio.run(crawl())
+        finally:
+            client.close()
+
+        assert len(tweets) == 12
+        assert state["peak"] == 3
+
+    def test_get_tweets_fetches_batches_concurrently(self, bridge, make_client):
+        """get_tweets() runs one batch request per chunk, in parallel."""
+        bridge.delay = 0.1
+        client = make_client()
+        ids = [str(1000 + i) for i in range(6)]
+
+        try:
+            started = time.perf_counter()
+            tweets = asyncio.run(client.get_tweets(ids + ["1000"]))
+            elapsed = time.perf_counter() - started
+        finally:
+            client.close()
+
+        assert [tweet.id for tweet in tweets] == ids + ["1000"]
+        assert len(bridge.requests_to("/api/tweets")) == 3
+        assert elapsed < 0.25
+
+    def test_get_tweets_reports_per_id_errors(self, make_client):
+        """A missing id yields its error without failing the batch."""
+        client = make_client()
+
+        try:
+            results = asyncio.run(client.get_tweets(["1000", "missing", "1001"]))
+        finally:
+            client.close()
+
+        assert isinstance(results[0], Tweet)
+        assert isinstance(results[1], TwitterClientError)
+        assert isinstance(results[2], Tweet)
+
+
+class TestAsyncTwitterClientTimelinePagination:
+    """Test async iter_timeline() cursor pagination."""
+
+    def test_streams_all_pages(self, stub_client):
+        """iter_timeline() yields every page following cursors."""
+        tweets = [make_bridge_tweet(str(1000 + i)) for i in range(7)]
+        with StubBridge(tweets) as bridge:
+            client = stub_client(bridge, client_class=AsyncTwitterClient)
+
+            async def collect():
+                return [tweet.id async for tweet in client.iter_timeline(page_size=3)]
+
+            try:
+                ids = asyncio.run(collect())
+            finally:
+                client.close()
+
+            assert ids == [str(1006 - i) for i in range(7)]
+            assert len(bridge.requests_to("/api/timeline")) == 3
+
+    def test_max_items_stops_paging(self, stub_client):
+        """max_items ends the stream without requesting more pages."""
+        tweets = [make_bridge_tweet(str(1000 + i)) for i in range(7)]
+        with StubBridge(tweets) as bridge:
+            client = stub_client(bridge, client_class=AsyncTwitterClient)
+
+            async def collect():
+                return [
+                    tweet.id
+                    async for tweet in client.iter_timeline(max_items=3, page_size=3)
+                ]
+
+            try:
+                ids = asyncio.run(collect())
+            finally:
+                client.close()
+
+            assert len(ids) == 3
+            assert len(bridge.requests_to("/api/timeline")) == 1
@@ -0,0 +1,374 @@
+"""
+Tests for the Bloom filter seen-id set.
+
+Tests cover:
+- Sizing from capacity and error rate, and parameter validation
+- No false negatives, and a false-positive rate within the target
+- Growing into larger filters past the initial capacity
+- Saving and memory-mapping filters back, read-only and copy-on-write
+- Non-numeric ids and repeats within a batch
+- Confirming Bloom hits against a TweetStore so new tweets are never dropped
+- Checking ids without marking them, and marking only normalized tweets
+- Marking only yielded timeline tweets, so an early exit loses none
+- Skipping already-seen timeline tweets in TwitterClient and AsyncTwitterClient
+"""
+
+import asyncio
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from async_twitter_client import AsyncTwitterClient
+from bloom import BloomFilter, ScalableBloomFilter, SeenIds, id_keys, optimal_parameters
+from storage import TweetStore
+from stub_bridge import StubBridge, make_bridge_tweet
+from twitter_client import TwitterClient
+
+
+@pytest.fixture
+def bridge():
+    """Serve ten tweets, ids 1000-1009, from a local stand-in bridge."""
+    tweets = [make_bridge_tweet(str(1000 + i)) for i in range(10)]
+    with StubBridge(tweets) as bridge:
+        yield bridge
+
+
+@pytest.fixture
+def seen_client(stub_client):
+    """Factory for clients on a stub bridge with seen-id filtering enabled."""
+
+    def make(bridge, client_class=TwitterClient, **seen_ids):
+        seen_ids = {"capacity": 1000, **seen_ids}
+        return stub_client(bridge, client_class, processing={"seen_ids": seen_ids})
+
+    return make
+
+
+def snowflakes(start, count):
+    """count consecutive Snowflake-sized ids as a uint64 array."""
+    return np.arange(start, start + count, dtype=np.uint64)
+
+
+class TestBloomFilter:
+    """Test the fixed-size filter."""
+
+    def test_sizing(self):
+        """Bits follow -n ln p / ln2^2, rounded up to a multiple of 64."""
+        bits, hashes = optimal_parameters(1_000_000, 0.01)
+        assert 9_585_000 < bits < 9_586_000
+        assert bits % 64 == 0
+        assert hashes == 7
+        assert BloomFilter(1_000_000, 0.01).nbytes == bits // 8
+
+    @pytest.mark.parametrize("capacity, error_rate", [(0, 0.01), (10, 0), (10, 1)])
+    def test_invalid_parameters(self, capacity, error_rate):
+        """Capacity must be positive and the error rate inside (0, 1)."""
+        with pytest.raises(ValueError):
+            BloomFilter(capacity, error_rate)
+
+    def test_no_false_negatives(self):
+        """Every added key is found."""
+        bloom = BloomFilter(10_000, 0.01)
+        keys = id_keys(snowflakes(1_600_000_000_000_000_000, 10_000))
+        bloom.add_keys(keys)
+
+        assert bloom.contains_keys(keys).all()
+        assert bloom.count == 10_000
+        assert bloom.full
+
+    def test_false_positive_rate(self):
+        """Keys never added hit at about the configured rate."""
+        bloom = BloomFilter(20_000, 0.01)
+        bloom.add_keys(id_keys(snowflakes(1_600_000_000_000_000_000, 20_000)))
+
+        others = id_keys(snowflakes(1_700_000_000_000_000_000, 100_000))
+        assert bloom.contains_keys(others).mean() < 0.015
+
+    def test_add_reports_present(self):
+        """add_keys returns which keys were already there; repeats don't count."""
+        bloom = BloomFilter(100, 0.001)
+        bloom.add_keys(id_keys([1, 2]))
+
+        assert bloom.add_keys(id_keys([2, 3])).tolist() == [True, False]
+        assert bloom.count == 3
+
+
+class TestScalableBloomFilter:
+    """Test the growing filter series."""
+
+    def test_grows_past_capacity(self):
+        """Filling the first filter adds a larger, tighter one."""
+        scalable = ScalableBloomFilter(initial_capacity=1000, error_rate=0.01)
+        ids = snowflakes(1_600_000_000_000_000_000, 5000)
+        scalable.add(ids)
+
+        assert len(scalable.filters) == 3
+        assert [b.capacity for b in scalable.filters] == [1000, 2000, 4000]
+        assert scalable.filters[1].error_rate < scalable.filters[0].error_rate
+        assert scalable.contains(ids).all()
+        others = snowflakes(1_700_000_000_000_000_000, 50_000)
+        assert scalable.contains(others).mean() < 0.01
+
+    def test_string_and_non_numeric_ids(self):
+        """Numeric strings match their numbers; other ids are hashed."""
+        scalable = ScalableBloomFilter(initial_capacity=100)
+        scalable.add(["1234567890123456789", "not-a-number"])
+
+        assert 1234567890123456789 in scalable
+        assert "not-a-number" in scalable
+        assert "1234567890123456790" not in scalable
+        assert len(scalable) == 2
+
+    def test_invalid_growth(self):
+        """growth and tightening are validated."""
+        with pytest.raises(ValueError):
+            ScalableBloomFilter(growth=0)
+        with pytest.raises(ValueError):
+            ScalableBloomFilter(tightening=1)
+
+
+class TestPersistence:
+    """Test saving and memory-mapping filters."""
+
+    @pytest.fixture
+    def saved(self, tmp_path):
+        """A two-filter series saved to disk, and the ids it holds."""
+        scalable = ScalableBloomFilter(initial_capacity=500, error_rate=0.01)
+        ids = snowflakes(1_600_000_000_000_000_000, 800)
+        scalable.add(ids)
+        return scalable.save(tmp_path / "seen.bloom"), ids
+
+    @pytest.mark.parametrize("mmap_mode", ["r", "c", None])
+    def test_round_trip(self, saved, mmap_mode):
+        """Loaded filters answer like the saved one."""
+        path, ids = saved
+        loaded = ScalableBloomFilter.load(path, mmap_mode=mmap_mode)
+
+        assert len(loaded.filters) == 2
+        assert len(loaded) == 800
+        assert loaded.contains(ids).all()
+        if mmap_mode is not None:
+            assert isinstance(loaded.filters[0].bits, np.memmap)
+
+    def test_read_only_map(self, saved):
+        """Adding to a read-only map fails instead of writing the file."""
+        path, _ = saved
+        loaded = ScalableBloomFilter.load(path, mmap_mode="r")
+        with pytest.raises(ValueError):
+            loaded.add(snowflakes(1_700_000_000_000_000_000, 10))
+
+    def test_copy_on_write_then_save(self, saved):
+        """Adds to a copy-on-write map persist only once saved."""
+        path, _ = saved
+        extra = snowflakes(1_700_000_000_000_000_000, 10)
+        loaded = ScalableBloomFilter.load(path, mmap_mode="c")
+        loaded.add(extra)
+        assert not ScalableBloomFilter.load(path).contains(extra).any()
+
+        loaded.save(path)
+        reloaded = ScalableBloomFilter.load(path)
+        assert reloaded.contains(extra).all()
+        assert len(reloaded) == 810
+
+    def test_rejects_other_files(self, tmp_path):
+        """Files without the magic header are refused."""
+        path = tmp_path / "other.bin"
+        path.write_bytes(b"\0" * 64)
+        with pytest.raises(ValueError):
+            ScalableBloomFilter.load(path)
+
+
+class TestSeenIds:
+    """Test the seen-id set."""
+
+    def test_filter_new(self):
+        """New ids are reported once, including repeats within a batch."""
+        seen = SeenIds(ScalableBloomFilter(initial_capacity=100))
+
+        assert seen.filter_new(["1", "2", "1"]) == [True, True, False]
+        assert seen.filter_new(["2", "3"]) == [False, True]
+        assert "3" in seen
+        assert "4" not in seen
+        assert seen.stats()["checked"] == 5
+        assert seen.stats()["skipped"] == 2
+
+    def test_check_then_mark(self):
+        """mark=False only checks; mark() records the ids afterwards."""
+        seen = SeenIds(ScalableBloomFilter(initial_capacity=100))
+
+        assert seen.filter_new(["1", "2", "1"], mark=False) == [True, True, False]
+        assert "1" not in seen
+        seen.mark(["1"])
+        assert seen.filter_new(["1", "2"], mark=False) == [False, True]
+
+    def test_filter_records(self):
+        """Raw tweet dicts are filtered by their id."""
+        seen = SeenIds(ScalableBloomFilter(initial_capacity=100))
+        records = [{"id": "1"}, {"id": "2"}]
+        seen.filter_records(records[:1])
+
+        assert seen.filter_records(records) == [{"id": "2"}]
+        assert seen.filter_records([]) == []
+
+    def test_store_confirms_hits(self, tmp_path):
+        """Bloom hits the store does not have are false positives, kept as new."""
+        bloom = ScalableBloomFilter(initial_capacity=100)
+        bloom.add(["1001", "1002"])
+        with TweetStore(tmp_path / "tweets.db") as store:
+            store.upsert_tweets(
+                TwitterClient()._normalize_tweets([make_bridge_tweet("1001")])
+            )
+            seen = SeenIds(bloom, store=store)
+
+            assert seen.filter_new(["1001", "1002", "1003"]) == [False, True, True]
+            assert "1002" not in seen
+            assert seen.stats()["false_positives"] == 1
+
+    def test_from_config_and_save(self, tmp_path):
+        """from_config builds a filter, and reloads the one save() wrote."""
+        config = {"capacity": 100, "error_rate": 0.01, "path": tmp_path / "s.bloom"}
+        seen = SeenIds.from_config(config)
+        assert seen.bloom.filters[0].capacity == 100
+        seen.filter_new(["1", "2"])
+        seen.save()
+
+        reloaded = SeenIds.from_config(config)
+        assert reloaded.filter_new(["2", "3"]) == [False, True]
+        assert SeenIds(ScalableBloomFilter(initial_capacity=10)).save() is None
+
+
+class TestClientIntegration:
+    """Test seen-id filtering in TwitterClient."""
+
+    def test_disabled_by_default(self):
+        """Clients only filter when configured to."""
+        assert TwitterClient().seen_ids is None
+
+    def test_seen_store_confirms_hits(self, bridge, stub_client, tmp_path):
+        """seen_store reaches SeenIds; unstored ids are delivered again."""
+        with TweetStore(tmp_path / "tweets.db") as store:
+            client = stub_client(
+                bridge, processing={"seen_ids": {"capacity": 1000}}, seen_store=store
+            )
+            first = client.get_timeline(count=3)
+            store.upsert_tweets(first[:2])
+            second = client.get_timeline(count=3)
+            client.close()
+
+        assert client.seen_ids.store is store
+        assert [t.id for t in second] == ["1007"]
+        assert client.seen_ids.stats()["false_positives"] == 1
+
+    def test_timeline_skips_seen(self, bridge, seen_client):
+        """Tweets already returned are not normalized again."""
+        client = seen_client(bridge)
+        first = client.get_timeline(count=3)
+        second = client.get_timeline(count=5)
+
+        assert [t.id for t in first] == ["1009", "1008", "1007"]
+        assert [t.id for t in second] == ["1006", "1005"]
+        assert [t.id for t in client.iter_timeline(page_size=4)] == [
+            "1004",
+            "1003",
+            "1002",
+            "1001",
+            "1000",
+        ]
+        assert client.seen_ids.stats()["skipped"] == 8
+        client.close()
+
+    def test_async_timeline_skips_seen(self, bridge, seen_client):
+        """The async client also pages past pages emptied by seen ids."""
+        client = seen_client(bridge, AsyncTwitterClient)
+
+        async def collect():
+            first = await client.get_timeline(count=4)
+            rest = [tweet.id async for tweet in client.iter_timeline(page_size=4)]
+            return [t.id for t in first], rest
+
+        try:
+            first, rest = asyncio.run(collect())
+        finally:
+            client.close()
+
+        assert first == ["1009", "1008", "1007", "1006"]
+        assert rest == ["1005", "1004", "1003", "1002", "1001", "1000"]
+
+    def test_marked_only_once_normalized(self, bridge, seen_client):
+        """Tweets are marked seen after normalization, and not when it fails."""
+        client = seen_client(bridge)
+        with patch.object(client, "_normalize_tweets", side_effect=ValueError):
+            with pytest.raises(ValueError):
+                client.get_timeline(count=3)
+
+        assert len(client.get_timeline(count=3)) == 3
+        client.close()
+
+    def test_unread_tweets_stay_unseen(self, seen_client):
+        """Tweets left unread after an early exit are returned next time."""
+        tweets = [make_bridge_tweet(str(2000 + i)) for i in range(30)]
+        with StubBridge(tweets) as bridge:
+            client = seen_client(bridge)
+            for position, _ in enumerate(client.iter_timeline(page_size=10)):
+                if position == 2:
+                    break
+            partial = list(client.iter_timeline(max_items=15, page_size=10))
+            rest = list(client.iter_timeline(page_size=10))
+            client.close()
+
+        assert len(partial) == 15
+        assert len(rest) == 12
+        assert len({t.id for t in partial + rest}) == 27
+
+    def test_async_unread_tweets_stay_unseen(self, seen_client):
+        """The async iterator also marks only the tweets it yielded."""
+        tweets = [make_bridge_tweet(str(2000 + i)) for i in range(30)]
+
+        async def first_three_then_rest(client):
+            first = []
+            async for tweet in client.iter_timeline(page_size=10):
+                first.append(tweet.id)
+                if len(first) == 3:
+                    break
+            rest = [tweet.id async for tweet in client.iter_timeline(page_size=10)]
+            return first, rest
+
+        with StubBridge(tweets) as bridge:
+            client = seen_client(bridge, AsyncTwitterClient)
+            try:
+                first, rest = asyncio.run(first_three_then_rest(client))
+            finally:
+                client.close()
+
+        assert first == ["2029", "2028", "2027"]
+        assert len(rest) == 27
+        assert rest[0] == "2026"
+
+    def test_skip_seen_per_call(self, bridge, seen_client):
+        """skip_seen=False returns every tweet and marks none."""
+        client = seen_client(bridge)
+        client.get_timeline(count=2)
+
+        assert len(client.get_timeline(count=4, skip_seen=False)) == 4
+        assert [t.id for t in client.get_timeline(count=4)] == ["1007", "1006"]
+        client.close()
+
+    def test_latest_tweet_unaffected(self, bridge, seen_client):
+        """get_latest_tweet still returns the newest tweet after it was seen."""
+        client = seen_client(bridge)
+        client.get_timeline(count=1)
+
+        assert client.get_latest_tweet().id == "1009"
+        client.close()
+
+    def test_close_saves_filter(self, tmp_path, bridge, seen_client):
+        """Closing the client writes the filter, and a new client resumes it."""
+        path = tmp_path / "seen.bloom"
+        client = seen_client(bridge, path=str(path))
+        client.get_timeline(count=4)
+        client.close()
+
+        resumed = seen_client(bridge, path=str(path))
+        assert [t.id for t in resumed.get_timeline(count=6)] == ["1005", "1004"]
+        resumed.close()
@@ -0,0 +1,238 @@
+"""
+Tests for the TTL + LRU response cache and its TwitterClient integration.
+
+Tests cover:
+- TTL expiry, LRU eviction and hit/miss counters
+- Negative entries with their own TTL
+- Invalidation hooks
+- get_tweet()/get_tweets() serving cached Tweets and NOT_FOUND results
+- Whole-request batch failures and unlisted ids never negatively cached
+"""
+
+from unittest.mock import Mock, patch
+
+import pytest
+
+from cache import TTLCache
+from twitter_client import TwitterClient, TwitterClientError
+
+
+@pytest.fixture
+def cached_client(stub_client, clock):
+    """Create authenticated TwitterClient with a controllable cache."""
+    cache = TTLCache(max_size=10, ttl_seconds=60, negative_ttl_seconds=5, clock=clock)
+    return stub_client(None, cache=cache)
+
+
+class TestTTLCache:
+    """Test TTLCache behavior."""
+
+    def test_returns_stored_value_until_ttl_expires(self, clock):
+        """Entries are served until their TTL elapses."""
+        cache = TTLCache(ttl_seconds=10, clock=clock)
+        cache.set("a", 1)
+
+        clock.advance(9)
+        assert cache.get("a").value == 1
+        clock.advance(1)
+        assert cache.get("a") is None
+
+    def test_evicts_least_recently_used(self, clock):
+        """The least recently used entry is evicted at capacity."""
+        cache = TTLCache(max_size=2, clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.get("a")
+        cache.set("c", 3)
+
+        assert cache.get("b") is None
+        assert cache.get("a").value == 1
+        assert cache.evictions == 1
+
+    def test_negative_entries_use_negative_ttl(self, clock):
+        """Negative entries expire after negative_ttl_seconds."""
+        cache = TTLCache(ttl_seconds=60, negative_ttl_seconds=5, clock=clock)
+        cache.set_negative("gone", "error")
+
+        entry = cache.get("gone")
+        assert entry.negative
+        clock.advance(5)
+        assert cache.get("gone") is None
+
+    def test_counts_hits_and_misses(self, clock):
+        """stats() reports hit/miss counters."""
+        cache = TTLCache(clock=clock)
+        cache.set("a", 1)
+        cache.get("a")
+        cache.get("b")
+
+        stats = cache.stats()
+        assert stats["hits"] == 1
+        assert stats["misses"] == 1
+        assert stats["hit_rate"] == 0.5
+
+    def test_invalidation(self, clock):
+        """invalidate() and clear() drop entries."""
+        cache = TTLCache(clock=clock)
+        cache.set("a", 1)
+        cache.set("b", 2)
+        cache.set("c", 3)
+
+        assert cache.invalidate("a")
+        assert not cache.invalidate("a")
+        assert cache.invalidate_many(["b", "x"]) == 1
+        cache.clear()
+        assert len(cache) == 0
+
+    def test_rejects_invalid_sizes(self):
+        """Non-positive size and TTLs are rejected."""
+        with pytest.raises(ValueError, match="max_size must be positive"):
+            TTLCache(max_size=0)
+        with pytest.raises(ValueError, match="TTLs must be positive"):
+            TTLCache(negative_ttl_seconds=0)
+
+
+class TestTwitterClientCaching:
+    """Test cached tweet lookups in TwitterClient."""
+
+    def test_cache_disabled_by_default(self):
+        """Without configuration the client does not cache."""
+        assert TwitterClient().cache is None
+
+    def test_cache_built_from_config(self, stub_client):
+        """api['cache'] configures the client cache."""
+        client = stub_client(None, api={"cache": {"max_size": 5, "ttl_seconds": 30}})
+
+        assert client.cache.max_size == 5
+        assert client.cache.ttl_seconds == 30
+
+    @patch("requests.Session.get")
+    def test_get_tweet_served_from_cache(
+        self, mock_get, cached_client, mock_bridge_responses
+    ):
+        """Repeated get_tweet() returns the same object with one request."""
+        mock_get.return_value = Mock(
+            status_code=200, json=lambda: mock_bridge_responses["tweet_success"]
+        )
+
+        with patch.object(
+            cached_client, "_normalize_tweet", wraps=cached_client._normalize_tweet
+        ) as normalize:
+            first = cached_client.get_tweet("1234567890123456789")
+            second = cached_client.get_tweet("1234567890123456789")
+
+        assert second is first
+        assert mock_get.call_count == 1
+        assert normalize.call_count == 1
+
+    @patch("requests.Session.get")
+    def test_not_found_is_negatively_cached(
+        self, mock_get, cached_client, mock_bridge_responses, clock
+    ):
+        """NOT_FOUND is cached for the negative TTL only."""
+        mock_get.return_value = Mock(
+            status_code=404, json=lambda: mock_bridge_responses["not_found_error"]
+        )
+
+        for _ in range(2):
+            with pytest.raises(TwitterClientError, match="not found"):
+                cached_client.get_tweet("deleted")
+        assert mock_get.call_count == 1
+
+        clock.advance(5)
+        with pytest.raises(TwitterClientError):
+            cached_client.get_tweet("deleted")
+        assert mock_get.call_count == 2
+
+    @patch("requests.Session.get")
+    def test_other_errors_are_not_cached(self, mock_get, cached_client):
+        """Transient or non-NOT_FOUND errors always reach the bridge."""
+        mock_get.return_value = Mock(
+            status_code=400,
+            json=lambda: {"error": {"code": "VALIDATION_ERROR", "message": "Bad"}},
+        )
+
+        for _ in range(2):
+            with pytest.raises(TwitterClientError):
+                cached_client.get_tweet("1")
+        assert mock_get.call_count == 2
+
+    @patch("requests.Session.get")
+    def test_invalidate_tweet_forces_refetch(
+        self, mock_get, cached_client, mock_bridge_responses
+    ):
+        """invalidate_tweet() drops a cached tweet."""
+        mock_get.return_value = Mock(
+            status_code=200, json=lambda: mock_bridge_responses["tweet_success"]
+        )
+
+        cached_client.get_tweet("1234567890123456789")
+        assert cached_client.invalidate_tweet("1234567890123456789")
+        cached_client.get_tweet("1234567890123456789")
+
+        assert mock_get.call_count == 2
+
+    @patch("requests.Session.post")
+    def test_get_tweets_only_requests_uncached_ids(
+        self, mock_post, cached_client, mock_bridge_responses
+    ):
+        """get_tweets() skips ids already cached, positive or negative."""
+        tweet = mock_bridge_responses["tweet_success"]["data"]
+        mock_post.return_value = Mock(
+            status_code=200,
+            json=lambda: {
+                "success": True,
+                "data": [tweet],
+                "errors": [{"id": "gone", "code": "NOT_FOUND", "message": "Gone"}],
+            },
+        )
+
+        cached_client.get_tweets([tweet["id"], "gone"])
+        results = cached_client.get_tweets([tweet["id"], "gone"])
+
+        assert mock_post.call_count == 1
+        assert results[0].id == tweet["id"]
+        assert results[1].code == "NOT_FOUND"
+
+    @patch("requests.Session.get")
+    @patch("requests.Session.post")
+    def test_batch_route_errors_are_not_cached(
+        self, mock_post, mock_get, cached_client
+    ):
+        """A NOT_FOUND for the whole request (no /api/tweets route) is not cached.
+
+        The ids are looked up one by one instead, and only those lookups'
+        per-id NOT_FOUNDs are cached.
+        """
+        mock_post.return_value = Mock(
+            status_code=404,
+            json=lambda: {
+                "success": False,
+                "error": {"code": "NOT_FOUND", "message": "Unknown route"},
+            },
+        )
+        mock_get.return_value = Mock(
+            status_code=404,
+            json=lambda: {
+                "success": False,
+                "error": {"code": "NOT_FOUND", "message": "Tweet not found"},
+            },
+        )
+
+        for _ in range(2):
+            results = cached_client.get_tweets(["1", "2"])
+            assert [r.code for r in results] == ["NOT_FOUND", "NOT_FOUND"]
+            assert all("Unknown route" not in str(r) for r in results)
+        assert mock_post.call_count == 1
+        assert mock_get.call_count == 2
+
+    @patch("requests.Session.post")
+    def test_ids_missing_from_batch_are_not_cached(self, mock_post, cached_client):
+        """Only ids listed in the response's errors are negatively cached."""
+        mock_post.return_value = Mock(
+            status_code=200, json=lambda: {"success": True, "data": []}
+        )
+
+        cached_client.get_tweets(["1"])
+        assert cached_client.get_tweets(["1"])[0].code == "NOT_FOUND"
+        assert mock_post.call_count == 2
@@ -0,0 +1,153 @@
+"""
+Tests for the decay-aware candidate index.
+
+Tests cover:
+- Top-K ranking matching a full re-score at query time
+- Current scores decaying with time
+- Replacement and removal
+- Expiry past max_age_hours
+- Construction from strategy and scoring configuration
+"""
+
+import math
+import random
+
+import pytest
+
+import config
+from candidate_index import CandidateIndex
+
+HOUR = 3600.0
+EPOCH = 1_700_000_000.0
+
+
+@pytest.fixture
+def index():
+    """Index decaying at 0.1 per hour with a 48 hour max age."""
+    return CandidateIndex(0.1, max_age_hours=48, epoch=EPOCH, clock=lambda: EPOCH)
+
+
+class TestCandidateRanking:
+    """Test ranking without re-scoring."""
+
+    def test_top_matches_full_rescore(self, index):
+        """top() equals re-scoring every candidate at query time."""
+        rng = random.Random(3)
+        scored = {}
+        for i in range(500):
+            scored_at = EPOCH + rng.uniform(0, 24) * HOUR
+            score = rng.uniform(0.01, 100)
+            index.add(i, score, created_at=scored_at, scored_at=scored_at)
+            scored[i] = (score, scored_at)
+        now = EPOCH + 30 * HOUR
+
+        top = index.top(10, now=now)
+
+        rescored = {
+            i: score * math.exp(-0.1 * (now - at) / HOUR)
+            for i, (score, at) in scored.items()
+        }
+        expected = sorted(rescored, key=rescored.get, reverse=True)[:10]
+        assert [item_id for item_id, _, _ in top] == expected
+        for item_id, score, _ in top:
+            assert score == pytest.approx(rescored[item_id])
+
+    def test_fresher_candidate_overtakes_older_one(self, index):
+        """A lower score earned later outranks a decayed earlier score."""
+        index.add("old", 10.0, created_at=EPOCH, scored_at=EPOCH)
+        index.add("new", 2.0, created_at=EPOCH + 20 * HOUR, scored_at=EPOCH + 20 * HOUR)
+
+        top = index.top(2, now=EPOCH + 20 * HOUR)
+
+        assert [item_id for item_id, _, _ in top] == ["new", "old"]
+        assert index.score("old", now=EPOCH + 20 * HOUR) == pytest.approx(
+            10.0 * math.exp(-2.0)
+        )
+
+    def test_top_leaves_index_intact(self, index):
+        """Repeated queries return the same candidates."""
+        for i in range(20):
+            index.add(i, float(i + 1), created_at=EPOCH, item=f"tweet{i}")
+
+        first = index.top(5, now=EPOCH)
+
+        assert first == index.top(5, now=EPOCH)
+        assert first[0] == (19, pytest.approx(20.0), "tweet19")
+        assert len(index) == 20
+
+    def test_zero_score_ranks_last_and_negative_is_rejected(self, index):
+        """Zero scores are kept but rank last; negative scores raise."""
+        index.add("zero", 0.0, created_at=EPOCH)
+        index.add("one", 1.0, created_at=EPOCH)
+
+        assert [item_id for item_id, _, _ in index.top(2)] == ["one", "zero"]
+        with pytest.raises(ValueError, match="non-negative"):
+            index.add("bad", -1.0, created_at=EPOCH)
+
+    def test_long_running_epoch_offsets_do_not_overflow(self):
+        """Keys stay finite for candidates scored years after the epoch."""
+        index = CandidateIndex(0.1, epoch=EPOCH)
+        later = EPOCH + 5 * 365 * 24 * HOUR
+
+        index.add("a", 3.0, created_at=later, scored_at=later)
+
+        assert index.score("a", now=later) == pytest.approx(3.0)
+
+
+class TestCandidateLifecycle:
+    """Test replacement, removal and expiry."""
+
+    def test_replace_and_remove(self, index):
+        """Re-adding an id replaces it; removed ids disappear from top()."""
+        index.add("a", 1.0, created_at=EPOCH)
+        index.add("b", 2.0, created_at=EPOCH)
+        index.add("a", 3.0, created_at=EPOCH)
+
+        assert [item_id for item_id, _, _ in index.top(5)] == ["a", "b"]
+        assert index.remove("a") is True
+        assert index.remove("a") is False
+        assert [item_id for item_id, _, _ in index.top(5)] == ["b"]
+        assert "a" not in index
+
+    def test_expire_drops_old_candidates(self, index):
+        """Candidates older than max_age_hours are popped by age."""
+        index.add("old", 100.0, created_at=EPOCH)
+        index.add("new", 1.0, created_at=EPOCH + 10 * HOUR)
+
+        assert index.expire(now=EPOCH + 49 * HOUR) == 1
+        assert [item_id for item_id, _, _ in index.top(5, EPOCH + 49 * HOUR)] == ["new"]
+        assert index.expired == 1
+
+    def test_churn_keeps_heaps_compact(self, index):
+        """Replacing candidates repeatedly does not grow the heaps unbounded."""
+        for round_number in range(50):
+            for i in range(100):
+                index.add(i, float(round_number + i), created_at=EPOCH)
+
+        assert len(index) == 100
+        assert len(index._by_score) <= 2 * len(index) + 64
+        assert index.top(1)[0][0] == 99
+
+
+class TestCandidateIndexConfig:
+    """Test construction from configuration."""
+
+    def test_from_strategy(self):
+        """decay_rate comes from opportunity_scoring.time_decay."""
+        strategy = {"opportunity_scoring": {"time_decay": {"decay_rate": 0.25}}}
+
+        assert CandidateIndex.from_strategy(strategy).decay_rate == 0.25
+
+    def test_from_scoring_config(self):
+        """Half-life converts to a decay rate; max age carries over."""
+        index = CandidateIndex.from_scoring_config(config.ScoringConfig())
+
+        assert index.decay_rate == pytest.approx(math.log(2) / 24)
+        assert index.max_age_hours == 168
+
+    def test_invalid_arguments(self):
+        """Negative decay rates and max ages are rejected."""
+        with pytest.raises(ValueError):
+            CandidateIndex(-0.1)
+        with pytest.raises(ValueError):
+            CandidateIndex(0.1, max_age_hours=0)
@@ -0,0 +1,316 @@
+"""
+Tests for bridge traffic capture and replay.
+
+Tests cover:
+- Recording TwitterClient round trips to a JSONL log without cookies
+- Size-based rotation, gzip-compressed segments and reading them back
+- Dropping records instead of blocking when the queue is full
+- Replaying recorded responses through the real client with no bridge
+- Replayed HTTP errors, timeouts and retries
+- Recorded, scaled and skipped latency; looping and missing responses
+"""
+
+import gzip
+import json
+import threading
+from unittest.mock import Mock, patch
+
+import pytest
+import requests
+
+from capture import (
+    CaptureLog,
+    ReplayMissError,
+    ReplayTransport,
+    capture_segments,
+    read_capture,
+)
+from stub_bridge import StubBridge, make_bridge_tweet
+from twitter_client import TwitterClient, TwitterClientError
+
+
+@pytest.fixture
+def bridge():
+    """Serve five tweets from a local stand-in bridge."""
+    tweets = [make_bridge_tweet(str(1000 + i)) for i in range(5)]
+    with StubBridge(tweets) as bridge:
+        yield bridge
+
+
+def make_entry(endpoint="/api/tweet/1", status=200, body=None, **fields):
+    """A capture record as the writer stores it."""
+    entry = {
+        "method": "GET",
+        "endpoint": endpoint,
+        "request": None,
+        "elapsed": 0.5,
+        "status": status,
+        "reason": "OK",
+        "body": json.dumps(body if body is not None else {"success": True}),
+    }
+    entry.update(fields)
+    return entry
+
+
+@pytest.fixture
+def recorded_client(tmp_path, bridge, stub_client):
+    """Client pointed at the stub bridge with capture enabled."""
+    return stub_client(
+        bridge, api={"capture": {"path": str(tmp_path / "capture.jsonl")}}
+    )
+
+
+@pytest.fixture
+def replay_client(stub_client):
+    """Factory for clients with no bridge behind them, served by a ReplayTransport.
+
+    replay_client(records, **options) returns (client, transport).
+    """
+
+    def make(records, **options):
+        client = stub_client(None)
+        transport = ReplayTransport(records, **options).install(client)
+        return client, transport
+
+    return make
+
+
+class TestCaptureLog:
+    """Test the background capture writer."""
+
+    def test_client_records_round_trips(
+        self, tmp_path, recorded_client, sample_cookie_data
+    ):
+        """Every bridge round trip is appended, without cookies."""
+        client = recorded_client
+        client.get_timeline(count=2)
+        with pytest.raises(TwitterClientError):
+            client.get_tweet("missing")
+        client.close()
+
+        records = list(read_capture(tmp_path / "capture.jsonl"))
+        assert [(r["method"], r["endpoint"]) for r in records] == [
+            ("POST", "/api/timeline"),
+            ("GET", "/api/tweet/missing"),
+        ]
+        assert records[0]["request"] == {"count": 2}
+        assert json.loads(records[0]["body"])["success"] is True
+        assert records[1]["status"] == 404
+        assert all(r["elapsed"] >= 0 for r in records)
+        text = (tmp_path / "capture.jsonl").read_text()
+        assert sample_cookie_data["essentials"]["auth_token"] not in text
+
+    def test_capture_disabled_by_default(self):
+        """Clients only capture when configured to."""
+        assert TwitterClient().capture is None
+
+    def test_records_transport_errors(self, tmp_path, stub_client):
+        """Timeouts are recorded as errors with no response."""
+        client = stub_client(
+            None, api={"capture": {"path": str(tmp_path / "capture.jsonl")}}
+        )
+
+        with patch.object(client.session, "get", side_effect=requests.Timeout), patch(
+            "twitter_client.time.sleep"
+        ):
+            with pytest.raises(TwitterClientError, match="timeout"):
+                client._make_request("GET", "/api/tweet/1", max_retries=2)
+        client.close()
+
+        records = list(read_capture(tmp_path / "capture.jsonl"))
+        assert [r["error"] for r in records] == ["timeout", "timeout"]
+
+    def test_appends_across_sessions(self, tmp_path):
+        """Reopening a log appends after the existing records."""
+        path = tmp_path / "capture.jsonl"
+        response = Mock(status_code=200, reason="OK", text="{}")
+        for _ in range(2):
+            with CaptureLog(path) as log:
+                log.record("GET", "/api/tweet/1", None, 0.1, response=response)
+
+        assert len(list(read_capture(path))) == 2
+
+    def test_rotation_and_compression(self, tmp_path):
+        """Full files rotate into numbered, optionally gzipped segments."""
+        path = tmp_path / "capture.jsonl"
+        response = Mock(status_code=200, reason="OK", text="x" * 200)
+        with CaptureLog(path, max_bytes=600, compress=True) as log:
+            for i in range(10):
+                log.record("GET", f"/api/tweet/{i}", None, 0.1, response=response)
+
+        segments = capture_segments(path)
+        assert len(segments) > 2
+        assert all(segment.suffix == ".gz" for segment in segments[:-1])
+        assert segments[-1] == path
+        with gzip.open(segments[0], "rt", encoding="utf-8") as f:
+            assert json.loads(f.readline())["endpoint"] == "/api/tweet/0"
+        endpoints = [r["endpoint"] for r in read_capture(path)]
+        assert endpoints == [f"/api/tweet/{i}" for i in range(10)]
+        for segment in segments:
+            assert segment.stat().st_size <= 600
+
+    def test_full_queue_drops(self, tmp_path):
+        """Records beyond queue_size are dropped rather than blocking."""
+        path = tmp_path / "capture.jsonl"
+        response = Mock(status_code=200, reason="OK", text="{}")
+        log = CaptureLog(path, queue_size=1)
+        # Hold the writer thread inside its first write
+        blocked = threading.Event()
+        release = threading.Event()
+        original = json.dumps
+
+        def slow_dumps(*args, **kwargs):
+            blocked.set()
+            release.wait(5)
+            return original(*args, **kwargs)
+
+        with patch("capture.json.dumps", side_effect=slow_dumps):
+            assert log.record("GET", "/a", None, 0.1, response=response)
+            blocked.wait(5)
+            assert log.record("GET", "/b", None, 0.1, response=response)
+            assert not log.record("GET", "/c", None, 0.1, response=response)
+            release.set()
+            log.close()
+
+        assert log.dropped == 1
+        assert log.recorded == 2
+        assert not log.record("GET", "/d", None, 0.1, response=response)
+
+    def test_writer_failure_is_raised(self, tmp_path):
+        """A failed writer surfaces its error instead of blocking flush/close."""
+        path = tmp_path / "capture.jsonl"
+        response = Mock(status_code=200, reason="OK", text="{}")
+        log = CaptureLog(path, queue_size=2)
+        calls = []
+
+        def flush_and_close():
+            for call in (log.flush, log.close, log.close):
+                try:
+                    call()
+                except OSError as e:
+                    calls.append(str(e))
+
+        with patch("capture.json.dumps", side_effect=OSError("No space left")):
+            log.record("GET", "/a", None, 0.1, response=response)
+            worker = threading.Thread(target=flush_and_close, daemon=True)
+            worker.start()
+            worker.join(5)
+
+        assert not worker.is_alive()
+        assert calls == ["No space left"] * 3
+        assert isinstance(log.error, OSError)
+        assert not log.record("GET", "/b", None, 0.1, response=response)
+        assert log.recorded == 0
+
+    def test_client_close_after_writer_failure(self, recorded_client):
+        """The client still saves its state before the capture error surfaces."""
+        client = recorded_client
+        client.capture.error = OSError("No space left")
+        client.seen_ids = Mock()
+
+        with pytest.raises(OSError):
+            client.close()
+        client.seen_ids.save.assert_called_once()
+
+    def test_invalid_settings(self, tmp_path):
+        """Sizes must be positive."""
+        with pytest.raises(ValueError):
+            CaptureLog(tmp_path / "capture.jsonl", max_bytes=0)
+        with pytest.raises(ValueError):
+            CaptureLog(tmp_path / "capture.jsonl", queue_size=0)
+
+
+class TestReplay:
+    """Test serving recorded responses."""
+
+    def test_replays_recorded_session(self, tmp_path, recorded_client, replay_client):
+        """A recorded session replays identically with the bridge gone."""
+        client = recorded_client
+        live_timeline = client.get_timeline(count=3)
+        live_tweet = client.get_tweet("1002")
+        client.close()
+
+        replayed, transport = replay_client(tmp_path / "capture.jsonl")
+        assert replayed.get_timeline(count=3) == live_timeline
+        assert replayed.get_tweet("1002") == live_tweet
+        assert transport.served == 2
+
+    def test_replays_http_errors(self, replay_client):
+        """Recorded error statuses go through _handle_response."""
+        body = {"success": False, "error": {"code": "NOT_FOUND", "message": "gone"}}
+        client, _ = replay_client([make_entry(status=404, body=body)])
+
+        with pytest.raises(TwitterClientError) as exc_info:
+            client._make_request("GET", "/api/tweet/1")
+        assert exc_info.value.code == "NOT_FOUND"
+
+    def test_replays_timeouts_through_retries(self, replay_client):
+        """A recorded timeout followed by a success is retried and served."""
+        records = [
+            make_entry(status=None, body=None, error="timeout"),
+            make_entry(body={"success": True, "data": {"id": "1"}}),
+        ]
+        client, transport = replay_client(records)
+
+        with patch("twitter_client.time.sleep") as sleep:
+            data = client._make_request("GET", "/api/tweet/1")
+        assert data["data"] == {"id": "1"}
+        sleep.assert_called_once()
+        assert transport.served == 2
+
+    def test_matches_on_request_body(self, replay_client):
+        """Requests with different bodies get their own responses."""
+        records = [
+            make_entry(
+                "/api/timeline",
+                method="POST",
+                request={"count": 1},
+                body={"success": True, "data": "one"},
+            ),
+            make_entry(
+                "/api/timeline",
+                method="POST",
+                request={"count": 2},
+                body={"success": True, "data": "two"},
+            ),
+        ]
+        client, _ = replay_client(records)
+
+        data = client._make_request("POST", "/api/timeline", {"count": 2})
+        assert data["data"] == "two"
+
+    def test_missing_and_exhausted(self, replay_client):
+        """Unrecorded or used-up requests raise ReplayMissError."""
+        client, transport = replay_client([make_entry()])
+        client._make_request("GET", "/api/tweet/1")
+
+        with pytest.raises(ReplayMissError):
+            client._make_request("GET", "/api/tweet/1")
+        with pytest.raises(ReplayMissError):
+            client._make_request("GET", "/api/tweet/2")
+
+        transport.reset()
+        client._make_request("GET", "/api/tweet/1")
+
+    def test_loop(self, replay_client):
+        """With loop, exhausted requests start over."""
+        client, transport = replay_client([make_entry()], loop=True)
+        for _ in range(3):
+            client._make_request("GET", "/api/tweet/1")
+
+        assert transport.served == 3
+        assert len(transport) == 1
+
+    @pytest.mark.parametrize("speed, expected", [(1.0, [0.5]), (10.0, [0.05]), (0, [])])
+    def test_timing(self, speed, expected, replay_client):
+        """Latency is replayed as recorded, scaled by speed, or skipped."""
+        sleeps = []
+        client, _ = replay_client([make_entry()], speed=speed, sleep=sleeps.append)
+        client._make_request("GET", "/api/tweet/1")
+
+        assert sleeps == pytest.approx(expected)
+
+    def test_negative_speed(self):
+        """speed must not be negative."""
+        with pytest.raises(ValueError):
+            ReplayTransport([], speed=-1)
@@ -464,6 +464,13 @@ class TestConfigValidation:
         with pytest.raises(ValueError, match="Batch size must be positive"):
             config.AppConfig(processing=invalid_processing_config)
 
+        # Zero concurrency
+        invalid_processing_config = {"batch_size": 20, "max_concurrent_requests": 0}
+        with pytest.raises(
+            ValueError, match="Max concurrent requests must be positive"
+        ):
+            config.AppConfig(processing=invalid_processing_config)
+
 
 class TestConfigDefaults:
     """Test configuration default values."""
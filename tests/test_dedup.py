@@ -0,0 +1,203 @@
+"""
+Tests for SimHash near-duplicate detection.
+
+Tests cover:
+- Fingerprint stability and sensitivity to edits
+- Ignoring links, mentions and the RT prefix
+- Banded index lookups agreeing with a brute-force scan
+- Array growth and memory accounting
+- Clustering tweets and keeping the most engaged copy, across calls
+- The dedup stage of RecommendationPipeline
+"""
+
+import numpy as np
+import pytest
+
+from config import AppConfig
+from dedup import (
+    Deduplicator,
+    SimHashIndex,
+    collapse_near_duplicates,
+    hamming_distances,
+    simhash,
+    simhash_batch,
+)
+from models import Tweet
+from pipeline import RecommendationPipeline
+
+BASE = (
+    "Just shipped version two of our open source machine learning library "
+    "with faster training and better docs, check it out"
+)
+
+
+def make_tweet(record, tweet_id, text, likes):
+    """Tweet from a fixture record with the given id, text and likes."""
+    data = dict(record, id=tweet_id, text=text)
+    data["engagement"] = dict(record["engagement"], likes=likes)
+    return Tweet.from_dict(data)
+
+
+class TestSimHash:
+    """Test fingerprinting."""
+
+    def test_fingerprints_are_stable(self):
+        """The same text always gets the same 64-bit fingerprint."""
+        assert simhash(BASE) == simhash(BASE)
+        assert 0 < simhash(BASE) < 2**64
+
+    def test_batch_matches_single(self):
+        """simhash_batch agrees with simhash, including empty texts."""
+        texts = [BASE, "", "!!!", "hello world"]
+
+        batch = simhash_batch(texts)
+
+        assert batch.dtype == np.uint64
+        assert batch.tolist() == [simhash(text) for text in texts]
+        assert batch[1] == batch[2] == 0
+
+    def test_reposts_collide(self):
+        """Case, links, mentions and RT prefixes do not change the fingerprint."""
+        variants = [
+            BASE + " https://t.co/abc",
+            "RT @someone: " + BASE.upper() + " https://t.co/xyz",
+            "@friend " + BASE,
+        ]
+
+        assert set(simhash_batch(variants).tolist()) == {simhash(BASE)}
+
+    def test_small_edits_stay_close(self):
+        """Light edits move a few bits; unrelated text is far away."""
+        edited = simhash(BASE + " 🚀 #AI")
+        unrelated = simhash("Recipe: slow roasted tomatoes with garlic and basil")
+
+        fingerprints = np.array([edited, unrelated], dtype=np.uint64)
+
+        distances = hamming_distances(fingerprints, simhash(BASE))
+
+        assert distances[0] <= 3
+        assert distances[1] > 10
+
+
+class TestSimHashIndex:
+    """Test the banded LSH index."""
+
+    def test_matches_brute_force(self):
+        """Lookups find exactly the fingerprints a full scan finds."""
+        rng = np.random.default_rng(7)
+        stored = rng.integers(0, 2**64, size=5000, dtype=np.uint64)
+        queries = stored[:200].copy()
+        queries[:100] ^= np.uint64(0b1011) << rng.integers(0, 60, 100).astype(np.uint64)
+        queries[100:] = rng.integers(0, 2**64, size=100, dtype=np.uint64)
+        index = SimHashIndex(max_distance=3, capacity=16)
+        for fingerprint in stored.tolist():
+            index.add(fingerprint)
+
+        for query in queries.tolist():
+            entry, distance = index.query(query)
+            closest = int(hamming_distances(stored, query).min())
+            if closest <= 3:
+                assert distance == closest
+                assert int(hamming_distances(stored[[entry]], query)[0]) == closest
+            else:
+                assert entry == -1
+
+        assert len(index) == 5000
+        # uint64 fingerprint, 4 int32 links and a cluster id per entry slot,
+        # plus int32 representative and float64 best per cluster slot
+        slots = len(index._fingerprints)
+        assert index.nbytes == slots * (8 + 4 * 4 + 4 + 12) + index._heads.nbytes
+
+    def test_clusters_and_representatives(self):
+        """Near fingerprints share a cluster led by the most engaged entry."""
+        index = SimHashIndex(max_distance=2)
+
+        first, cluster = index.add(0b1111, engagement=5)
+        second, same = index.add(0b1110, engagement=9)
+        repeat, again = index.add(0b1111, engagement=1)
+        _, other = index.add(2**63 | 2**40 | 2**20, engagement=1)
+
+        assert cluster == same == again != other
+        assert index.cluster_count == 2
+        assert index.representative(cluster) == second
+        assert index.best_engagement(cluster) == 9
+        assert index.cluster_of(repeat) == cluster
+        assert index.query(0b1111) == (first, 0)
+
+    @pytest.mark.parametrize(
+        "kwargs", [{"max_distance": -1}, {"bands": 2}, {"bands": 65}, {"capacity": 0}]
+    )
+    def test_invalid_configuration(self, kwargs):
+        """Bands must exceed max_distance and fit in 64 bits."""
+        with pytest.raises(ValueError):
+            SimHashIndex(**{"max_distance": 3, **kwargs})
+
+
+class TestDeduplicator:
+    """Test collapsing tweets."""
+
+    def test_keeps_most_engaged_copy(self, sample_records):
+        """Each cluster is represented by its highest-engagement tweet."""
+        record = sample_records[0]
+        tweets = [
+            make_tweet(record, "1", BASE, likes=10),
+            make_tweet(record, "2", "Unrelated note about the weather", likes=1),
+            make_tweet(record, "3", "RT @a: " + BASE + " https://t.co/x", likes=50),
+            make_tweet(record, "4", BASE + " 🚀", likes=20),
+        ]
+
+        kept = collapse_near_duplicates(tweets)
+
+        assert [tweet.id for tweet in kept] == ["3", "2"]
+
+    def test_state_carries_across_calls(self, sample_records):
+        """Later copies are dropped unless they beat the cluster's best."""
+        record = sample_records[0]
+        deduplicator = Deduplicator()
+
+        assert len(deduplicator.collapse([make_tweet(record, "1", BASE, 10)])) == 1
+        assert deduplicator.collapse([make_tweet(record, "2", BASE, 5)]) == []
+        better = deduplicator.collapse([make_tweet(record, "3", BASE, 99)])
+
+        assert [tweet.id for tweet in better] == ["3"]
+        assert (deduplicator.seen, deduplicator.collapsed) == (3, 1)
+        assert deduplicator.index.cluster_count == 1
+
+    def test_wordless_tweets_are_not_clustered(self, sample_records):
+        """Unrelated link-, emoji- and mention-only tweets all pass through."""
+        record = sample_records[0]
+        deduplicator = Deduplicator()
+        texts = ["https://a.com/x", "🔥🔥🔥", "@alice", "https://b.com/totally-different"]
+        tweets = [
+            make_tweet(record, str(i), text, likes=i) for i, text in enumerate(texts)
+        ]
+        tweets.insert(2, make_tweet(record, "b", BASE, likes=5))
+
+        kept = deduplicator.collapse(tweets)
+
+        assert [tweet.id for tweet in kept] == ["0", "1", "b", "2", "3"]
+        assert deduplicator.collapsed == 0
+        assert len(deduplicator.index) == 1
+
+
+class TestPipelineStage:
+    """Test the dedup stage of RecommendationPipeline."""
+
+    def test_duplicates_are_not_scored(self, sample_records):
+        """With near_duplicate_distance set, copies never reach featurize.
+
+        The fixtures already hold a retweet of the first tweet.
+        """
+        copies = [
+            dict(sample_records[0], id=f"copy{i}", text=sample_records[0]["text"])
+            for i in range(5)
+        ]
+        app_config = AppConfig()
+        app_config.processing["near_duplicate_distance"] = 3
+        pipeline = RecommendationPipeline.from_config(app_config, min_priority="low")
+
+        list(pipeline.run(sample_records + copies))
+        stats = pipeline.stats()
+
+        assert stats["dedup"].items_in == len(sample_records) + 5
+        assert stats["featurize"].items_in == len(sample_records) - 1
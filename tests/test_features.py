@@ -0,0 +1,151 @@
+"""
+Tests for single-pass content feature extraction.
+
+Tests cover:
+- Word count, code point length and question detection
+- Hashtags, mentions and URLs, including look-alikes that are not entities
+- Emoji counting with modifiers, joiners and flags
+- Conversion to ContentFeatures
+- Features of bridge tweet dicts
+- Batch extraction in-process and on a process pool
+"""
+
+import pytest
+
+from features import TextFeatures, extract_batch, extract_features, record_features
+from keywords import KeywordMatcher
+
+
+class TestExtractFeatures:
+    """Test extracting features from one text."""
+
+    def test_plain_text(self):
+        """Words are whitespace-separated tokens; length counts code points."""
+        features = extract_features("  Machine  learning is\nfun  ")
+
+        assert features.word_count == 4
+        assert features.length == 28
+        assert not features.has_question
+
+    def test_empty_text(self):
+        """Empty text has no features."""
+        assert extract_features("") == TextFeatures()
+
+    def test_hashtags_and_mentions(self):
+        """Real hashtags and mentions are extracted in order."""
+        features = extract_features("Thanks @alice and @Bob_2! Loving #AI and #ML2024")
+
+        assert features.hashtags == ["AI", "ML2024"]
+        assert features.mentions == ["alice", "Bob_2"]
+
+    @pytest.mark.parametrize(
+        "text",
+        [
+            "Ranked #1 again",
+            "it&#39;s fine",
+            "issue#42 closed",
+            "mail me at someone@example.com",
+        ],
+    )
+    def test_lookalikes_are_not_entities(self, text):
+        """Numbers, HTML entities, mid-word # and emails are not entities."""
+        features = extract_features(text)
+
+        assert features.hashtags == []
+        assert features.mentions == []
+
+    def test_hash_and_question_mark_inside_url_are_ignored(self):
+        """A URL's fragment and query string are part of the link."""
+        features = extract_features("Read https://example.com/page?x=1#section now")
+
+        assert features.urls == ["https://example.com/page?x=1#section"]
+        assert features.hashtags == []
+        assert not features.has_question
+        assert features.word_count == 3
+
+    def test_trailing_punctuation_is_outside_url(self):
+        """Closing punctuation after a link is not part of it."""
+        features = extract_features("(see www.example.org/docs). Really?")
+
+        assert features.urls == ["www.example.org/docs"]
+        assert features.has_question
+
+    def test_full_width_question_mark(self):
+        """Full-width question marks count as questions."""
+        assert extract_features("本当？").has_question
+
+    def test_emoji_sequences_count_once(self):
+        """Skin tones, variation selectors, ZWJ families and flags are one emoji each."""
+        text = "Great 👍🏽 family 👨‍👩‍👧 flag 🇺🇸 heart ❤️ 🔥🔥"
+
+        assert extract_features(text).emoji_count == 6
+
+
+class TestContentFeatures:
+    """Test conversion to ContentFeatures."""
+
+    def test_to_content_features(self):
+        """Text features map onto ContentFeatures flags."""
+        features = extract_features("Is #AI here? ask @bob https://x.co 🎉")
+
+        content = features.to_content_features(has_media=True, sentiment="positive")
+
+        assert content.has_question and content.has_hashtags and content.has_mentions
+        assert content.has_links and content.has_media
+        assert content.word_count == 7
+        assert content.emoji_count == 1
+        assert content.sentiment == "positive"
+
+
+class TestRecordFeatures:
+    """Test features derived from bridge tweet dicts."""
+
+    def test_bridge_fields_and_fallbacks(self):
+        """Bridge urls and media count; entities come from the text if absent."""
+        record = {
+            "text": "Is #AI here? ask @bob",
+            "urls": [{"url": "https://t.co/x"}],
+            "media": [{"type": "photo"}],
+        }
+
+        features, hashtags, mentions = record_features(record, lambda text: "positive")
+
+        assert features.has_links and features.has_media and features.has_question
+        assert features.sentiment == "positive"
+        assert features.topics == []
+        assert (hashtags, mentions) == (["AI"], ["bob"])
+
+    def test_bridge_entities_and_topics(self):
+        """Bridge hashtags and mentions win; the matcher supplies topics."""
+        matcher = KeywordMatcher({"ai": "ai"})
+        record = {"text": "ask @bob about #AI", "hashtags": [], "mentions": ["eve"]}
+
+        features, hashtags, mentions = record_features(
+            record, lambda text: "neutral", matcher
+        )
+
+        assert features.topics == ["ai"]
+        assert (hashtags, mentions) == ([], ["eve"])
+
+
+class TestExtractBatch:
+    """Test the batch API."""
+
+    TEXTS = ["#one?", "@two", "plain words here", "https://x.co/#frag", "🚀🚀"] * 20
+
+    def test_batch_matches_single(self):
+        """In-process batch extraction preserves order."""
+        assert extract_batch(self.TEXTS) == [extract_features(t) for t in self.TEXTS]
+
+    def test_process_pool(self):
+        """A process pool returns the same results in the same order."""
+        assert extract_batch(self.TEXTS, workers=2, chunksize=16) == extract_batch(
+            self.TEXTS
+        )
+
+    def test_invalid_arguments(self):
+        """workers and chunksize must be positive."""
+        with pytest.raises(ValueError):
+            extract_batch(self.TEXTS, workers=0)
+        with pytest.raises(ValueError):
+            extract_batch(self.TEXTS, chunksize=0)
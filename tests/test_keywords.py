@@ -0,0 +1,143 @@
+"""
+Tests for the compiled keyword and topic matcher.
+
+Tests cover:
+- Case folding, word boundaries and whitespace tolerance
+- Overlapping and prefix phrases
+- Topic labels with several phrases
+- Tagging tweets and per-keyword hit sets
+- Building from strategy/persona config and caching compiled matchers
+- TwitterClient topic population
+"""
+
+import pytest
+
+from config import AppConfig, PersonaConfig
+from keywords import KeywordMatcher
+from twitter_client import TwitterClient
+
+
+@pytest.fixture
+def matcher():
+    """Matcher over a few strategy-style keywords."""
+    keywords = ["machine learning", "learning", "LLM", "Claude", "Claude Code"]
+    return KeywordMatcher({keyword: keyword for keyword in keywords})
+
+
+class TestKeywordMatcher:
+    """Test scanning text."""
+
+    def test_case_folding(self, matcher):
+        """Phrases match regardless of case."""
+        assert matcher.topics("MACHINE Learning is here") == [
+            "machine learning",
+            "learning",
+        ]
+
+    @pytest.mark.parametrize("text", ["LLMs everywhere", "an SLLM", "llm_ops"])
+    def test_word_boundaries(self, matcher, text):
+        """Phrases do not match inside longer words."""
+        assert "LLM" not in matcher.topics(text)
+
+    def test_punctuation_is_a_boundary(self, matcher):
+        """Punctuation and line ends delimit words."""
+        assert matcher.topics("(LLM), #LLM and LLM!") == ["LLM"]
+        assert matcher.find("(LLM), #LLM and LLM!") == ["llm", "llm", "llm"]
+
+    def test_whitespace_runs_match_a_space(self, matcher):
+        """Any whitespace run matches the space inside a phrase."""
+        assert "machine learning" in matcher.topics("machine\n  learning")
+
+    def test_prefix_phrases(self, matcher):
+        """A phrase that prefixes a longer one is reported with it."""
+        assert matcher.topics("Trying claude code") == ["Claude", "Claude Code"]
+        assert matcher.topics("claude codex") == ["Claude"]
+
+    def test_topics_group_phrases(self):
+        """A label can list several phrases; each label is reported once."""
+        matcher = KeywordMatcher({"ML": ["machine learning", "ML"], "C++": "c++"})
+
+        assert matcher.topics("ML and machine learning in C++") == ["ML", "C++"]
+        assert matcher.find("c++x") == []
+
+    def test_empty_matcher(self):
+        """A matcher without phrases finds nothing."""
+        assert KeywordMatcher({}).topics("anything") == []
+
+    def test_empty_phrase_is_rejected(self):
+        """Blank phrases are configuration errors."""
+        with pytest.raises(ValueError, match="Empty keyword"):
+            KeywordMatcher({"blank": "  "})
+
+
+class TestTagging:
+    """Test tagging tweets."""
+
+    def test_tag_sets_topics_and_returns_hits(self, matcher, sample_tweets):
+        """tag() fills features.topics and returns tweet ids per label."""
+        hits = matcher.tag(sample_tweets)
+
+        assert set(hits) == set(matcher.labels)
+        for tweet in sample_tweets:
+            assert tweet.features.topics == matcher.topics(tweet.text)
+        assert hits["machine learning"] == {
+            t.id for t in sample_tweets if "machine learning" in t.text.lower()
+        }
+        assert hits["LLM"] == set()
+
+
+class TestFromConfig:
+    """Test building matchers from configuration."""
+
+    def test_keywords_and_pillars(self):
+        """keywords_to_monitor and content_pillars each become a label."""
+        strategy = {"keywords_to_monitor": ["PyTorch", "LLM"]}
+        persona = {"content_pillars": ["Ethical implications of AI"]}
+
+        matcher = KeywordMatcher.from_config(strategy, persona)
+
+        assert matcher.labels == ("PyTorch", "LLM", "Ethical implications of AI")
+        assert matcher.topics("On the ethical implications of AI, using pytorch") == [
+            "Ethical implications of AI",
+            "PyTorch",
+        ]
+
+    def test_unchanged_config_reuses_matcher(self):
+        """Matchers are only rebuilt when the phrases change."""
+        persona = PersonaConfig(
+            name="Bot",
+            target_audience="devs",
+            tone_of_voice="calm",
+            content_pillars=["AI research"],
+        )
+        strategy = {"keywords_to_monitor": ["LLM"]}
+
+        first = KeywordMatcher.from_config(strategy, persona)
+
+        assert KeywordMatcher.from_config(dict(strategy), persona) is first
+        strategy["keywords_to_monitor"].append("AGI")
+        assert KeywordMatcher.from_config(strategy, persona) is not first
+
+
+class TestClientTopics:
+    """Test topic population in TwitterClient."""
+
+    def test_pillars_populate_topics(self):
+        """Persona content pillars tag normalized tweets."""
+        app_config = AppConfig()
+        app_config.persona.content_pillars = ["prompt engineering"]
+        client = TwitterClient(app_config)
+
+        tweet = client._normalize_tweet(
+            {"id": "1", "text": "Prompt engineering tips", "user": {"id": "2"}}
+        )
+
+        assert tweet.features.topics == ["prompt engineering"]
+        client.close()
+
+    def test_no_pillars_no_matcher(self):
+        """Without pillars the client does no topic matching."""
+        client = TwitterClient(AppConfig())
+
+        assert client.keyword_matcher is None
+        client.close()
@@ -530,3 +530,38 @@ class TestEdgeCases:
         # Should handle long bio without issues
         assert len(profile.bio) == 1000
         assert profile.bio == long_bio
+
+
+class TestCompactLayout:
+    """Test the slotted memory layout of the models."""
+
+    @pytest.mark.parametrize(
+        "instance",
+        [
+            models.EngagementMetrics(),
+            models.ContentFeatures(),
+            models.Profile(id="1", username="u", display_name="U"),
+            models.Tweet(
+                id="1",
+                text="t",
+                user=models.Profile(id="1", username="u", display_name="U"),
+                created_at=datetime(2024, 1, 15, 10, 30),
+            ),
+            models.Recommendation(
+                action_type="like", target_id="1", target_type="tweet"
+            ),
+        ],
+    )
+    def test_models_have_no_instance_dict(self, instance):
+        """Models are slotted and reject undeclared attributes."""
+        assert not hasattr(instance, "__dict__")
+        with pytest.raises(AttributeError):
+            instance.undeclared = True
+
+    def test_slotted_models_round_trip(self, sample_records):
+        """from_dict/to_dict and validation are unchanged by slots."""
+        tweet = models.Tweet.from_dict(sample_records[0])
+
+        assert models.Tweet.from_dict(tweet.to_dict()) == tweet
+        with pytest.raises(ValueError, match="cannot be negative"):
+            models.EngagementMetrics(likes=-1)
@@ -0,0 +1,239 @@
+"""
+Tests for the compiled opportunity scorer.
+
+Tests cover:
+- Loading strategy.yaml and normalizing metric weights
+- Each modifier of the opportunity_scoring formula
+- Validation of constants at load time
+- Vectorized score_frame matching the scalar score
+- Priority thresholds
+"""
+
+import copy
+import math
+import time
+from datetime import datetime, timedelta, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import models
+from opportunity import OpportunityScorer, load_opportunity_scorer, load_strategy
+from tweet_frame import TweetFrame
+
+STRATEGY_PATH = Path(__file__).parent.parent / "strategy.yaml"
+NOW = datetime(2024, 3, 15, 12, 0, tzinfo=timezone.utc)
+
+
+@pytest.fixture
+def strategy():
+    """The repository's strategy.yaml as a dict."""
+    return load_strategy(STRATEGY_PATH)
+
+
+@pytest.fixture
+def bare_scoring():
+    """Scoring section with only likes weighted and no modifiers."""
+    return {"metric_weights": {"likes": 1.0}}
+
+
+def make_tweet(
+    likes=100,
+    replies=0,
+    retweets=0,
+    views=0,
+    age_hours=0.0,
+    username="someone",
+    followers=0,
+    following=0,
+    length=0,
+    **features,
+):
+    """Build a tweet with the fields the opportunity formula reads."""
+    return models.Tweet(
+        id="1",
+        text="t",
+        user=models.Profile(
+            id="2",
+            username=username,
+            display_name="Someone",
+            followers=followers,
+            following=following,
+        ),
+        created_at=NOW - timedelta(hours=age_hours),
+        engagement=models.EngagementMetrics(
+            likes=likes, replies=replies, retweets=retweets, views=views
+        ),
+        features=models.ContentFeatures(length=length, **features),
+    )
+
+
+class TestOpportunityScorerLoading:
+    """Test loading and validating the opportunity_scoring section."""
+
+    def test_loads_repository_strategy(self):
+        """strategy.yaml compiles with normalized weights and its influencers."""
+        scorer = load_opportunity_scorer(STRATEGY_PATH)
+
+        assert math.isclose(sum(scorer.metric_weights.values()), 1.0)
+        assert math.isclose(scorer.metric_weights["replies"], 0.5 / 1.1)
+        assert scorer.decay_rate == 0.1
+        assert "karpathy" in scorer.influencers
+        assert list(scorer.priority_thresholds) == ["strategic", "growth"]
+
+    def test_missing_section_raises(self):
+        """A strategy without opportunity_scoring is rejected."""
+        with pytest.raises(ValueError, match="opportunity_scoring"):
+            OpportunityScorer.from_strategy({"recommendation_count": 10})
+
+    @pytest.mark.parametrize(
+        "mutate, message",
+        [
+            (lambda s: s["metric_weights"].update(bookmarks=1), "Unknown"),
+            (lambda s: s["metric_weights"].update(likes=-1), "must be >= 0"),
+            (lambda s: s.update(metric_weights={"likes": 0}), "must not all be zero"),
+            (lambda s: s["time_decay"].update(decay_rate="fast"), "must be a number"),
+            (
+                lambda s: s["author_modifiers"].update(is_influencer_multiplier=0),
+                "must be positive",
+            ),
+            (
+                lambda s: s["content_modifiers"]["ideal_length_range"].update(max=10),
+                "max must be >= min",
+            ),
+            (
+                lambda s: s["content_modifiers"].update(
+                    contains_link_penalty=float("nan")
+                ),
+                "must be finite",
+            ),
+        ],
+    )
+    def test_invalid_constants_raise(self, strategy, mutate, message):
+        """Invalid constants fail once, when the scorer is built."""
+        scoring = copy.deepcopy(strategy["opportunity_scoring"])
+        mutate(scoring)
+
+        with pytest.raises(ValueError, match=message):
+            OpportunityScorer(scoring)
+
+    def test_missing_file_raises(self, tmp_path):
+        """A missing strategy file raises FileNotFoundError."""
+        with pytest.raises(FileNotFoundError):
+            load_opportunity_scorer(tmp_path / "missing.yaml")
+
+
+class TestOpportunityScorerFormula:
+    """Test each term of the opportunity formula."""
+
+    def test_base_is_normalized_weighted_sum(self):
+        """Weights are normalized before weighting the metrics."""
+        scorer = OpportunityScorer({"metric_weights": {"likes": 1, "replies": 3}})
+        tweet = make_tweet(likes=100, replies=20)
+
+        assert scorer.score(tweet, now=NOW.timestamp()) == pytest.approx(40.0)
+
+    def test_time_decay(self, bare_scoring):
+        """The score decays by exp(-decay_rate * age_hours)."""
+        bare_scoring["time_decay"] = {"decay_rate": 0.1}
+        scorer = OpportunityScorer(bare_scoring)
+
+        score = scorer.score(make_tweet(age_hours=24), now=NOW.timestamp())
+
+        assert score == pytest.approx(100 * math.exp(-2.4))
+
+    def test_influencer_match_is_case_insensitive(self, bare_scoring):
+        """Influencer usernames match regardless of case."""
+        bare_scoring["author_modifiers"] = {"is_influencer_multiplier": 1.5}
+        scorer = OpportunityScorer(bare_scoring, influencers=["JeffDean"])
+
+        assert scorer.score(make_tweet(username="jeffdean"), NOW.timestamp()) == 150
+        assert scorer.score(make_tweet(username="other"), NOW.timestamp()) == 100
+
+    def test_author_bonuses(self, bare_scoring):
+        """Follower and ratio bonuses apply above their minimums; ratio is capped."""
+        bare_scoring["author_modifiers"] = {
+            "followers_bonus": {"factor": 0.1, "min_followers_for_bonus": 1000},
+            "follower_ratio_bonus": {"factor": 0.05, "min_ratio_for_bonus": 2.0},
+        }
+        scorer = OpportunityScorer(bare_scoring)
+        now = NOW.timestamp()
+
+        assert scorer.score(make_tweet(followers=999, following=999), now) == 100
+        assert scorer.score(
+            make_tweet(followers=100_000, following=100_000), now
+        ) == pytest.approx(100 * 1.2)
+        assert scorer.score(
+            make_tweet(followers=100_000, following=1), now
+        ) == pytest.approx(100 * 1.2 * 1.25)
+
+    def test_content_modifiers(self, bare_scoring):
+        """Question, media, link and ideal-length modifiers multiply together."""
+        bare_scoring["content_modifiers"] = {
+            "contains_question_multiplier": 1.3,
+            "contains_media_multiplier": 1.1,
+            "contains_link_penalty": 0.8,
+            "ideal_length_range": {"min": 50, "max": 200, "bonus": 1.1},
+        }
+        scorer = OpportunityScorer(bare_scoring)
+        tweet = make_tweet(
+            length=120, has_question=True, has_media=True, has_links=True
+        )
+
+        score = scorer.score(tweet, now=NOW.timestamp())
+
+        assert score == pytest.approx(100 * 1.3 * 1.1 * 0.8 * 1.1)
+        assert scorer.score(make_tweet(length=201), NOW.timestamp()) == 100
+
+    def test_priority(self, strategy):
+        """Scores map to the highest threshold they reach."""
+        scorer = OpportunityScorer.from_strategy(strategy)
+
+        assert scorer.priority(0.9) == "strategic"
+        assert scorer.priority(0.6) == "growth"
+        assert scorer.priority(0.1) is None
+
+
+class TestOpportunityScorerVectorized:
+    """Test score_frame against the scalar scorer."""
+
+    def test_score_frame_matches_scalar(self, strategy):
+        """Every modifier combination scores the same in both paths."""
+        scorer = OpportunityScorer.from_strategy(strategy)
+        tweets = [
+            make_tweet(likes=5, replies=2, retweets=1, views=100, age_hours=1),
+            make_tweet(username="Karpathy", followers=900_000, following=1000),
+            make_tweet(followers=5000, following=0, has_question=True, length=80),
+            make_tweet(views=5000, age_hours=30, has_links=True, has_media=True),
+            make_tweet(likes=0, followers=0, following=0, length=250),
+            make_tweet(age_hours=-1),
+        ]
+        now = NOW.timestamp()
+
+        scores = scorer.score_frame(TweetFrame.from_tweets(tweets), now=now)
+
+        np.testing.assert_allclose(scores, [scorer.score(t, now) for t in tweets])
+
+    def test_score_frame_from_dicts(self, strategy):
+        """Frames built from raw dicts carry usernames for influencer matching."""
+        scorer = OpportunityScorer.from_strategy(strategy)
+        records = [
+            {
+                "id": "1",
+                "createdAt": "2024-03-15T11:00:00.000Z",
+                "user": {"username": "ylecun", "followers": 10, "following": 10},
+                "engagement": {"likes": 10},
+            }
+        ]
+        frame = TweetFrame.from_dicts(records)
+
+        scores = scorer.score_frame(frame, now=NOW.timestamp())
+
+        assert scores[0] == pytest.approx(scorer.score(frame[0], NOW.timestamp()))
+
+    def test_empty_frame(self, strategy):
+        """An empty frame scores to an empty array."""
+        scorer = OpportunityScorer.from_strategy(strategy)
+
+        assert scorer.score_frame(TweetFrame.from_tweets([]), time.time()).shape == (0,)
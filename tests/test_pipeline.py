@@ -0,0 +1,283 @@
+"""
+Tests for the streaming recommendation pipeline.
+
+Tests cover:
+- Batching, stage chaining and multi-worker stages
+- Process-pool stages
+- Backpressure from bounded queues and early shutdown
+- Error propagation
+- Per-stage stats
+- RecommendationPipeline parity with the scalar scoring path
+- Raw bridge tweets scored like tweets fetched through the client
+"""
+
+import threading
+import time
+
+import pytest
+
+import config
+import models
+import scoring
+from config import AppConfig
+from keywords import KeywordMatcher
+from pipeline import Pipeline, RecommendationPipeline, Stage
+from stub_bridge import StubBridge, make_bridge_tweet
+
+
+def double(batch):
+    """Module-level (picklable) stage function."""
+    return [item * 2 for item in batch]
+
+
+def evens(batch):
+    """Drop odd items."""
+    return [item for item in batch if item % 2 == 0]
+
+
+class TestPipeline:
+    """Test the generic staged pipeline."""
+
+    def test_stages_run_in_order_on_batches(self):
+        """Items flow through each stage, batched by batch_size."""
+        sizes = []
+
+        def record(batch):
+            sizes.append(len(batch))
+            return batch
+
+        pipeline = Pipeline(
+            [Stage("record", record), Stage("double", double), Stage("evens", evens)],
+            batch_size=4,
+        )
+
+        assert list(pipeline.run(range(10))) == [0, 2, 4, 6, 8, 10, 12, 14, 16, 18]
+        assert sizes == [4, 4, 2]
+
+    def test_filtering_stage(self):
+        """A stage may emit fewer items than it receives."""
+        pipeline = Pipeline([Stage("evens", evens)], batch_size=3)
+
+        assert list(pipeline.run(range(9))) == [0, 2, 4, 6, 8]
+        stats = pipeline.stats()["evens"]
+        assert (stats.items_in, stats.items_out, stats.batches) == (9, 5, 3)
+
+    def test_multi_worker_thread_stage(self):
+        """Thread stages with several workers process batches concurrently."""
+        active = []
+        peak = [0]
+        lock = threading.Lock()
+
+        def slow(batch):
+            with lock:
+                active.append(1)
+                peak[0] = max(peak[0], len(active))
+            time.sleep(0.02)
+            with lock:
+                active.pop()
+            return batch
+
+        pipeline = Pipeline(
+            [Stage("slow", slow, workers=4)], batch_size=1, queue_size=8
+        )
+
+        assert sorted(pipeline.run(range(16))) == list(range(16))
+        assert peak[0] > 1
+
+    def test_process_stage(self):
+        """Process stages run picklable batch functions in a process pool."""
+        pipeline = Pipeline(
+            [Stage("double", double, workers=2, executor="process")], batch_size=5
+        )
+
+        assert sorted(pipeline.run(range(20))) == [i * 2 for i in range(20)]
+        assert pipeline.stats()["double"].items_out == 20
+
+    def test_bounded_queues_apply_backpressure(self):
+        """A slow consumer stops the source from running far ahead."""
+        pulled = [0]
+
+        def source():
+            for i in range(1000):
+                pulled[0] += 1
+                yield i
+
+        pipeline = Pipeline(
+            [Stage("a", double), Stage("b", double)], batch_size=1, queue_size=2
+        )
+        stream = pipeline.run(source())
+        next(stream)
+        time.sleep(0.1)
+
+        # Each of the three queues holds at most queue_size batches, plus one
+        # batch in hand per worker.
+        assert pulled[0] <= 3 * 2 + 4
+        stream.close()
+
+    def test_closing_stops_the_source(self):
+        """Closing the output generator closes a generator source."""
+        closed = threading.Event()
+
+        def source():
+            try:
+                for i in range(1_000_000):
+                    yield i
+            finally:
+                closed.set()
+
+        stream = Pipeline([Stage("double", double)], batch_size=10).run(source())
+        assert next(stream) == 0
+        stream.close()
+
+        assert closed.wait(1.0)
+
+    def test_stage_errors_propagate(self):
+        """The first stage exception is re-raised by run()."""
+
+        def boom(batch):
+            raise RuntimeError("stage failed")
+
+        pipeline = Pipeline([Stage("double", double), Stage("boom", boom)])
+
+        with pytest.raises(RuntimeError, match="stage failed"):
+            list(pipeline.run(range(100)))
+
+    def test_stats_identify_the_bottleneck(self):
+        """The slow stage is fully utilized and its input queue fills up."""
+
+        def slow(batch):
+            time.sleep(0.01)
+            return batch
+
+        pipeline = Pipeline([Stage("fast", double), Stage("slow", slow)], batch_size=1)
+        list(pipeline.run(range(30)))
+        stats = pipeline.stats()
+
+        assert list(stats) == ["source", "fast", "slow"]
+        assert stats["slow"].max_queue_depth == pipeline.queue_size
+        assert stats["slow"].utilization > 0.8
+        assert stats["fast"].utilization < 0.2
+        assert stats["slow"].busy_seconds >= 0.3
+        assert stats["slow"].throughput > 0
+        assert stats["source"].items_out == 30
+
+    def test_invalid_configuration(self):
+        """Stages and pipeline settings are validated."""
+        with pytest.raises(ValueError, match="workers must be positive"):
+            Stage("a", double, workers=0)
+        with pytest.raises(ValueError, match="executor"):
+            Stage("a", double, executor="fiber")
+        with pytest.raises(ValueError, match="unique"):
+            Pipeline([Stage("a", double), Stage("a", double)])
+        with pytest.raises(ValueError, match="Batch size"):
+            Pipeline([Stage("a", double)], batch_size=0)
+
+
+class TestRecommendationPipeline:
+    """Test the fetch -> normalize -> featurize -> score -> rank pipeline."""
+
+    def test_matches_scalar_scoring(self, sample_records):
+        """Streamed recommendations match calculate_score per tweet."""
+        scoring_config = config.ScoringConfig()
+        pipeline = RecommendationPipeline(
+            scoring_config, min_priority="low", batch_size=2
+        )
+
+        recommendations = list(pipeline.run(sample_records))
+
+        expected = {}
+        for record in sample_records:
+            tweet = models.Tweet.from_dict(record)
+            score = scoring_config.calculate_score(scoring.tweet_metrics(tweet))
+            if scoring_config.get_priority_level(score) != "none":
+                expected[tweet.id] = score
+        scores = {r.target_id: r.confidence_score for r in recommendations}
+        assert scores == pytest.approx(expected, abs=1e-3)
+        stages = ["source", *RecommendationPipeline.STAGES]
+        assert list(pipeline.stats()) == stages
+
+    def test_top_recommendations(self, sample_records):
+        """Every scored tweet is offered to the recommendation_count selector."""
+        pipeline = RecommendationPipeline(
+            config.ScoringConfig(), recommendation_count=2, min_priority="high"
+        )
+
+        list(pipeline.run(sample_records))
+        top = pipeline.top_recommendations()
+
+        assert len(top) == 2
+        assert top[0].confidence_score >= top[1].confidence_score
+
+    def test_fetch_stage_resolves_ids(self, stub_client):
+        """With a client, the fetch stage resolves tweet ids via the bridge."""
+        tweets = [make_bridge_tweet(str(1000 + i), text="Question?") for i in range(6)]
+        with StubBridge(tweets) as bridge:
+            client = stub_client(bridge, processing={"batch_size": 2})
+            pipeline = RecommendationPipeline.from_config(
+                client.config, client=client, min_priority="low"
+            )
+
+            try:
+                list(pipeline.run([str(1000 + i) for i in range(6)] + ["404"]))
+            finally:
+                client.close()
+
+            stats = pipeline.stats()
+            assert stats["fetch"].workers == 3
+            assert (stats["fetch"].items_in, stats["fetch"].items_out) == (7, 6)
+            assert len(bridge.requests_to("/api/tweets")) == 4
+
+    def test_raw_bridge_tweets_match_client_path(self, stub_client):
+        """Bridge dicts without features are scored like tweets the client fetched."""
+        tweets = [
+            make_bridge_tweet("2001", text="Anyone tried the new release?"),
+            make_bridge_tweet("2002", text="Loving this amazing machine learning demo"),
+            make_bridge_tweet("2003", text="Server maintenance tonight"),
+            make_bridge_tweet("2004", text="Look", media=[{"type": "photo"}]),
+        ]
+        with StubBridge(tweets) as bridge:
+            client = stub_client(bridge)
+            client.config.persona.content_pillars = ["machine learning"]
+            client.keyword_matcher = KeywordMatcher.from_config(
+                persona=client.config.persona
+            )
+            via_client = RecommendationPipeline.from_config(
+                client.config, client=client, min_priority="low"
+            )
+            try:
+                fetched = {
+                    r.target_id: r.confidence_score
+                    for r in via_client.run([tweet["id"] for tweet in tweets])
+                }
+            finally:
+                client.close()
+
+        raw = RecommendationPipeline.from_config(client.config, min_priority="low")
+        scores = {r.target_id: r.confidence_score for r in raw.run(tweets)}
+
+        assert scores == pytest.approx(fetched)
+        # Questions rank above engaging tweets, which rank above plain ones
+        assert scores["2003"] < scores["2002"] < scores["2001"]
+
+    def test_process_stages_from_config(self, sample_records):
+        """processing['pipeline'] configures per-stage executors."""
+        app_config = AppConfig()
+        app_config.processing["pipeline"] = {
+            "queue_size": 2,
+            "stages": {"score": {"executor": "process", "workers": 2}},
+        }
+        pipeline = RecommendationPipeline.from_config(app_config, min_priority="low")
+
+        threaded = RecommendationPipeline(config.ScoringConfig(), min_priority="low")
+
+        assert sorted(r.target_id for r in pipeline.run(sample_records)) == sorted(
+            r.target_id for r in threaded.run(sample_records)
+        )
+        assert pipeline.stats()["score"].executor == "process"
+
+    def test_rank_stage_must_be_single_threaded(self):
+        """The rank stage owns the selector and cannot be parallelized."""
+        with pytest.raises(ValueError, match="rank"):
+            RecommendationPipeline(
+                config.ScoringConfig(), stage_options={"rank": {"workers": 2}}
+            )
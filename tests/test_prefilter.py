@@ -0,0 +1,193 @@
+"""
+Tests for the forbidden-topic prefilter.
+
+Tests cover:
+- Term expansion and text matching on raw dicts and Tweets
+- Hashtag matching, exact and on word boundaries inside compound tags
+- Batch filtering and rejection counters
+- Building from persona config
+- The prefilter stage of RecommendationPipeline
+"""
+
+from pathlib import Path
+from unittest.mock import patch
+
+import pytest
+import yaml
+
+import config
+from config import AppConfig
+from models import Tweet
+from pipeline import RecommendationPipeline
+from prefilter import TopicPrefilter
+
+
+@pytest.fixture
+def prefilter():
+    """Prefilter for the forbidden topics in persona.yaml."""
+    return TopicPrefilter(["Politics", "Cryptocurrency", "General tech news"])
+
+
+class TestCheck:
+    """Test checking single tweets."""
+
+    @pytest.mark.parametrize(
+        "text, topic",
+        [
+            ("Thoughts on politics today", "Politics"),
+            ("Senate votes on the new bill", "Politics"),
+            ("Bitcoin breaks another record", "Cryptocurrency"),
+            ("ETH is up", "Cryptocurrency"),
+            ("The new iPhone is here", "General tech news"),
+            ("Attention is all you need, revisited", None),
+        ],
+    )
+    def test_expanded_terms_in_text(self, prefilter, text, topic):
+        """Topic names and their expansion terms are found case-insensitively."""
+        assert prefilter.check({"text": text}) == topic
+
+    def test_word_boundaries(self, prefilter):
+        """Terms inside longer words do not match."""
+        assert prefilter.check({"text": "Method and ethics of benchmarking"}) is None
+
+    @pytest.mark.parametrize(
+        "hashtags, topic",
+        [
+            (["TechNews"], "General tech news"),
+            (["technews"], "General tech news"),
+            (["tech_news"], "General tech news"),
+            (["#BitcoinPrice"], "Cryptocurrency"),
+            (["ETHPrice"], "Cryptocurrency"),
+            (["Web3Jobs"], "Cryptocurrency"),
+            (["eth"], "Cryptocurrency"),
+            (["ElectionNight"], "Politics"),
+            (["Ethics"], None),
+            (["FeatureSelection"], None),
+            (["ModelSelection"], None),
+            (["Cryptography"], None),
+        ],
+    )
+    def test_hashtags(self, prefilter, hashtags, topic):
+        """Terms match a whole tag or whole words of it, never part of a word."""
+        assert prefilter.check({"text": "see tags", "hashtags": hashtags}) == topic
+
+    def test_hashtags_read_from_text(self, prefilter):
+        """Without a hashtags list, tags in the text are checked."""
+        assert prefilter.check({"text": "Big day #USPolitics"}) == "Politics"
+
+    def test_tweets(self, prefilter, sample_records):
+        """Tweets are checked like raw dicts."""
+        tweet = Tweet.from_dict(sample_records[0])
+
+        assert prefilter.check(tweet) is None
+        tweet.text += " #crypto"
+        tweet.hashtags = []
+        assert prefilter.check(tweet) == "Cryptocurrency"
+
+    def test_custom_expansions(self):
+        """Callers can supply their own term lists."""
+        prefilter = TopicPrefilter(["Sports"], expansions={"sports": ["world cup"]})
+
+        assert prefilter.check({"text": "World Cup final tonight"}) == "Sports"
+        assert prefilter.check({"text": "Bitcoin"}) is None
+
+
+class TestFilterBatch:
+    """Test batch filtering and counters."""
+
+    def test_counts_rejections(self, prefilter):
+        """Rejected tweets are counted per topic; ids pass through uncounted."""
+        batch = [
+            {"text": "election night"},
+            {"text": "new PyTorch release"},
+            {"text": "NFT drop"},
+            {"text": "airdrop soon"},
+            "1234567890",
+        ]
+
+        kept = prefilter.filter_batch(batch)
+        summary = prefilter.summary(downstream_seconds_per_item=0.5)
+
+        assert kept == [{"text": "new PyTorch release"}, "1234567890"]
+        assert summary["seen"] == 4
+        assert summary["rejected"] == 3
+        assert summary["passed"] == 1
+        assert summary["rejection_rate"] == 0.75
+        assert summary["by_topic"] == {"Politics": 1, "Cryptocurrency": 2}
+        assert summary["estimated_seconds_saved"] == 1.5
+
+        prefilter.reset()
+        assert prefilter.summary()["seen"] == 0
+
+    def test_filter_is_lazy(self, prefilter):
+        """filter() yields allowed items one at a time."""
+        stream = prefilter.filter(iter([{"text": "GOP"}, {"text": "LLM"}]))
+
+        assert next(stream) == {"text": "LLM"}
+        assert prefilter.rejected == 1
+
+    def test_without_topics_everything_passes(self):
+        """A persona without forbidden topics filters nothing."""
+        prefilter = TopicPrefilter.from_config(AppConfig().persona)
+        batch = [{"text": "politics"}]
+
+        assert prefilter.filter_batch(batch) is batch
+
+
+class TestFromConfig:
+    """Test building from persona config."""
+
+    def test_persona_yaml(self):
+        """persona.yaml's forbidden topics are enforced."""
+        persona_path = Path(__file__).parent.parent / "persona.yaml"
+        with open(persona_path, "r", encoding="utf-8") as f:
+            prefilter = TopicPrefilter.from_config(yaml.safe_load(f))
+
+        assert prefilter.forbidden_topics == (
+            "Politics",
+            "Cryptocurrency",
+            "General tech news",
+        )
+
+
+class TestPipelineStage:
+    """Test the prefilter stage of RecommendationPipeline."""
+
+    def test_rejects_before_normalization(self, sample_records):
+        """Forbidden tweets never reach the later stages."""
+        records = [dict(record) for record in sample_records]
+        records[0]["text"] = "Bitcoin to the moon"
+        app_config = AppConfig()
+        app_config.persona.forbidden_topics = ["Cryptocurrency"]
+        pipeline = RecommendationPipeline.from_config(app_config, min_priority="low")
+
+        list(pipeline.run(records))
+        stats = pipeline.stats()
+        summary = pipeline.prefilter_summary()
+
+        assert stats["prefilter"].items_in == len(records)
+        assert stats["normalize"].items_in == len(records) - 1
+        assert summary["rejected"] == 1
+        assert summary["estimated_seconds_saved"] > 0
+
+    def test_rejected_records_are_never_parsed(self, sample_records):
+        """Without a client, only records that pass are built into Tweets."""
+        records = [dict(sample_records[0], id=str(i)) for i in range(6)]
+        for record in records[1:]:
+            record["text"] = "Bitcoin to the moon"
+        app_config = AppConfig()
+        app_config.persona.forbidden_topics = ["Cryptocurrency"]
+        pipeline = RecommendationPipeline.from_config(app_config, min_priority="low")
+
+        with patch.object(Tweet, "from_dict", side_effect=Tweet.from_dict) as parse:
+            list(pipeline.run(records))
+
+        assert parse.call_count == 1
+
+    def test_prefilter_runs_on_threads(self):
+        """The prefilter keeps counters in-process, so it cannot use processes."""
+        with pytest.raises(ValueError, match="prefilter"):
+            RecommendationPipeline(
+                config.ScoringConfig(),
+                stage_options={"prefilter": {"executor": "process"}},
+            )
@@ -0,0 +1,151 @@
+"""
+Tests for client-side token-bucket rate limiting.
+
+Tests cover:
+- Token bucket refill, burst capacity and non-blocking acquisition
+- Blocking and asyncio acquisition with timeouts
+- Per-endpoint buckets configured from api['rate_limit']
+- Integration with TwitterClient._make_request
+"""
+
+import asyncio
+from unittest.mock import Mock, patch
+
+import pytest
+
+from config import AppConfig
+from rate_limiter import RateLimiter, TokenBucket
+from twitter_client import TwitterClient
+
+
+class TestTokenBucket:
+    """Test TokenBucket behavior."""
+
+    def test_starts_full_and_allows_burst(self, clock):
+        """A new bucket allows up to capacity requests immediately."""
+        bucket = TokenBucket(rate_per_second=1, capacity=3, clock=clock)
+
+        assert [bucket.try_acquire() for _ in range(4)] == [True, True, True, False]
+
+    def test_refills_at_configured_rate(self, clock):
+        """Tokens accrue at rate_per_second up to capacity."""
+        bucket = TokenBucket(rate_per_second=2, capacity=2, clock=clock)
+        bucket.try_acquire()
+        bucket.try_acquire()
+
+        clock.advance(0.5)
+        assert bucket.try_acquire()
+        assert not bucket.try_acquire()
+
+        clock.advance(10)
+        assert bucket.available == 2
+
+    def test_acquire_sleeps_until_token_available(self, clock):
+        """Blocking acquire sleeps for exactly the refill deficit."""
+        bucket = TokenBucket(rate_per_second=4, capacity=1, clock=clock)
+        bucket.try_acquire()
+
+        with patch("rate_limiter.time.sleep", side_effect=clock.advance) as sleep:
+            assert bucket.acquire()
+
+        sleep.assert_called_once_with(0.25)
+
+    def test_acquire_times_out(self, clock):
+        """Blocking acquire gives up when the wait exceeds the timeout."""
+        bucket = TokenBucket(rate_per_second=1, capacity=1, clock=clock)
+        bucket.try_acquire()
+
+        with patch("rate_limiter.time.sleep") as sleep:
+            assert not bucket.acquire(timeout=0.5)
+        sleep.assert_not_called()
+
+    def test_acquire_async_waits_without_blocking(self):
+        """Async acquire awaits the refill deficit."""
+        bucket = TokenBucket(rate_per_second=100, capacity=1)
+        bucket.try_acquire()
+
+        assert asyncio.run(bucket.acquire_async())
+        assert not bucket.try_acquire()
+
+    def test_rejects_invalid_parameters(self):
+        """Non-positive rate and sub-unit capacity are rejected."""
+        with pytest.raises(ValueError, match="Rate must be positive"):
+            TokenBucket(rate_per_second=0, capacity=1)
+        with pytest.raises(ValueError, match="Capacity must be at least 1"):
+            TokenBucket(rate_per_second=1, capacity=0)
+
+
+class TestRateLimiter:
+    """Test per-endpoint rate limiting."""
+
+    def test_from_config_reads_rate_limit_section(self):
+        """Limits come from api['rate_limit']."""
+        limiter = RateLimiter.from_config(
+            {"requests_per_minute": 120, "burst_limit": 5}
+        )
+
+        bucket = limiter.bucket("/api/timeline")
+        assert bucket.rate_per_second == 2
+        assert bucket.capacity == 5
+
+    def test_endpoint_key_ignores_resource_ids(self):
+        """Tweet ids share one bucket per endpoint."""
+        assert RateLimiter.endpoint_key("/api/tweet/123") == "/api/tweet"
+        assert RateLimiter.endpoint_key("/api/timeline?x=1") == "/api/timeline"
+
+    def test_endpoints_have_independent_buckets(self, clock):
+        """Exhausting one endpoint does not throttle another."""
+        limiter = RateLimiter(requests_per_minute=60, burst_limit=1, clock=clock)
+
+        assert limiter.try_acquire("/api/tweet/1")
+        assert not limiter.try_acquire("/api/tweet/2")
+        assert limiter.try_acquire("/api/timeline")
+
+    def test_endpoint_overrides(self, clock):
+        """Per-endpoint limits override the defaults."""
+        limiter = RateLimiter(
+            requests_per_minute=60,
+            burst_limit=1,
+            endpoint_limits={"/api/timeline": {"burst_limit": 3}},
+            clock=clock,
+        )
+
+        assert limiter.bucket("/api/timeline").capacity == 3
+        assert limiter.bucket("/api/tweet/1").capacity == 1
+
+
+class TestTwitterClientRateLimiting:
+    """Test that TwitterClient consults the limiter before sending."""
+
+    def test_client_builds_limiter_from_config(self):
+        """Default AppConfig rate limit is applied to the client."""
+        client = TwitterClient()
+
+        assert client.rate_limiter is not None
+        assert client.rate_limiter.burst_limit == 10
+
+    def test_make_request_acquires_before_sending(self, stub_client):
+        """Each request takes a token from its endpoint bucket."""
+        client = stub_client(
+            None, api={"rate_limit": {"requests_per_minute": 60, "burst_limit": 2}}
+        )
+
+        with patch("requests.Session.post") as mock_post:
+            mock_post.return_value = Mock(
+                status_code=200, json=lambda: {"success": True, "data": []}
+            )
+            client.get_timeline()
+            client.get_timeline()
+
+        assert not client.rate_limiter.try_acquire("/api/timeline")
+        assert client.rate_limiter.try_acquire("/api/tweet/1")
+
+    def test_invalid_rate_limit_config_rejected(self):
+        """AppConfig rejects non-positive rate limits."""
+        with pytest.raises(ValueError, match="requests_per_minute must be positive"):
+            AppConfig(
+                api={
+                    "base_url": "http://localhost:3000",
+                    "rate_limit": {"requests_per_minute": 0, "burst_limit": 1},
+                }
+            )
@@ -0,0 +1,143 @@
+"""
+Tests for vectorized batch scoring.
+
+Tests cover:
+- Bit-for-bit parity of BatchScorer with ScoringConfig scalar methods
+- Matrix and mapping metric inputs
+- Priority level bucketing at threshold boundaries
+- Metrics derived from TweetFrames
+- config staying importable without NumPy or scoring
+"""
+
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+import config
+from scoring import BatchScorer, frame_metrics, tweet_metrics
+from tweet_frame import TweetFrame
+
+
+@pytest.fixture
+def scoring_config():
+    """Default scoring configuration."""
+    return config.ScoringConfig()
+
+
+class TestBatchScorer:
+    """Test BatchScorer against the scalar scoring path."""
+
+    def test_scores_match_scalar_exactly(self, scoring_config):
+        """Batch scores equal calculate_score bit for bit."""
+        rng = np.random.default_rng(7)
+        matrix = rng.random((1000, 5))
+        scorer = BatchScorer(scoring_config)
+
+        scores = scorer.score(matrix)
+
+        expected = [
+            scoring_config.calculate_score(dict(zip(scorer.metric_names, row)))
+            for row in matrix.tolist()
+        ]
+        assert scores.tolist() == expected
+
+    def test_priority_levels_match_scalar(self, scoring_config):
+        """Levels match get_priority_level, including exact thresholds."""
+        scores = np.array([0.0, 0.19999, 0.2, 0.5, 0.79, 0.8, 1.5, np.nan])
+        scorer = BatchScorer(scoring_config)
+
+        levels = scorer.priority_levels(scores)
+
+        assert levels.tolist() == [
+            scoring_config.get_priority_level(score) for score in scores
+        ]
+
+    def test_partial_thresholds_match_scalar(self):
+        """Missing thresholds fall back per level, exactly as in the scalar path."""
+        partial = config.ScoringConfig(priority_thresholds={"high": 0.3})
+        scores = np.array([0.0, 0.19, 0.2, 0.25, 0.3, 0.4, 0.5, 0.9, np.nan])
+
+        levels = BatchScorer(partial).priority_levels(scores)
+
+        assert levels.tolist() == [partial.get_priority_level(s) for s in scores]
+        assert levels.tolist()[2:6] == ["low", "low", "high", "high"]
+
+    def test_mapping_input_skips_missing_metrics(self, scoring_config):
+        """Metrics missing from a mapping contribute nothing."""
+        scores, levels = scoring_config.score_batch(
+            {"engagement_rate": np.array([1.0, 0.5]), "recency": np.array([1.0, 0.0])}
+        )
+
+        assert scores.tolist() == [
+            scoring_config.calculate_score({"engagement_rate": 1.0, "recency": 1.0}),
+            scoring_config.calculate_score({"engagement_rate": 0.5, "recency": 0.0}),
+        ]
+        assert levels.tolist() == ["medium", "none"]
+
+    def test_rejects_wrong_matrix_shape(self, scoring_config):
+        """Matrix columns must match the number of weighted metrics."""
+        with pytest.raises(ValueError, match="shape"):
+            BatchScorer(scoring_config).score(np.zeros((3, 2)))
+
+    def test_custom_weights_and_thresholds(self):
+        """Custom configurations compile to the same results."""
+        custom = config.ScoringConfig.from_dict(
+            {
+                "metric_weights": {
+                    "engagement_rate": 0.5,
+                    "recency": 0.5,
+                    "author_credibility": 0.0,
+                    "content_relevance": 0.0,
+                    "viral_potential": 0.0,
+                },
+                "priority_thresholds": {"high": 0.9, "medium": 0.4, "low": 0.1},
+            }
+        )
+        matrix = np.array([[0.95, 0.95, 0, 0, 0], [0.3, 0.6, 0, 0, 0]])
+
+        scores, levels = custom.score_batch(matrix)
+
+        assert levels.tolist() == [
+            custom.get_priority_level(custom.calculate_score(m))
+            for m in (
+                {"engagement_rate": 0.95, "recency": 0.95},
+                {"engagement_rate": 0.3, "recency": 0.6},
+            )
+        ]
+
+
+    def test_config_import_stays_light(self):
+        """Importing config loads neither NumPy nor the scoring modules."""
+        code = (
+            "import sys, config; "
+            "print(sorted({'numpy', 'scoring', 'models'} & set(sys.modules)))"
+        )
+        result = subprocess.run(
+            [sys.executable, "-c", code],
+            cwd=Path(__file__).parent.parent,
+            capture_output=True,
+            text=True,
+            check=True,
+        )
+
+        assert result.stdout.strip() == "[]"
+
+
+class TestFrameMetrics:
+    """Test metrics derived from TweetFrames."""
+
+    def test_frame_metrics_match_tweet_metrics(self, scoring_config, sample_tweets):
+        """Vectorized metrics and scores match the per-tweet path."""
+        now = time.time()
+        frame = TweetFrame.from_tweets(sample_tweets)
+
+        scores, levels = scoring_config.score_batch(frame_metrics(frame, now=now))
+
+        for i, tweet in enumerate(sample_tweets):
+            expected = scoring_config.calculate_score(tweet_metrics(tweet))
+            assert scores[i] == pytest.approx(expected, abs=1e-6)
+            assert levels[i] == scoring_config.get_priority_level(scores[i])
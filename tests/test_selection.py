@@ -0,0 +1,165 @@
+"""
+Tests for streaming top-K recommendation selection.
+
+Tests cover:
+- Top-K selection matching sort-then-slice
+- Bounded memory on long streams
+- Priority bucketing, rejection and per-level quotas
+- Recommendation output
+"""
+
+import json
+import random
+from pathlib import Path
+
+import pytest
+
+import config
+import models
+from selection import TopKSelector, select_top_k
+
+THRESHOLDS = {"high": 0.8, "medium": 0.5, "low": 0.2}
+
+
+@pytest.fixture
+def sample_tweet_data():
+    """First sample tweet from fixtures."""
+    fixture_path = Path(__file__).parent / "fixtures" / "sample_tweets.json"
+    with open(fixture_path, "r", encoding="utf-8") as f:
+        return json.load(f)["tweets"][0]
+
+
+class TestTopKSelector:
+    """Test bounded top-K selection."""
+
+    def test_matches_sort_then_slice(self):
+        """The kept items are exactly the K best of the stream."""
+        rng = random.Random(7)
+        scored = [(rng.random(), f"id{i}") for i in range(5000)]
+
+        top = TopKSelector(25).consume(scored).top()
+
+        expected = sorted(scored, key=lambda pair: pair[0], reverse=True)[:25]
+        assert [(score, item) for score, _, item in top] == expected
+
+    def test_memory_is_bounded_by_k(self):
+        """No more than K candidates are held at any point."""
+        selector = TopKSelector(10)
+
+        for i in range(10_000):
+            selector.push(float(i % 997), i)
+            assert len(selector) <= 10
+
+        assert selector.seen == 10_000
+
+    def test_ties_keep_earliest_items(self):
+        """Equal scores keep the items that arrived first."""
+        top = TopKSelector(2).consume([(1.0, "a"), (1.0, "b"), (1.0, "c")]).top()
+
+        assert [item for _, _, item in top] == ["a", "b"]
+
+    def test_readable_mid_stream(self):
+        """top() can be read between pushes without disturbing selection."""
+        selector = TopKSelector(2)
+        selector.consume([(0.1, "a"), (0.9, "b")])
+
+        assert [item for _, _, item in selector.top()] == ["b", "a"]
+
+        selector.push(0.5, "c")
+        assert [item for _, _, item in selector.top()] == ["b", "c"]
+
+    def test_invalid_arguments(self):
+        """k, priority levels and quotas are validated."""
+        with pytest.raises(ValueError, match="k must be positive"):
+            TopKSelector(0)
+        with pytest.raises(ValueError, match="Invalid priority levels"):
+            TopKSelector(5, {"urgent": 0.9})
+        with pytest.raises(ValueError, match="Quotas require"):
+            TopKSelector(5, quotas={"high": 1})
+        with pytest.raises(ValueError, match="unknown priority levels"):
+            TopKSelector(5, {"high": 0.8}, quotas={"low": 1})
+
+
+class TestPriorityQuotas:
+    """Test priority bucketing and quotas."""
+
+    def test_scores_below_lowest_threshold_are_rejected(self):
+        """Scores below 'low' and NaN scores never become candidates."""
+        selector = TopKSelector(5, THRESHOLDS)
+
+        selector.consume([(0.1, "a"), (float("nan"), "b"), (0.3, "c")])
+
+        assert [(item, level) for _, level, item in selector.top()] == [("c", "low")]
+        assert selector.rejected == 2
+
+    def test_quota_caps_a_level(self):
+        """A level cannot fill more than its quota, even with the best scores."""
+        scored = [(0.95, "h1"), (0.9, "h2"), (0.85, "h3"), (0.6, "m1"), (0.3, "l1")]
+
+        top = TopKSelector(3, THRESHOLDS, quotas={"high": 1}).consume(scored).top()
+
+        assert [(item, level) for _, level, item in top] == [
+            ("h1", "high"),
+            ("m1", "medium"),
+            ("l1", "low"),
+        ]
+
+    def test_consume_matches_push(self):
+        """consume()'s fast rejection keeps the same items and counts as push()."""
+        rng = random.Random(11)
+        scored = [(rng.random(), i) for i in range(3000)]
+        pushed = TopKSelector(20, THRESHOLDS, quotas={"high": 3, "medium": 8})
+        for score, item in scored:
+            pushed.push(score, item)
+
+        consumed = TopKSelector(20, THRESHOLDS, quotas={"high": 3, "medium": 8})
+        consumed.consume(scored)
+
+        assert consumed.top() == pushed.top()
+        assert (consumed.seen, consumed.rejected) == (pushed.seen, pushed.rejected)
+
+    def test_zero_quota_excludes_a_level(self):
+        """A quota of zero keeps nothing from that level."""
+        top = (
+            TopKSelector(3, THRESHOLDS, quotas={"low": 0})
+            .consume([(0.3, "l1"), (0.6, "m1")])
+            .top()
+        )
+
+        assert [item for _, _, item in top] == ["m1"]
+
+    def test_from_config_uses_scoring_thresholds(self):
+        """from_config buckets with ScoringConfig.priority_thresholds."""
+        scoring_config = config.ScoringConfig()
+        selector = TopKSelector.from_config(3, scoring_config)
+
+        selector.push(0.55, "x")
+
+        assert selector.top()[0][1] == scoring_config.get_priority_level(0.55)
+
+
+class TestRecommendations:
+    """Test Recommendation output."""
+
+    def test_recommendations_from_tweets(self, sample_tweet_data):
+        """Tweets become Recommendations targeting their ids, best first."""
+        tweet = models.Tweet.from_dict(sample_tweet_data)
+
+        recommendations = select_top_k(
+            [(0.4, "123"), (0.9, tweet)],
+            k=10,
+            priority_thresholds=THRESHOLDS,
+            action_type=lambda item: "reply" if hasattr(item, "text") else "like",
+        )
+
+        assert [r.target_id for r in recommendations] == [tweet.id, "123"]
+        assert [r.priority for r in recommendations] == ["high", "low"]
+        assert recommendations[0].action_type == "reply"
+        assert recommendations[0].confidence_score == 0.9
+
+    def test_confidence_is_clamped(self):
+        """Unbounded scores are clamped into Recommendation's confidence range."""
+        recommendations = select_top_k([(42.0, "a")], k=1)
+
+        assert recommendations[0].confidence_score == 1.0
+        assert recommendations[0].priority == "medium"
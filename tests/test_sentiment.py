@@ -0,0 +1,146 @@
+"""
+Tests for the offline lexicon sentiment scorer.
+
+Tests cover:
+- Positive, negative and neutral text
+- Negation, intensifiers and contrastive `but`
+- Emoji polarity
+- Text normalization and memoization of retweets and duplicates
+- Batch scoring parity with single-text scoring
+- Pickling for worker processes
+"""
+
+import pickle
+
+import numpy as np
+import pytest
+
+from sentiment import SentimentAnalyzer, normalize_text, polarity_label, score_text
+
+
+@pytest.fixture
+def analyzer():
+    """Fresh analyzer with an empty memo."""
+    return SentimentAnalyzer()
+
+
+class TestScoreText:
+    """Test scoring normalized text."""
+
+    @pytest.mark.parametrize(
+        "text, label",
+        [
+            ("i love this library", "positive"),
+            ("what a terrible, buggy release", "negative"),
+            ("the meeting is at noon", "neutral"),
+            ("", "neutral"),
+        ],
+    )
+    def test_polarity(self, text, label):
+        """Lexicon words set the polarity; text without them is neutral."""
+        assert polarity_label(score_text(text)) == label
+
+    def test_scores_are_bounded(self):
+        """Compound scores stay within [-1, 1]."""
+        assert 0.9 < score_text("great " * 50) <= 1.0
+        assert -1.0 <= score_text("awful " * 50) < -0.9
+
+    @pytest.mark.parametrize(
+        "text", ["this is not good", "i don't like it", "never a great idea"]
+    )
+    def test_negation_flips_polarity(self, text):
+        """A negator flips sentiment words within its window."""
+        assert score_text(text) < 0
+
+    def test_negation_window_and_punctuation(self):
+        """Negation covers the next three words and ends at punctuation."""
+        assert score_text("not bad") > 0
+        assert score_text("not bad. great") > score_text("not bad great")
+        assert score_text("no one here thinks this is great") > 0
+
+    def test_intensifier_boosts(self):
+        """Intensifiers strengthen the following sentiment word."""
+        assert score_text("really good") > score_text("good")
+        assert score_text("really bad") < score_text("bad")
+
+    def test_but_favours_the_second_clause(self):
+        """Text after `but` outweighs text before it."""
+        assert score_text("great idea but terrible execution") < 0
+        assert score_text("terrible docs but great library") > 0
+
+    def test_but_after_neutral_clause(self):
+        """The clause after `but` is weighted even when nothing came before."""
+        assert score_text("I thought so but this is awful") < score_text(
+            "this is awful"
+        )
+
+    def test_emoji_polarity(self):
+        """Emoji carry polarity, including with skin-tone modifiers."""
+        assert polarity_label(score_text("shipping today 🚀")) == "positive"
+        assert polarity_label(score_text("build broke again 😡")) == "negative"
+        assert score_text("👍🏽") == score_text("👍")
+
+
+class TestSentimentAnalyzer:
+    """Test the memoizing analyzer."""
+
+    def test_normalize_text(self):
+        """Case, whitespace, curly apostrophes and the RT prefix are normalized."""
+        assert normalize_text("RT @alice:  Don’t   STOP\n") == "don't stop"
+
+    def test_retweets_and_duplicates_are_memoized(self, analyzer):
+        """Texts that normalize equal are scored once."""
+        first = analyzer.score("I love this")
+        assert analyzer.score("RT @bob: i  LOVE this") == first
+        assert analyzer.label("I love this") == "positive"
+
+        assert (analyzer.misses, analyzer.hits) == (1, 2)
+        assert len(analyzer) == 1
+
+    def test_memo_is_bounded(self):
+        """The least recently used text is evicted first."""
+        analyzer = SentimentAnalyzer(memo_size=2)
+        analyzer.score("good")
+        analyzer.score("bad")
+        analyzer.score("good")
+        analyzer.score("fine")
+
+        assert len(analyzer) == 2
+        analyzer.score("good")
+        assert analyzer.hits == 2
+        analyzer.score("bad")
+        assert analyzer.misses == 4
+
+    def test_invalid_memo_size(self):
+        """memo_size must be positive."""
+        with pytest.raises(ValueError):
+            SentimentAnalyzer(memo_size=0)
+
+    def test_batch_matches_single(self, analyzer):
+        """Batch scores and labels match single-text scoring."""
+        texts = ["great work", "RT @x: great work", "not great", "hello", "😭"] * 40
+
+        scores, labels = analyzer.score_batch(texts)
+
+        single = SentimentAnalyzer()
+        assert scores.tolist() == [single.score(text) for text in texts]
+        assert labels.tolist() == [single.label(text) for text in texts]
+        assert analyzer.misses == 4
+        assert analyzer.hits == len(texts) - 4
+
+    def test_empty_batch(self, analyzer):
+        """An empty batch returns empty arrays."""
+        scores, labels = analyzer.score_batch([])
+
+        assert scores.shape == labels.shape == (0,)
+        assert scores.dtype == np.float64
+
+    def test_pickles_without_memo(self, analyzer):
+        """Pickled analyzers keep memo_size and start with an empty memo."""
+        analyzer.score("great work")
+
+        copy = pickle.loads(pickle.dumps(analyzer))
+
+        assert copy.memo_size == analyzer.memo_size
+        assert len(copy) == 0
+        assert copy.label("great work") == analyzer.label("great work")
@@ -0,0 +1,191 @@
+"""
+Tests for Snowflake id decoding.
+
+Tests cover:
+- Decoding ids to epoch milliseconds and UTC datetimes
+- Rejecting non-numeric and pre-Snowflake ids
+- Vectorized decoding of id arrays and id strings
+- Time windows as id bounds, numeric id ordering and createdAt validation
+- created_at fallbacks in Tweet.from_dict, TweetFrame and TwitterClient
+- Id ordering and id-range selection on TweetFrame
+"""
+
+import json
+from datetime import datetime, timezone
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+from config import AppConfig
+from models import Tweet
+from snowflake import (
+    MIN_SNOWFLAKE_ID,
+    TWITTER_EPOCH_MS,
+    id_sort_key,
+    is_snowflake,
+    matches_created_at,
+    snowflake_bounds,
+    snowflake_ms_batch,
+    snowflake_to_datetime,
+    snowflake_to_ms,
+)
+from tweet_frame import TweetFrame
+from twitter_client import TwitterClient
+
+# 2024-01-15T10:30:00.123Z
+CREATED_MS = 1705314600123
+
+
+def make_id(ms: int, worker: int = 5, sequence: int = 7) -> int:
+    """Snowflake id for a creation time in epoch milliseconds."""
+    return ((ms - TWITTER_EPOCH_MS) << 22) | (worker << 12) | sequence
+
+
+@pytest.fixture
+def sample_records():
+    """Load sample tweets from fixtures."""
+    fixture_path = Path(__file__).parent / "fixtures" / "sample_tweets.json"
+    with open(fixture_path, "r", encoding="utf-8") as f:
+        return json.load(f)["tweets"]
+
+
+class TestDecoding:
+    """Test decoding single ids."""
+
+    def test_decode_ms_and_datetime(self):
+        """The top 41 bits are milliseconds since the Twitter epoch."""
+        tweet_id = str(make_id(CREATED_MS))
+
+        assert snowflake_to_ms(tweet_id) == CREATED_MS
+        assert snowflake_to_datetime(tweet_id) == datetime(
+            2024, 1, 15, 10, 30, 0, 123000, tzinfo=timezone.utc
+        )
+
+    @pytest.mark.parametrize("tweet_id", ["", "abc", "20", str(MIN_SNOWFLAKE_ID - 1)])
+    def test_non_snowflake_ids(self, tweet_id):
+        """Non-numeric and pre-Snowflake ids are rejected."""
+        assert not is_snowflake(tweet_id)
+        with pytest.raises(ValueError):
+            snowflake_to_ms(tweet_id)
+
+    def test_batch_decoding(self):
+        """Arrays and id strings decode in one call; invalid ids give -1."""
+        ids = np.array([make_id(CREATED_MS), make_id(CREATED_MS + 1), 20], np.int64)
+
+        assert snowflake_ms_batch(ids).tolist() == [CREATED_MS, CREATED_MS + 1, -1]
+        assert snowflake_ms_batch(ids.astype(np.uint64)).tolist() == [
+            CREATED_MS,
+            CREATED_MS + 1,
+            -1,
+        ]
+        strings = [str(make_id(CREATED_MS)), "not-an-id", "-5"]
+        assert snowflake_ms_batch(strings).tolist() == [CREATED_MS, -1, -1]
+        assert snowflake_ms_batch([]).dtype == np.int64
+
+    def test_bounds_cover_the_window(self):
+        """Every id created inside the window falls within its bounds."""
+        low, high = snowflake_bounds(CREATED_MS, CREATED_MS + 999)
+
+        assert low == make_id(CREATED_MS, worker=0, sequence=0)
+        assert high == make_id(CREATED_MS + 999, worker=1023, sequence=4095)
+        assert not low <= make_id(CREATED_MS - 1, 1023, 4095) <= high
+        assert not low <= make_id(CREATED_MS + 1000, 0, 0) <= high
+        with pytest.raises(ValueError):
+            snowflake_bounds(CREATED_MS, CREATED_MS - 1)
+
+    def test_numeric_sort_key(self):
+        """Ids sort numerically, not as text."""
+        ids = ["1000000000000000000", "999999999999999999", "bad"]
+
+        assert sorted(ids, key=id_sort_key) == [
+            "bad",
+            "999999999999999999",
+            "1000000000000000000",
+        ]
+
+    def test_matches_created_at(self):
+        """createdAt can be validated against the id."""
+        tweet_id = make_id(CREATED_MS)
+
+        assert matches_created_at(tweet_id, datetime(2024, 1, 15, 10, 30))
+        assert not matches_created_at(tweet_id, datetime(2024, 1, 15, 11, 30))
+        assert matches_created_at("123", datetime(1999, 1, 1))
+
+
+class TestCreatedAtFallback:
+    """Test created_at recovery from ids."""
+
+    def test_from_dict_without_created_at(self, sample_records):
+        """Tweet.from_dict decodes created_at from a Snowflake id."""
+        record = dict(sample_records[0], id=str(make_id(CREATED_MS)))
+        del record["createdAt"]
+
+        tweet = Tweet.from_dict(record)
+
+        assert tweet.created_at.timestamp() * 1000 == pytest.approx(CREATED_MS)
+        assert TweetFrame.from_dicts([record]).created_at[0] == pytest.approx(
+            CREATED_MS / 1000
+        )
+
+    def test_from_dict_still_requires_a_time(self, sample_records):
+        """Without createdAt or a Snowflake id, from_dict still fails."""
+        record = dict(sample_records[0], id="123")
+        del record["createdAt"]
+
+        with pytest.raises(ValueError, match="createdAt"):
+            Tweet.from_dict(record)
+
+    @pytest.mark.parametrize("created_at", [None, "not a date"])
+    def test_client_decodes_missing_or_bad_created_at(self, created_at):
+        """The client no longer falls back to the current time for Snowflakes."""
+        client = TwitterClient()
+        data = {"id": str(make_id(CREATED_MS)), "text": "hi", "user": {"id": "1"}}
+        if created_at:
+            data["createdAt"] = created_at
+
+        tweet = client._normalize_tweet(data)
+
+        assert tweet.created_at == snowflake_to_datetime(data["id"])
+        client.close()
+
+    def test_client_snowflake_fast_path(self):
+        """processing['snowflake_timestamps'] skips createdAt parsing."""
+        app_config = AppConfig()
+        app_config.processing["snowflake_timestamps"] = True
+        client = TwitterClient(app_config)
+        data = {
+            "id": str(make_id(CREATED_MS)),
+            "text": "hi",
+            "user": {"id": "1"},
+            "createdAt": "2020-01-01T00:00:00Z",
+        }
+
+        assert client._normalize_tweet(data).created_at == snowflake_to_datetime(
+            data["id"]
+        )
+        client.close()
+
+
+class TestFrameOrdering:
+    """Test id ordering on TweetFrame."""
+
+    def test_sort_and_select_by_id(self, sample_records):
+        """Frames sort by numeric id and select time windows by id alone."""
+        times = [CREATED_MS + 5000, CREATED_MS, CREATED_MS + 60_000]
+        records = [
+            dict(record, id=str(make_id(ms)))
+            for record, ms in zip(sample_records, times)
+        ]
+        frame = TweetFrame.from_dicts(records)
+
+        ordered = frame.sort_by_id()
+        window = frame.created_between(CREATED_MS, CREATED_MS + 10_000)
+
+        assert ordered.ids.tolist() == [records[i]["id"] for i in (1, 0, 2)]
+        assert frame.sort_by_id(descending=True).ids.tolist() == [
+            records[i]["id"] for i in (2, 0, 1)
+        ]
+        assert sorted(window.ids.tolist()) == sorted(
+            [records[0]["id"], records[1]["id"]]
+        )
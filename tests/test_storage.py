@@ -0,0 +1,280 @@
+"""
+Tests for the SQLite tweet store.
+
+Tests cover:
+- Round-tripping Tweets and Profiles through the store
+- Upserts refreshing engagement instead of duplicating rows
+- Batched writes, counts, the newest stored id and id existence checks
+- Author, time-window and id-range filters and ordering
+- Streaming TweetFrames that match TweetFrame.from_tweets
+- WAL mode and read-only connections reading alongside a writer
+"""
+
+import sqlite3
+from dataclasses import replace
+from datetime import datetime, timezone
+from unittest.mock import patch
+
+import numpy as np
+import pytest
+
+from models import EngagementMetrics, Profile, Tweet
+from storage import TweetStore
+from tweet_frame import TweetFrame
+
+
+@pytest.fixture
+def store(tmp_path):
+    """Writable store in a temporary directory."""
+    with TweetStore(tmp_path / "tweets.db") as store:
+        yield store
+
+
+def with_likes(tweet: Tweet, likes: int) -> Tweet:
+    """Copy of tweet with a different like count."""
+    return replace(
+        tweet, engagement=replace(tweet.engagement or EngagementMetrics(), likes=likes)
+    )
+
+
+class TestRoundTrip:
+    """Test writing and reading back tweets and profiles."""
+
+    def test_tweets_round_trip(self, store, sample_tweets):
+        """Stored tweets read back equal to what was written."""
+        assert store.upsert_tweets(sample_tweets) == len(sample_tweets)
+
+        for tweet in sample_tweets:
+            stored = store.get_tweet(tweet.id)
+            assert stored.to_dict() == tweet.to_dict()
+
+    def test_authors_stored_with_tweets(self, store, sample_tweets):
+        """Each tweet's author is upserted in the same batch."""
+        store.upsert_tweets(sample_tweets)
+
+        for tweet in sample_tweets:
+            assert store.get_profile(tweet.user.id) == tweet.user
+
+    def test_missing_rows(self, store):
+        """Unknown ids read as None."""
+        assert store.get_tweet("1") is None
+        assert store.get_profile("1") is None
+        assert store.max_id() is None
+
+    def test_upsert_profiles(self, store):
+        """Profiles can be written on their own."""
+        profile = Profile(
+            id="42",
+            username="someone",
+            display_name="Someone",
+            followers=10,
+            join_date=datetime(2020, 5, 1, tzinfo=timezone.utc),
+        )
+
+        assert store.upsert_profiles([profile]) == 1
+        assert store.get_profile("42") == profile
+
+    def test_tweet_without_stored_author(self, store, sample_tweets):
+        """Tweets whose author row is missing still read back."""
+        store.upsert_tweets(sample_tweets[:1])
+        with store._conn:
+            store._conn.execute("DELETE FROM profiles")
+
+        tweet = store.get_tweet(sample_tweets[0].id)
+        assert tweet.user.id == sample_tweets[0].user.id
+        frame = next(store.iter_frames())
+        assert frame.columns["followers"][0] == 0
+
+
+class TestUpserts:
+    """Test re-writing stored tweets."""
+
+    def test_upsert_updates_engagement(self, store, sample_tweets):
+        """A re-fetched tweet replaces the stored counts."""
+        store.upsert_tweets(sample_tweets)
+        store.upsert_tweets([with_likes(sample_tweets[0], 9999)])
+
+        assert store.count() == len(sample_tweets)
+        assert store.get_tweet(sample_tweets[0].id).engagement.likes == 9999
+
+    def test_batched_writes(self, tmp_path, sample_tweets):
+        """Writes split into batch_size transactions store every row."""
+        tweets = [
+            replace(sample_tweets[i % len(sample_tweets)], id=str(10**15 + i))
+            for i in range(10)
+        ]
+        with TweetStore(tmp_path / "tweets.db", batch_size=3) as store:
+            assert store.upsert_tweets(tweets) == 10
+            assert store.count() == 10
+            assert [len(frame) for frame in store.iter_frames()] == [3, 3, 3, 1]
+
+    def test_count_and_max_id(self, store, sample_tweets):
+        """count() and max_id() optionally narrow to one author."""
+        store.upsert_tweets(sample_tweets)
+        author = sample_tweets[1].user.id
+
+        assert store.count(author_id=author) == 1
+        assert store.max_id() == max(t.id for t in sample_tweets)
+        assert store.max_id(author_id=author) == sample_tweets[1].id
+
+    def test_existing_ids(self, store, sample_tweets):
+        """existing_ids() returns the stored subset, across parameter chunks."""
+        store.upsert_tweets(sample_tweets)
+        stored = {t.id for t in sample_tweets}
+        candidates = [str(i) for i in range(2000)] + sorted(stored)
+
+        assert store.existing_ids(candidates) == stored
+        assert store.existing_ids([]) == set()
+
+    def test_invalid_batch_size(self, tmp_path):
+        """batch_size must be positive."""
+        with pytest.raises(ValueError):
+            TweetStore(tmp_path / "tweets.db", batch_size=0)
+
+
+class TestQueries:
+    """Test filtered and ordered reads."""
+
+    def test_order_by_id(self, store, sample_tweets):
+        """Tweets stream in numeric id order, either direction."""
+        store.upsert_tweets(reversed(sample_tweets))
+        ids = sorted(t.id for t in sample_tweets)
+
+        assert [t.id for t in store.iter_tweets()] == ids
+        assert [t.id for t in store.iter_tweets(descending=True)] == ids[::-1]
+
+    def test_order_by_created_at(self, store, sample_tweets):
+        """order_by="created_at" orders by creation time."""
+        store.upsert_tweets(sample_tweets)
+        expected = [t.id for t in sorted(sample_tweets, key=lambda t: t.created_at)]
+
+        assert [t.id for t in store.iter_tweets(order_by="created_at")] == expected
+
+    def test_invalid_order(self, store):
+        """Unknown orderings are rejected."""
+        with pytest.raises(ValueError):
+            list(store.iter_tweets(order_by="likes"))
+
+    def test_author_filter(self, store, sample_tweets):
+        """author_id selects one author's tweets."""
+        store.upsert_tweets(sample_tweets)
+        author = sample_tweets[0].user.id
+
+        tweets = list(store.iter_tweets(author_id=author))
+        assert [t.id for t in tweets] == [sample_tweets[0].id]
+
+    def test_time_window(self, store, sample_tweets):
+        """since is inclusive and until exclusive."""
+        store.upsert_tweets(sample_tweets)
+        since = datetime(2024, 3, 15, 15, 10, tzinfo=timezone.utc)
+        until = datetime(2024, 3, 15, 19, 20, tzinfo=timezone.utc)
+
+        tweets = store.iter_tweets(since=since, until=until)
+        expected = {t.id for t in sample_tweets if since <= t.created_at < until}
+        assert {t.id for t in tweets} == expected
+
+    def test_id_range(self, store, sample_tweets):
+        """since_id is exclusive and max_id inclusive."""
+        store.upsert_tweets(sample_tweets)
+        ids = sorted(t.id for t in sample_tweets)
+
+        tweets = store.iter_tweets(since_id=ids[0], max_id=ids[2])
+        assert [t.id for t in tweets] == ids[1:3]
+
+    def test_limit(self, store, sample_tweets):
+        """limit caps the rows read."""
+        store.upsert_tweets(sample_tweets)
+
+        assert len(list(store.iter_tweets(limit=2))) == 2
+
+    def test_authors_shared(self, store, sample_tweets):
+        """Tweets by the same author share one Profile."""
+        tweets = [replace(sample_tweets[0], id=str(10**15 + i)) for i in range(3)]
+        store.upsert_tweets(tweets)
+
+        users = {id(t.user) for t in store.iter_tweets()}
+        assert len(users) == 1
+
+
+class TestFrames:
+    """Test streaming TweetFrames."""
+
+    def test_frame_matches_from_tweets(self, store, sample_tweets):
+        """Columns built from rows match TweetFrame.from_tweets."""
+        store.upsert_tweets(sample_tweets)
+        ordered = sorted(sample_tweets, key=lambda t: int(t.id))
+
+        frame = next(store.iter_frames())
+        expected = TweetFrame.from_tweets(ordered)
+        assert list(frame.ids) == list(expected.ids)
+        assert list(frame.usernames) == list(expected.usernames)
+        for name, column in expected.columns.items():
+            assert frame.columns[name].dtype == column.dtype
+            np.testing.assert_array_equal(frame.columns[name], column)
+
+    def test_frame_rows_materialize(self, store, sample_tweets):
+        """Indexing a stored frame builds the Tweet."""
+        store.upsert_tweets(sample_tweets)
+
+        frame = next(store.iter_frames(descending=True))
+        newest = max(sample_tweets, key=lambda t: int(t.id))
+        assert frame[0].to_dict() == newest.to_dict()
+        assert frame.take([0])[0].id == newest.id
+
+    def test_take_keeps_rows_lazy(self, store, sample_tweets):
+        """Taking rows of a stored frame builds no Tweets."""
+        store.upsert_tweets(sample_tweets)
+        frame = next(store.iter_frames(descending=True))
+
+        with patch("storage._tweet_from_row") as from_row, patch.object(
+            Tweet, "from_dict"
+        ) as from_dict:
+            taken = frame.take(np.arange(len(frame))[::-1])
+            reordered = taken.sort_by_id(descending=True)
+        from_row.assert_not_called()
+        from_dict.assert_not_called()
+
+        assert list(reordered.ids) == list(frame.ids)
+        assert reordered[0].to_dict() == frame[0].to_dict()
+
+
+class TestConcurrency:
+    """Test WAL mode and read-only connections."""
+
+    def test_wal_mode(self, store):
+        """Writable stores use the WAL journal."""
+        mode = store._conn.execute("PRAGMA journal_mode").fetchone()[0]
+        assert mode == "wal"
+
+    def test_reader_during_write(self, tmp_path, sample_tweets):
+        """A read-only store reads committed rows while a write is open."""
+        path = tmp_path / "tweets.db"
+        with TweetStore(path) as writer:
+            writer.upsert_tweets(sample_tweets[:2])
+            with TweetStore(path, read_only=True) as reader:
+                writer._conn.execute("BEGIN IMMEDIATE")
+                writer._conn.executemany(
+                    "UPDATE tweets SET likes = 0 WHERE id = ?",
+                    [(t.id,) for t in sample_tweets],
+                )
+
+                assert reader.count() == 2
+                assert reader.get_tweet(sample_tweets[0].id).engagement.likes > 0
+
+                writer._conn.commit()
+                writer.upsert_tweets(sample_tweets[2:])
+                assert reader.count() == len(sample_tweets)
+
+    def test_read_only_rejects_writes(self, tmp_path, sample_tweets):
+        """Read-only stores refuse upserts."""
+        path = tmp_path / "tweets.db"
+        TweetStore(path).close()
+
+        with TweetStore(path, read_only=True) as reader:
+            with pytest.raises(sqlite3.OperationalError):
+                reader.upsert_tweets(sample_tweets)
+
+    def test_read_only_requires_file(self, tmp_path):
+        """Opening a missing file read-only fails instead of creating it."""
+        with pytest.raises(FileNotFoundError):
+            TweetStore(tmp_path / "missing.db", read_only=True)
@@ -0,0 +1,352 @@
+"""
+Tests for incremental timeline sync.
+
+Tests cover:
+- iter_timeline(since_id=...) stopping at the first already-seen tweet
+- First syncs, steady-state polls and their request counts
+- Catching up a backlog larger than max_items without skipping tweets, reading
+  the gap once
+- Checkpoints in a JSON file and in a TweetStore, across restarts
+- Deferred commits re-delivering uncommitted tweets
+- Keyword feeds that return matches but checkpoint every scanned tweet
+- Upserting synced tweets into a TweetStore
+- Feeds unaffected by the client's seen_ids filter, which commits update
+"""
+
+import pytest
+
+from keywords import KeywordMatcher
+from storage import TweetStore
+from stub_bridge import StubBridge, make_bridge_tweet
+from sync import CheckpointFile, IncrementalSync, StoreCheckpoints, newest_id
+
+
+@pytest.fixture
+def bridge():
+    """Serve thirty tweets, ids 1000-1029, from a local stand-in bridge."""
+    tweets = [make_bridge_tweet(str(1000 + i)) for i in range(30)]
+    with StubBridge(tweets) as bridge:
+        yield bridge
+
+
+@pytest.fixture
+def client(bridge, stub_client):
+    """Client pointed at the stub bridge."""
+    with stub_client(bridge) as client:
+        yield client
+
+
+def add_tweets(bridge, *ids, text=""):
+    """Publish new tweets on the stub bridge."""
+    for tweet_id in ids:
+        bridge.tweets[str(tweet_id)] = make_bridge_tweet(str(tweet_id), text)
+
+
+def timeline_requests(bridge):
+    """Number of timeline requests the bridge has served."""
+    return len(bridge.requests_to("/api/timeline"))
+
+
+class TestSinceId:
+    """Test since_id on the client timeline."""
+
+    def test_stops_at_seen_tweet(self, client, bridge):
+        """Only tweets above since_id are yielded and no further page is read."""
+        tweets = list(client.iter_timeline(page_size=5, since_id="1022"))
+
+        assert [t.id for t in tweets] == [str(i) for i in range(1029, 1022, -1)]
+        assert timeline_requests(bridge) == 2
+        assert bridge.requests_to("/api/timeline")[0]["sinceId"] == "1022"
+
+    def test_nothing_new(self, client, bridge):
+        """With nothing newer, one request returns nothing."""
+        assert list(client.iter_timeline(page_size=5, since_id="1029")) == []
+        assert timeline_requests(bridge) == 1
+
+    def test_ids_compare_numerically(self, client, bridge):
+        """Longer ids are newer even where they sort lower as text."""
+        add_tweets(bridge, 10000)
+
+        tweets = list(client.iter_timeline(page_size=5, since_id="1029"))
+        assert [t.id for t in tweets] == ["10000"]
+
+
+class TestIncrementalSync:
+    """Test polling feeds against checkpoints."""
+
+    def test_first_poll_then_steady_state(self, tmp_path, client, bridge):
+        """A first sync reads initial_items; later polls only new tweets."""
+        sync = IncrementalSync(
+            client, CheckpointFile(tmp_path / "checkpoints.json"), page_size=10
+        )
+
+        first = sync.poll()
+        assert [t.id for t in first.tweets] == [str(i) for i in range(1029, 1009, -1)]
+        assert first.newest_id == "1029"
+
+        add_tweets(bridge, 1030, 1031, 1032)
+        before = timeline_requests(bridge)
+        second = sync.poll()
+        assert [t.id for t in second.tweets] == ["1032", "1031", "1030"]
+        assert second.since_id == "1029"
+        assert timeline_requests(bridge) - before == 1
+
+        before = timeline_requests(bridge)
+        assert sync.poll().tweets == []
+        assert timeline_requests(bridge) - before == 1
+
+    def test_steady_state_independent_of_backlog(self, tmp_path, client, bridge):
+        """Poll cost follows new tweets, not the initial count."""
+        sync = IncrementalSync(
+            client,
+            CheckpointFile(tmp_path / "checkpoints.json"),
+            page_size=5,
+            initial_items=30,
+        )
+        sync.poll()
+        add_tweets(bridge, *range(1030, 1037))
+
+        before = timeline_requests(bridge)
+        assert len(sync.poll().tweets) == 7
+        assert timeline_requests(bridge) - before == 2
+
+    def test_checkpoint_file_survives_restart(self, tmp_path, client, bridge):
+        """A new sync resumes from the file written by the last one."""
+        path = tmp_path / "state" / "checkpoints.json"
+        IncrementalSync(client, CheckpointFile(path)).poll()
+        add_tweets(bridge, 1030)
+
+        resumed = IncrementalSync(client, CheckpointFile(path))
+        assert [t.id for t in resumed.poll().tweets] == ["1030"]
+        assert CheckpointFile(path).feeds() == {"home": "1030"}
+
+    def test_uncommitted_poll_redelivers(self, tmp_path, client, bridge):
+        """Without commit the checkpoint stays until commit() is called."""
+        sync = IncrementalSync(client, CheckpointFile(tmp_path / "cp.json"))
+        sync.poll()
+        add_tweets(bridge, 1030)
+
+        pending = sync.poll(commit=False)
+        assert [t.id for t in sync.poll(commit=False).tweets] == ["1030"]
+        sync.commit(pending)
+        sync.commit(pending)
+        assert sync.poll().tweets == []
+
+    def test_backlog_over_max_items_is_caught_up(self, tmp_path, client, bridge):
+        """More new tweets than max_items arrive oldest first over several polls."""
+        sync = IncrementalSync(
+            client,
+            CheckpointFile(tmp_path / "cp.json"),
+            page_size=3,
+            initial_items=5,
+            max_items=4,
+        )
+        sync.poll()
+        add_tweets(bridge, *range(1030, 1040))
+
+        polls = [sync.poll() for _ in range(4)]
+        assert [[t.id for t in p.tweets] for p in polls] == [
+            ["1033", "1032", "1031", "1030"],
+            ["1037", "1036", "1035", "1034"],
+            ["1039", "1038"],
+            [],
+        ]
+        assert [p.truncated for p in polls] == [True, True, False, False]
+        assert [p.newest_id for p in polls[:3]] == ["1033", "1037", "1039"]
+
+    def test_backlog_is_read_once(self, tmp_path, client, bridge):
+        """Catching up reads the gap once, not once per poll."""
+        sync = IncrementalSync(
+            client,
+            CheckpointFile(tmp_path / "cp.json"),
+            page_size=10,
+            initial_items=5,
+            max_items=5,
+        )
+        sync.poll()
+        add_tweets(bridge, *range(1030, 1070))
+        before = timeline_requests(bridge)
+
+        polls = [sync.poll()]
+        gap_requests = timeline_requests(bridge) - before
+        while polls[-1].truncated:
+            polls.append(sync.poll())
+
+        assert len(polls) == 8
+        caught_up = [t.id for p in polls for t in reversed(p.tweets)]
+        assert caught_up == [str(i) for i in range(1030, 1070)]
+        # Four pages of new tweets, then the page that reaches the checkpoint
+        assert gap_requests == 5
+        assert timeline_requests(bridge) - before == gap_requests
+
+        add_tweets(bridge, 1070)
+        assert [t.id for t in sync.poll().tweets] == ["1070"]
+        assert timeline_requests(bridge) - before == gap_requests + 1
+
+    def test_uncommitted_backlog_poll_redelivers(self, tmp_path, client, bridge):
+        """An uncommitted slice of a backlog comes back on the next poll."""
+        sync = IncrementalSync(
+            client, CheckpointFile(tmp_path / "cp.json"), initial_items=5, max_items=4
+        )
+        sync.poll()
+        add_tweets(bridge, *range(1030, 1040))
+
+        pending = sync.poll(commit=False)
+        again = sync.poll()
+        assert [t.id for t in again.tweets] == [t.id for t in pending.tweets]
+        assert [t.id for t in sync.poll().tweets] == ["1037", "1036", "1035", "1034"]
+        assert timeline_requests(bridge) == 2
+
+    def test_checkpoint_never_moves_back(self, tmp_path, client):
+        """Committing an older result keeps the newer checkpoint."""
+        checkpoints = CheckpointFile(tmp_path / "cp.json")
+        sync = IncrementalSync(client, checkpoints, initial_items=5)
+        stale = sync.poll(commit=False)
+        checkpoints.set("home", "5000")
+
+        sync.commit(stale)
+        assert checkpoints.get("home") == "5000"
+
+    def test_feeds_checkpoint_separately(self, tmp_path, client, bridge):
+        """Each feed has its own checkpoint."""
+        checkpoints = CheckpointFile(tmp_path / "cp.json")
+        sync = IncrementalSync(client, checkpoints, initial_items=3)
+        sync.poll("home")
+
+        assert checkpoints.get("home:replies") is None
+        assert len(sync.poll("home:replies").tweets) == 3
+        assert bridge.requests_to("/api/timeline")[-1]["includeReplies"] is True
+
+    def test_unknown_feed(self, tmp_path, client):
+        """Polling an unregistered feed fails."""
+        sync = IncrementalSync(client, CheckpointFile(tmp_path / "cp.json"))
+        with pytest.raises(ValueError):
+            sync.poll("mentions")
+
+    def test_invalid_sizes(self, tmp_path, client):
+        """Sizes must be positive."""
+        with pytest.raises(ValueError):
+            IncrementalSync(client, CheckpointFile(tmp_path / "cp.json"), page_size=0)
+
+
+class TestFeeds:
+    """Test keyword and custom feeds."""
+
+    def test_keyword_feed(self, tmp_path, client, bridge):
+        """Keyword feeds return matches and checkpoint past everything scanned."""
+        add_tweets(bridge, 1030, 1032, text="Shipping a new python release")
+        add_tweets(bridge, 1031, text="Nothing to see here")
+        matcher = KeywordMatcher({"python": ["python"], "rust": ["rust"]})
+        sync = IncrementalSync(client, CheckpointFile(tmp_path / "cp.json"))
+        sync.register_keyword("python", matcher, topic="python")
+
+        result = sync.poll("python")
+        assert [t.id for t in result.tweets] == ["1032", "1030"]
+        assert result.newest_id == "1032"
+        assert result.scanned == 20
+
+        add_tweets(bridge, 1033, text="More rust news")
+        result = sync.poll("python")
+        assert result.tweets == []
+        assert result.newest_id == "1033"
+
+    def test_custom_feed(self, tmp_path, client):
+        """register() accepts any newest-first fetch function."""
+        calls = []
+
+        def fetch(since_id, max_items):
+            calls.append((since_id, max_items))
+            return client.iter_timeline(max_items=max_items, since_id=since_id)
+
+        sync = IncrementalSync(
+            client, CheckpointFile(tmp_path / "cp.json"), initial_items=2
+        )
+        sync.register("account:someone", fetch)
+        sync.poll("account:someone")
+        sync.poll("account:someone")
+
+        assert calls == [(None, 2), ("1029", None)]
+        assert "account:someone" in sync.feeds
+
+
+class TestStoreCheckpoints:
+    """Test checkpoints and tweets kept in a TweetStore."""
+
+    def test_store_backed_sync(self, tmp_path, client, bridge):
+        """Synced tweets are upserted and checkpoints kept in the store."""
+        path = tmp_path / "tweets.db"
+        with TweetStore(path) as store:
+            sync = IncrementalSync(
+                client, StoreCheckpoints(store), initial_items=5, store=store
+            )
+            sync.poll()
+            assert store.count() == 5
+            assert store.get_checkpoint("home") == "1029"
+
+        add_tweets(bridge, 1030)
+        with TweetStore(path) as store:
+            sync = IncrementalSync(client, StoreCheckpoints(store), store=store)
+            assert [t.id for t in sync.poll().tweets] == ["1030"]
+            assert store.count() == 6
+            assert store.get_checkpoint("home") == "1030"
+            assert store.get_checkpoint("missing") is None
+
+
+class TestSeenIds:
+    """Test feeds on a client that skips seen ids."""
+
+    @pytest.fixture
+    def seen_client(self, tmp_path, bridge, stub_client):
+        """Factory for clients with seen_ids saved to the same file."""
+        seen_ids = {"capacity": 1000, "path": str(tmp_path / "seen.bloom")}
+        return lambda: stub_client(bridge, processing={"seen_ids": seen_ids})
+
+    def test_feeds_share_pages(self, tmp_path, seen_client):
+        """Every feed gets its tweets although they share timeline pages."""
+        client = seen_client()
+        sync = IncrementalSync(
+            client, CheckpointFile(tmp_path / "cp.json"), initial_items=5
+        )
+
+        results = sync.poll_all()
+        assert len(results["home"].tweets) == 5
+        assert len(results["home:replies"].tweets) == 5
+        client.close()
+
+    def test_uncommitted_poll_redelivers_after_restart(self, tmp_path, seen_client):
+        """A crash before commit re-delivers, even with the filter saved."""
+        checkpoints = tmp_path / "cp.json"
+        client = seen_client()
+        pending = IncrementalSync(client, CheckpointFile(checkpoints)).poll(
+            commit=False
+        )
+        client.close()
+
+        client = seen_client()
+        again = IncrementalSync(client, CheckpointFile(checkpoints)).poll()
+        assert [t.id for t in again.tweets] == [t.id for t in pending.tweets]
+        client.close()
+
+    def test_commit_marks_seen(self, tmp_path, seen_client):
+        """Committed tweets are skipped by later get_timeline() calls."""
+        client = seen_client()
+        sync = IncrementalSync(
+            client, CheckpointFile(tmp_path / "cp.json"), initial_items=3
+        )
+        pending = sync.poll(commit=False)
+        assert len(client.get_timeline(count=3, skip_seen=False)) == 3
+
+        sync.commit(pending)
+        assert [t.id for t in client.get_timeline(count=5)] == ["1026", "1025"]
+        client.close()
+
+
+class TestNewestId:
+    """Test numeric id comparison."""
+
+    def test_newest_id(self):
+        """Ids compare as numbers and the current value counts."""
+        assert newest_id(["999", "1000"]) == "1000"
+        assert newest_id([], "5") == "5"
+        assert newest_id(["4"], "5") == "5"
+        assert newest_id([]) is None
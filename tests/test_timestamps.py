@@ -0,0 +1,66 @@
+"""
+Tests for fast ISO-8601 timestamp parsing.
+
+Tests cover:
+- Parity with dateutil on bridge-format timestamps
+- Fallback to dateutil for non-strict formats
+- Error handling for unparseable input
+- Memoized parsing of repeated values
+"""
+
+from datetime import timezone
+
+import pytest
+from dateutil import parser as date_parser
+
+from timestamps import parse_timestamp, parse_timestamp_cached
+
+
+class TestParseTimestamp:
+    """Test parse_timestamp fast path and fallback."""
+
+    @pytest.mark.parametrize(
+        "value",
+        [
+            "2024-01-15T10:30:00.000Z",
+            "2024-03-15T14:30:00Z",
+            "2024-03-15T14:30:00",
+            "2024-03-15T14:30:00.5Z",
+            "2024-03-15T14:30:00.123456+02:00",
+            "2024-03-15T14:30:00-05:30",
+        ],
+    )
+    def test_matches_dateutil_for_iso_8601(self, value):
+        """Fast path produces the same instant and offset as dateutil."""
+        fast = parse_timestamp(value)
+        slow = date_parser.parse(value)
+
+        assert fast == slow
+        assert fast.utcoffset() == slow.utcoffset()
+
+    def test_z_suffix_is_utc(self):
+        """A trailing Z yields a UTC-aware datetime."""
+        parsed = parse_timestamp("2024-01-15T10:30:00.000Z")
+
+        assert parsed.utcoffset() == timezone.utc.utcoffset(None)
+        assert parsed.microsecond == 0
+
+    def test_falls_back_to_dateutil_for_loose_formats(self):
+        """Non-ISO strings are parsed by dateutil."""
+        assert parse_timestamp("Mon Jan 15 10:30:00 +0000 2024") == date_parser.parse(
+            "Mon Jan 15 10:30:00 +0000 2024"
+        )
+
+    def test_raises_value_error_for_invalid_input(self):
+        """Unparseable and out-of-range strings raise ValueError."""
+        with pytest.raises(ValueError):
+            parse_timestamp("not a date")
+        with pytest.raises(ValueError):
+            parse_timestamp("2024-02-30T10:30:00Z")
+
+    def test_cached_parse_returns_shared_instance(self):
+        """Repeated values are parsed once."""
+        first = parse_timestamp_cached("2020-05-01T00:00:00Z")
+        second = parse_timestamp_cached("2020-05-01T00:00:00Z")
+
+        assert first is second
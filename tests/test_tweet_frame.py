@@ -0,0 +1,163 @@
+"""
+Tests for the columnar TweetFrame.
+
+Tests cover:
+- Building frames from Tweet objects and raw dicts
+- Column dtypes
+- Vectorized methods matching the scalar model methods
+- Lazy row materialization and row selection
+"""
+
+import time
+from datetime import datetime, timedelta, timezone
+
+import numpy as np
+import pytest
+
+import models
+from tweet_frame import COLUMNS, TweetFrame
+
+
+@pytest.fixture
+def edge_case_tweets():
+    """Tweets exercising zero views, zero following and each engaging trigger."""
+    now = datetime.now(timezone.utc)
+
+    def make(i, views, followers, following, verified=False, **features):
+        return models.Tweet(
+            id=str(i),
+            text="t",
+            user=models.Profile(
+                id=str(i),
+                username="u",
+                display_name="U",
+                followers=followers,
+                following=following,
+                verified=verified,
+            ),
+            created_at=now - timedelta(hours=i),
+            engagement=models.EngagementMetrics(
+                likes=i, retweets=2 * i, replies=3, views=views
+            ),
+            features=models.ContentFeatures(**features),
+        )
+
+    return [
+        make(1, 0, 0, 0),
+        make(2, 100, 10, 0),
+        make(3, 50, 5000, 2000),
+        make(4, 10, 600, 100, has_question=True),
+        make(5, 10, 100, 100, verified=True, sentiment="positive"),
+        make(6, 10, 100, 100, topics=["ai"]),
+        make(7, 10, 100, 100, has_media=True, sentiment="negative"),
+    ]
+
+
+class TestTweetFrameConstruction:
+    """Test building TweetFrames."""
+
+    def test_from_tweets_uses_typed_columns(self, edge_case_tweets):
+        """Every column is a NumPy array of the declared dtype."""
+        frame = TweetFrame.from_tweets(edge_case_tweets)
+
+        assert len(frame) == 7
+        for name, dtype in COLUMNS.items():
+            assert frame.columns[name].dtype == dtype
+        assert frame.likes.tolist() == [1, 2, 3, 4, 5, 6, 7]
+
+    def test_from_dicts_matches_from_tweets(self, sample_records):
+        """Raw dicts produce the same columns as the equivalent Tweets."""
+        from_dicts = TweetFrame.from_dicts(sample_records)
+        from_tweets = TweetFrame.from_tweets(
+            models.Tweet.from_dict(record) for record in sample_records
+        )
+
+        for name in COLUMNS:
+            np.testing.assert_array_equal(
+                from_dicts.columns[name], from_tweets.columns[name]
+            )
+        assert from_dicts.ids.tolist() == [r["id"] for r in sample_records]
+
+    def test_empty_frame(self):
+        """An empty input yields an empty frame."""
+        frame = TweetFrame.from_tweets([])
+
+        assert len(frame) == 0
+        assert frame.engagement_rate().shape == (0,)
+
+
+class TestTweetFrameVectorizedMethods:
+    """Test vectorized equivalents of the model methods."""
+
+    def test_engagement_methods_match_scalar(self, edge_case_tweets):
+        """total_engagements/engagement_rate match EngagementMetrics."""
+        frame = TweetFrame.from_tweets(edge_case_tweets)
+
+        assert frame.total_engagements().tolist() == [
+            t.engagement.total_engagements() for t in edge_case_tweets
+        ]
+        np.testing.assert_allclose(
+            frame.engagement_rate(),
+            [t.engagement.engagement_rate() for t in edge_case_tweets],
+        )
+
+    def test_age_hours_matches_scalar(self, edge_case_tweets):
+        """age_hours matches Tweet.age_hours."""
+        frame = TweetFrame.from_tweets(edge_case_tweets)
+
+        ages = frame.age_hours(now=time.time())
+
+        np.testing.assert_allclose(
+            ages, [t.age_hours() for t in edge_case_tweets], atol=1e-3
+        )
+
+    def test_is_engaging_matches_scalar(self, edge_case_tweets):
+        """is_engaging matches ContentFeatures.is_engaging."""
+        frame = TweetFrame.from_tweets(edge_case_tweets)
+
+        assert frame.is_engaging().tolist() == [
+            t.features.is_engaging() for t in edge_case_tweets
+        ]
+
+    def test_profile_methods_match_scalar(self, edge_case_tweets):
+        """follower_ratio/is_influential match Profile."""
+        frame = TweetFrame.from_tweets(edge_case_tweets)
+
+        assert frame.follower_ratio().tolist() == [
+            t.user.follower_ratio() for t in edge_case_tweets
+        ]
+        assert frame.is_influential().tolist() == [
+            t.user.is_influential() for t in edge_case_tweets
+        ]
+
+
+class TestTweetFrameRows:
+    """Test lazy row access and selection."""
+
+    def test_rows_materialize_lazily_from_dicts(self, sample_records):
+        """Indexing builds a Tweet once and reuses it."""
+        frame = TweetFrame.from_dicts(sample_records)
+
+        tweet = frame[1]
+
+        assert isinstance(tweet, models.Tweet)
+        assert tweet.id == sample_records[1]["id"]
+        assert frame[1] is tweet
+        assert frame[-1].id == sample_records[-1]["id"]
+
+    def test_rows_from_tweets_return_original_objects(self, edge_case_tweets):
+        """Frames built from Tweets return the original instances."""
+        frame = TweetFrame.from_tweets(edge_case_tweets)
+
+        assert frame[0] is edge_case_tweets[0]
+
+    def test_take_selects_rows_by_mask(self, edge_case_tweets):
+        """take() accepts boolean masks and index arrays."""
+        frame = TweetFrame.from_tweets(edge_case_tweets)
+
+        engaging = frame.take(frame.is_engaging())
+
+        assert engaging.ids.tolist() == ["4", "5", "6", "7"]
+        assert engaging[0] is edge_case_tweets[3]
+        assert engaging.usernames.tolist() == ["u"] * 4
+        assert len(frame.take([])) == 0
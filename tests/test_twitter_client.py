@@ -15,6 +15,8 @@ Tests cover:
 """
 
 import json
+import threading
+import time
 import pytest
 from unittest.mock import Mock, patch, MagicMock
 from pathlib import Path
@@ -24,7 +26,8 @@ import requests
 # Import the classes we need to test with
 from models import Tweet, Profile, EngagementMetrics, ContentFeatures
 from config import AppConfig
-from twitter_client import TwitterClient, TwitterClientError
+from twitter_client import ProfileInterner, TwitterClient, TwitterClientError
+from stub_bridge import StubBridge, make_bridge_tweet
 
 
 # Global fixtures available to all test classes
@@ -346,6 +349,66 @@ class TestTwitterClientResponseNormalization:
         assert tweet.engagement is not None  # Should have default values
         assert tweet.features is not None
 
+    def test_extracts_content_features_from_text(self, authenticated_client):
+        """Features come from the text; a # inside a URL is not a hashtag."""
+        tweet = authenticated_client._normalize_tweet({
+            "id": "123",
+            "text": "Docs at https://example.com/#setup for @dev? #Python",
+            "user": {"id": "456", "username": "user", "displayName": "User"},
+            "createdAt": "2024-01-15T10:30:00.000Z"
+        })
+
+        assert tweet.features.has_links and tweet.features.has_question
+        assert tweet.features.word_count == 6
+        assert tweet.hashtags == ["Python"]
+        assert tweet.mentions == ["dev"]
+
+    def test_links_from_bridge_urls(self, authenticated_client):
+        """A urls field marks links even when the text has none."""
+        tweet = authenticated_client._normalize_tweet({
+            "id": "123",
+            "text": "Read this",
+            "urls": ["https://example.com/article"],
+            "user": {"id": "456", "username": "user", "displayName": "User"},
+            "createdAt": "2024-01-15T10:30:00.000Z"
+        })
+
+        assert tweet.features.has_links
+
+    def test_bridge_entities_take_precedence(self, authenticated_client):
+        """Hashtags and mentions sent by the bridge are kept as-is."""
+        tweet = authenticated_client._normalize_tweet({
+            "id": "123",
+            "text": "#one @two",
+            "hashtags": [],
+            "mentions": ["three"],
+            "user": {"id": "456", "username": "user", "displayName": "User"},
+            "createdAt": "2024-01-15T10:30:00.000Z"
+        })
+
+        assert tweet.hashtags == []
+        assert tweet.mentions == ["three"]
+        assert tweet.features.has_hashtags
+
+    def test_sentiment_is_scored_from_text(self, authenticated_client):
+        """Sentiment is derived from the text; retweets reuse the memoized score."""
+        user = {"id": "456", "username": "user", "displayName": "User"}
+        original = authenticated_client._normalize_tweet(
+            {"id": "1", "text": "This release is not bad, I love it 🎉", "user": user}
+        )
+        retweet = authenticated_client._normalize_tweet(
+            {"id": "2", "text": "RT @user: This release is not bad, I love it 🎉",
+             "user": user}
+        )
+        neutral = authenticated_client._normalize_tweet(
+            {"id": "3", "text": "Release notes are published", "user": user}
+        )
+
+        assert original.features.sentiment == "positive"
+        assert retweet.features.sentiment == "positive"
+        assert neutral.features.sentiment == "neutral"
+        assert authenticated_client.sentiment_analyzer.hits == 1
+
 
 class TestTwitterClientFunctionalMethods:
     """Test functional client methods that work with Node.js bridge."""
@@ -791,3 +854,266 @@ class TestTwitterClientCookieValidation:
             match=r"Authentication cookies invalid or incomplete; see is_authenticated\(\) docstring for required set"
         ):
             client.get_timeline()
+
+
+class TestTwitterClientBatchRetrieval:
+    """Test get_tweets() batch retrieval against the stub bridge."""
+    
+    @pytest.fixture
+    def bridge(self):
+        """Serve ten tweets from a local stand-in bridge."""
+        tweets = [make_bridge_tweet(str(1000 + i)) for i in range(10)]
+        with StubBridge(tweets) as bridge:
+            yield bridge
+            
+    def test_returns_results_in_input_order(self, bridge, stub_client):
+        """get_tweets() returns tweets aligned with the requested ids."""
+        client = stub_client(bridge)
+        
+        results = client.get_tweets(["1005", "1001", "1009"])
+        
+        assert [tweet.id for tweet in results] == ["1005", "1001", "1009"]
+        assert all(isinstance(tweet, Tweet) for tweet in results)
+        
+    def test_deduplicates_and_chunks_ids(self, bridge, stub_client):
+        """Duplicate ids are fetched once and ids are chunked by batch_size."""
+        client = stub_client(bridge, processing={"batch_size": 4})
+        ids = [str(1000 + i) for i in range(10)] + ["1000", "1003"]
+        
+        results = client.get_tweets(ids)
+        
+        batches = bridge.requests_to("/api/tweets")
+        assert [len(body["ids"]) for body in batches] == [4, 4, 2]
+        assert len(results) == 12
+        assert results[10] is results[0]
+        
+    def test_reports_per_id_errors(self, bridge, stub_client):
+        """Missing ids yield NOT_FOUND errors without failing the batch."""
+        client = stub_client(bridge)
+        
+        results = client.get_tweets(["1000", "missing", "1001"])
+        
+        assert isinstance(results[0], Tweet)
+        assert isinstance(results[1], TwitterClientError)
+        assert results[1].code == "NOT_FOUND"
+        assert "not found" in str(results[1])
+        assert isinstance(results[2], Tweet)
+        
+    def test_batch_failure_reported_for_every_id(self, sample_cookie_data):
+        """A failing batch request becomes a per-id error for its ids."""
+        client = TwitterClient()
+        client.load_cookies(sample_cookie_data)
+        
+        with patch('requests.Session.post') as mock_post:
+            mock_post.return_value = Mock(
+                status_code=400,
+                json=lambda: {"error": {"code": "VALIDATION_ERROR", "message": "Bad ids"}}
+            )
+            results = client.get_tweets(["1", "2"])
+            
+        assert all(isinstance(result, TwitterClientError) for result in results)
+        assert results[0].code == "VALIDATION_ERROR"
+        
+    def test_falls_back_to_single_lookups_without_batch_route(self, stub_client):
+        """A bridge without /api/tweets is asked for each id on its own."""
+        tweets = [make_bridge_tweet(str(1000 + i)) for i in range(5)]
+        with StubBridge(tweets, batch_route=False) as bridge:
+            client = stub_client(bridge, processing={"batch_size": 2})
+            
+            results = client.get_tweets(["1000", "missing", "1001", "1000"])
+            more = client.get_tweets(["1002", "1003"])
+            
+            assert [type(r) for r in results] == [Tweet, TwitterClientError, Tweet, Tweet]
+            assert results[1].code == "NOT_FOUND"
+            assert "Unknown route" not in str(results[1])
+            assert [tweet.id for tweet in more] == ["1002", "1003"]
+            assert len(bridge.requests_to("/api/tweets")) == 1
+            single = [path for _, path, _ in bridge.requests if path.startswith("/api/tweet/")]
+            assert single == [f"/api/tweet/{i}" for i in ("1000", "missing", "1001", "1002", "1003")]
+            
+    def test_fallback_lookups_coalesce_concurrent_requests(self, stub_client):
+        """Single-id fallback requests are still shared between callers."""
+        tweets = [make_bridge_tweet(str(1000 + i)) for i in range(5)]
+        with StubBridge(tweets, delay=0.1, batch_route=False) as bridge:
+            client = stub_client(bridge)
+            results = {}
+            
+            def fetch(name, ids):
+                results[name] = client.get_tweets(ids)
+                
+            first = threading.Thread(target=fetch, args=("first", ["1000", "1001"]))
+            first.start()
+            while not bridge.requests_to("/api/tweets"):
+                time.sleep(0.005)
+            second = threading.Thread(target=fetch, args=("second", ["1001", "1002"]))
+            second.start()
+            first.join()
+            second.join()
+            
+            single = sorted(path for _, path, _ in bridge.requests if path.startswith("/api/tweet/"))
+            assert single == ["/api/tweet/1000", "/api/tweet/1001", "/api/tweet/1002"]
+            assert results["second"][0] is results["first"][1]
+            
+    def test_coalesces_concurrent_requests_for_same_ids(self, bridge, stub_client):
+        """Concurrent callers share one in-flight fetch per id."""
+        bridge.delay = 0.2
+        client = stub_client(bridge)
+        results = {}
+        
+        def fetch(name, ids):
+            results[name] = client.get_tweets(ids)
+            
+        first = threading.Thread(target=fetch, args=("first", ["1000", "1001"]))
+        first.start()
+        while not bridge.requests_to("/api/tweets"):
+            time.sleep(0.005)
+        second = threading.Thread(target=fetch, args=("second", ["1001", "1002"]))
+        second.start()
+        first.join()
+        second.join()
+        
+        requested = [i for body in bridge.requests_to("/api/tweets") for i in body["ids"]]
+        assert sorted(requested) == ["1000", "1001", "1002"]
+        assert results["second"][0] is results["first"][1]
+
+
+class TestTwitterClientTimelinePagination:
+    """Test iter_timeline() cursor pagination against the stub bridge."""
+    
+    @pytest.fixture
+    def bridge(self):
+        """Serve 25 timeline tweets from a local stand-in bridge."""
+        tweets = [make_bridge_tweet(str(1000 + i)) for i in range(25)]
+        with StubBridge(tweets) as bridge:
+            yield bridge
+            
+    @pytest.fixture
+    def client(self, bridge, stub_client):
+        """Authenticated client pointed at the bridge."""
+        return stub_client(bridge)
+        
+    def test_follows_cursors_until_has_more_is_false(self, client, bridge):
+        """iter_timeline() yields every page in order."""
+        tweets = list(client.iter_timeline(page_size=10))
+        
+        assert [tweet.id for tweet in tweets] == [str(1024 - i) for i in range(25)]
+        bodies = bridge.requests_to("/api/timeline")
+        assert [body.get("cursor") for body in bodies] == [None, "10", "20"]
+        
+    def test_max_items_limits_requests(self, client, bridge):
+        """max_items trims the last page request and stops paging."""
+        tweets = list(client.iter_timeline(max_items=12, page_size=10))
+        
+        assert len(tweets) == 12
+        assert [body["count"] for body in bridge.requests_to("/api/timeline")] == [10, 2]
+        
+    def test_prefetches_next_page_while_consuming(self, client, bridge):
+        """The next page is requested before the current one is consumed."""
+        stream = client.iter_timeline(page_size=10)
+        next(stream)
+        
+        deadline = time.monotonic() + 2
+        while len(bridge.requests_to("/api/timeline")) < 2 and time.monotonic() < deadline:
+            time.sleep(0.005)
+        assert len(bridge.requests_to("/api/timeline")) == 2
+        stream.close()
+        
+    def test_stopping_early_fetches_no_further_pages(self, client, bridge):
+        """Closing the generator stops pagination."""
+        stream = client.iter_timeline(page_size=10)
+        first_five = [next(stream) for _ in range(5)]
+        stream.close()
+        time.sleep(0.05)
+        
+        assert len(first_five) == 5
+        assert len(bridge.requests_to("/api/timeline")) <= 2
+        
+    @patch('requests.Session.post')
+    def test_stops_when_no_cursor_returned(self, mock_post, authenticated_client, mock_bridge_responses):
+        """hasMore without nextCursor cannot advance and ends the stream."""
+        mock_post.return_value = Mock(
+            status_code=200, json=lambda: mock_bridge_responses["timeline_success"]
+        )
+        
+        tweets = list(authenticated_client.iter_timeline())
+        
+        assert len(tweets) == 1
+        assert mock_post.call_count == 1
+        
+    def test_rejects_non_positive_page_size(self, client):
+        """page_size must be positive."""
+        with pytest.raises(ValueError, match="page_size must be positive"):
+            list(client.iter_timeline(page_size=0))
+
+
+class TestTwitterClientProfileInterning:
+    """Test Profile sharing during timeline normalization."""
+    
+    def timeline(self, *authors):
+        """Bridge timeline payload with one tweet per (user_id, followers) pair."""
+        return {
+            "success": True,
+            "data": [
+                make_bridge_tweet(
+                    str(1000 + i),
+                    user={
+                        "id": user_id,
+                        "username": f"user_{user_id}",
+                        "displayName": f"User {user_id}",
+                        "followers": followers,
+                        "joinDate": "2020-05-01T00:00:00.000Z",
+                    },
+                )
+                for i, (user_id, followers) in enumerate(authors)
+            ],
+        }
+        
+    @patch('requests.Session.post')
+    def test_tweets_by_same_author_share_profile(self, mock_post, authenticated_client):
+        """Tweets from one author in a response share one Profile instance."""
+        payload = self.timeline(("1", 100), ("2", 200), ("1", 150))
+        mock_post.return_value = Mock(status_code=200, json=lambda: payload)
+        
+        tweets = authenticated_client.get_timeline()
+        
+        assert tweets[0].user is tweets[2].user
+        assert tweets[0].user is not tweets[1].user
+        assert tweets[0].user.followers == 150
+        
+    @patch('requests.Session.post')
+    def test_profiles_scoped_per_response_by_default(self, mock_post, authenticated_client):
+        """Without a client interner, responses do not share profiles."""
+        payload = self.timeline(("1", 100))
+        mock_post.return_value = Mock(status_code=200, json=lambda: payload)
+        
+        first = authenticated_client.get_timeline()
+        second = authenticated_client.get_timeline()
+        
+        assert first[0].user is not second[0].user
+        
+    @patch('requests.Session.post')
+    def test_client_interner_spans_responses(self, mock_post, sample_cookie_data):
+        """processing['profile_intern_size'] shares profiles across responses."""
+        config = AppConfig()
+        config.processing["profile_intern_size"] = 2
+        client = TwitterClient(config=config)
+        client.load_cookies(sample_cookie_data)
+        payloads = [self.timeline(("1", 100)), self.timeline(("1", 175), ("2", 5), ("3", 7))]
+        mock_post.side_effect = [Mock(status_code=200, json=lambda p=p: p) for p in payloads]
+        
+        first = client.get_timeline()
+        second = client.get_timeline()
+        
+        assert second[0].user is first[0].user
+        assert first[0].user.followers == 175
+        assert len(client.profile_interner) == 2
+        
+    def test_profiles_without_id_are_not_interned(self):
+        """Users without an id always get their own Profile."""
+        interner = ProfileInterner()
+        
+        first = interner.get_or_create({"username": "anon"}, TwitterClient()._normalize_user)
+        second = interner.get_or_create({"username": "anon"}, TwitterClient()._normalize_user)
+        
+        assert first is not second
+        assert len(interner) == 0
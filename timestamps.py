@@ -0,0 +1,48 @@
+"""
+Fast timestamp parsing for bridge and fixture data.
+
+The Node.js bridge always emits strict ISO-8601 timestamps such as
+`2024-01-15T10:30:00.000Z`. These are parsed with `datetime.fromisoformat`,
+which is implemented in C and far cheaper than `dateutil.parser.parse`.
+Anything the fast path rejects falls back to dateutil, so loosely formatted
+input keeps parsing exactly as before.
+"""
+
+import re
+from datetime import datetime
+from functools import lru_cache
+
+from dateutil import parser as date_parser
+
+# Strict bridge format: date, time, optional fraction, optional Z/offset.
+_ISO_8601 = re.compile(
+    r"\d{4}-\d{2}-\d{2}T\d{2}:\d{2}:\d{2}(?:\.(\d{1,6}))?(Z|[+-]\d{2}:\d{2})?"
+)
+
+
+def parse_timestamp(value: str) -> datetime:
+    """Parse a timestamp string, using the ISO-8601 fast path when possible.
+
+    A trailing `Z` yields a UTC-aware datetime, matching dateutil. Raises
+    ValueError for strings neither parser understands.
+    """
+    match = _ISO_8601.fullmatch(value)
+    if match is not None:
+        fraction, offset = match.groups()
+        # fromisoformat before Python 3.11 accepts neither `Z` nor fractions
+        # other than 3 or 6 digits; normalize both before parsing.
+        if offset == "Z":
+            value = value[:-1] + "+00:00"
+        if fraction is not None and len(fraction) not in (3, 6):
+            start = value.index(".") + 1
+            value = (
+                value[:start] + fraction.ljust(6, "0") + value[start + len(fraction) :]
+            )
+        return datetime.fromisoformat(value)
+    return date_parser.parse(value)
+
+
+@lru_cache(maxsize=4096)
+def parse_timestamp_cached(value: str) -> datetime:
+    """Memoized parse_timestamp for values that repeat, such as join dates."""
+    return parse_timestamp(value)
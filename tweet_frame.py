@@ -0,0 +1,296 @@
+"""
+Columnar TweetFrame backed by typed NumPy arrays.
+
+A TweetFrame holds the numeric and boolean parts of many tweets as one array
+per column, so analysis passes run as vectorized NumPy expressions instead of
+per-tweet method calls. The vectorized methods mirror the model methods:
+- total_engagements / engagement_rate -> EngagementMetrics
+- age_hours -> Tweet.age_hours
+- is_engaging -> ContentFeatures.is_engaging
+- follower_ratio / is_influential -> Profile
+
+Author usernames are kept alongside the ids as an object array. Rows are
+materialized as Tweet objects lazily, only when indexed. A frame may also be
+given ids, usernames and rows as lazy sequences with a take() method (as
+TweetArchive does); those become arrays only when first read.
+"""
+
+import time
+from typing import Any, Dict, Iterable, List, Optional, Sequence, Union
+
+import numpy as np
+
+from models import Tweet
+from snowflake import id_sort_key, is_snowflake, snowflake_bounds, snowflake_to_datetime
+from timestamps import parse_timestamp
+
+SENTIMENT_CODES = {"negative": -1, "neutral": 0, "positive": 1}
+
+FEATURE_FLAGS = (
+    "has_question",
+    "has_media",
+    "has_links",
+    "has_hashtags",
+    "has_mentions",
+)
+
+# Column name -> dtype for every column a frame carries.
+COLUMNS = {
+    "likes": np.int64,
+    "retweets": np.int64,
+    "replies": np.int64,
+    "views": np.int64,
+    "created_at": np.float64,
+    "followers": np.int64,
+    "following": np.int64,
+    "verified": np.bool_,
+    "sentiment": np.int8,
+    "topic_count": np.int32,
+    "length": np.int32,
+    "word_count": np.int32,
+    **{flag: np.bool_ for flag in FEATURE_FLAGS},
+}
+
+
+def _tweet_row(tweet: Tweet) -> tuple:
+    """Column values for a Tweet, in COLUMNS order."""
+    engagement = tweet.engagement
+    features = tweet.features
+    user = tweet.user
+    return (
+        engagement.likes,
+        engagement.retweets,
+        engagement.replies,
+        engagement.views,
+        tweet.created_at.timestamp(),
+        user.followers,
+        user.following,
+        user.verified,
+        SENTIMENT_CODES[features.sentiment],
+        len(features.topics),
+        features.length,
+        features.word_count,
+        features.has_question,
+        features.has_media,
+        features.has_links,
+        features.has_hashtags,
+        features.has_mentions,
+    )
+
+
+def _dict_row(data: Dict[str, Any]) -> tuple:
+    """Column values for a bridge/fixture dict, read as Tweet.from_dict reads it."""
+    engagement = data.get("engagement") or {}
+    features = data.get("features") or {}
+    user = data.get("user") or {}
+    created_at = data.get("createdAt", data.get("created_at"))
+    if isinstance(created_at, str):
+        created_at = parse_timestamp(created_at)
+    if created_at is None and is_snowflake(data.get("id", "")):
+        created_at = snowflake_to_datetime(data["id"])
+    if created_at is None:
+        raise ValueError("createdAt field is required and must be a valid datetime")
+    return (
+        engagement.get("likes", 0),
+        engagement.get("retweets", 0),
+        engagement.get("replies", 0),
+        engagement.get("views", 0),
+        created_at.timestamp(),
+        user.get("followers", 0),
+        user.get("following", 0),
+        user.get("verified", False),
+        SENTIMENT_CODES[features.get("sentiment", "neutral")],
+        len(features.get("topics", [])),
+        features.get("length", 0),
+        features.get("wordCount", features.get("word_count", 0)),
+        features.get("hasQuestion", features.get("has_question", False)),
+        features.get("hasMedia", features.get("has_media", False)),
+        features.get("hasLinks", features.get("has_links", False)),
+        features.get("hasHashtags", features.get("has_hashtags", False)),
+        features.get("hasMentions", features.get("has_mentions", False)),
+    )
+
+
+def _object_column(values: Sequence[Any]) -> Any:
+    """values as an object array, unless it is a lazy sequence with take()."""
+    if hasattr(values, "take") and not isinstance(values, np.ndarray):
+        return values
+    return np.asarray(values, dtype=object)
+
+
+class TweetFrame:
+    """Columnar collection of tweets with vectorized model methods."""
+
+    def __init__(
+        self,
+        ids: Sequence[str],
+        columns: Dict[str, np.ndarray],
+        rows: Sequence[Union[Tweet, Dict[str, Any]]],
+        usernames: Optional[Sequence[str]] = None,
+    ):
+        """Wrap prepared columns; use from_tweets() or from_dicts() instead."""
+        missing = set(COLUMNS) - set(columns)
+        if missing:
+            raise ValueError(f"Missing columns: {sorted(missing)}")
+        if any(len(column) != len(ids) for column in columns.values()):
+            raise ValueError("All columns must have the same length")
+        if usernames is None:
+            usernames = [""] * len(ids)
+        elif len(usernames) != len(ids):
+            raise ValueError("usernames must have one entry per row")
+        self._length = len(ids)
+        self._ids = _object_column(ids)
+        self._usernames = _object_column(usernames)
+        self.columns = columns
+        self._rows = rows
+        self._materialized: Dict[int, Tweet] = {}
+
+    @property
+    def ids(self) -> np.ndarray:
+        """Tweet ids as an object array."""
+        if not isinstance(self._ids, np.ndarray):
+            self._ids = np.asarray(self._ids, dtype=object)
+        return self._ids
+
+    @property
+    def usernames(self) -> np.ndarray:
+        """Author usernames as an object array."""
+        if not isinstance(self._usernames, np.ndarray):
+            self._usernames = np.asarray(self._usernames, dtype=object)
+        return self._usernames
+
+    @classmethod
+    def _from_rows(
+        cls, ids: List[str], values: List[tuple], rows, usernames: List[str]
+    ) -> "TweetFrame":
+        columns = {}
+        for position, (name, dtype) in enumerate(COLUMNS.items()):
+            columns[name] = np.fromiter(
+                (row[position] for row in values), dtype=dtype, count=len(values)
+            )
+        return cls(ids, columns, rows, usernames)
+
+    @classmethod
+    def from_tweets(cls, tweets: Iterable[Tweet]) -> "TweetFrame":
+        """Build a frame from Tweet objects."""
+        tweets = list(tweets)
+        return cls._from_rows(
+            [tweet.id for tweet in tweets],
+            [_tweet_row(tweet) for tweet in tweets],
+            tweets,
+            [tweet.user.username for tweet in tweets],
+        )
+
+    @classmethod
+    def from_dicts(cls, records: Iterable[Dict[str, Any]]) -> "TweetFrame":
+        """Build a frame from raw tweet dicts without creating Tweet objects."""
+        records = list(records)
+        return cls._from_rows(
+            [record.get("id", "") for record in records],
+            [_dict_row(record) for record in records],
+            records,
+            [(record.get("user") or {}).get("username", "") for record in records],
+        )
+
+    def __len__(self) -> int:
+        """Number of tweets in the frame."""
+        return self._length
+
+    def __getattr__(self, name: str) -> np.ndarray:
+        """Expose columns as attributes, e.g. frame.likes."""
+        columns = self.__dict__.get("columns", {})
+        if name in columns:
+            return columns[name]
+        raise AttributeError(name)
+
+    def __getitem__(self, index: int) -> Tweet:
+        """Materialize row index as a Tweet (cached after first access)."""
+        if index < 0:
+            index += len(self)
+        tweet = self._materialized.get(index)
+        if tweet is None:
+            row = self._rows[index]
+            tweet = row if isinstance(row, Tweet) else Tweet.from_dict(row)
+            self._materialized[index] = tweet
+        return tweet
+
+    def take(self, indices: Union[Sequence[int], np.ndarray]) -> "TweetFrame":
+        """Return a new frame with the given rows (indices or boolean mask)."""
+        indices = np.asarray(indices)
+        if indices.dtype == np.bool_:
+            indices = np.flatnonzero(indices)
+        indices = indices.astype(np.intp, copy=False)
+        rows = self._rows
+        return TweetFrame(
+            self._ids.take(indices),
+            {name: column[indices] for name, column in self.columns.items()},
+            rows.take(indices) if hasattr(rows, "take") else [rows[i] for i in indices],
+            self._usernames.take(indices),
+        )
+
+    def numeric_ids(self) -> np.ndarray:
+        """Tweet ids as int64 (-1 for non-numeric ids), for id ordering."""
+        return np.fromiter(
+            (id_sort_key(tweet_id) for tweet_id in self.ids),
+            dtype=np.int64,
+            count=len(self),
+        )
+
+    def sort_by_id(self, descending: bool = False) -> "TweetFrame":
+        """Frame ordered by numeric id, i.e. by creation time for Snowflake ids."""
+        order = np.argsort(self.numeric_ids(), kind="stable")
+        return self.take(order[::-1] if descending else order)
+
+    def created_between(self, start_ms: int, end_ms: int) -> "TweetFrame":
+        """Rows whose Snowflake id falls in [start_ms, end_ms] (epoch ms).
+
+        Selects by id alone; no timestamps are parsed or read.
+        """
+        low, high = snowflake_bounds(start_ms, end_ms)
+        ids = self.numeric_ids()
+        return self.take((ids >= low) & (ids <= high))
+
+    def total_engagements(self) -> np.ndarray:
+        """Likes + retweets + replies per tweet."""
+        columns = self.columns
+        return columns["likes"] + columns["retweets"] + columns["replies"]
+
+    def engagement_rate(self) -> np.ndarray:
+        """Total engagements / views per tweet, 0.0 where views is 0."""
+        views = self.columns["views"]
+        rate = np.zeros(len(self), dtype=np.float64)
+        np.divide(self.total_engagements(), views, out=rate, where=views != 0)
+        return rate
+
+    def age_hours(self, now: Optional[float] = None) -> np.ndarray:
+        """Age of each tweet in hours relative to now (epoch seconds)."""
+        if now is None:
+            now = time.time()
+        return (now - self.columns["created_at"]) / 3600
+
+    def is_engaging(self) -> np.ndarray:
+        """ContentFeatures.is_engaging() per tweet."""
+        columns = self.columns
+        return (
+            columns["has_question"]
+            | columns["has_media"]
+            | (columns["sentiment"] == SENTIMENT_CODES["positive"])
+            | (columns["topic_count"] > 0)
+        )
+
+    def follower_ratio(self) -> np.ndarray:
+        """Profile.follower_ratio() per tweet author (inf for 0 following)."""
+        followers = self.columns["followers"].astype(np.float64)
+        following = self.columns["following"]
+        ratio = np.where(followers > 0, np.inf, 0.0)
+        np.divide(followers, following, out=ratio, where=following != 0)
+        return ratio
+
+    def is_influential(self) -> np.ndarray:
+        """Profile.is_influential() per tweet author."""
+        ratio = self.follower_ratio()
+        return (
+            self.columns["verified"]
+            | (self.columns["followers"] >= 5000)
+            | (np.isfinite(ratio) & (ratio >= 5.0))
+        )
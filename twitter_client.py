@@ -8,25 +8,147 @@ to Python data models from models.py.
 
 import json
 import time
+import threading
 import requests
-from typing import List, Dict, Any, Optional
+from concurrent.futures import Future, ThreadPoolExecutor
+from collections import OrderedDict
+from typing import (Callable, List, Dict, Any, Iterator, Optional, Sequence, Set,
+                    Tuple, Union, Iterable)
 from datetime import datetime
-from dateutil import parser as date_parser
 
-from models import Tweet, Profile, EngagementMetrics, ContentFeatures
+from models import Tweet, Profile, EngagementMetrics
 from config import AppConfig
+from bloom import SeenIds
+from cache import TTLCache
+from capture import CaptureLog
+from features import record_features
+from keywords import KeywordMatcher
+from rate_limiter import RateLimiter
+from sentiment import SentimentAnalyzer
+from snowflake import id_sort_key, is_snowflake, snowflake_to_datetime
+from timestamps import parse_timestamp, parse_timestamp_cached
 
 
 class TwitterClientError(Exception):
     """Custom exception for TwitterClient errors."""
-    pass
+    
+    def __init__(self, message: str = "", code: Optional[str] = None):
+        """Store the bridge error code (e.g. 'NOT_FOUND') when one is known."""
+        super().__init__(message)
+        self.code = code
+
+
+def _is_unknown_route(error: TwitterClientError) -> bool:
+    """Whether error is the bridge's 404 for a route it does not serve."""
+    return error.code == 'NOT_FOUND' and 'Unknown route' in str(error)
+
+
+class _SingleFlight:
+    """Coalesce concurrent fetches of the same key into one in-flight call."""
+    
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._calls: Dict[str, Future] = {}
+        
+    def claim(self, keys: Sequence[str]) -> Tuple[List[str], Dict[str, Future]]:
+        """Return keys this caller must fetch and futures for every key."""
+        owned: List[str] = []
+        futures: Dict[str, Future] = {}
+        with self._lock:
+            for key in keys:
+                future = self._calls.get(key)
+                if future is None:
+                    future = Future()
+                    self._calls[key] = future
+                    owned.append(key)
+                futures[key] = future
+        return owned, futures
+        
+    def resolve(self, key: str, result: Any) -> None:
+        """Publish the result for an owned key to all waiters."""
+        with self._lock:
+            future = self._calls.pop(key)
+        future.set_result(result)
+        
+    def fail(self, key: str, exc: BaseException) -> None:
+        """Propagate an unexpected exception for an owned key to all waiters."""
+        with self._lock:
+            future = self._calls.pop(key, None)
+        if future is not None and not future.done():
+            future.set_exception(exc)
+
+
+class ProfileInterner:
+    """Identity map that shares one Profile instance per user id.
+    
+    Scoped to a single response, it lets every tweet by the same author share
+    one Profile. Owned by a client with max_size set, it also spans responses
+    and evicts the least recently seen authors. When an author is seen again
+    the follower, following and tweet counts are refreshed in place, so the
+    freshest counts win.
+    """
+    
+    REFRESHED_FIELDS = (
+        ('followers', 'followers'),
+        ('following', 'following'),
+        ('tweetCount', 'tweet_count'),
+        ('verified', 'verified'),
+    )
+    
+    def __init__(self, max_size: Optional[int] = None):
+        """Initialize an empty identity map, unbounded unless max_size is set."""
+        if max_size is not None and max_size <= 0:
+            raise ValueError("Profile intern max_size must be positive")
+        self.max_size = max_size
+        self._profiles: "OrderedDict[str, Profile]" = OrderedDict()
+        self._lock = threading.Lock()
+        
+    def __len__(self) -> int:
+        """Number of interned profiles."""
+        return len(self._profiles)
+        
+    def get_or_create(self, user_data: Dict[str, Any],
+                      factory: Callable[[Dict[str, Any]], Profile]) -> Profile:
+        """Return the shared Profile for user_data, building it on first sight."""
+        user_id = user_data.get('id')
+        if not user_id:
+            return factory(user_data)
+            
+        with self._lock:
+            profile = self._profiles.get(user_id)
+            if profile is not None:
+                self._profiles.move_to_end(user_id)
+                for source, attribute in self.REFRESHED_FIELDS:
+                    if source in user_data:
+                        setattr(profile, attribute, user_data[source])
+                return profile
+                
+        profile = factory(user_data)
+        with self._lock:
+            # Another thread may have interned the same author meanwhile
+            profile = self._profiles.setdefault(user_id, profile)
+            if self.max_size is not None and len(self._profiles) > self.max_size:
+                self._profiles.popitem(last=False)
+        return profile
+        
+    def clear(self) -> None:
+        """Forget every interned profile."""
+        with self._lock:
+            self._profiles.clear()
 
 
 class TwitterClient:
     """Twitter client that communicates with Node.js bridge via HTTP requests."""
     
-    def __init__(self, config: Optional[AppConfig] = None):
-        """Initialize TwitterClient with configuration."""
+    def __init__(self, config: Optional[AppConfig] = None, cache: Optional[TTLCache] = None,
+                 seen_store: Optional[Any] = None):
+        """Initialize TwitterClient with configuration.
+        
+        Tweet lookups are cached when a cache is passed in or api['cache'] is
+        configured; otherwise every lookup goes to the bridge. seen_store (a
+        TweetStore) confirms the seen-id filter's "maybe seen" answers when
+        processing['seen_ids'] is configured; see SeenIds.
+        """
         self.config = config or AppConfig()
         if not hasattr(self.config, 'api') or 'base_url' not in self.config.api:
             self.config.api = {"base_url": "http://localhost:3000"}
@@ -46,6 +168,54 @@ class TwitterClient:
         })
         
         self.cookie_data: Optional[Dict[str, Any]] = None
+        self._inflight_tweets = _SingleFlight()
+        # Set once the bridge answers /api/tweets with an unknown-route 404
+        self._batch_route_missing = False
+        
+        cache_config = self.config.api.get('cache')
+        if cache is None and cache_config:
+            cache = TTLCache.from_config(cache_config)
+        self.cache: Optional[TTLCache] = cache
+        
+        # Share Profiles across responses when processing['profile_intern_size'] is set
+        intern_size = self.config.processing.get('profile_intern_size')
+        self.profile_interner: Optional[ProfileInterner] = (
+            ProfileInterner(max_size=intern_size) if intern_size else None
+        )
+        
+        # Sentiment labels are memoized by normalized text, so retweets and
+        # duplicate texts are scored once
+        self.sentiment_analyzer = SentimentAnalyzer(
+            memo_size=self.config.processing.get('sentiment_memo_size', 65536)
+        )
+        
+        # Topics come from the persona's content pillars; assign a matcher built
+        # with KeywordMatcher.from_config(strategy, persona) to add keywords
+        self.keyword_matcher: Optional[KeywordMatcher] = (
+            KeywordMatcher.from_config(persona=self.config.persona)
+            if self.config.persona.content_pillars else None
+        )
+        
+        # Client-side rate limiting from api['rate_limit'], if configured
+        rate_limit = self.config.api.get('rate_limit')
+        self.rate_limiter: Optional[RateLimiter] = (
+            RateLimiter.from_config(rate_limit) if rate_limit else None
+        )
+        
+        # Raw bridge traffic is appended to a capture log when api['capture']
+        # is configured; capture.ReplayTransport serves it back later
+        capture_config = self.config.api.get('capture')
+        self.capture: Optional[CaptureLog] = (
+            CaptureLog.from_config(capture_config) if capture_config else None
+        )
+        
+        # Timeline tweets whose ids were already returned are dropped before
+        # normalization when processing['seen_ids'] is configured; Bloom
+        # filter hits are confirmed against seen_store when one is given
+        seen_config = self.config.processing.get('seen_ids')
+        self.seen_ids: Optional[SeenIds] = (
+            SeenIds.from_config(seen_config, store=seen_store) if seen_config else None
+        )
         
     def __enter__(self):
         """Context manager entry."""
@@ -56,10 +226,15 @@ class TwitterClient:
         self.close()
         
     def close(self):
-        """Close the requests session."""
+        """Close the requests session and capture log; save the seen-id filter."""
         if hasattr(self, 'session'):
             self.session.close()
             delattr(self, 'session')
+        if getattr(self, 'seen_ids', None) is not None:
+            self.seen_ids.save()
+        # Last, since it raises if the capture writer failed
+        if getattr(self, 'capture', None) is not None:
+            self.capture.close()
     
     def load_cookies(self, cookie_data: Dict[str, Any]) -> None:
         """Load cookie data from open_x_cdp.py format."""
@@ -136,6 +311,12 @@ class TwitterClient:
         headers = {'Cookie': self.get_cookie_header()}
         
         for attempt in range(max_retries):
+            # Wait for quota before every round trip, including retries
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire(endpoint)
+                
+            request_data = None
+            started = time.perf_counter()
             try:
                 if method.upper() == 'POST':
                     request_data = data or {}
@@ -150,14 +331,23 @@ class TwitterClient:
                 else:
                     response = self.session.get(url, headers=headers, timeout=timeout_seconds)
                 
+                if self.capture is not None:
+                    self.capture.record(method, endpoint, request_data,
+                                        time.perf_counter() - started, response=response)
                 return self._handle_response(response)
                 
             except requests.Timeout:
+                if self.capture is not None:
+                    self.capture.record(method, endpoint, request_data,
+                                        time.perf_counter() - started, error='timeout')
                 if attempt == max_retries - 1:
                     raise TwitterClientError("Request timeout - bridge may be unavailable")
                 time.sleep(backoff_base ** attempt)  # Exponential backoff
                 
             except requests.ConnectionError:
+                if self.capture is not None:
+                    self.capture.record(method, endpoint, request_data,
+                                        time.perf_counter() - started, error='connection')
                 if attempt == max_retries - 1:
                     raise TwitterClientError("Connection error - unable to reach bridge")
                 time.sleep(backoff_base ** attempt)  # Exponential backoff
@@ -187,7 +377,10 @@ class TwitterClient:
                 error_message = error.get('message', 'Unknown error')
                 
                 # Format as HTTP status error with JSON details
-                raise TwitterClientError(f"HTTP {response.status_code}: {error_code} - {error_message}")
+                raise TwitterClientError(
+                    f"HTTP {response.status_code}: {error_code} - {error_message}",
+                    code=error_code
+                )
                 
             except json.JSONDecodeError:
                 # No valid JSON, use status code and reason phrase
@@ -202,61 +395,84 @@ class TwitterClient:
             
         # Handle application-level errors from successful HTTP responses
         if not data.get('success', False):
-            error = data.get('error', {})
-            error_code = error.get('code', 'UNKNOWN')
-            error_message = error.get('message', 'Unknown error')
-            
-            if 'AUTHENTICATION' in error_code:
-                raise TwitterClientError(f"Authentication error: {error_message}")
-            elif error_code == 'NOT_FOUND':
-                raise TwitterClientError(f"Resource not found: {error_message}")
-            elif error_code == 'RATE_LIMITED':
-                raise TwitterClientError(f"Rate limit exceeded: {error_message}")
-            else:
-                raise TwitterClientError(f"API error ({error_code}): {error_message}")
+            raise self._error_from_payload(data.get('error', {}))
                 
         return data
         
-    def _normalize_tweet(self, tweet_data: Dict[str, Any]) -> Tweet:
+    def _error_from_payload(self, error: Dict[str, Any]) -> TwitterClientError:
+        """Map a bridge error object to a TwitterClientError."""
+        error_code = error.get('code', 'UNKNOWN')
+        error_message = error.get('message', 'Unknown error')
+        
+        if 'AUTHENTICATION' in error_code:
+            return TwitterClientError(f"Authentication error: {error_message}", code=error_code)
+        elif error_code == 'NOT_FOUND':
+            return TwitterClientError(f"Resource not found: {error_message}", code=error_code)
+        elif error_code == 'RATE_LIMITED':
+            return TwitterClientError(f"Rate limit exceeded: {error_message}", code=error_code)
+        else:
+            return TwitterClientError(f"API error ({error_code}): {error_message}", code=error_code)
+        
+    def _normalize_tweets(self, tweet_list: List[Dict[str, Any]]) -> List[Tweet]:
+        """Normalize a response's tweets, sharing one Profile per author."""
+        profiles = self.profile_interner
+        if profiles is None:
+            profiles = ProfileInterner()
+        return [self._normalize_tweet(tweet_data, profiles) for tweet_data in tweet_list]
+        
+    def _normalize_unseen(self, tweet_list: List[Dict[str, Any]],
+                          skip_seen: bool = True, mark: bool = True) -> List[Tweet]:
+        """Normalize timeline tweets, skipping ids seen_ids has already seen.
+        
+        Seen tweets are dropped from the raw dicts, so no Tweet is built for
+        them; with mark the rest are marked seen once they have been
+        normalized. With skip_seen False every tweet is returned and none is
+        marked.
+        """
+        if self.seen_ids is None or not skip_seen:
+            return self._normalize_tweets(tweet_list)
+        unseen = self.seen_ids.filter_records(tweet_list, mark=False)
+        tweets = self._normalize_tweets(unseen)
+        if mark:
+            self._mark_seen(tweets, skip_seen)
+        return tweets
+        
+    def _mark_seen(self, tweets: Iterable[Tweet], skip_seen: bool = True) -> None:
+        """Mark tweets seen in seen_ids, unless skip_seen is False."""
+        if self.seen_ids is not None and skip_seen:
+            self.seen_ids.mark(tweet.id for tweet in tweets)
+        
+    def _normalize_tweet(self, tweet_data: Dict[str, Any],
+                         profiles: Optional[ProfileInterner] = None) -> Tweet:
         """Normalize bridge tweet data to Tweet model."""
         user_data = tweet_data.get('user', {})
-        user = self._normalize_user(user_data)
+        if profiles is None:
+            profiles = self.profile_interner
+        if profiles is not None:
+            user = profiles.get_or_create(user_data, self._normalize_user)
+        else:
+            user = self._normalize_user(user_data)
         
         engagement_data = tweet_data.get('engagement', {})
         engagement = self._normalize_engagement(engagement_data)
         
-        # Parse created_at timestamp
-        created_at_str = tweet_data.get('createdAt')
-        if created_at_str:
-            try:
-                created_at = date_parser.parse(created_at_str)
-            except (ValueError, TypeError):
-                created_at = datetime.now()
-        else:
-            created_at = datetime.now()
+        created_at = self._created_at(tweet_data)
             
-        # Create basic content features
-        text = tweet_data.get('text', '')
-        features = ContentFeatures(
-            length=len(text),
-            word_count=len(text.split()),
-            has_question='?' in text,
-            has_media=bool(tweet_data.get('media', [])),
-            has_hashtags='#' in text,
-            has_mentions='@' in text,
-            has_links='http' in text.lower()
+        # Derive content features from the text in one pass
+        features, hashtags, mentions = record_features(
+            tweet_data, self.sentiment_analyzer.label, self.keyword_matcher
         )
         
         return Tweet(
             id=tweet_data.get('id', ''),
-            text=text,
+            text=tweet_data.get('text', ''),
             user=user,
             created_at=created_at,
             engagement=engagement,
             features=features,
             urls=tweet_data.get('urls', []),
-            hashtags=tweet_data.get('hashtags', []),
-            mentions=tweet_data.get('mentions', []),
+            hashtags=hashtags,
+            mentions=mentions,
             media=tweet_data.get('media', []),
             is_retweet=tweet_data.get('isRetweet', False),
             is_reply=tweet_data.get('isReply', False),
@@ -266,12 +482,34 @@ class TwitterClient:
             retweeted_tweet=tweet_data.get('retweetedTweet')
         )
         
+    def _created_at(self, tweet_data: Dict[str, Any]) -> datetime:
+        """Creation time from createdAt, or decoded from a Snowflake id.
+        
+        With processing['snowflake_timestamps'] the id is decoded first and
+        createdAt is only parsed for non-Snowflake ids. The current time is
+        the last resort, for records with neither.
+        """
+        tweet_id = tweet_data.get('id', '')
+        snowflake = is_snowflake(tweet_id)
+        if snowflake and self.config.processing.get('snowflake_timestamps'):
+            return snowflake_to_datetime(tweet_id)
+        created_at_str = tweet_data.get('createdAt')
+        if created_at_str:
+            try:
+                return parse_timestamp(created_at_str)
+            except (ValueError, TypeError):
+                pass
+        if snowflake:
+            return snowflake_to_datetime(tweet_id)
+        return datetime.now()
+        
     def _normalize_user(self, user_data: Dict[str, Any]) -> Profile:
         """Normalize bridge user data to Profile model."""
         join_date = None
         if 'joinDate' in user_data:
             try:
-                join_date = date_parser.parse(user_data['joinDate'])
+                # Join dates repeat for every tweet by the same author
+                join_date = parse_timestamp_cached(user_data['joinDate'])
             except (ValueError, TypeError):
                 pass
                 
@@ -302,33 +540,270 @@ class TwitterClient:
         
     # Functional methods that work with Node.js bridge
     
-    def get_timeline(self, count: int = 20) -> List[Tweet]:
-        """Get timeline tweets."""
+    def get_timeline(self, count: int = 20, skip_seen: bool = True) -> List[Tweet]:
+        """Get timeline tweets; with seen_ids configured, only unseen ones.
+        
+        Pass skip_seen=False to get every tweet without marking any seen.
+        """
         data = self._make_request('POST', '/api/timeline', {'count': count})
         tweet_list = data.get('data', [])
-        return [self._normalize_tweet(tweet_data) for tweet_data in tweet_list]
+        return self._normalize_unseen(tweet_list, skip_seen)
+        
+    def iter_timeline(self, max_items: Optional[int] = None, page_size: int = 20,
+                      include_replies: bool = False,
+                      since_id: Optional[str] = None,
+                      skip_seen: bool = True) -> Iterator[Tweet]:
+        """Stream timeline tweets page by page following bridge cursors.
+        
+        Tweets are yielded as each page arrives. While the caller consumes a
+        page the next one is already being fetched in the background, as long
+        as `metadata.hasMore` is set and more items are wanted. Closing the
+        generator early (or reaching max_items) stops further page requests.
+        
+        With since_id only newer tweets are yielded: paging stops at the
+        first tweet whose id is not above since_id. skip_seen is passed on
+        to seen_ids filtering as in get_timeline.
+        """
+        if page_size <= 0:
+            raise ValueError("page_size must be positive")
+        remaining = max_items
+        if remaining is not None and remaining <= 0:
+            return
+            
+        executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix='timeline-prefetch')
+        next_page: Optional[Future] = None
+        try:
+            count = page_size if remaining is None else min(page_size, remaining)
+            page, cursor = self._fetch_timeline_page(count, None, include_replies,
+                                                     since_id, skip_seen)
+            while True:
+                if remaining is not None:
+                    page = page[:remaining]
+                    remaining -= len(page)
+                if cursor is not None and remaining != 0:
+                    count = page_size if remaining is None else min(page_size, remaining)
+                    next_page = executor.submit(self._fetch_timeline_page, count, cursor,
+                                                include_replies, since_id, skip_seen)
+                    
+                # Only tweets handed to the caller are marked seen, so ones
+                # left unread after an early exit come back next time.
+                for tweet in page:
+                    self._mark_seen([tweet], skip_seen)
+                    yield tweet
+                
+                if next_page is None:
+                    return
+                page, cursor = next_page.result()
+                next_page = None
+        finally:
+            if next_page is not None:
+                next_page.cancel()
+            executor.shutdown(wait=False)
+            
+    def _fetch_timeline_page(self, count: int, cursor: Optional[str],
+                             include_replies: bool = False,
+                             since_id: Optional[str] = None,
+                             skip_seen: bool = True) -> Tuple[List[Tweet], Optional[str]]:
+        """Fetch one timeline page; return its tweets and the next cursor, if any.
+        
+        With since_id the page is cut at the first already-seen tweet (before
+        normalizing it) and no next cursor is returned. An empty page also
+        ends paging; one emptied by seen_ids does not. No tweet is marked
+        seen here; iter_timeline marks them as they are yielded.
+        """
+        request_data: Dict[str, Any] = {'count': count}
+        if cursor is not None:
+            request_data['cursor'] = cursor
+        if include_replies:
+            request_data['includeReplies'] = True
+        if since_id is not None:
+            request_data['sinceId'] = since_id
+        data = self._make_request('POST', '/api/timeline', request_data)
+        
+        metadata = data.get('metadata') or {}
+        next_cursor = metadata.get('nextCursor') if metadata.get('hasMore') else None
+        tweet_list = data.get('data', [])
+        if not tweet_list:
+            next_cursor = None
+        if since_id is not None:
+            newest_seen = id_sort_key(since_id)
+            for position, tweet_data in enumerate(tweet_list):
+                if id_sort_key(tweet_data.get('id', '')) <= newest_seen:
+                    tweet_list = tweet_list[:position]
+                    next_cursor = None
+                    break
+        return self._normalize_unseen(tweet_list, skip_seen, mark=False), next_cursor
         
     def get_latest_tweet(self) -> Tweet:
-        """Get the latest tweet from timeline."""
-        tweets = self.get_timeline(count=1)
+        """Get the latest tweet from timeline, even if it was seen before."""
+        data = self._make_request('POST', '/api/timeline', {'count': 1})
+        tweets = self._normalize_tweets(data.get('data', []))
         if not tweets:
             raise TwitterClientError("No tweets found")
         return tweets[0]
         
-    def get_tweets_and_replies(self, count: int = 20) -> List[Tweet]:
-        """Get tweets and replies."""
+    def get_tweets_and_replies(self, count: int = 20,
+                               skip_seen: bool = True) -> List[Tweet]:
+        """Get tweets and replies; skip_seen as in get_timeline."""
         data = self._make_request('POST', '/api/timeline', {
             'count': count, 
             'includeReplies': True
         })
         tweet_list = data.get('data', [])
-        return [self._normalize_tweet(tweet_data) for tweet_data in tweet_list]
+        return self._normalize_unseen(tweet_list, skip_seen)
         
     def get_tweet(self, tweet_id: str) -> Tweet:
-        """Get specific tweet by ID."""
-        data = self._make_request('GET', f'/api/tweet/{tweet_id}')
+        """Get specific tweet by ID, served from the cache when possible."""
+        cached = self._cached_tweet(tweet_id)
+        if isinstance(cached, TwitterClientError):
+            raise cached
+        if cached is not None:
+            return cached
+            
+        try:
+            data = self._make_request('GET', f'/api/tweet/{tweet_id}')
+        except TwitterClientError as e:
+            self._cache_result(tweet_id, e)
+            raise
         tweet_data = data.get('data', {})
-        return self._normalize_tweet(tweet_data)
+        tweet = self._normalize_tweet(tweet_data)
+        self._cache_result(tweet_id, tweet)
+        return tweet
+        
+    def get_tweets(self, tweet_ids: Sequence[str]) -> List[Union[Tweet, TwitterClientError]]:
+        """Get many tweets by ID through the bridge batch endpoint.
+        
+        Duplicate ids are fetched once and ids already being fetched by another
+        thread are awaited instead of requested again. Ids are sent to
+        `/api/tweets` in chunks of processing['batch_size']; a bridge without
+        that route gets one `/api/tweet/{id}` request per id instead, made one
+        at a time by the thread that owns the ids. The result list matches
+        the input order; each position holds the Tweet or the
+        TwitterClientError for that id, so one bad id never fails the batch.
+        """
+        results: Dict[str, Union[Tweet, TwitterClientError]] = {}
+        uncached_ids = []
+        for tweet_id in dict.fromkeys(tweet_ids):
+            cached = self._cached_tweet(tweet_id)
+            if cached is None:
+                uncached_ids.append(tweet_id)
+            else:
+                results[tweet_id] = cached
+                
+        owned, futures = self._inflight_tweets.claim(uncached_ids)
+        
+        batch_size = self.config.processing.get('batch_size', 20)
+        pending = list(owned)
+        try:
+            while pending:
+                chunk, pending = pending[:batch_size], pending[batch_size:]
+                results_by_id, reported = self._fetch_tweet_batch(chunk)
+                for tweet_id, result in results_by_id.items():
+                    self._cache_result(tweet_id, result, negative=tweet_id in reported)
+                    self._inflight_tweets.resolve(tweet_id, result)
+        except BaseException as e:
+            # Never leave other callers waiting on ids we failed to fetch
+            for tweet_id in chunk + pending:
+                self._inflight_tweets.fail(tweet_id, e)
+            raise
+            
+        for tweet_id, future in futures.items():
+            results[tweet_id] = future.result()
+        return [results[tweet_id] for tweet_id in tweet_ids]
+        
+    def _cached_tweet(self, tweet_id: str) -> Optional[Union[Tweet, TwitterClientError]]:
+        """Return the cached Tweet or NOT_FOUND error for an id, if any."""
+        if self.cache is None:
+            return None
+        entry = self.cache.get(tweet_id)
+        if entry is None:
+            return None
+        if entry.negative:
+            error = entry.value
+            return TwitterClientError(str(error), code=error.code)
+        return entry.value
+        
+    def _cache_result(self, tweet_id: str, result: Union[Tweet, TwitterClientError],
+                      negative: bool = True) -> None:
+        """Cache a fetched Tweet, or a NOT_FOUND error as a negative entry.
+        
+        With negative False errors are never cached, for failures that say
+        nothing about this particular tweet.
+        """
+        if self.cache is None:
+            return
+        if isinstance(result, Tweet):
+            self.cache.set(tweet_id, result)
+        elif negative and result.code == 'NOT_FOUND':
+            self.cache.set_negative(tweet_id, result)
+            
+    def invalidate_tweet(self, tweet_id: str) -> bool:
+        """Drop a tweet (or its NOT_FOUND marker) from the cache."""
+        if self.cache is None:
+            return False
+        return self.cache.invalidate(tweet_id)
+        
+    def clear_cache(self) -> None:
+        """Drop every cached tweet lookup."""
+        if self.cache is not None:
+            self.cache.clear()
+        
+    def _fetch_tweet_batch(
+        self, tweet_ids: List[str]
+    ) -> Tuple[Dict[str, Union[Tweet, TwitterClientError]], Set[str]]:
+        """Fetch one chunk of ids from `/api/tweets`.
+        
+        Returns each id's result and the ids whose error came from the
+        response's per-id `errors` list. A failed request is given to every
+        id but is never a statement about any one tweet, so it is not in that
+        set. When the bridge has no such route, the ids are fetched one by
+        one instead, from then on without trying the batch route again.
+        """
+        if self._batch_route_missing:
+            return self._fetch_tweets_one_by_one(tweet_ids)
+        try:
+            data = self._make_request('POST', '/api/tweets', {'ids': tweet_ids})
+        except TwitterClientError as e:
+            if _is_unknown_route(e):
+                self._batch_route_missing = True
+                return self._fetch_tweets_one_by_one(tweet_ids)
+            return {tweet_id: e for tweet_id in tweet_ids}, set()
+            
+        results: Dict[str, Union[Tweet, TwitterClientError]] = {
+            tweet.id: tweet for tweet in self._normalize_tweets(data.get('data', []))
+        }
+        reported = set()
+        for error in data.get('errors', []):
+            results[error.get('id', '')] = self._error_from_payload(error)
+            reported.add(error.get('id', ''))
+            
+        return {
+            tweet_id: results.get(tweet_id) or TwitterClientError(
+                f"Resource not found: Tweet {tweet_id} missing from batch response",
+                code='NOT_FOUND'
+            )
+            for tweet_id in tweet_ids
+        }, reported
+        
+    def _fetch_tweets_one_by_one(
+        self, tweet_ids: List[str]
+    ) -> Tuple[Dict[str, Union[Tweet, TwitterClientError]], Set[str]]:
+        """Fetch a chunk through `/api/tweet/{id}`, like _fetch_tweet_batch.
+        
+        A per-id NOT_FOUND is reported for its id; other failures are not.
+        """
+        results: Dict[str, Union[Tweet, TwitterClientError]] = {}
+        reported = set()
+        for tweet_id in tweet_ids:
+            try:
+                data = self._make_request('GET', f'/api/tweet/{tweet_id}')
+            except TwitterClientError as e:
+                results[tweet_id] = e
+                if e.code == 'NOT_FOUND' and not _is_unknown_route(e):
+                    reported.add(tweet_id)
+                continue
+            results[tweet_id] = self._normalize_tweet(data.get('data', {}))
+        return results, reported
         
     # Placeholder methods for features not yet implemented
     